@@ -5,13 +5,19 @@ This script benchmarks the simulation with and without spatial partitioning
 across different boid counts to demonstrate the performance improvements.
 """
 
-from dataclasses import dataclass
+import argparse
+import statistics
+from dataclasses import dataclass, field
 
 import pygame as pg
 
+from benchmarks.isolation import run_isolated
 from my_boids.boid_vs_boundary import BoundaryType
 from my_boids.game import Game
 from my_boids.options import BoidOptions, ScreenOptions
+from my_boids.spatial_grid import GridQueryStats
+
+SEED = 12345
 
 
 @dataclass
@@ -24,6 +30,10 @@ class BenchmarkResult:
         avg_fps: Average frames per second.
         avg_frame_time_ms: Average frame time in milliseconds.
         total_frames: Total number of frames processed.
+        grid_stats: Spatial grid query statistics of the last frame, or None
+            without the grid.
+        frame_times_ms: Time of every frame in milliseconds.
+        runs: Number of isolated runs pooled into the result.
     """
 
     boid_count: int
@@ -31,12 +41,16 @@ class BenchmarkResult:
     avg_fps: float
     avg_frame_time_ms: float
     total_frames: int
+    grid_stats: GridQueryStats | None = None
+    frame_times_ms: list[float] = field(default_factory=list)
+    runs: int = 1
 
 
 def benchmark_simulation(
     boid_count: int,
     use_spatial_grid: bool,
     frames_to_test: int = 300,
+    seed: int = SEED,
 ) -> BenchmarkResult:
     """Run a benchmark of the simulation.
 
@@ -44,6 +58,7 @@ def benchmark_simulation(
         boid_count: Number of boids to simulate.
         use_spatial_grid: Whether to use spatial partitioning.
         frames_to_test: Number of frames to run for benchmarking.
+        seed: Seed for the initial flock, so every run starts from the same one.
 
     Returns:
         BenchmarkResult: Performance metrics from the benchmark.
@@ -79,27 +94,55 @@ def benchmark_simulation(
         use_spatial_grid=use_spatial_grid,
         show_metrics=False,
         enable_profiling=True,
+        seed=seed,
     )
 
     # Run simulation for specified number of frames
+    frame_times_ms = []
     for _ in range(frames_to_test):
         game.performance.start_frame()
         game.run_logic()
         game.performance.end_frame()
-
-    # Get performance metrics
-    avg_fps = game.performance.get_fps()
-    avg_frame_time = game.performance.get_avg_frame_time()
+        assert game.performance.current_metrics is not None
+        frame_times_ms.append(game.performance.current_metrics.frame_time * 1000)
 
     # Cleanup
     pg.quit()
 
+    avg_frame_time = statistics.fmean(frame_times_ms)
     return BenchmarkResult(
         boid_count=boid_count,
         use_spatial_grid=use_spatial_grid,
-        avg_fps=avg_fps,
+        avg_fps=1000 / avg_frame_time if avg_frame_time > 0 else 0.0,
         avg_frame_time_ms=avg_frame_time,
         total_frames=frames_to_test,
+        grid_stats=game.grid_stats,
+        frame_times_ms=frame_times_ms,
+    )
+
+
+def pool_results(runs: list[BenchmarkResult]) -> BenchmarkResult:
+    """Pool the frames of runs of one configuration into a single result.
+
+    Args:
+        runs: Results of the same boid count and mode, e.g. from separate
+            processes.
+
+    Returns:
+        BenchmarkResult: The averages over every frame of every run, with the
+            grid statistics of the last run.
+    """
+    frame_times_ms = [frame_time for run in runs for frame_time in run.frame_times_ms]
+    avg_frame_time = statistics.fmean(frame_times_ms)
+    return BenchmarkResult(
+        boid_count=runs[0].boid_count,
+        use_spatial_grid=runs[0].use_spatial_grid,
+        avg_fps=1000 / avg_frame_time if avg_frame_time > 0 else 0.0,
+        avg_frame_time_ms=avg_frame_time,
+        total_frames=len(frame_times_ms),
+        grid_stats=runs[-1].grid_stats,
+        frame_times_ms=frame_times_ms,
+        runs=sum(run.runs for run in runs),
     )
 
 
@@ -111,7 +154,10 @@ def print_results(results: list[BenchmarkResult]) -> None:
     """
     print("\nPerformance Comparison Results")
     print("=" * 80)
-    print(f"{'Boids':<10} {'Mode':<15} {'Avg FPS':<12} {'Avg Frame (ms)':<15} {'Frames':<10}")
+    print(
+        f"{'Boids':<10} {'Mode':<15} {'Avg FPS':<12} {'Avg Frame (ms)':<15} "
+        f"{'Frames':<10} {'Runs':<6}"
+    )
     print("-" * 80)
 
     for result in results:
@@ -119,7 +165,34 @@ def print_results(results: list[BenchmarkResult]) -> None:
         print(
             f"{result.boid_count:<10} {mode:<15} "
             f"{result.avg_fps:<12.2f} {result.avg_frame_time_ms:<15.3f} "
-            f"{result.total_frames:<10}"
+            f"{result.total_frames:<10} {result.runs:<6}"
+        )
+
+    print("=" * 80)
+
+
+def print_grid_stats(results: list[BenchmarkResult]) -> None:
+    """Print the spatial grid query statistics of the grid runs.
+
+    Args:
+        results: List of benchmark results to display.
+    """
+    print("\nSpatial Grid Query Statistics (last frame)")
+    print("=" * 80)
+    print(
+        f"{'Boids':<10} {'Cells/Query':<13} {'Scanned/Query':<15} {'Hit Rate':<10} "
+        f"{'Avg Occupancy':<15} {'Max Occupancy':<14}"
+    )
+    print("-" * 80)
+
+    for result in results:
+        stats = result.grid_stats
+        if stats is None:
+            continue
+        print(
+            f"{result.boid_count:<10} {stats.cells_per_query:<13.1f} "
+            f"{stats.candidates_per_query:<15.1f} {stats.hit_rate:<10.1%} "
+            f"{stats.mean_occupancy:<15.2f} {stats.max_occupancy:<14}"
         )
 
     print("=" * 80)
@@ -159,40 +232,80 @@ def calculate_speedup(results: list[BenchmarkResult]) -> None:
     print("=" * 80)
 
 
-def main():
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=1,
+        metavar="N",
+        help="isolated runs per configuration, pooled into one result (default: 1)",
+    )
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        help="pin every run to this CPU, where the platform supports it",
+    )
+    args = parser.parse_args(argv)
+    if args.repeats < 1:
+        parser.error(f"--repeats must be at least 1, got {args.repeats}")
+    return args
+
+
+def run_configuration(
+    boid_count: int,
+    use_spatial_grid: bool,
+    frames_to_test: int,
+    repeats: int = 1,
+    cpu: int | None = None,
+) -> BenchmarkResult:
+    """Benchmark one configuration in ``repeats`` freshly spawned processes.
+
+    Args:
+        boid_count: Number of boids to simulate.
+        use_spatial_grid: Whether to use spatial partitioning.
+        frames_to_test: Number of frames per run.
+        repeats: Number of isolated runs, pooled into one result.
+        cpu: CPU to pin every run to, or None.
+
+    Returns:
+        BenchmarkResult: The pooled result.
+    """
+    runs = [
+        run_isolated(benchmark_simulation, boid_count, use_spatial_grid, frames_to_test, cpu=cpu)
+        for _ in range(repeats)
+    ]
+    return pool_results(runs)
+
+
+def main(argv: list[str] | None = None):
     """Run performance benchmarks and display results."""
+    args = _parse_args(argv)
     print("Boids Simulation Performance Benchmark")
     print("Testing spatial partitioning vs brute force collision detection...")
     print()
 
-    # Test configurations: different boid counts
+    # Test configurations: different boid counts. Every run is a fresh
+    # process from the same seeded flock, so runs don't affect each other
     boid_counts = [50, 100, 200, 500]
     frames_per_test = 300
 
     results: list[BenchmarkResult] = []
 
     for boid_count in boid_counts:
-        print(f"Testing {boid_count} boids (brute force)...", end=" ", flush=True)
-        result = benchmark_simulation(
-            boid_count=boid_count,
-            use_spatial_grid=False,
-            frames_to_test=frames_per_test,
-        )
-        results.append(result)
-        print(f"Done! Avg FPS: {result.avg_fps:.2f}")
-
-        print(f"Testing {boid_count} boids (spatial grid)...", end=" ", flush=True)
-        result = benchmark_simulation(
-            boid_count=boid_count,
-            use_spatial_grid=True,
-            frames_to_test=frames_per_test,
-        )
-        results.append(result)
-        print(f"Done! Avg FPS: {result.avg_fps:.2f}")
+        for use_spatial_grid in (False, True):
+            mode = "spatial grid" if use_spatial_grid else "brute force"
+            print(f"Testing {boid_count} boids ({mode})...", end=" ", flush=True)
+            result = run_configuration(
+                boid_count, use_spatial_grid, frames_per_test, args.repeats, args.cpu
+            )
+            results.append(result)
+            print(f"Done! Avg FPS: {result.avg_fps:.2f}")
         print()
 
     # Display results
     print_results(results)
+    print_grid_stats(results)
     calculate_speedup(results)
 
     print("\nBenchmark complete!")
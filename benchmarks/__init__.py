@@ -0,0 +1,5 @@
+"""Benchmark suites for the boids simulation.
+
+Run them with ``python -m benchmarks``, or through pytest with
+``pytest -m benchmark``.
+"""
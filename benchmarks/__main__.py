@@ -0,0 +1,7 @@
+"""Allow running the benchmark suites with ``python -m benchmarks``."""
+
+import sys
+
+from benchmarks.runner import main
+
+sys.exit(main())
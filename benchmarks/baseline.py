@@ -0,0 +1,255 @@
+"""Benchmark baselines and regression detection.
+
+Results are saved to a JSON baseline file together with metadata about the
+machine and interpreter that produced them. A later run is compared against
+the baseline benchmark by benchmark: a benchmark regresses when its median
+is slower by more than a relative threshold *and* by more than the run to run
+noise, estimated from the interquartile ranges of both runs.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Literal
+
+from benchmarks.harness import BenchmarkResult, format_time
+
+BASELINE_FORMAT_VERSION = 1
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_NOISE_FACTOR = 2.0
+
+ComparisonStatus = Literal["regressed", "improved", "unchanged", "new", "missing"]
+
+ResultKey = tuple[str, int, tuple[tuple[str, str], ...]]
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """A benchmark compared against its baseline.
+
+    Attributes:
+        name: Benchmark name.
+        size: Problem size.
+        params: Extra configuration parameters.
+        baseline_median: Baseline median time per call in seconds, or None if new.
+        current_median: Current median time per call in seconds, or None if missing.
+        status: Outcome of the comparison.
+    """
+
+    name: str
+    size: int
+    params: dict[str, str]
+    baseline_median: float | None
+    current_median: float | None
+    status: ComparisonStatus
+
+    @property
+    def ratio(self) -> float | None:
+        """Current median divided by the baseline median."""
+        if not self.baseline_median or self.current_median is None:
+            return None
+        return self.current_median / self.baseline_median
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def _package_version(package: str) -> str | None:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def collect_metadata() -> dict[str, Any]:
+    """Describe the machine and interpreter running the benchmarks."""
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "packages": {
+            package: _package_version(package) for package in ("numpy", "pygame-ce", "pydantic")
+        },
+        "git_commit": _git_commit(),
+    }
+
+
+def _result_key(result: BenchmarkResult) -> ResultKey:
+    return (result.name, result.size, tuple(sorted(result.params.items())))
+
+
+def save_baseline(results: list[BenchmarkResult], path: str | Path) -> Path:
+    """Write benchmark results and run metadata to a JSON baseline file.
+
+    Args:
+        results (list[BenchmarkResult]): Results to save.
+        path (str | Path): Destination file. Parent directories are created.
+
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        "version": BASELINE_FORMAT_VERSION,
+        "metadata": collect_metadata(),
+        "results": [
+            {
+                "name": result.name,
+                "size": result.size,
+                "params": result.params,
+                "number": result.number,
+                "samples": result.samples,
+                "median": result.median,
+                "iqr": result.iqr,
+            }
+            for result in results
+        ],
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+    return path
+
+
+def load_baseline(path: str | Path) -> tuple[dict[str, Any], list[BenchmarkResult]]:
+    """Read a baseline file written by :func:`save_baseline`.
+
+    Args:
+        path (str | Path): Baseline file.
+
+    Returns:
+        tuple[dict[str, Any], list[BenchmarkResult]]: The run metadata and results.
+
+    Raises:
+        ValueError: If the file has an unsupported format version.
+    """
+    baseline = json.loads(Path(path).read_text())
+    if baseline.get("version") != BASELINE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported baseline format version: {baseline.get('version')}")
+    results = [
+        BenchmarkResult(
+            name=entry["name"],
+            size=entry["size"],
+            number=entry["number"],
+            samples=entry["samples"],
+            params=entry.get("params", {}),
+        )
+        for entry in baseline["results"]
+    ]
+    return baseline["metadata"], results
+
+
+def compare_results(
+    baseline: list[BenchmarkResult],
+    current: list[BenchmarkResult],
+    threshold: float = DEFAULT_THRESHOLD,
+    noise_factor: float = DEFAULT_NOISE_FACTOR,
+) -> list[Comparison]:
+    """Compare current results against a baseline.
+
+    A benchmark regresses (or improves) when its median changes by more than
+    ``threshold`` relative to the baseline and by more than ``noise_factor``
+    times the larger interquartile range of the two runs.
+
+    Args:
+        baseline (list[BenchmarkResult]): Baseline results.
+        current (list[BenchmarkResult]): Results of the current run.
+        threshold (float): Minimum relative change to report. Defaults to 0.10.
+        noise_factor (float): Multiple of the run to run noise a change must
+            exceed. Defaults to 2.0.
+
+    Returns:
+        list[Comparison]: One comparison per benchmark in either run, in the
+            order of the current run followed by benchmarks missing from it.
+    """
+    baseline_by_key = {_result_key(result): result for result in baseline}
+    current_keys = set()
+    comparisons = []
+    for result in current:
+        key = _result_key(result)
+        current_keys.add(key)
+        reference = baseline_by_key.get(key)
+        if reference is None:
+            comparisons.append(
+                Comparison(result.name, result.size, result.params, None, result.median, "new")
+            )
+            continue
+        change = result.median - reference.median
+        noise = noise_factor * max(reference.iqr, result.iqr)
+        status: ComparisonStatus = "unchanged"
+        if abs(change) > threshold * reference.median and abs(change) > noise:
+            status = "regressed" if change > 0 else "improved"
+        comparisons.append(
+            Comparison(
+                result.name, result.size, result.params, reference.median, result.median, status
+            )
+        )
+
+    for key, reference in baseline_by_key.items():
+        if key not in current_keys:
+            comparisons.append(
+                Comparison(
+                    reference.name,
+                    reference.size,
+                    reference.params,
+                    reference.median,
+                    None,
+                    "missing",
+                )
+            )
+    return comparisons
+
+
+def print_comparison(comparisons: list[Comparison]) -> None:
+    """Print a comparison against a baseline as a table.
+
+    Args:
+        comparisons: Comparisons to display.
+    """
+    print("=" * 100)
+    print(
+        f"{'Benchmark':<28} {'Size':>7} {'Params':<16} {'Baseline':>12} {'Current':>12} "
+        f"{'Change':>9}  {'Status':<10}"
+    )
+    print("-" * 100)
+    for comparison in comparisons:
+        params = ",".join(f"{key}={value}" for key, value in sorted(comparison.params.items()))
+        baseline = (
+            format_time(comparison.baseline_median)
+            if comparison.baseline_median is not None
+            else "-"
+        )
+        current = (
+            format_time(comparison.current_median) if comparison.current_median is not None else "-"
+        )
+        ratio = comparison.ratio
+        change = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else "-"
+        status = (
+            comparison.status.upper() if comparison.status == "regressed" else comparison.status
+        )
+        print(
+            f"{comparison.name:<28} {comparison.size:>7} {params:<16} {baseline:>12} "
+            f"{current:>12} {change:>9}  {status:<10}"
+        )
+    print("=" * 100)
@@ -0,0 +1,299 @@
+"""Memory benchmark: bytes per boid for each state representation.
+
+Three representations of the flock are measured:
+
+- ``sprites``: the live ``Game``, where every boid is a ``Sprite`` holding
+  two ``Vector2``, a ``Color``, a ``Surface`` and a ``Rect``, plus the sprite
+  groups and, with the ``spatial_grid`` backend, the grid's cell lists
+- ``snapshot``: the ``FrameSnapshot`` the pipelined mode renders from
+- ``arrays``: the positions and velocities as numpy arrays
+
+Each one is measured twice, each time in a freshly spawned process: once for
+the growth of the resident set size (RSS), and once with tracemalloc for the
+bytes Python allocated. Tracing is kept out of the RSS run because its own
+bookkeeping inflates the RSS. Pixel data of pygame surfaces is allocated by
+SDL, outside Python's allocator, so only the RSS sees it. That matters for
+the snapshot: from ``heatmap_threshold`` boids on it holds a window-sized
+density heatmap instead of one blit per sprite.
+
+For the live game, one simulation step is also traced to find its transient
+peak, the memory allocated and freed again within the step, and, with the
+spatial grid, the bytes one grid rebuild allocates. The grid is rebuilt from
+scratch every frame, so that is allocation churn on every frame.
+"""
+
+import csv
+import os
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from benchmarks.harness import BACKENDS, DEFAULT_SEED, ensure_display, make_game
+from benchmarks.isolation import run_isolated
+from benchmarks.scaling import world_size
+from my_boids.game import Game
+
+REPRESENTATIONS = ("sprites", "snapshot", "arrays")
+DEFAULT_COUNTS = [1000, 10_000, 50_000]
+# A brute-force step is quadratic, so larger flocks are not stepped
+BRUTE_FORCE_STEP_LIMIT = 2000
+
+
+@dataclass(frozen=True)
+class FootprintResult:
+    """Memory used by one representation of a flock.
+
+    Attributes:
+        representation: State representation in :data:`REPRESENTATIONS`.
+        backend: Neighbor backend, or None where it does not apply.
+        count: Number of boids.
+        rss_bytes: Growth of the resident set size while building the state.
+        traced_bytes: Bytes allocated by Python for the state, per tracemalloc.
+        step_peak_bytes: Transient peak of one simulation step above the state,
+            or None if the representation is not stepped or the flock is too
+            large for a brute-force step.
+        grid_rebuild_bytes: Bytes one spatial grid rebuild allocates, or None
+            without the grid.
+    """
+
+    representation: str
+    backend: str | None
+    count: int
+    rss_bytes: int
+    traced_bytes: int
+    step_peak_bytes: int | None = None
+    grid_rebuild_bytes: int | None = None
+
+    @property
+    def rss_per_boid(self) -> float:
+        """RSS growth per boid, in bytes."""
+        return self.rss_bytes / self.count
+
+    @property
+    def traced_per_boid(self) -> float:
+        """Traced bytes per boid."""
+        return self.traced_bytes / self.count
+
+
+def current_rss() -> int:
+    """Resident set size of the current process in bytes, or 0 if unavailable.
+
+    Read from ``/proc`` on Linux. Elsewhere the peak RSS from ``getrusage`` is
+    used, which only grows, so deltas stay meaningful while memory is being
+    allocated.
+    """
+    statm = Path("/proc/self/statm")
+    if statm.exists():
+        return int(statm.read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def _traced() -> int:
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _build_game(count: int, use_spatial_grid: bool, seed: int) -> Game:
+    game = make_game(count, world_size(count), use_spatial_grid=use_spatial_grid, seed=seed)
+    if use_spatial_grid:
+        # One step fills the spatial grid
+        game.run_logic()
+    return game
+
+
+def measure_footprint(
+    representation: str, backend: str | None, count: int, trace: bool, seed: int = DEFAULT_SEED
+) -> dict[str, int]:
+    """Build one representation of a flock and measure its memory in this process.
+
+    Run it in a fresh process, e.g. with :func:`run_isolated`, so nothing
+    allocated earlier blurs the RSS.
+
+    Args:
+        representation (str): State representation in :data:`REPRESENTATIONS`.
+        backend (str | None): Neighbor backend for the live game. Defaults
+            to the spatial grid for the other representations.
+        count (int): Number of boids.
+        trace (bool): Measure with tracemalloc instead of the RSS.
+        seed (int): Seed for the flock.
+
+    Returns:
+        dict[str, int]: ``rss_bytes`` without tracing, or ``traced_bytes``,
+            ``step_peak_bytes`` and ``grid_rebuild_bytes`` (those last two for
+            the live game only) with tracing.
+
+    Raises:
+        ValueError: If the representation or backend is unknown.
+    """
+    if representation not in REPRESENTATIONS:
+        raise ValueError(f"Unknown representation: {representation}")
+    if backend is not None and backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    ensure_display()
+    use_spatial_grid = BACKENDS[backend or "spatial_grid"]
+
+    if representation != "sprites":
+        game = _build_game(count, use_spatial_grid, seed)
+        rss_before = current_rss()
+        if trace:
+            tracemalloc.start()
+        state: object = (
+            game.snapshot()
+            if representation == "snapshot"
+            else (game.get_boid_positions(), game.get_boid_velocities())
+        )
+        if not trace:
+            return {"rss_bytes": current_rss() - rss_before}
+        measured = {"traced_bytes": _traced()}
+        tracemalloc.stop()
+        del state
+        return measured
+
+    rss_before = current_rss()
+    if trace:
+        tracemalloc.start()
+    game = _build_game(count, use_spatial_grid, seed)
+    if not trace:
+        return {"rss_bytes": current_rss() - rss_before}
+    measured = {"traced_bytes": _traced()}
+
+    if use_spatial_grid or count <= BRUTE_FORCE_STEP_LIMIT:
+        tracemalloc.reset_peak()
+        baseline = _traced()
+        game.run_logic()
+        measured["step_peak_bytes"] = tracemalloc.get_traced_memory()[1] - baseline
+    if game.spatial_grid is not None:
+        game.spatial_grid.clear()
+        cleared = _traced()
+        for boid in game.boid_list:
+            game.spatial_grid.insert(boid)
+        measured["grid_rebuild_bytes"] = _traced() - cleared
+    tracemalloc.stop()
+    return measured
+
+
+def run_footprint(
+    counts: list[int] | None = None,
+    representations: list[str] | None = None,
+    backends: list[str] | None = None,
+    seed: int = DEFAULT_SEED,
+    verbose: bool = False,
+) -> list[FootprintResult]:
+    """Measure every representation of flocks of every size.
+
+    Args:
+        counts (list[int] | None): Boid counts. Defaults to 1000, 10000 and 50000.
+        representations (list[str] | None): Representations. Defaults to all.
+        backends (list[str] | None): Neighbor backends for the live game.
+            Defaults to all.
+        seed (int): Seed for the flock.
+        verbose (bool): Print progress. Defaults to False.
+
+    Returns:
+        list[FootprintResult]: One result per count, representation and,
+            for the live game, backend.
+
+    Raises:
+        ValueError: If a representation or backend is unknown.
+    """
+    unknown = sorted(set(representations or []) - set(REPRESENTATIONS))
+    unknown += sorted(set(backends or []) - set(BACKENDS))
+    if unknown:
+        raise ValueError(f"Unknown representations or backends: {', '.join(unknown)}")
+
+    results = []
+    for count in counts or DEFAULT_COUNTS:
+        for representation in representations or REPRESENTATIONS:
+            representation_backends: list[str | None] = (
+                list(backends or BACKENDS) if representation == "sprites" else [None]
+            )
+            for backend in representation_backends:
+                if verbose:
+                    label = f"{representation}/{backend}" if backend else representation
+                    print(f"Measuring {label} at {count} boids...", flush=True)
+                rss = run_isolated(measure_footprint, representation, backend, count, False, seed)
+                traced = run_isolated(measure_footprint, representation, backend, count, True, seed)
+                results.append(
+                    FootprintResult(
+                        representation=representation,
+                        backend=backend,
+                        count=count,
+                        rss_bytes=rss["rss_bytes"],
+                        traced_bytes=traced["traced_bytes"],
+                        step_peak_bytes=traced.get("step_peak_bytes"),
+                        grid_rebuild_bytes=traced.get("grid_rebuild_bytes"),
+                    )
+                )
+    return results
+
+
+def _format_bytes(value: float | None) -> str:
+    if value is None:
+        return "-"
+    if abs(value) >= 1024 * 1024:
+        return f"{value / (1024 * 1024):.1f}MiB"
+    if abs(value) >= 1024:
+        return f"{value / 1024:.1f}KiB"
+    return f"{value:.0f}B"
+
+
+def print_footprint(results: list[FootprintResult]) -> None:
+    """Print memory results in a formatted table.
+
+    Args:
+        results: Results to display.
+    """
+    print("=" * 112)
+    print(
+        f"{'Representation':<24} {'Boids':>7} {'RSS':>10} {'RSS/boid':>10} {'Traced':>10} "
+        f"{'Traced/boid':>12} {'Step peak':>10} {'Step/boid':>10} {'Grid/frame':>11}"
+    )
+    print("-" * 112)
+    for result in results:
+        label = (
+            f"{result.representation}/{result.backend}" if result.backend else result.representation
+        )
+        step_per_boid = (
+            result.step_peak_bytes / result.count if result.step_peak_bytes is not None else None
+        )
+        print(
+            f"{label:<24} {result.count:>7} {_format_bytes(result.rss_bytes):>10} "
+            f"{_format_bytes(result.rss_per_boid):>10} {_format_bytes(result.traced_bytes):>10} "
+            f"{_format_bytes(result.traced_per_boid):>12} "
+            f"{_format_bytes(result.step_peak_bytes):>10} {_format_bytes(step_per_boid):>10} "
+            f"{_format_bytes(result.grid_rebuild_bytes):>11}"
+        )
+    print("=" * 112)
+
+
+def write_footprint_csv(results: list[FootprintResult], path: str | Path) -> Path:
+    """Write memory results to a CSV file, one row per result.
+
+    Args:
+        results (list[FootprintResult]): Results to write.
+        path (str | Path): Destination file. Parent directories are created.
+
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = [
+        {
+            **asdict(result),
+            "rss_per_boid": result.rss_per_boid,
+            "traced_per_boid": result.traced_per_boid,
+        }
+        for result in results
+    ]
+    with open(path, "w", newline="") as file_handle:
+        writer = csv.DictWriter(file_handle, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
@@ -0,0 +1,334 @@
+"""Timing harness shared by the benchmark suites.
+
+Each measurement runs a callable a few times to warm up, calibrates how many
+calls make up one sample so that a sample is long enough to time reliably,
+then collects repeated samples and summarizes them.
+"""
+
+import csv
+import math
+import os
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pygame as pg
+
+from my_boids.boids import Boid
+from my_boids.game import Game
+from my_boids.options import (
+    PREDATOR_ATTACK_MODE_CENTER,
+    BoidOptions,
+    BoundaryType,
+    PerformanceOptions,
+    PredatorAttackMode,
+    PredatorOptions,
+    ScreenOptions,
+)
+
+DEFAULT_WARMUP = 2
+DEFAULT_REPEATS = 10
+# A sample is at least this long, so timer resolution and call overhead
+# stay negligible for fast kernels
+DEFAULT_MIN_SAMPLE_TIME = 0.005
+DEFAULT_SEED = 12345
+DEFAULT_WINSIZE = (800, 600)
+# Simulation benchmarks time at least this many steps per configuration
+MIN_STEPS = 3
+
+# Neighbor backends by name, mapped to Game's use_spatial_grid flag
+BACKENDS = {"brute_force": False, "spatial_grid": True}
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing samples of one benchmark at one size.
+
+    Attributes:
+        name: Benchmark name.
+        size: Problem size, usually the number of boids.
+        number: Calls per sample.
+        samples: Time per call of every sample, in seconds.
+        params: Extra parameters that identify the configuration.
+    """
+
+    name: str
+    size: int
+    number: int
+    samples: list[float]
+    params: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def label(self) -> str:
+        """Name followed by the parameter values, e.g. ``scaling[spatial_grid]``."""
+        if not self.params:
+            return self.name
+        return f"{self.name}[{','.join(self.params.values())}]"
+
+    @property
+    def min(self) -> float:
+        """Fastest time per call in seconds."""
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        """Median time per call in seconds."""
+        return statistics.median(self.samples)
+
+    @property
+    def mean(self) -> float:
+        """Mean time per call in seconds."""
+        return statistics.fmean(self.samples)
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation of the time per call in seconds."""
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def iqr(self) -> float:
+        """Interquartile range of the time per call in seconds."""
+        if len(self.samples) < 2:
+            return 0.0
+        lower, _, upper = statistics.quantiles(self.samples, n=4)
+        return upper - lower
+
+    @property
+    def per_item(self) -> float:
+        """Median time per call divided by the size, in seconds."""
+        return self.median / self.size if self.size else self.median
+
+
+def measure(
+    func: Callable[[], object],
+    warmup: int = DEFAULT_WARMUP,
+    repeats: int = DEFAULT_REPEATS,
+    min_sample_time: float = DEFAULT_MIN_SAMPLE_TIME,
+) -> tuple[int, list[float]]:
+    """Time repeated calls of ``func``.
+
+    Args:
+        func (Callable[[], object]): The code to time.
+        warmup (int): Untimed calls before measuring. Defaults to 2.
+        repeats (int): Number of samples. Defaults to 10.
+        min_sample_time (float): Minimum length of a sample in seconds; fast
+            functions are called several times per sample. Defaults to 0.005.
+
+    Returns:
+        tuple[int, list[float]]: Calls per sample and the time per call of
+            every sample, in seconds.
+    """
+    for _ in range(warmup):
+        func()
+
+    start = time.perf_counter()
+    func()
+    single = time.perf_counter() - start
+    number = max(1, math.ceil(min_sample_time / single)) if single > 0 else 1000
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return number, samples
+
+
+def ensure_display(winsize: tuple[int, int] = DEFAULT_WINSIZE) -> pg.Surface:
+    """Initialize pygame with the dummy video driver and return the display."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if not pg.get_init():
+        pg.init()
+    surface = pg.display.get_surface()
+    if surface is None or surface.get_size() != winsize:
+        surface = pg.display.set_mode(winsize)
+    return surface
+
+
+def make_flock(
+    count: int,
+    winsize: tuple[int, int] = DEFAULT_WINSIZE,
+    max_speed: float = 5.0,
+    seed: int = DEFAULT_SEED,
+) -> list[Boid]:
+    """Create ``count`` boids uniformly spread over the window.
+
+    Args:
+        count (int): Number of boids.
+        winsize (tuple[int, int]): World size. Defaults to 800x600.
+        max_speed (float): Largest velocity component. Defaults to 5.0.
+        seed (int): Random seed, so every run sees the same flock.
+
+    Returns:
+        list[Boid]: The boids.
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform((0, 0), winsize, size=(count, 2))
+    velocities = rng.uniform(-max_speed, max_speed, size=(count, 2))
+    return [
+        Boid(pos=(float(pos[0]), float(pos[1])), vel=(float(vel[0]), float(vel[1])))
+        for pos, vel in zip(positions, velocities, strict=True)
+    ]
+
+
+def make_game(
+    count: int,
+    winsize: tuple[int, int] = DEFAULT_WINSIZE,
+    use_spatial_grid: bool = True,
+    visual_range: int | None = None,
+    boundary_type: BoundaryType = BoundaryType.BOUNCE,
+    attack_mode: PredatorAttackMode = PREDATOR_ATTACK_MODE_CENTER,
+    seed: int = DEFAULT_SEED,
+) -> Game:
+    """Create a headless game for timing simulation steps.
+
+    Instrumentation is off so only the simulation is timed. The predator
+    chases the flock center by default so the run does not depend on the
+    mouse.
+
+    Args:
+        count (int): Number of boids.
+        winsize (tuple[int, int]): World size. Defaults to 800x600.
+        use_spatial_grid (bool): Use the spatial grid for neighbor search.
+            Defaults to True.
+        visual_range (int | None): Boid visual range. Defaults to the
+            BoidOptions default.
+        boundary_type (BoundaryType): Behavior at the world edge.
+            Defaults to BOUNCE.
+        attack_mode (PredatorAttackMode): Predator targeting strategy.
+            Defaults to "center".
+        seed (int): Seed for the initial flock, so every run sees the same one.
+
+    Returns:
+        Game: The game, with its boids spread uniformly over the world.
+    """
+    ensure_display()
+    boid_opts = BoidOptions(num_boids=count)
+    if visual_range is not None:
+        boid_opts.visual_range = visual_range
+    return Game(
+        screen_opts=ScreenOptions(winsize=list(winsize), boundary_type=boundary_type),
+        boid_opts=boid_opts,
+        predator_opts=PredatorOptions(predator_attack_mode=attack_mode),
+        performance_opts=PerformanceOptions(track_gc=False),
+        use_spatial_grid=use_spatial_grid,
+        show_metrics=False,
+        enable_profiling=False,
+        seed=seed,
+    )
+
+
+def time_steps(game: Game, steps: int, budget: float = math.inf) -> list[float]:
+    """Time up to ``steps`` simulation steps, stopping once ``budget`` is spent.
+
+    One untimed step runs first. At least :data:`MIN_STEPS` steps are timed
+    regardless of the budget.
+
+    Args:
+        game (Game): The game to step.
+        steps (int): Maximum number of timed steps.
+        budget (float): Seconds of stepping after which no more steps are
+            started. Defaults to no limit.
+
+    Returns:
+        list[float]: Duration of every timed step in seconds.
+    """
+    clock = time.perf_counter
+    game.run_logic()
+    samples: list[float] = []
+    spent = 0.0
+    while len(samples) < steps and (len(samples) < MIN_STEPS or spent < budget):
+        start = clock()
+        game.run_logic()
+        elapsed = clock() - start
+        samples.append(elapsed)
+        spent += elapsed
+    return samples
+
+
+def format_time(seconds: float) -> str:
+    """Format a duration with a unit that keeps it readable."""
+    if seconds >= 1:
+        return f"{seconds:.3f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f}ms"
+    if seconds >= 1e-6:
+        return f"{seconds * 1e6:.3f}us"
+    return f"{seconds * 1e9:.1f}ns"
+
+
+def print_results(results: list[BenchmarkResult]) -> None:
+    """Print benchmark results in a formatted table.
+
+    Args:
+        results: Results to display.
+    """
+    width = max([28, *(len(result.label) for result in results)])
+    print("=" * (width + 72))
+    print(
+        f"{'Benchmark':<{width}} {'Size':>7} {'Median':>12} {'Mean':>12} {'Stdev':>12} "
+        f"{'IQR':>12} {'Per boid':>12}"
+    )
+    print("-" * (width + 72))
+    for result in results:
+        print(
+            f"{result.label:<{width}} {result.size:>7} {format_time(result.median):>12} "
+            f"{format_time(result.mean):>12} {format_time(result.stdev):>12} "
+            f"{format_time(result.iqr):>12} {format_time(result.per_item):>12}"
+        )
+    print("=" * (width + 72))
+
+
+def write_csv(results: list[BenchmarkResult], path: str | Path) -> Path:
+    """Write benchmark results to a CSV file, one row per result.
+
+    Every parameter key used by any result becomes a column, so the table
+    can be pivoted or plotted directly.
+
+    Args:
+        results (list[BenchmarkResult]): Results to write.
+        path (str | Path): Destination file. Parent directories are created.
+
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    param_keys = list(dict.fromkeys(key for result in results for key in result.params))
+    with open(path, "w", newline="") as file_handle:
+        writer = csv.writer(file_handle)
+        writer.writerow(
+            [
+                "name",
+                "size",
+                *param_keys,
+                "samples",
+                "median_s",
+                "mean_s",
+                "min_s",
+                "stdev_s",
+                "iqr_s",
+                "per_item_s",
+            ]
+        )
+        for result in results:
+            writer.writerow(
+                [
+                    result.name,
+                    result.size,
+                    *(result.params.get(key, "") for key in param_keys),
+                    len(result.samples),
+                    result.median,
+                    result.mean,
+                    result.min,
+                    result.stdev,
+                    result.iqr,
+                    result.per_item,
+                ]
+            )
+    return path
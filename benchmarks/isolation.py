@@ -0,0 +1,67 @@
+"""Run benchmark configurations in fresh interpreter processes.
+
+Timing every configuration in one long-lived interpreter lets earlier runs
+leak into later ones through the heap, the garbage collector, caches and
+pygame's global state. :func:`run_isolated` runs a function in a newly
+spawned process instead, optionally pinned to one CPU so the scheduler
+does not migrate it between cores mid-measurement.
+"""
+
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+
+def pin_to_cpu(cpu: int | None) -> bool:
+    """Restrict the current process to ``cpu``, where the platform supports it.
+
+    CPU affinity is available on Linux; elsewhere this does nothing.
+
+    Args:
+        cpu (int | None): CPU number, or None to leave the affinity unchanged.
+
+    Returns:
+        bool: Whether the process was pinned.
+    """
+    if cpu is None or not hasattr(os, "sched_setaffinity"):
+        return False
+    os.sched_setaffinity(0, {cpu})
+    return True
+
+
+def check_processes(processes: int, isolate: bool) -> None:
+    """Reject repeated runs that would not be isolated.
+
+    Repeating a configuration in the same process measures a warm heap and
+    warm caches rather than independent runs, so more than one run per
+    configuration needs isolation.
+
+    Raises:
+        ValueError: If ``processes`` is less than 1, or more than 1 without
+            ``isolate``.
+    """
+    if processes < 1:
+        raise ValueError(f"processes must be at least 1, got {processes}")
+    if processes > 1 and not isolate:
+        raise ValueError("more than one run per configuration needs isolated processes")
+
+
+def run_isolated[T](func: Callable[..., T], *args: object, cpu: int | None = None) -> T:
+    """Call ``func(*args)`` in a freshly spawned interpreter and return its result.
+
+    ``func``, its arguments and its result must be picklable, so ``func``
+    has to be defined at module level.
+
+    Args:
+        func (Callable[..., T]): The function to call.
+        *args (object): Arguments for ``func``.
+        cpu (int | None): CPU to pin the process to. Defaults to None.
+
+    Returns:
+        T: The value returned by ``func``.
+    """
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=get_context("spawn"), initializer=pin_to_cpu, initargs=(cpu,)
+    ) as executor:
+        return executor.submit(func, *args).result()
@@ -0,0 +1,263 @@
+"""Kernel benchmarks: the simulation's hot functions, timed in isolation.
+
+Every kernel is registered with :func:`kernel` as a setup function that
+builds its inputs for a given size and returns the callable to time, so only
+the kernel itself is measured.
+"""
+
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import pygame as pg
+
+from benchmarks.harness import DEFAULT_WINSIZE, ensure_display, make_flock, make_game, measure
+from my_boids.analytics import flock_metrics
+from my_boids.boid_vs_boundary import boid_vs_boundary
+from my_boids.clusters import find_clusters
+from my_boids.flock_rules import VISUAL_RANGE, flock_rules, react_to_predator
+from my_boids.hud import draw_frame
+from my_boids.options import (
+    PREDATOR_ATTACK_MODE_CENTER,
+    PREDATOR_MODE_AVOID,
+    BoundaryType,
+)
+from my_boids.performance import PerformanceMonitor
+from my_boids.predator_targeting import (
+    target_flock_center,
+    target_most_isolated_bird,
+    target_mouse_cursor,
+    target_nearest_bird,
+)
+from my_boids.spatial_grid import SpatialGrid
+
+KernelSetup = Callable[[int], Callable[[], object]]
+
+# Sizes for kernels that are linear in the number of boids, and for those
+# that compare every pair of boids
+LINEAR_SIZES = (100, 1000, 5000)
+QUADRATIC_SIZES = (50, 200, 500)
+
+PREDATOR_DETECTION_RANGE = 400.0
+PREDATOR_REACTION_STRENGTH = 0.5
+
+
+@dataclass(frozen=True)
+class Kernel:
+    """A registered kernel benchmark.
+
+    Attributes:
+        name: Benchmark name.
+        setup: Builds the inputs for a size and returns the callable to time.
+        sizes: Default sizes to run.
+        description: One-line description.
+    """
+
+    name: str
+    setup: KernelSetup
+    sizes: tuple[int, ...]
+    description: str
+
+
+KERNELS: dict[str, Kernel] = {}
+
+
+def kernel(
+    name: str, sizes: tuple[int, ...] = LINEAR_SIZES
+) -> Callable[[KernelSetup], KernelSetup]:
+    """Register a kernel setup function under ``name``.
+
+    The first line of the setup function's docstring is used as the
+    kernel's description.
+    """
+
+    def decorator(setup: KernelSetup) -> KernelSetup:
+        description = setup.__doc__.strip().splitlines()[0] if setup.__doc__ else ""
+        KERNELS[name] = Kernel(name=name, setup=setup, sizes=sizes, description=description)
+        return setup
+
+    return decorator
+
+
+def time_kernel(name: str, size: int, warmup: int, repeats: int) -> tuple[int, list[float]]:
+    """Set up kernel ``name`` at ``size`` and time it with :func:`measure`.
+
+    Defined at module level so it can run in an isolated process.
+
+    Returns:
+        tuple[int, list[float]]: Calls per sample and the time per call of
+            every sample, in seconds.
+    """
+    return measure(KERNELS[name].setup(size), warmup=warmup, repeats=repeats)
+
+
+def _world_center() -> pg.Vector2:
+    return pg.Vector2(DEFAULT_WINSIZE[0] / 2, DEFAULT_WINSIZE[1] / 2)
+
+
+@kernel("flock_rules", sizes=QUADRATIC_SIZES)
+def setup_flock_rules(size: int) -> Callable[[], object]:
+    """Cohesion, separation and alignment for every boid against the whole flock."""
+    boids = make_flock(size)
+
+    def run() -> None:
+        for boid in boids:
+            flock_rules(boid, boids)
+
+    return run
+
+
+@kernel("grid_build")
+def setup_grid_build(size: int) -> Callable[[], object]:
+    """Clear the spatial grid and insert every boid."""
+    boids = make_flock(size)
+    grid = SpatialGrid(cell_size=VISUAL_RANGE)
+
+    def run() -> None:
+        grid.clear()
+        for boid in boids:
+            grid.insert(boid)
+
+    return run
+
+
+@kernel("grid_query")
+def setup_grid_query(size: int) -> Callable[[], object]:
+    """Query the spatial grid for the neighbors of every boid."""
+    boids = make_flock(size)
+    grid = SpatialGrid(cell_size=VISUAL_RANGE)
+    for boid in boids:
+        grid.insert(boid)
+
+    def run() -> None:
+        for boid in boids:
+            grid.get_nearby_boids(boid.pos, search_radius=VISUAL_RANGE)
+
+    return run
+
+
+@kernel("target_mouse_cursor", sizes=(1,))
+def setup_target_mouse_cursor(size: int) -> Callable[[], object]:
+    """Predator targeting: mouse cursor."""
+    ensure_display()
+    return target_mouse_cursor
+
+
+@kernel("target_flock_center")
+def setup_target_flock_center(size: int) -> Callable[[], object]:
+    """Predator targeting: flock centroid."""
+    boids = make_flock(size)
+    fallback = _world_center()
+    return lambda: target_flock_center(boids, fallback)
+
+
+@kernel("target_nearest_bird")
+def setup_target_nearest_bird(size: int) -> Callable[[], object]:
+    """Predator targeting: boid nearest to the predator."""
+    boids = make_flock(size)
+    predator_pos = _world_center()
+    return lambda: target_nearest_bird(predator_pos, boids, predator_pos)
+
+
+@kernel("target_most_isolated_bird", sizes=QUADRATIC_SIZES)
+def setup_target_most_isolated_bird(size: int) -> Callable[[], object]:
+    """Predator targeting: boid with the largest nearest-neighbor distance."""
+    boids = make_flock(size)
+    fallback = _world_center()
+    return lambda: target_most_isolated_bird(boids, fallback)
+
+
+@kernel("react_to_predator")
+def setup_react_to_predator(size: int) -> Callable[[], object]:
+    """Predator avoidance for every boid."""
+    boids = make_flock(size)
+    predator_pos = _world_center()
+
+    def run() -> None:
+        for boid in boids:
+            react_to_predator(
+                boid,
+                predator_pos,
+                behavior_mode=PREDATOR_MODE_AVOID,
+                detection_range=PREDATOR_DETECTION_RANGE,
+                reaction_strength=PREDATOR_REACTION_STRENGTH,
+            )
+
+    return run
+
+
+def _boundary_setup(boundary_type: BoundaryType) -> KernelSetup:
+    def setup(size: int) -> Callable[[], object]:
+        boids = make_flock(size)
+
+        def run() -> None:
+            for boid in boids:
+                boid_vs_boundary(boid, boundary_type=boundary_type, window_size=DEFAULT_WINSIZE)
+
+        return run
+
+    setup.__doc__ = f"Boundary handling ({boundary_type.name.lower()}) for every boid."
+    return setup
+
+
+kernel("boid_vs_boundary_bounce")(_boundary_setup(BoundaryType.BOUNCE))
+kernel("boid_vs_boundary_wrap")(_boundary_setup(BoundaryType.WRAP))
+
+
+@kernel("sprite_update")
+def setup_sprite_update(size: int) -> Callable[[], object]:
+    """Sprite group update, moving every boid by its velocity."""
+    group: pg.sprite.Group = pg.sprite.Group(make_flock(size))
+    return group.update
+
+
+@kernel("draw_frame")
+def setup_draw_frame(size: int) -> Callable[[], object]:
+    """Draw a full frame with sprites and HUD to an offscreen surface."""
+    ensure_display()
+    surface = pg.Surface(DEFAULT_WINSIZE)
+    group: pg.sprite.Group = pg.sprite.Group(make_flock(size))
+    performance = PerformanceMonitor()
+
+    def run() -> None:
+        draw_frame(
+            surface,
+            group,
+            0,
+            PREDATOR_MODE_AVOID,
+            PREDATOR_ATTACK_MODE_CENTER,
+            False,
+            performance,
+            True,
+            size,
+            False,
+            None,
+        )
+
+    return run
+
+
+@kernel("save_state")
+def setup_save_state(size: int) -> Callable[[], object]:
+    """Checkpoint a game to an uncompressed state file."""
+    game = make_game(size)
+    path = Path(tempfile.gettempdir()) / "my_boids-kernel-state.npz"
+    return lambda: game.save_state(path)
+
+
+@kernel("flock_metrics")
+def setup_flock_metrics(size: int) -> Callable[[], object]:
+    """Polarization, spread, speed and nearest-neighbor metrics of a game's flock."""
+    game = make_game(size)
+    positions = game.get_boid_positions()
+    velocities = game.get_boid_velocities()
+    return lambda: flock_metrics(positions, velocities)
+
+
+@kernel("clusters")
+def setup_clusters(size: int) -> Callable[[], object]:
+    """Sub-flocks connected within the visual range of a game's flock."""
+    game = make_game(size)
+    positions = game.get_boid_positions()
+    return lambda: find_clusters(positions, VISUAL_RANGE)
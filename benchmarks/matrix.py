@@ -0,0 +1,175 @@
+"""Parameter-matrix benchmark: simulation step time across configurations.
+
+Every combination of world size, boid count, visual range, boundary type,
+predator attack mode, initial distribution and neighbor backend is stepped
+and timed, so the cost of each parameter can be read off one table, worst
+cases included.
+"""
+
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+
+from benchmarks.harness import BACKENDS, DEFAULT_SEED, BenchmarkResult, make_game, time_steps
+from benchmarks.isolation import check_processes, run_isolated
+from benchmarks.scenarios import SCENARIOS, place_boids
+from my_boids.options import BoundaryType, PredatorAttackMode
+
+DEFAULT_STEPS = 20
+DEFAULT_BUDGET = 5.0
+
+
+@dataclass(frozen=True)
+class MatrixPoint:
+    """One configuration of the parameter matrix.
+
+    Attributes:
+        winsize: World size.
+        count: Number of boids.
+        visual_range: Boid visual range.
+        boundary_type: Behavior at the world edge.
+        attack_mode: Predator targeting strategy.
+        scenario: Name of the initial distribution in :data:`SCENARIOS`.
+        backend: Name of the neighbor backend in :data:`BACKENDS`.
+    """
+
+    winsize: tuple[int, int]
+    count: int
+    visual_range: int
+    boundary_type: BoundaryType
+    attack_mode: PredatorAttackMode
+    scenario: str
+    backend: str
+
+    @property
+    def params(self) -> dict[str, str]:
+        """The configuration as benchmark result parameters."""
+        return {
+            "world": f"{self.winsize[0]}x{self.winsize[1]}",
+            "visual_range": str(self.visual_range),
+            "boundary": self.boundary_type.name.lower(),
+            "attack": self.attack_mode,
+            "scenario": self.scenario,
+            "backend": self.backend,
+        }
+
+
+def parse_winsize(value: str) -> tuple[int, int]:
+    """Parse a world size written as ``WIDTHxHEIGHT``, e.g. ``800x600``.
+
+    Raises:
+        ValueError: If the value is not two positive integers separated by ``x``.
+    """
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"World size must look like 800x600, got {value!r}") from None
+    if width <= 0 or height <= 0:
+        raise ValueError(f"World size must be positive, got {value!r}")
+    return width, height
+
+
+def expand_matrix(
+    winsizes: list[tuple[int, int]],
+    counts: list[int],
+    visual_ranges: list[int],
+    boundary_types: list[BoundaryType],
+    attack_modes: list[PredatorAttackMode],
+    scenarios: list[str],
+    backends: list[str],
+) -> list[MatrixPoint]:
+    """Every combination of the given parameter values.
+
+    Raises:
+        ValueError: If a scenario or backend name is unknown.
+    """
+    unknown = sorted(set(scenarios) - set(SCENARIOS)) + sorted(set(backends) - set(BACKENDS))
+    if unknown:
+        raise ValueError(f"Unknown scenarios or backends: {', '.join(unknown)}")
+    return [
+        MatrixPoint(*values)
+        for values in itertools.product(
+            winsizes, counts, visual_ranges, boundary_types, attack_modes, scenarios, backends
+        )
+    ]
+
+
+def time_point(point: MatrixPoint, steps: int, budget: float, seed: int) -> list[float]:
+    """Time simulation steps at one point of the matrix in the current process.
+
+    The flock's velocities come from the game seeded with ``seed``, and its
+    positions from the point's scenario with a generator seeded the same way.
+
+    Returns:
+        list[float]: Duration of every timed step in seconds.
+    """
+    game = make_game(
+        point.count,
+        point.winsize,
+        use_spatial_grid=BACKENDS[point.backend],
+        visual_range=point.visual_range,
+        boundary_type=point.boundary_type,
+        attack_mode=point.attack_mode,
+        seed=seed,
+    )
+    positions = SCENARIOS[point.scenario](
+        point.count, point.winsize, float(point.visual_range), np.random.default_rng(seed)
+    )
+    place_boids(game, positions)
+    return time_steps(game, steps, budget)
+
+
+def run_matrix(
+    points: list[MatrixPoint],
+    steps: int = DEFAULT_STEPS,
+    budget: float = DEFAULT_BUDGET,
+    seed: int = DEFAULT_SEED,
+    processes: int = 1,
+    isolate: bool = True,
+    cpu: int | None = None,
+    verbose: bool = False,
+) -> list[BenchmarkResult]:
+    """Time simulation steps at every point of a parameter matrix.
+
+    Every point is run ``processes`` times from the same seeded flock, each
+    in a freshly spawned process, and the step samples of all runs are pooled
+    into one result.
+
+    Args:
+        points (list[MatrixPoint]): Configurations to run.
+        steps (int): Timed steps per run. Defaults to 20.
+        budget (float): Seconds of stepping per run; a run stops early once
+            it is spent. Defaults to 5.0.
+        seed (int): Seed for the initial flock.
+        processes (int): Runs per point. Defaults to 1.
+        isolate (bool): Run every point in freshly spawned processes.
+            Defaults to True. Without it a point runs once, in the current
+            process.
+        cpu (int | None): CPU to pin isolated runs to. Defaults to None.
+        verbose (bool): Print progress. Defaults to False.
+
+    Returns:
+        list[BenchmarkResult]: Step time results named ``matrix``, with the
+            point's configuration as params.
+
+    Raises:
+        ValueError: If ``processes`` is more than 1 without ``isolate``.
+    """
+    check_processes(processes, isolate)
+    results = []
+    for point in points:
+        if verbose:
+            print(f"Running {point.count} boids [{','.join(point.params.values())}]...", flush=True)
+        samples = []
+        for _ in range(processes):
+            if isolate:
+                samples.extend(run_isolated(time_point, point, steps, budget, seed, cpu=cpu))
+            else:
+                samples.extend(time_point(point, steps, budget, seed))
+        results.append(
+            BenchmarkResult(
+                name="matrix", size=point.count, number=1, samples=samples, params=point.params
+            )
+        )
+    return results
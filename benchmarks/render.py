@@ -0,0 +1,166 @@
+"""Render benchmark: the cost of drawing a frame, stage by stage.
+
+Frames are composed exactly as the main loop composes them, under the dummy
+video driver: ``Game.display_frame`` (which clears the screen and calls
+``draw_frame``), then the pygame_gui UI, then the display flip. The spans
+that ``PerformanceMonitor`` records for those stages give one timing result
+per stage:
+
+- ``render/frame``: the whole frame
+- ``render/draw_frame``: ``Game.display_frame`` without the flip
+- ``render/sprites``: drawing the boids and predator
+- ``render/hud``: the score, mode and metrics text
+- ``render/ui``: ``UIManager.update`` and ``draw_ui``
+- ``render/flip``: ``pg.display.flip``
+
+Each render path the game can take is run in turn:
+
+- ``sprites``: the live sprite group, drawn with ``Group.draw``
+- ``snapshot``: the pipelined mode's ``FrameSnapshot``, drawn with one ``blits`` call
+- ``heatmap``: the array-based density heatmap, binned with numpy and blitted once
+"""
+
+import pygame as pg
+import pygame_gui
+from pygame_gui.elements import UIButton
+
+from benchmarks.harness import BenchmarkResult, ensure_display, make_game
+from benchmarks.isolation import run_isolated
+from my_boids.options import MAX_NUM_BOIDS
+
+RENDER_PATHS = ("sprites", "snapshot", "heatmap")
+RENDER_STAGES = {
+    "draw_frame": "render",
+    "sprites": "render/sprites",
+    "hud": "render/hud",
+    "ui": "ui",
+    "flip": "flip",
+}
+
+DEFAULT_WINSIZES = [(800, 600), (1920, 1080)]
+DEFAULT_COUNTS = [100, 1000, 5000]
+DEFAULT_FRAMES = 60
+DEFAULT_WARMUP_FRAMES = 5
+
+
+def time_render(
+    winsize: tuple[int, int],
+    count: int,
+    path: str,
+    frames: int = DEFAULT_FRAMES,
+    warmup: int = DEFAULT_WARMUP_FRAMES,
+) -> dict[str, list[float]]:
+    """Draw ``frames`` frames of a ``count`` boid flock along one render path.
+
+    Args:
+        winsize (tuple[int, int]): Window and world size.
+        count (int): Number of boids.
+        path (str): Render path in :data:`RENDER_PATHS`.
+        frames (int): Timed frames. Defaults to 60.
+        warmup (int): Untimed frames drawn first. Defaults to 5.
+
+    Returns:
+        dict[str, list[float]]: Duration of every timed frame in seconds, for
+            the whole frame (``frame``) and for every stage in :data:`RENDER_STAGES`.
+
+    Raises:
+        ValueError: If ``path`` is unknown.
+    """
+    if path not in RENDER_PATHS:
+        raise ValueError(f"Unknown render path: {path}")
+    screen = ensure_display(winsize)
+    game = make_game(count, winsize)
+    game.show_metrics = True
+    game.performance.enabled = True
+    game.performance_opts.heatmap_threshold = 1 if path == "heatmap" else MAX_NUM_BOIDS + 1
+    # One step fills the spatial grid and the metrics the HUD shows
+    game.run_logic()
+    snapshot = game.snapshot() if path == "snapshot" else None
+
+    ui_manager = pygame_gui.UIManager(winsize)
+    UIButton(
+        relative_rect=pg.Rect(winsize[0] - 128, 8, 120, 34), text="Settings", manager=ui_manager
+    )
+
+    performance = game.performance
+    samples: dict[str, list[float]] = {"frame": [], **{stage: [] for stage in RENDER_STAGES}}
+    for frame in range(warmup + frames):
+        performance.start_frame()
+        game.display_frame(screen, flip=False, snapshot=snapshot)
+        with performance.span("ui"):
+            ui_manager.update(1 / 60)
+            ui_manager.draw_ui(screen)
+        with performance.span("flip"):
+            pg.display.flip()
+        performance.end_frame()
+        if frame < warmup:
+            continue
+
+        samples["frame"].append(performance.frame_times[-1])
+        frame_spans = performance.last_frame_spans
+        spans = dict(frame_spans.iter_paths()) if frame_spans is not None else {}
+        for stage, span_path in RENDER_STAGES.items():
+            node = spans.get(span_path)
+            samples[stage].append(node.total_time if node is not None else 0.0)
+    return samples
+
+
+def run_render(
+    winsizes: list[tuple[int, int]] | None = None,
+    counts: list[int] | None = None,
+    paths: list[str] | None = None,
+    frames: int = DEFAULT_FRAMES,
+    warmup: int = DEFAULT_WARMUP_FRAMES,
+    isolate: bool = True,
+    cpu: int | None = None,
+    verbose: bool = False,
+) -> list[BenchmarkResult]:
+    """Time every render stage for every window size, flock size and render path.
+
+    Args:
+        winsizes (list[tuple[int, int]] | None): Window sizes. Defaults to
+            800x600 and 1920x1080.
+        counts (list[int] | None): Boid counts. Defaults to 100, 1000 and 5000.
+        paths (list[str] | None): Render paths. Defaults to all.
+        frames (int): Timed frames per configuration. Defaults to 60.
+        warmup (int): Untimed frames per configuration. Defaults to 5.
+        isolate (bool): Draw every configuration in a freshly spawned
+            process. Defaults to True.
+        cpu (int | None): CPU to pin isolated runs to. Defaults to None.
+        verbose (bool): Print progress. Defaults to False.
+
+    Returns:
+        list[BenchmarkResult]: One result per configuration and stage, named
+            ``render/<stage>`` with ``world`` and ``path`` params.
+
+    Raises:
+        ValueError: If a render path is unknown.
+    """
+    unknown = sorted(set(paths or []) - set(RENDER_PATHS))
+    if unknown:
+        raise ValueError(f"Unknown render paths: {', '.join(unknown)}")
+
+    results: list[BenchmarkResult] = []
+    for winsize in winsizes or DEFAULT_WINSIZES:
+        for count in counts or DEFAULT_COUNTS:
+            for path in paths or RENDER_PATHS:
+                world = f"{winsize[0]}x{winsize[1]}"
+                if verbose:
+                    print(f"Rendering {count} boids in {world} via {path}...", flush=True)
+                if isolate:
+                    samples = run_isolated(
+                        time_render, winsize, count, path, frames, warmup, cpu=cpu
+                    )
+                else:
+                    samples = time_render(winsize, count, path, frames=frames, warmup=warmup)
+                results.extend(
+                    BenchmarkResult(
+                        name=f"render/{stage}",
+                        size=count,
+                        number=1,
+                        samples=stage_samples,
+                        params={"world": world, "path": path},
+                    )
+                    for stage, stage_samples in samples.items()
+                )
+    return results
@@ -0,0 +1,599 @@
+"""Command line entry point for the benchmark suites.
+
+Run ``python -m benchmarks --help`` for the available suites.
+"""
+
+import argparse
+
+from benchmarks.baseline import (
+    DEFAULT_NOISE_FACTOR,
+    DEFAULT_THRESHOLD,
+    compare_results,
+    load_baseline,
+    print_comparison,
+    save_baseline,
+)
+from benchmarks.footprint import DEFAULT_COUNTS as MEMORY_DEFAULT_COUNTS
+from benchmarks.footprint import (
+    REPRESENTATIONS,
+    print_footprint,
+    run_footprint,
+    write_footprint_csv,
+)
+from benchmarks.harness import (
+    BACKENDS,
+    DEFAULT_REPEATS,
+    DEFAULT_SEED,
+    DEFAULT_WARMUP,
+    BenchmarkResult,
+    print_results,
+    write_csv,
+)
+from benchmarks.isolation import run_isolated
+from benchmarks.kernels import KERNELS, time_kernel
+from benchmarks.matrix import DEFAULT_BUDGET as MATRIX_DEFAULT_BUDGET
+from benchmarks.matrix import DEFAULT_STEPS as MATRIX_DEFAULT_STEPS
+from benchmarks.matrix import expand_matrix, parse_winsize, run_matrix
+from benchmarks.render import DEFAULT_COUNTS as RENDER_DEFAULT_COUNTS
+from benchmarks.render import (
+    DEFAULT_FRAMES,
+    DEFAULT_WARMUP_FRAMES,
+    DEFAULT_WINSIZES,
+    RENDER_PATHS,
+    run_render,
+)
+from benchmarks.scaling import (
+    DEFAULT_BUDGET,
+    DEFAULT_DENSITY,
+    DEFAULT_FACTOR,
+    DEFAULT_START,
+    DEFAULT_STEPS,
+    fit_results,
+    geometric_sizes,
+    print_fits,
+    run_scaling,
+)
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.startup import DEFAULT_COUNT as STARTUP_DEFAULT_COUNT
+from benchmarks.startup import DEFAULT_MODULES as STARTUP_DEFAULT_MODULES
+from benchmarks.startup import DEFAULT_REPEATS as STARTUP_DEFAULT_REPEATS
+from benchmarks.startup import print_top_imports, run_startup
+from my_boids.options import (
+    MAX_NUM_BOIDS,
+    PREDATOR_ATTACK_MODE_CENTER,
+    PREDATOR_ATTACK_MODES,
+    BoundaryType,
+)
+
+
+def run_kernels(
+    names: list[str] | None = None,
+    sizes: list[int] | None = None,
+    warmup: int = DEFAULT_WARMUP,
+    repeats: int = DEFAULT_REPEATS,
+    isolate: bool = True,
+    cpu: int | None = None,
+    verbose: bool = False,
+) -> list[BenchmarkResult]:
+    """Run kernel benchmarks.
+
+    Args:
+        names (list[str] | None): Kernels to run. Defaults to all.
+        sizes (list[int] | None): Sizes to run every kernel at. Defaults to
+            each kernel's own sizes.
+        warmup (int): Untimed calls before measuring. Defaults to 2.
+        repeats (int): Timed samples per size. Defaults to 10.
+        isolate (bool): Run every kernel and size in a freshly spawned
+            process. Defaults to True.
+        cpu (int | None): CPU to pin isolated runs to. Defaults to None.
+        verbose (bool): Print progress. Defaults to False.
+
+    Returns:
+        list[BenchmarkResult]: One result per kernel and size.
+
+    Raises:
+        ValueError: If a kernel name is unknown.
+    """
+    unknown = sorted(set(names or []) - set(KERNELS))
+    if unknown:
+        raise ValueError(f"Unknown kernels: {', '.join(unknown)}")
+
+    results = []
+    for name in names or list(KERNELS):
+        kernel = KERNELS[name]
+        for size in sizes or kernel.sizes:
+            if verbose:
+                print(f"Running {name} at size {size}...", flush=True)
+            if isolate:
+                number, samples = run_isolated(time_kernel, name, size, warmup, repeats, cpu=cpu)
+            else:
+                number, samples = time_kernel(name, size, warmup, repeats)
+            results.append(BenchmarkResult(name=name, size=size, number=number, samples=samples))
+    return results
+
+
+def _add_timing_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=DEFAULT_WARMUP,
+        help=f"untimed calls before measuring (default: {DEFAULT_WARMUP})",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help=f"timed samples per configuration (default: {DEFAULT_REPEATS})",
+    )
+
+
+def _add_process_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--isolate",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="run every configuration in a freshly spawned interpreter (default: on)",
+    )
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        help="pin isolated runs to this CPU, where the platform supports it",
+    )
+
+
+def _add_isolation_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"seed for the initial flock (default: {DEFAULT_SEED})",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        metavar="N",
+        help="isolated runs per configuration, pooled into one result (default: 1)",
+    )
+    _add_process_args(parser)
+
+
+def _add_baseline_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--save", metavar="PATH", help="save the results to a JSON baseline file")
+    parser.add_argument(
+        "--compare",
+        metavar="PATH",
+        help="compare the results against a JSON baseline file and exit with 1 on regression",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"relative median change that counts as a regression (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--noise-factor",
+        type=float,
+        default=DEFAULT_NOISE_FACTOR,
+        help="multiple of the interquartile range a change must also exceed "
+        f"(default: {DEFAULT_NOISE_FACTOR})",
+    )
+
+
+def _report(results: list[BenchmarkResult], args: argparse.Namespace) -> int:
+    """Print results, then save and compare them as requested.
+
+    Returns:
+        int: 1 if any benchmark regressed against the baseline, otherwise 0.
+    """
+    print_results(results)
+    if args.save:
+        print(f"Saved baseline to {save_baseline(results, args.save)}")
+    if args.compare:
+        metadata, baseline = load_baseline(args.compare)
+        print(
+            f"Comparing against {args.compare} "
+            f"(Python {metadata.get('python')}, {metadata.get('platform')}, "
+            f"commit {metadata.get('git_commit') or 'unknown'})"
+        )
+        comparisons = compare_results(
+            baseline, results, threshold=args.threshold, noise_factor=args.noise_factor
+        )
+        print_comparison(comparisons)
+        regressed = [comparison for comparison in comparisons if comparison.status == "regressed"]
+        if regressed:
+            print(f"{len(regressed)} benchmark(s) regressed")
+            return 1
+    return 0
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    suites = parser.add_subparsers(dest="suite", required=True)
+
+    kernels = suites.add_parser("kernels", help="time the simulation's hot functions in isolation")
+    kernels.add_argument(
+        "names",
+        nargs="*",
+        metavar="KERNEL",
+        help="kernels to run (default: all)",
+    )
+    kernels.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        metavar="N",
+        help="boid counts to run every kernel at (default: per kernel)",
+    )
+    kernels.add_argument("--list", action="store_true", help="list the kernels and exit")
+    _add_timing_args(kernels)
+    _add_process_args(kernels)
+    _add_baseline_args(kernels)
+
+    scaling = suites.add_parser(
+        "scaling", help="sweep the flock size and fit the complexity of each neighbor backend"
+    )
+    scaling.add_argument(
+        "--backends",
+        nargs="+",
+        choices=list(BACKENDS),
+        help="neighbor backends to run (default: all)",
+    )
+    scaling.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        metavar="N",
+        help="boid counts to run (default: a geometric sweep from --start to --max-boids)",
+    )
+    scaling.add_argument(
+        "--start",
+        type=int,
+        default=DEFAULT_START,
+        help=f"smallest flock (default: {DEFAULT_START})",
+    )
+    scaling.add_argument(
+        "--max-boids",
+        type=int,
+        default=MAX_NUM_BOIDS,
+        help=f"largest flock (default: {MAX_NUM_BOIDS})",
+    )
+    scaling.add_argument(
+        "--factor",
+        type=float,
+        default=DEFAULT_FACTOR,
+        help=f"growth factor between flock sizes (default: {DEFAULT_FACTOR})",
+    )
+    scaling.add_argument(
+        "--steps",
+        type=int,
+        default=DEFAULT_STEPS,
+        help=f"timed steps per flock size (default: {DEFAULT_STEPS})",
+    )
+    scaling.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET,
+        help="seconds of stepping per flock size; larger flocks predicted to exceed it "
+        f"are skipped (default: {DEFAULT_BUDGET})",
+    )
+    scaling.add_argument(
+        "--density",
+        type=float,
+        default=DEFAULT_DENSITY,
+        help=f"boids per square pixel; the world grows to keep it (default: {DEFAULT_DENSITY:.2e})",
+    )
+    scaling.add_argument(
+        "--fixed-world",
+        action="store_true",
+        help="keep the 800x600 world at every flock size instead of a constant density",
+    )
+    scaling.add_argument("--csv", metavar="PATH", help="write the results to a CSV file")
+    _add_isolation_args(scaling)
+    _add_baseline_args(scaling)
+
+    matrix = suites.add_parser(
+        "matrix", help="time the simulation at every combination of the given parameters"
+    )
+    matrix.add_argument(
+        "--worlds",
+        type=parse_winsize,
+        nargs="+",
+        default=[(800, 600)],
+        metavar="WxH",
+        help="world sizes (default: 800x600)",
+    )
+    matrix.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=[500],
+        metavar="N",
+        help="boid counts (default: 500)",
+    )
+    matrix.add_argument(
+        "--visual-ranges",
+        type=int,
+        nargs="+",
+        default=[40],
+        metavar="R",
+        help="boid visual ranges (default: 40)",
+    )
+    matrix.add_argument(
+        "--boundaries",
+        type=str.upper,
+        nargs="+",
+        choices=[boundary_type.name for boundary_type in BoundaryType],
+        default=[BoundaryType.BOUNCE.name],
+        help="boundary types (default: BOUNCE)",
+    )
+    matrix.add_argument(
+        "--attack-modes",
+        nargs="+",
+        choices=list(PREDATOR_ATTACK_MODES),
+        default=[PREDATOR_ATTACK_MODE_CENTER],
+        help=f"predator attack modes (default: {PREDATOR_ATTACK_MODE_CENTER})",
+    )
+    matrix.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=list(SCENARIOS),
+        default=list(SCENARIOS),
+        help="initial boid distributions (default: all)",
+    )
+    matrix.add_argument(
+        "--backends",
+        nargs="+",
+        choices=list(BACKENDS),
+        default=["spatial_grid"],
+        help="neighbor backends (default: spatial_grid)",
+    )
+    matrix.add_argument(
+        "--steps",
+        type=int,
+        default=MATRIX_DEFAULT_STEPS,
+        help=f"timed steps per configuration (default: {MATRIX_DEFAULT_STEPS})",
+    )
+    matrix.add_argument(
+        "--budget",
+        type=float,
+        default=MATRIX_DEFAULT_BUDGET,
+        help=f"seconds of stepping per configuration (default: {MATRIX_DEFAULT_BUDGET})",
+    )
+    matrix.add_argument("--csv", metavar="PATH", help="write the results to a CSV file")
+    _add_isolation_args(matrix)
+    _add_baseline_args(matrix)
+
+    render = suites.add_parser(
+        "render", help="time each stage of drawing a frame under the dummy video driver"
+    )
+    render.add_argument(
+        "--worlds",
+        type=parse_winsize,
+        nargs="+",
+        default=DEFAULT_WINSIZES,
+        metavar="WxH",
+        help="window sizes (default: 800x600 1920x1080)",
+    )
+    render.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=RENDER_DEFAULT_COUNTS,
+        metavar="N",
+        help="boid counts (default: 100 1000 5000)",
+    )
+    render.add_argument(
+        "--paths",
+        nargs="+",
+        choices=RENDER_PATHS,
+        default=list(RENDER_PATHS),
+        help="render paths (default: all)",
+    )
+    render.add_argument(
+        "--frames",
+        type=int,
+        default=DEFAULT_FRAMES,
+        help=f"timed frames per configuration (default: {DEFAULT_FRAMES})",
+    )
+    render.add_argument(
+        "--warmup",
+        type=int,
+        default=DEFAULT_WARMUP_FRAMES,
+        help=f"untimed frames per configuration (default: {DEFAULT_WARMUP_FRAMES})",
+    )
+    render.add_argument("--csv", metavar="PATH", help="write the results to a CSV file")
+    _add_process_args(render)
+    _add_baseline_args(render)
+
+    memory = suites.add_parser(
+        "memory", help="measure the bytes per boid of each state representation"
+    )
+    memory.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=MEMORY_DEFAULT_COUNTS,
+        metavar="N",
+        help="boid counts (default: 1000 10000 50000)",
+    )
+    memory.add_argument(
+        "--representations",
+        nargs="+",
+        choices=REPRESENTATIONS,
+        default=list(REPRESENTATIONS),
+        help="state representations (default: all)",
+    )
+    memory.add_argument(
+        "--backends",
+        nargs="+",
+        choices=list(BACKENDS),
+        default=list(BACKENDS),
+        help="neighbor backends of the live game (default: all)",
+    )
+    memory.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"seed for the flock (default: {DEFAULT_SEED})",
+    )
+    memory.add_argument("--csv", metavar="PATH", help="write the results to a CSV file")
+
+    startup = suites.add_parser(
+        "startup", help="time imports and the first frame in fresh interpreters"
+    )
+    startup.add_argument(
+        "--modules",
+        nargs="+",
+        default=STARTUP_DEFAULT_MODULES,
+        metavar="MODULE",
+        help="modules whose import time to measure (default: my_boids and its submodules)",
+    )
+    startup.add_argument(
+        "--count",
+        type=int,
+        default=STARTUP_DEFAULT_COUNT,
+        help=f"boids in the first frame (default: {STARTUP_DEFAULT_COUNT})",
+    )
+    startup.add_argument(
+        "--repeats",
+        type=int,
+        default=STARTUP_DEFAULT_REPEATS,
+        help=f"fresh interpreters per measurement (default: {STARTUP_DEFAULT_REPEATS})",
+    )
+    startup.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"seed for the flock (default: {DEFAULT_SEED})",
+    )
+    startup.add_argument(
+        "--top",
+        type=int,
+        default=0,
+        metavar="N",
+        help="also list the N heaviest imports of every module (default: 0)",
+    )
+    _add_baseline_args(startup)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark suite selected on the command line.
+
+    Returns:
+        int: Process exit code.
+    """
+    args = _parse_args(argv)
+
+    if args.suite == "kernels":
+        if args.list:
+            for kernel in KERNELS.values():
+                sizes = ", ".join(str(size) for size in kernel.sizes)
+                print(f"{kernel.name:<28} [{sizes}] {kernel.description}")
+            return 0
+        try:
+            results = run_kernels(
+                args.names,
+                args.sizes,
+                warmup=args.warmup,
+                repeats=args.repeats,
+                isolate=args.isolate,
+                cpu=args.cpu,
+                verbose=True,
+            )
+        except ValueError as error:
+            print(error)
+            return 2
+        return _report(results, args)
+
+    if args.suite == "scaling":
+        try:
+            scaling_sizes = args.sizes or geometric_sizes(args.start, args.max_boids, args.factor)
+            results, skipped = run_scaling(
+                args.backends,
+                scaling_sizes,
+                steps=args.steps,
+                budget=args.budget,
+                density=None if args.fixed_world else args.density,
+                seed=args.seed,
+                processes=args.processes,
+                isolate=args.isolate,
+                cpu=args.cpu,
+                verbose=True,
+            )
+        except ValueError as error:
+            print(error)
+            return 2
+        exit_code = _report(results, args)
+        print_fits(fit_results(results), skipped)
+        if args.csv:
+            print(f"Wrote {write_csv(results, args.csv)}")
+        return exit_code
+
+    if args.suite == "matrix":
+        points = expand_matrix(
+            args.worlds,
+            args.counts,
+            args.visual_ranges,
+            [BoundaryType[name] for name in args.boundaries],
+            args.attack_modes,
+            args.scenarios,
+            args.backends,
+        )
+        try:
+            results = run_matrix(
+                points,
+                steps=args.steps,
+                budget=args.budget,
+                seed=args.seed,
+                processes=args.processes,
+                isolate=args.isolate,
+                cpu=args.cpu,
+                verbose=True,
+            )
+        except ValueError as error:
+            print(error)
+            return 2
+        exit_code = _report(results, args)
+        if args.csv:
+            print(f"Wrote {write_csv(results, args.csv)}")
+        return exit_code
+
+    if args.suite == "render":
+        try:
+            results = run_render(
+                args.worlds,
+                args.counts,
+                args.paths,
+                frames=args.frames,
+                warmup=args.warmup,
+                isolate=args.isolate,
+                cpu=args.cpu,
+                verbose=True,
+            )
+        except ValueError as error:
+            print(error)
+            return 2
+        exit_code = _report(results, args)
+        if args.csv:
+            print(f"Wrote {write_csv(results, args.csv)}")
+        return exit_code
+
+    if args.suite == "memory":
+        footprints = run_footprint(
+            args.counts, args.representations, args.backends, seed=args.seed, verbose=True
+        )
+        print_footprint(footprints)
+        if args.csv:
+            print(f"Wrote {write_footprint_csv(footprints, args.csv)}")
+
+    if args.suite == "startup":
+        results = run_startup(
+            args.modules, args.count, repeats=args.repeats, seed=args.seed, verbose=True
+        )
+        exit_code = _report(results, args)
+        for module in args.modules if args.top else []:
+            print_top_imports(module, args.top)
+        return exit_code
+    return 0
@@ -0,0 +1,266 @@
+"""Scaling benchmark: simulation step time against flock size.
+
+Every neighbor backend is stepped at boid counts that grow geometrically, and
+a straight line is fitted to the step times on log-log axes. The slope of that
+line is the empirical complexity of the backend: about 1 for O(n), a little
+more for O(n log n) and about 2 for O(n²).
+
+By default the world grows with the flock so the density, and with it the
+number of neighbors per boid, stays constant. Each point has a time budget;
+a point predicted to need more than its budget is skipped, along with every
+larger point of the same backend.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from benchmarks.harness import (
+    BACKENDS,
+    DEFAULT_SEED,
+    DEFAULT_WINSIZE,
+    MIN_STEPS,
+    BenchmarkResult,
+    format_time,
+)
+from benchmarks.isolation import check_processes, run_isolated
+from benchmarks.matrix import MatrixPoint, time_point
+from my_boids.options import (
+    MAX_NUM_BOIDS,
+    PREDATOR_ATTACK_MODE_CENTER,
+    BoidOptions,
+    BoundaryType,
+)
+
+DEFAULT_START = 100
+DEFAULT_FACTOR = 2.0
+DEFAULT_STEPS = 20
+DEFAULT_BUDGET = 10.0
+# The density of 500 boids in the default 800x600 world
+DEFAULT_DENSITY = 500 / (DEFAULT_WINSIZE[0] * DEFAULT_WINSIZE[1])
+
+
+@dataclass(frozen=True)
+class ScalingFit:
+    """A power law fitted to the step times of one backend.
+
+    Attributes:
+        backend: Neighbor backend name.
+        slope: Exponent ``k`` of the fitted ``t = c * n**k``.
+        coefficient: Factor ``c`` of the fitted power law, in seconds.
+        sizes: Boid counts the fit is based on.
+    """
+
+    backend: str
+    slope: float
+    coefficient: float
+    sizes: tuple[int, ...]
+
+    @property
+    def complexity(self) -> str:
+        """The complexity class whose log-log slope is closest to the fitted one.
+
+        Over a finite range, n log n has a log-log slope of 1 + 1/ln(n), so it
+        is evaluated at the geometric mean of the fitted sizes.
+        """
+        log_mean = sum(math.log(size) for size in self.sizes) / len(self.sizes)
+        candidates = {"O(n)": 1.0, "O(n log n)": 1.0 + 1.0 / log_mean, "O(n²)": 2.0}
+        return min(candidates, key=lambda label: abs(candidates[label] - self.slope))
+
+    def predict(self, size: int) -> float:
+        """Step time predicted by the fit for ``size`` boids, in seconds."""
+        return self.coefficient * math.pow(size, self.slope)
+
+
+def geometric_sizes(start: int, stop: int, factor: float = DEFAULT_FACTOR) -> list[int]:
+    """Boid counts from ``start`` to ``stop``, each ``factor`` times the last.
+
+    ``stop`` is always included as the last size.
+
+    Raises:
+        ValueError: If ``start`` is not positive, ``stop`` is less than
+            ``start`` or ``factor`` is not greater than 1.
+    """
+    if start < 1 or stop < start:
+        raise ValueError(f"Invalid size range {start}..{stop}")
+    if factor <= 1:
+        raise ValueError(f"factor must be greater than 1, got {factor}")
+    sizes: list[int] = []
+    size = float(start)
+    while round(size) < stop:
+        if not sizes or round(size) > sizes[-1]:
+            sizes.append(round(size))
+        size *= factor
+    sizes.append(stop)
+    return sizes
+
+
+def world_size(count: int, density: float | None = DEFAULT_DENSITY) -> tuple[int, int]:
+    """A 4:3 world holding ``count`` boids at ``density`` boids per square pixel.
+
+    The world is never smaller than the default window. With ``density``
+    None, the default window size is returned for every count.
+    """
+    if density is None:
+        return DEFAULT_WINSIZE
+    height = math.sqrt(count / density * 3 / 4)
+    width = height * 4 / 3
+    return max(DEFAULT_WINSIZE[0], math.ceil(width)), max(DEFAULT_WINSIZE[1], math.ceil(height))
+
+
+def fit_power_law(backend: str, results: list[BenchmarkResult]) -> ScalingFit:
+    """Fit ``t = c * n**k`` to the median step times of ``results``.
+
+    Raises:
+        ValueError: If fewer than two sizes were measured.
+    """
+    sizes = [result.size for result in results]
+    if len(set(sizes)) < 2:
+        raise ValueError(f"Need at least two sizes to fit {backend}, got {len(set(sizes))}")
+    slope, intercept = np.polyfit(
+        np.log(sizes), np.log([result.median for result in results]), deg=1
+    )
+    return ScalingFit(
+        backend=backend,
+        slope=float(slope),
+        coefficient=float(np.exp(intercept)),
+        sizes=tuple(sizes),
+    )
+
+
+def _predicted_step_time(measured: list[BenchmarkResult], size: int) -> float | None:
+    """Extrapolate the step time at ``size`` from the largest points measured so far.
+
+    The growth between the last two points is assumed to continue, but never
+    slower than linear. With a single point, quadratic growth is assumed so
+    an unknown backend is not underestimated.
+    """
+    if not measured:
+        return None
+    last = measured[-1]
+    slope = 2.0 if len(measured) == 1 else max(1.0, fit_power_law("", measured[-2:]).slope)
+    return last.median * math.pow(size / last.size, slope)
+
+
+def run_scaling(
+    backends: list[str] | None = None,
+    sizes: list[int] | None = None,
+    steps: int = DEFAULT_STEPS,
+    budget: float = DEFAULT_BUDGET,
+    density: float | None = DEFAULT_DENSITY,
+    seed: int = DEFAULT_SEED,
+    processes: int = 1,
+    isolate: bool = True,
+    cpu: int | None = None,
+    verbose: bool = False,
+) -> tuple[list[BenchmarkResult], list[tuple[str, int]]]:
+    """Time simulation steps for every backend at every size.
+
+    Args:
+        backends (list[str] | None): Backends to run. Defaults to all.
+        sizes (list[int] | None): Boid counts, smallest first. Defaults to a
+            geometric sweep from 100 to :data:`MAX_NUM_BOIDS`.
+        steps (int): Timed steps per point. Defaults to 20.
+        budget (float): Seconds of stepping per point. Points predicted to
+            take longer are skipped. Defaults to 10.0.
+        density (float | None): Boids per square pixel, or None to keep the
+            default 800x600 world at every size.
+        seed (int): Seed for the initial flock.
+        processes (int): Runs per point, pooled into one result. Defaults to 1.
+        isolate (bool): Run every point in freshly spawned processes.
+            Defaults to True.
+        cpu (int | None): CPU to pin isolated runs to. Defaults to None.
+        verbose (bool): Print progress. Defaults to False.
+
+    Returns:
+        tuple[list[BenchmarkResult], list[tuple[str, int]]]: Step time results
+            named ``scaling`` with ``backend`` and ``world`` params, and the
+            (backend, size) points that were skipped.
+
+    Raises:
+        ValueError: If a backend name is unknown, or ``processes`` is more
+            than 1 without ``isolate``.
+    """
+    unknown = sorted(set(backends or []) - set(BACKENDS))
+    if unknown:
+        raise ValueError(f"Unknown backends: {', '.join(unknown)}")
+    check_processes(processes, isolate)
+    sizes = sorted(sizes or geometric_sizes(DEFAULT_START, MAX_NUM_BOIDS))
+
+    results = []
+    skipped: list[tuple[str, int]] = []
+    for backend in backends or list(BACKENDS):
+        measured: list[BenchmarkResult] = []
+        for index, size in enumerate(sizes):
+            predicted = _predicted_step_time(measured, size)
+            if predicted is not None and predicted * (MIN_STEPS + 1) > budget:
+                if verbose:
+                    print(
+                        f"Skipping {backend} from {size} boids: "
+                        f"~{format_time(predicted)} per step exceeds the budget"
+                    )
+                skipped.extend((backend, skipped_size) for skipped_size in sizes[index:])
+                break
+            winsize = world_size(size, density)
+            if verbose:
+                print(
+                    f"Running {backend} at {size} boids in {winsize[0]}x{winsize[1]}...",
+                    flush=True,
+                )
+            point = MatrixPoint(
+                winsize=winsize,
+                count=size,
+                visual_range=BoidOptions().visual_range,
+                boundary_type=BoundaryType.BOUNCE,
+                attack_mode=PREDATOR_ATTACK_MODE_CENTER,
+                scenario="uniform",
+                backend=backend,
+            )
+            samples = []
+            for _ in range(processes):
+                if isolate:
+                    samples.extend(run_isolated(time_point, point, steps, budget, seed, cpu=cpu))
+                else:
+                    samples.extend(time_point(point, steps, budget, seed))
+            result = BenchmarkResult(
+                name="scaling",
+                size=size,
+                number=1,
+                samples=samples,
+                params={"backend": backend, "world": f"{winsize[0]}x{winsize[1]}"},
+            )
+            measured.append(result)
+            results.append(result)
+    return results, skipped
+
+
+def fit_results(results: list[BenchmarkResult]) -> list[ScalingFit]:
+    """Fit a power law per backend to scaling results with at least two sizes."""
+    by_backend: dict[str, list[BenchmarkResult]] = {}
+    for result in results:
+        by_backend.setdefault(result.params["backend"], []).append(result)
+    return [
+        fit_power_law(backend, backend_results)
+        for backend, backend_results in by_backend.items()
+        if len({result.size for result in backend_results}) >= 2
+    ]
+
+
+def print_fits(fits: list[ScalingFit], skipped: list[tuple[str, int]]) -> None:
+    """Print the fitted complexity of every backend and the skipped points.
+
+    Args:
+        fits: Fits from :func:`fit_results`.
+        skipped: Skipped (backend, size) points.
+    """
+    print("=" * 100)
+    print(f"{'Backend':<16} {'Slope':>7}  {'Complexity':<12} {'Sizes':<20}")
+    print("-" * 100)
+    for fit in fits:
+        sizes = f"{min(fit.sizes)}..{max(fit.sizes)}"
+        print(f"{fit.backend:<16} {fit.slope:>7.2f}  {fit.complexity:<12} {sizes:<20}")
+    for backend in sorted({backend for backend, _ in skipped}):
+        first = min(size for skipped_backend, size in skipped if skipped_backend == backend)
+        print(f"{backend:<16} skipped from {first} boids (over the time budget)")
+    print("=" * 100)
@@ -0,0 +1,81 @@
+"""Initial boid distributions for simulation benchmarks.
+
+A uniform flock measures the average case, but neighbor search cost depends
+on how crowded the boids are. The other scenarios pack the flock into dense
+blobs, into a single spatial grid cell (the grid's worst case, where every
+boid is a neighbor of every other) or onto a ring.
+
+Every scenario takes the boid count, the world size, the visual range and a
+random generator, and returns an (n, 2) array of positions inside the world.
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+
+from my_boids.game import Game
+
+Scenario = Callable[[int, tuple[int, int], float, np.random.Generator], np.ndarray]
+
+# Number of blobs in the clustered scenario
+CLUSTER_COUNT = 8
+
+
+def uniform(
+    count: int, winsize: tuple[int, int], visual_range: float, rng: np.random.Generator
+) -> np.ndarray:
+    """Boids spread uniformly over the world."""
+    return rng.uniform((0, 0), winsize, size=(count, 2))
+
+
+def clustered(
+    count: int, winsize: tuple[int, int], visual_range: float, rng: np.random.Generator
+) -> np.ndarray:
+    """Boids in Gaussian blobs a few visual ranges across, at random centers."""
+    centers = rng.uniform((0, 0), winsize, size=(CLUSTER_COUNT, 2))
+    members = rng.integers(0, CLUSTER_COUNT, size=count)
+    positions = centers[members] + rng.normal(0, 2 * visual_range, size=(count, 2))
+    return np.clip(positions, 0, np.subtract(winsize, 1))
+
+
+def hot_cell(
+    count: int, winsize: tuple[int, int], visual_range: float, rng: np.random.Generator
+) -> np.ndarray:
+    """Every boid inside one visual-range square at the center of the world."""
+    low = np.subtract(np.divide(winsize, 2), visual_range / 2)
+    return rng.uniform(low, low + visual_range, size=(count, 2))
+
+
+def ring(
+    count: int, winsize: tuple[int, int], visual_range: float, rng: np.random.Generator
+) -> np.ndarray:
+    """Boids on a ring around the center of the world, one visual range thick."""
+    angles = rng.uniform(0, 2 * np.pi, size=count)
+    radii = 0.4 * min(winsize) + rng.uniform(-visual_range / 2, visual_range / 2, size=count)
+    center = np.divide(winsize, 2)
+    return center + np.column_stack((np.cos(angles), np.sin(angles))) * radii[:, np.newaxis]
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "uniform": uniform,
+    "clustered": clustered,
+    "hot_cell": hot_cell,
+    "ring": ring,
+}
+
+
+def place_boids(game: Game, positions: np.ndarray) -> None:
+    """Move the game's boids to ``positions``, keeping their velocities.
+
+    Args:
+        game (Game): The game whose boids to move.
+        positions (np.ndarray): One position per boid, as an (n, 2) array.
+
+    Raises:
+        ValueError: If the number of positions and boids differ.
+    """
+    if len(positions) != len(game.boid_list):
+        raise ValueError(f"Got {len(positions)} positions for {len(game.boid_list)} boids")
+    for boid, (x, y) in zip(game.boid_list, positions, strict=True):
+        boid.pos.update(float(x), float(y))
+        boid.rect.center = (round(boid.pos.x), round(boid.pos.y))
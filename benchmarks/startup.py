@@ -0,0 +1,201 @@
+"""Startup benchmark: import time and time to first frame.
+
+Every measurement starts a fresh interpreter, since a module is only ever
+imported once per process:
+
+- ``startup/import``: the cumulative import time of a module as reported by
+  ``python -X importtime``, for ``my_boids`` itself and the modules behind
+  its public names
+- ``startup/process``: wall time from launching the interpreter until it
+  exits after drawing the first frame, as seen by the parent process
+- ``startup/imports``, ``startup/init`` and ``startup/first_frame``: the
+  phases of that run as timed inside it: importing ``Game`` and the options,
+  creating the display and the game, and one simulation step plus one frame
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import my_boids
+from benchmarks.harness import DEFAULT_SEED, BenchmarkResult
+
+DEFAULT_MODULES = ["my_boids", "my_boids.options", "my_boids.game", "my_boids.boids_sim"]
+DEFAULT_COUNT = 500
+DEFAULT_REPEATS = 5
+
+# Run in the child interpreter: argv holds the boid count and the seed
+FIRST_FRAME_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame as pg
+from my_boids.game import Game
+from my_boids.options import BoidOptions, PerformanceOptions, PredatorOptions, ScreenOptions
+imported = time.perf_counter()
+pg.init()
+screen = pg.display.set_mode((800, 600))
+game = Game(
+    screen_opts=ScreenOptions(winsize=[800, 600]),
+    boid_opts=BoidOptions(num_boids=int(sys.argv[1])),
+    predator_opts=PredatorOptions(predator_attack_mode="center"),
+    performance_opts=PerformanceOptions(track_gc=False),
+    use_spatial_grid=True,
+    seed=int(sys.argv[2]),
+)
+initialized = time.perf_counter()
+game.run_logic()
+game.display_frame(screen)
+drawn = time.perf_counter()
+print(json.dumps({
+    "imports": imported - start,
+    "init": initialized - imported,
+    "first_frame": drawn - initialized,
+}))
+"""
+
+
+def _child_env() -> dict[str, str]:
+    """Environment for child interpreters, able to import my_boids from this tree."""
+    env = dict(os.environ)
+    source_root = str(Path(my_boids.__file__).resolve().parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [source_root, env.get("PYTHONPATH")]))
+    return env
+
+
+def parse_importtime(output: str) -> dict[str, tuple[int, int]]:
+    """Parse the report ``python -X importtime`` writes to stderr.
+
+    Args:
+        output (str): The report.
+
+    Returns:
+        dict[str, tuple[int, int]]: Self and cumulative import time of every
+            imported module, in microseconds.
+    """
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            # The header row
+            continue
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """Import ``module`` in a fresh interpreter under ``-X importtime``.
+
+    Args:
+        module (str): Module to import.
+
+    Returns:
+        dict[str, tuple[int, int]]: Self and cumulative import time of every
+            module the import pulled in, in microseconds.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=_child_env(),
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+    return parse_importtime(completed.stderr)
+
+
+def time_first_frame(count: int = DEFAULT_COUNT, seed: int = DEFAULT_SEED) -> dict[str, float]:
+    """Start a fresh interpreter that draws one frame of a ``count`` boid flock.
+
+    Args:
+        count (int): Number of boids. Defaults to 500.
+        seed (int): Seed for the flock.
+
+    Returns:
+        dict[str, float]: Seconds spent in every phase, plus ``process``, the
+            wall time of the whole child process.
+
+    Raises:
+        RuntimeError: If the child process fails.
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", FIRST_FRAME_SCRIPT, str(count), str(seed)],
+        capture_output=True,
+        text=True,
+        env=_child_env(),
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Drawing the first frame failed:\n{completed.stderr}")
+    phases = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {"process": elapsed, **phases}
+
+
+def run_startup(
+    modules: list[str] | None = None,
+    count: int = DEFAULT_COUNT,
+    repeats: int = DEFAULT_REPEATS,
+    seed: int = DEFAULT_SEED,
+    verbose: bool = False,
+) -> list[BenchmarkResult]:
+    """Measure import times and the time to first frame over ``repeats`` runs.
+
+    Args:
+        modules (list[str] | None): Modules to import. Defaults to
+            :data:`DEFAULT_MODULES`.
+        count (int): Number of boids in the first frame. Defaults to 500.
+        repeats (int): Fresh interpreters per measurement. Defaults to 5.
+        seed (int): Seed for the flock.
+        verbose (bool): Print progress. Defaults to False.
+
+    Returns:
+        list[BenchmarkResult]: ``startup/import`` results with a ``module``
+            param, then one result per phase of the first frame.
+    """
+    results = []
+    for module in modules or DEFAULT_MODULES:
+        if verbose:
+            print(f"Importing {module}...", flush=True)
+        samples = [import_times(module)[module][1] / 1e6 for _ in range(repeats)]
+        results.append(
+            BenchmarkResult(
+                name="startup/import", size=1, number=1, samples=samples, params={"module": module}
+            )
+        )
+
+    if verbose:
+        print(f"Drawing the first frame of {count} boids...", flush=True)
+    runs = [time_first_frame(count, seed) for _ in range(repeats)]
+    results.extend(
+        BenchmarkResult(
+            name=f"startup/{phase}", size=count, number=1, samples=[run[phase] for run in runs]
+        )
+        for phase in runs[0]
+    )
+    return results
+
+
+def print_top_imports(module: str, top: int) -> None:
+    """Print the ``top`` modules with the largest self import time under ``module``.
+
+    Args:
+        module (str): Module to import.
+        top (int): Number of modules to list.
+    """
+    times = import_times(module)
+    heaviest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    print(f"Heaviest imports of {module} ({times[module][1] / 1000:.1f}ms cumulative)")
+    print(f"{'Module':<48} {'Self':>10} {'Cumulative':>12}")
+    for name, (self_us, cumulative_us) in heaviest:
+        print(f"{name:<48} {self_us / 1000:>8.1f}ms {cumulative_us / 1000:>10.1f}ms")
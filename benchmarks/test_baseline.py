@@ -0,0 +1,96 @@
+"""Tests for benchmark baselines and regression detection."""
+
+import json
+
+import pytest
+
+from benchmarks.baseline import compare_results, load_baseline, save_baseline
+from benchmarks.harness import BenchmarkResult
+from benchmarks.runner import main
+
+
+def _result(median, spread=0.0, name="k", size=100, params=None):
+    samples = [median - spread, median, median, median + spread]
+    return BenchmarkResult(name=name, size=size, number=1, samples=samples, params=params or {})
+
+
+def _statuses(comparisons):
+    return {(comparison.name, comparison.size): comparison.status for comparison in comparisons}
+
+
+def test_baseline_round_trip(tmp_path):
+    results = [_result(1e-3, 1e-5), _result(2e-3, name="other", params={"mode": "wrap"})]
+
+    path = save_baseline(results, tmp_path / "nested" / "baseline.json")
+    metadata, loaded = load_baseline(path)
+
+    assert metadata["python"]
+    assert metadata["cpu_count"]
+    assert [(result.name, result.samples, result.params) for result in loaded] == [
+        (result.name, result.samples, result.params) for result in results
+    ]
+
+
+def test_load_baseline_rejects_unknown_version(tmp_path):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"version": 999, "metadata": {}, "results": []}))
+
+    with pytest.raises(ValueError):
+        load_baseline(path)
+
+
+def test_compare_flags_regressions_and_improvements():
+    baseline = [_result(1.0, name="slower"), _result(1.0, name="faster"), _result(1.0, name="same")]
+    current = [_result(1.5, name="slower"), _result(0.5, name="faster"), _result(1.05, name="same")]
+
+    statuses = _statuses(compare_results(baseline, current, threshold=0.1))
+
+    assert statuses == {
+        ("slower", 100): "regressed",
+        ("faster", 100): "improved",
+        ("same", 100): "unchanged",
+    }
+
+
+def test_compare_ignores_changes_within_noise():
+    baseline = [_result(1.0, spread=0.2)]
+    current = [_result(1.2, spread=0.2)]
+
+    (comparison,) = compare_results(baseline, current, threshold=0.1, noise_factor=2.0)
+
+    assert comparison.status == "unchanged"
+    assert comparison.ratio == pytest.approx(1.2)
+
+
+def test_compare_reports_new_and_missing_benchmarks():
+    baseline = [_result(1.0, size=100), _result(1.0, size=200)]
+    current = [_result(1.0, size=100), _result(1.0, size=300)]
+
+    statuses = _statuses(compare_results(baseline, current))
+
+    assert statuses == {("k", 100): "unchanged", ("k", 300): "new", ("k", 200): "missing"}
+
+
+def test_compare_matches_on_params():
+    baseline = [_result(1.0, params={"mode": "wrap"})]
+    current = [_result(1.0, params={"mode": "bounce"})]
+
+    statuses = [comparison.status for comparison in compare_results(baseline, current)]
+
+    assert statuses == ["new", "missing"]
+
+
+@pytest.mark.benchmark
+def test_cli_exits_non_zero_on_regression(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    args = ["kernels", "grid_build", "--sizes", "20", "--warmup", "0", "--repeats", "3"]
+    assert main([*args, "--save", str(path)]) == 0
+
+    # Make the baseline impossibly fast so the next run regresses against it
+    baseline = json.loads(path.read_text())
+    for entry in baseline["results"]:
+        entry["samples"] = [1e-12] * len(entry["samples"])
+    path.write_text(json.dumps(baseline))
+
+    assert main([*args, "--compare", str(path)]) == 1
+    assert "REGRESSED" in capsys.readouterr().out
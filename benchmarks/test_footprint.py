@@ -0,0 +1,72 @@
+"""Tests for the memory footprint benchmark."""
+
+import csv
+
+import pytest
+
+from benchmarks.footprint import (
+    FootprintResult,
+    current_rss,
+    measure_footprint,
+    run_footprint,
+    write_footprint_csv,
+)
+from benchmarks.runner import main
+
+
+def test_current_rss_is_positive():
+    assert current_rss() > 0
+
+
+def test_footprint_result_reports_bytes_per_boid():
+    result = FootprintResult("arrays", None, 100, rss_bytes=4096, traced_bytes=3200)
+
+    assert result.rss_per_boid == pytest.approx(40.96)
+    assert result.traced_per_boid == pytest.approx(32.0)
+
+
+def test_unknown_representation_or_backend_is_rejected():
+    with pytest.raises(ValueError):
+        measure_footprint("no_such_representation", None, 10, trace=True)
+    with pytest.raises(ValueError):
+        measure_footprint("sprites", "no_such_backend", 10, trace=True)
+    with pytest.raises(ValueError):
+        run_footprint(representations=["no_such_representation"])
+
+
+def test_measure_footprint_traces_arrays_in_process():
+    measured = measure_footprint("arrays", None, 100, trace=True)
+
+    # Two (100, 2) float64 arrays
+    assert measured["traced_bytes"] >= 2 * 100 * 2 * 8
+    assert "step_peak_bytes" not in measured
+
+
+def test_write_footprint_csv(tmp_path):
+    results = [FootprintResult("sprites", "spatial_grid", 10, 1000, 800, 50, 20)]
+
+    path = write_footprint_csv(results, tmp_path / "memory.csv")
+
+    with open(path, newline="") as file_handle:
+        rows = list(csv.DictReader(file_handle))
+    assert rows[0]["representation"] == "sprites"
+    assert float(rows[0]["traced_per_boid"]) == pytest.approx(80.0)
+
+
+@pytest.mark.benchmark
+def test_run_footprint_measures_every_representation():
+    results = run_footprint(counts=[200], backends=["spatial_grid"])
+
+    assert [result.representation for result in results] == ["sprites", "snapshot", "arrays"]
+    sprites, _, arrays = results
+    assert sprites.traced_per_boid > arrays.traced_per_boid
+    assert sprites.step_peak_bytes is not None
+    assert sprites.grid_rebuild_bytes is not None and sprites.grid_rebuild_bytes > 0
+
+
+@pytest.mark.benchmark
+def test_cli_runs_memory_suite(capsys):
+    exit_code = main(["memory", "--counts", "100", "--representations", "arrays"])
+
+    assert exit_code == 0
+    assert "arrays" in capsys.readouterr().out
@@ -0,0 +1,95 @@
+"""Tests for process-isolated benchmark runs."""
+
+import os
+
+import pytest
+
+from benchmarks.isolation import pin_to_cpu, run_isolated
+from benchmarks.kernels import time_kernel
+from benchmarks.matrix import expand_matrix, run_matrix, time_point
+from benchmarks.render import run_render
+from benchmarks.runner import main, run_kernels
+from benchmarks.scaling import run_scaling
+from my_boids.options import PREDATOR_ATTACK_MODE_CENTER, BoundaryType
+
+
+def _point(scenario="uniform"):
+    (point,) = expand_matrix(
+        [(800, 600)],
+        [20],
+        [40],
+        [BoundaryType.BOUNCE],
+        [PREDATOR_ATTACK_MODE_CENTER],
+        [scenario],
+        ["spatial_grid"],
+    )
+    return point
+
+
+def test_pin_to_cpu_without_cpu_does_nothing():
+    assert pin_to_cpu(None) is False
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_getaffinity"), reason="needs CPU affinity")
+def test_pin_to_cpu_restricts_affinity():
+    original = os.sched_getaffinity(0)
+    cpu = min(original)
+    try:
+        assert pin_to_cpu(cpu) is True
+        assert os.sched_getaffinity(0) == {cpu}
+    finally:
+        os.sched_setaffinity(0, original)
+
+
+def test_run_isolated_uses_a_fresh_process():
+    assert run_isolated(os.getpid) != os.getpid()
+
+
+@pytest.mark.benchmark
+def test_run_matrix_pools_runs():
+    (result,) = run_matrix([_point()], steps=3, processes=2)
+
+    assert len(result.samples) == 6
+
+
+@pytest.mark.benchmark
+def test_time_point_runs_isolated():
+    point = _point("clustered")
+
+    isolated = run_isolated(time_point, point, 3, 1.0, 7)
+
+    assert len(isolated) == 3
+    assert len(time_point(point, 3, 1.0, 7)) == 3
+
+
+def test_repeated_runs_need_isolation():
+    with pytest.raises(ValueError):
+        run_matrix([_point()], steps=3, processes=2, isolate=False)
+    with pytest.raises(ValueError):
+        run_scaling(["brute_force"], sizes=[10], steps=3, processes=2, isolate=False)
+    assert main(["matrix", "--counts", "20", "--processes", "2", "--no-isolate"]) == 2
+
+
+@pytest.mark.benchmark
+def test_kernels_and_render_run_isolated(monkeypatch):
+    spawned = []
+
+    def fake_run_isolated(func, *args, cpu=None):
+        spawned.append(func.__name__)
+        return func(*args)
+
+    monkeypatch.setattr("benchmarks.runner.run_isolated", fake_run_isolated)
+    monkeypatch.setattr("benchmarks.render.run_isolated", fake_run_isolated)
+
+    run_kernels(["grid_build"], sizes=[20], warmup=0, repeats=2)
+    run_render([(320, 240)], [20], ["sprites"], frames=1, warmup=0)
+
+    assert spawned == ["time_kernel", "time_render"]
+
+
+@pytest.mark.benchmark
+def test_time_kernel_runs_isolated():
+    number, samples = run_isolated(time_kernel, "grid_build", 20, 0, 2)
+
+    assert number >= 1
+    assert len(samples) == 2
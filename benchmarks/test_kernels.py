@@ -0,0 +1,56 @@
+"""Smoke tests for the kernel benchmarks, and unit tests for the harness."""
+
+import pytest
+
+from benchmarks.harness import BenchmarkResult, format_time, measure
+from benchmarks.kernels import KERNELS
+from benchmarks.runner import main, run_kernels
+
+
+def test_result_statistics():
+    result = BenchmarkResult(name="k", size=10, number=1, samples=[1.0, 2.0, 3.0, 4.0, 10.0])
+
+    assert result.min == 1.0
+    assert result.median == 3.0
+    assert result.mean == pytest.approx(4.0)
+    assert result.iqr > 0
+    assert result.per_item == pytest.approx(0.3)
+
+
+def test_measure_calibrates_calls_per_sample():
+    calls = []
+
+    number, samples = measure(lambda: calls.append(1), warmup=1, repeats=3, min_sample_time=0.001)
+
+    assert number > 1
+    assert len(samples) == 3
+    assert len(calls) == 1 + 1 + 3 * number
+
+
+def test_format_time_picks_unit():
+    assert format_time(2.0) == "2.000s"
+    assert format_time(0.0025) == "2.500ms"
+    assert format_time(3e-6) == "3.000us"
+
+
+def test_unknown_kernel_is_rejected():
+    with pytest.raises(ValueError):
+        run_kernels(["no_such_kernel"])
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(KERNELS))
+def test_kernel_runs(name):
+    (result,) = run_kernels([name], sizes=[20], warmup=1, repeats=3, isolate=False)
+
+    assert result.name == name
+    assert len(result.samples) == 3
+    assert result.median > 0
+
+
+@pytest.mark.benchmark
+def test_cli_lists_kernels(capsys):
+    assert main(["kernels", "--list"]) == 0
+
+    output = capsys.readouterr().out
+    assert all(name in output for name in KERNELS)
@@ -0,0 +1,109 @@
+"""Tests for the parameter-matrix benchmark and its scenarios."""
+
+import csv
+
+import numpy as np
+import pytest
+
+from benchmarks.harness import make_game
+from benchmarks.matrix import expand_matrix, parse_winsize, run_matrix
+from benchmarks.runner import main
+from benchmarks.scenarios import SCENARIOS, hot_cell, place_boids
+from my_boids.options import PREDATOR_ATTACK_MODE_CENTER, BoundaryType
+
+WINSIZE = (800, 600)
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_scenario_positions_stay_in_world(name):
+    positions = SCENARIOS[name](500, WINSIZE, 40.0, np.random.default_rng(1))
+
+    assert positions.shape == (500, 2)
+    assert (positions >= 0).all()
+    assert (positions < WINSIZE).all()
+
+
+def test_scenarios_are_deterministic_for_a_seed():
+    first = SCENARIOS["clustered"](100, WINSIZE, 40.0, np.random.default_rng(7))
+    second = SCENARIOS["clustered"](100, WINSIZE, 40.0, np.random.default_rng(7))
+
+    np.testing.assert_array_equal(first, second)
+
+
+def test_hot_cell_fits_in_one_visual_range():
+    positions = hot_cell(200, WINSIZE, 40.0, np.random.default_rng(1))
+
+    assert np.ptp(positions, axis=0).max() <= 40.0
+
+
+def test_place_boids_moves_boids_and_rects():
+    game = make_game(3)
+    positions = np.array([[10.0, 20.0], [30.0, 40.0], [50.0, 60.0]])
+
+    place_boids(game, positions)
+
+    assert [tuple(boid.pos) for boid in game.boid_list] == [(10, 20), (30, 40), (50, 60)]
+    assert [boid.rect.center for boid in game.boid_list] == [(10, 20), (30, 40), (50, 60)]
+    with pytest.raises(ValueError):
+        place_boids(game, positions[:2])
+
+
+def test_parse_winsize():
+    assert parse_winsize("1600x1200") == (1600, 1200)
+    for value in ("800", "800x", "0x600", "axb"):
+        with pytest.raises(ValueError):
+            parse_winsize(value)
+
+
+def test_expand_matrix_covers_every_combination():
+    points = expand_matrix(
+        [WINSIZE],
+        [100, 200],
+        [40],
+        list(BoundaryType),
+        [PREDATOR_ATTACK_MODE_CENTER],
+        ["uniform", "ring"],
+        ["spatial_grid"],
+    )
+
+    assert len(points) == 2 * 2 * 2
+    assert len({tuple(point.params.items()) + (point.count,) for point in points}) == 8
+
+
+def test_expand_matrix_rejects_unknown_scenario():
+    with pytest.raises(ValueError):
+        expand_matrix([WINSIZE], [10], [40], [BoundaryType.WRAP], ["center"], ["nope"], [])
+
+
+@pytest.mark.benchmark
+def test_run_matrix():
+    points = expand_matrix(
+        [WINSIZE],
+        [20],
+        [40],
+        [BoundaryType.WRAP],
+        [PREDATOR_ATTACK_MODE_CENTER],
+        list(SCENARIOS),
+        ["brute_force", "spatial_grid"],
+    )
+
+    results = run_matrix(points, steps=3, isolate=False)
+
+    assert len(results) == len(SCENARIOS) * 2
+    assert all(len(result.samples) == 3 for result in results)
+    assert results[0].params["boundary"] == "wrap"
+
+
+@pytest.mark.benchmark
+def test_cli_writes_csv(tmp_path):
+    path = tmp_path / "matrix.csv"
+
+    exit_code = main(
+        ["matrix", "--counts", "20", "--boundaries", "wrap", "bounce", "--scenarios", "ring"]
+        + ["--steps", "3", "--csv", str(path)]
+    )
+
+    assert exit_code == 0
+    with open(path, newline="") as file_handle:
+        rows = list(csv.DictReader(file_handle))
+    assert [row["boundary"] for row in rows] == ["wrap", "bounce"]
@@ -0,0 +1,36 @@
+"""Tests for the render benchmark."""
+
+import pytest
+
+from benchmarks.render import RENDER_PATHS, RENDER_STAGES, run_render, time_render
+from benchmarks.runner import main
+
+
+def test_unknown_render_path_is_rejected():
+    with pytest.raises(ValueError):
+        run_render(paths=["no_such_path"])
+    with pytest.raises(ValueError):
+        time_render((800, 600), 10, "no_such_path")
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("path", RENDER_PATHS)
+def test_time_render_times_every_stage(path):
+    samples = time_render((320, 240), 20, path, frames=3, warmup=1)
+
+    assert set(samples) == {"frame", *RENDER_STAGES}
+    assert all(len(stage_samples) == 3 for stage_samples in samples.values())
+    assert all(sample > 0 for sample in samples["frame"] + samples["hud"])
+    assert all(
+        draw <= frame for draw, frame in zip(samples["draw_frame"], samples["frame"], strict=True)
+    )
+
+
+@pytest.mark.benchmark
+def test_cli_runs_render_suite(capsys):
+    exit_code = main(
+        ["render", "--worlds", "320x240", "--counts", "20", "--paths", "heatmap", "--frames", "2"]
+    )
+
+    assert exit_code == 0
+    assert "render/hud[320x240,heatmap]" in capsys.readouterr().out
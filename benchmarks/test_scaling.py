@@ -0,0 +1,107 @@
+"""Tests for the scaling benchmark."""
+
+import csv
+
+import pytest
+
+from benchmarks.harness import BenchmarkResult, write_csv
+from benchmarks.runner import main
+from benchmarks.scaling import (
+    DEFAULT_DENSITY,
+    fit_power_law,
+    fit_results,
+    geometric_sizes,
+    run_scaling,
+    world_size,
+)
+
+
+def _results(backend, exponent, sizes=(100, 1000, 10000)):
+    return [
+        BenchmarkResult(
+            name="scaling",
+            size=size,
+            number=1,
+            samples=[1e-6 * size**exponent],
+            params={"backend": backend, "world": "800x600"},
+        )
+        for size in sizes
+    ]
+
+
+def test_geometric_sizes_end_at_stop():
+    assert geometric_sizes(100, 1000) == [100, 200, 400, 800, 1000]
+    assert geometric_sizes(1, 4, factor=1.5) == [1, 2, 3, 4]
+
+
+def test_geometric_sizes_rejects_bad_range():
+    with pytest.raises(ValueError):
+        geometric_sizes(100, 10)
+    with pytest.raises(ValueError):
+        geometric_sizes(1, 10, factor=1.0)
+
+
+def test_world_size_keeps_density():
+    width, height = world_size(40_000)
+
+    assert 40_000 / (width * height) == pytest.approx(DEFAULT_DENSITY, rel=0.01)
+    assert width / height == pytest.approx(4 / 3, rel=0.01)
+    assert world_size(10) == (800, 600)
+    assert world_size(40_000, density=None) == (800, 600)
+
+
+@pytest.mark.parametrize(
+    ("exponent", "complexity"),
+    [(1.0, "O(n)"), (1.15, "O(n log n)"), (2.0, "O(n²)")],
+)
+def test_fit_power_law_recovers_exponent(exponent, complexity):
+    fit = fit_power_law("backend", _results("backend", exponent))
+
+    assert fit.slope == pytest.approx(exponent)
+    assert fit.complexity == complexity
+    assert fit.predict(100) == pytest.approx(1e-6 * 100**exponent)
+
+
+def test_fit_power_law_needs_two_sizes():
+    with pytest.raises(ValueError):
+        fit_power_law("backend", _results("backend", 1.0, sizes=(100,)))
+
+
+def test_fit_results_groups_by_backend():
+    fits = fit_results(_results("fast", 1.0) + _results("slow", 2.0))
+
+    assert {fit.backend: round(fit.slope, 3) for fit in fits} == {"fast": 1.0, "slow": 2.0}
+
+
+def test_write_csv(tmp_path):
+    path = write_csv(_results("fast", 1.0), tmp_path / "scaling.csv")
+
+    with open(path, newline="") as file_handle:
+        rows = list(csv.DictReader(file_handle))
+    assert [int(row["size"]) for row in rows] == [100, 1000, 10000]
+    assert rows[0]["backend"] == "fast"
+    assert rows[0]["world"] == "800x600"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        run_scaling(["no_such_backend"])
+
+
+@pytest.mark.benchmark
+def test_run_scaling_skips_points_over_budget():
+    results, skipped = run_scaling(
+        ["brute_force"], sizes=[10, 20, 100_000], steps=3, budget=1.0, isolate=False
+    )
+
+    assert [result.size for result in results] == [10, 20]
+    assert all(len(result.samples) == 3 for result in results)
+    assert skipped == [("brute_force", 100_000)]
+
+
+@pytest.mark.benchmark
+def test_cli_writes_csv(tmp_path):
+    path = tmp_path / "scaling.csv"
+
+    assert main(["scaling", "--sizes", "10", "20", "--steps", "3", "--csv", str(path)]) == 0
+    assert len(path.read_text().splitlines()) == 1 + 2 * 2
@@ -0,0 +1,51 @@
+"""Tests for the startup benchmark."""
+
+import pytest
+
+from benchmarks.runner import main
+from benchmarks.startup import import_times, parse_importtime, run_startup
+
+IMPORTTIME_REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2500 | my_boids
+"""
+
+
+def test_parse_importtime_reads_self_and_cumulative_times():
+    assert parse_importtime(IMPORTTIME_REPORT) == {"_io": (120, 120), "my_boids": (2000, 2500)}
+
+
+def test_import_times_of_the_package_exclude_pygame():
+    times = import_times("my_boids")
+
+    assert times["my_boids"][1] > 0
+    assert "pygame" not in times
+
+
+def test_failing_import_is_reported():
+    with pytest.raises(RuntimeError):
+        import_times("no_such_module")
+
+
+@pytest.mark.benchmark
+def test_run_startup_times_imports_and_first_frame():
+    results = run_startup(["my_boids"], count=20, repeats=1)
+
+    assert [result.label for result in results] == [
+        "startup/import[my_boids]",
+        "startup/process",
+        "startup/imports",
+        "startup/init",
+        "startup/first_frame",
+    ]
+    process, *phases = results[1:]
+    assert sum(phase.median for phase in phases) < process.median
+
+
+@pytest.mark.benchmark
+def test_cli_runs_startup_suite(capsys):
+    exit_code = main(["startup", "--modules", "my_boids", "--count", "20", "--repeats", "1"])
+
+    assert exit_code == 0
+    assert "startup/first_frame" in capsys.readouterr().out
@@ -1,23 +1,54 @@
-"""Public API for the my_boids package."""
-
-from my_boids.game import Game
-from my_boids.options import (
-    PREDATOR_ATTACK_MODE_CENTER,
-    PREDATOR_ATTACK_MODE_ISOLATED,
-    PREDATOR_ATTACK_MODE_MOUSE,
-    PREDATOR_ATTACK_MODE_NEAREST,
-    PREDATOR_ATTACK_MODES,
-    PREDATOR_BEHAVIOR_MODES,
-    PREDATOR_MODE_ATTRACT,
-    PREDATOR_MODE_AVOID,
-    BoidOptions,
-    BoundaryType,
-    PredatorAttackMode,
-    PredatorBehaviorMode,
-    PredatorOptions,
-    ScreenOptions,
-)
-from my_boids.settings_ui import SettingsDialog
+"""Public API for the my_boids package.
+
+The public names are resolved lazily, on first access, through the module
+``__getattr__``. ``import my_boids`` therefore stays cheap: ``Game`` pulls in
+pygame and numpy, ``SettingsDialog`` pygame_gui, and the options pydantic, and
+none of them is imported until it is used.
+"""
+
+import importlib
+
+# Not imported from typing, which would cost more than the rest of this module
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from my_boids.game import Game
+    from my_boids.options import (
+        PREDATOR_ATTACK_MODE_CENTER,
+        PREDATOR_ATTACK_MODE_ISOLATED,
+        PREDATOR_ATTACK_MODE_MOUSE,
+        PREDATOR_ATTACK_MODE_NEAREST,
+        PREDATOR_ATTACK_MODES,
+        PREDATOR_BEHAVIOR_MODES,
+        PREDATOR_MODE_ATTRACT,
+        PREDATOR_MODE_AVOID,
+        BoidOptions,
+        BoundaryType,
+        PredatorAttackMode,
+        PredatorBehaviorMode,
+        PredatorOptions,
+        ScreenOptions,
+    )
+    from my_boids.settings_ui import SettingsDialog
+
+# Public name -> module that defines it
+_LAZY_IMPORTS = {
+    "Game": "my_boids.game",
+    "SettingsDialog": "my_boids.settings_ui",
+    "BoundaryType": "my_boids.options",
+    "ScreenOptions": "my_boids.options",
+    "BoidOptions": "my_boids.options",
+    "PredatorOptions": "my_boids.options",
+    "PredatorBehaviorMode": "my_boids.options",
+    "PredatorAttackMode": "my_boids.options",
+    "PREDATOR_MODE_AVOID": "my_boids.options",
+    "PREDATOR_MODE_ATTRACT": "my_boids.options",
+    "PREDATOR_BEHAVIOR_MODES": "my_boids.options",
+    "PREDATOR_ATTACK_MODE_MOUSE": "my_boids.options",
+    "PREDATOR_ATTACK_MODE_CENTER": "my_boids.options",
+    "PREDATOR_ATTACK_MODE_NEAREST": "my_boids.options",
+    "PREDATOR_ATTACK_MODE_ISOLATED": "my_boids.options",
+    "PREDATOR_ATTACK_MODES": "my_boids.options",
+}
 
 __all__ = [
     "Game",
@@ -37,3 +68,17 @@ __all__ = [
     "PREDATOR_ATTACK_MODE_ISOLATED",
     "PREDATOR_ATTACK_MODES",
 ]
+
+
+def __getattr__(name: str) -> object:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache it, so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
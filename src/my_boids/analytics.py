@@ -0,0 +1,367 @@
+"""Flock analytics computed from position and velocity arrays.
+
+Every metric is a few numpy passes over the (n, 2) state arrays, with no
+Python loop over the boids:
+
+- polarization: length of the mean unit heading, 1 when every boid flies the
+  same way and near 0 for random headings
+- centroid and radius of gyration: mean position, and the root mean squared
+  distance to it
+- speed mean and standard deviation
+- nearest-neighbor distances: mean and 10th, 50th and 90th percentiles
+
+Distances are plain Euclidean ones, so with wrap-around boundaries a flock
+straddling an edge counts as spread across the world.
+
+Nearest neighbors are found exactly without comparing every pair. The points
+are bucketed into square cells and sorted by cell, and every point is
+compared with the points of the 3x3 cells around it, which finds its nearest
+neighbor whenever that is closer than one cell. Points left without one are
+searched again with cells twice as large, until every point is settled.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import IO, Protocol
+
+import numpy as np
+
+# Below this many points, nearest neighbors come from the full distance matrix
+_BRUTE_FORCE_POINTS = 512
+# Points still unsettled after a grid pass are compared with every point once
+# that takes at most this many distances
+_BRUTE_FORCE_PAIRS = 2**22
+# Largest average number of pairs per point the first cell grid may compare
+_PAIRS_PER_POINT = 32
+# Cells are looked up in a dense table while it has at most this many
+# entries per point, and by binary search otherwise
+_DENSE_CELLS_PER_POINT = 8
+NEAREST_NEIGHBOR_PERCENTILES = (10, 50, 90)
+
+
+@dataclass(frozen=True)
+class FlockMetrics:
+    """Flock metrics of one simulation step.
+
+    Attributes:
+        step: Simulation step.
+        count: Number of live boids.
+        polarization: Length of the mean unit heading, from 0 to 1.
+        centroid_x: Mean x position.
+        centroid_y: Mean y position.
+        radius_of_gyration: Root mean squared distance to the centroid.
+        speed_mean: Mean speed.
+        speed_std: Standard deviation of the speed.
+        nn_mean: Mean distance to the nearest neighbor.
+        nn_p10: 10th percentile of the nearest-neighbor distance.
+        nn_p50: Median nearest-neighbor distance.
+        nn_p90: 90th percentile of the nearest-neighbor distance.
+    """
+
+    step: int
+    count: int
+    polarization: float
+    centroid_x: float
+    centroid_y: float
+    radius_of_gyration: float
+    speed_mean: float
+    speed_std: float
+    nn_mean: float
+    nn_p10: float
+    nn_p50: float
+    nn_p90: float
+
+
+def _brute_force_nearest(xs: np.ndarray, ys: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """Squared distance from every query point to its nearest other point."""
+    best = np.empty(len(queries))
+    # Bound the distance matrix to about a million entries at a time
+    chunk = max(1, 2**20 // len(xs))
+    for start in range(0, len(queries), chunk):
+        batch = queries[start : start + chunk]
+        dx = xs[batch, None] - xs
+        dy = ys[batch, None] - ys
+        squared = dx * dx
+        squared += dy * dy
+        squared[np.arange(len(batch)), batch] = np.inf
+        best[start : start + chunk] = squared.min(axis=1)
+    return best
+
+
+class _CellIndex:
+    """Points sorted by the square cell they fall in."""
+
+    def __init__(self, points: np.ndarray, cell_size: float):
+        cells = np.floor((points - points.min(axis=0)) / cell_size).astype(np.int64)
+        # One empty column on each side, so neighboring keys never wrap rows
+        self.width = int(cells[:, 0].max()) + 3
+        self.keys = (cells[:, 1] + 1) * self.width + cells[:, 0] + 1
+        self.order = np.argsort(self.keys)
+        self.offsets = [dy * self.width + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+        table_size = (int(cells[:, 1].max()) + 3) * self.width
+        self._dense = table_size <= _DENSE_CELLS_PER_POINT * len(points)
+        if self._dense:
+            # Start and count of every cell, looked up by key
+            self._counts = np.bincount(self.keys, minlength=table_size)
+            self._starts = np.cumsum(self._counts) - self._counts
+        else:
+            # Start and count of every occupied cell, looked up by binary search
+            sorted_keys = self.keys[self.order]
+            self._cell_keys, self._starts, self._counts = np.unique(
+                sorted_keys, return_index=True, return_counts=True
+            )
+
+    def ranges(self, queries: np.ndarray, offset: int) -> tuple[np.ndarray, np.ndarray]:
+        """Start and count, in sorted order, of the points in a cell next to every query.
+
+        Queries given in cell order look up cells fastest.
+        """
+        target = self.keys[queries] + offset
+        if self._dense:
+            return self._starts[target], self._counts[target]
+        cells = np.searchsorted(self._cell_keys, target)
+        cells[cells == len(self._cell_keys)] = 0
+        found = self._cell_keys[cells] == target
+        return self._starts[cells], np.where(found, self._counts[cells], 0)
+
+    def pair_count(self, queries: np.ndarray) -> int:
+        """Pairs a pass over ``queries`` would compare."""
+        return sum(int(self.ranges(queries, offset)[1].sum()) for offset in self.offsets)
+
+    def nearest(self, xs: np.ndarray, ys: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Squared distance from every query to its nearest other point in the 3x3 cells."""
+        best = np.full(len(queries), np.inf)
+        for offset in self.offsets:
+            starts, counts = self.ranges(queries, offset)
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            firsts = np.cumsum(counts) - counts
+            owners = np.repeat(queries, counts)
+            others = self.order[np.repeat(starts - firsts, counts) + np.arange(total)]
+            dx = xs[others] - xs[owners]
+            dy = ys[others] - ys[owners]
+            squared = dx * dx
+            squared += dy * dy
+            squared[others == owners] = np.inf
+            occupied = counts > 0
+            minima = np.minimum.reduceat(squared, firsts[occupied])
+            best[occupied] = np.minimum(best[occupied], minima)
+        return best
+
+
+def nearest_neighbor_distances(positions: np.ndarray) -> np.ndarray:
+    """Distance from every point to its nearest other point.
+
+    Args:
+        positions (np.ndarray): Points as an (n, 2) array.
+
+    Returns:
+        np.ndarray: (n,) distances, all infinite when there are fewer than
+            two points.
+    """
+    points = np.asarray(positions, dtype=np.float64)
+    count = len(points)
+    if count < 2:
+        return np.full(count, np.inf)
+    xs = np.ascontiguousarray(points[:, 0])
+    ys = np.ascontiguousarray(points[:, 1])
+    everything = np.arange(count)
+    if count <= _BRUTE_FORCE_POINTS:
+        return np.sqrt(_brute_force_nearest(xs, ys, everything))
+
+    extent = float(np.ptp(points, axis=0).max())
+    if extent == 0:
+        return np.zeros(count)
+    # About four points per cell if they were spread evenly, and smaller
+    # cells while tight clusters would make too many pairs
+    cell_size = 2 * extent / np.sqrt(count)
+    index = _CellIndex(points, cell_size)
+    for _ in range(32):
+        if index.pair_count(everything) <= _PAIRS_PER_POINT * count:
+            break
+        cell_size /= 2
+        index = _CellIndex(points, cell_size)
+
+    distances = np.empty(count)
+    queries = index.order
+    while True:
+        best = index.nearest(xs, ys, queries)
+        # Anything within one cell is inside the 3x3 block searched
+        settled = best <= cell_size * cell_size
+        distances[queries[settled]] = np.sqrt(best[settled])
+        queries = queries[~settled]
+        if len(queries) * count <= _BRUTE_FORCE_PAIRS:
+            # A few isolated points are quicker to compare with everything
+            distances[queries] = np.sqrt(_brute_force_nearest(xs, ys, queries))
+            return distances
+        cell_size *= 2
+        index = _CellIndex(points, cell_size)
+        queries = queries[np.argsort(index.keys[queries])]
+
+
+def flock_metrics(positions: np.ndarray, velocities: np.ndarray, step: int = 0) -> FlockMetrics:
+    """Compute the flock metrics of one step.
+
+    Args:
+        positions (np.ndarray): Boid positions as an (n, 2) array.
+        velocities (np.ndarray): Boid velocities as an (n, 2) array.
+        step (int): Simulation step the state is from. Defaults to 0.
+
+    Returns:
+        FlockMetrics: The metrics. With no boids every metric is NaN, and
+            the nearest-neighbor ones are also NaN with a single boid.
+    """
+    count = len(positions)
+    if count == 0:
+        nan = float("nan")
+        return FlockMetrics(step, 0, nan, nan, nan, nan, nan, nan, nan, nan, nan, nan)
+
+    speeds = np.hypot(velocities[:, 0], velocities[:, 1])
+    moving = speeds > 0
+    if moving.any():
+        headings = velocities[moving] / speeds[moving, None]
+        polarization = float(np.hypot(*headings.mean(axis=0)))
+    else:
+        polarization = 0.0
+
+    centroid = positions.mean(axis=0)
+    offsets = positions - centroid
+    radius_of_gyration = float(np.sqrt((offsets**2).sum(axis=1).mean()))
+
+    if count > 1:
+        nearest = nearest_neighbor_distances(positions)
+        nn_mean = float(nearest.mean())
+        nn_p10, nn_p50, nn_p90 = (
+            float(value) for value in np.percentile(nearest, NEAREST_NEIGHBOR_PERCENTILES)
+        )
+    else:
+        nn_mean = nn_p10 = nn_p50 = nn_p90 = float("nan")
+
+    return FlockMetrics(
+        step=step,
+        count=count,
+        polarization=polarization,
+        centroid_x=float(centroid[0]),
+        centroid_y=float(centroid[1]),
+        radius_of_gyration=radius_of_gyration,
+        speed_mean=float(speeds.mean()),
+        speed_std=float(speeds.std()),
+        nn_mean=nn_mean,
+        nn_p10=nn_p10,
+        nn_p50=nn_p50,
+        nn_p90=nn_p90,
+    )
+
+
+class MetricsSink(Protocol):
+    """Destination of the metrics of every analyzed step."""
+
+    def write(self, metrics: FlockMetrics) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class MetricsFileSink:
+    """Stream metrics to a CSV file, or JSON lines for any other suffix.
+
+    Attributes:
+        path (Path): The metrics file.
+    """
+
+    def __init__(self, path: str | Path):
+        """Create the file, replacing any existing one.
+
+        Args:
+            path (str | Path): Destination file. A ``.csv`` suffix writes CSV
+                with a header row, anything else one JSON object per line.
+                Parent directories are created.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] | None = open(self.path, "w", newline="")  # noqa: SIM115
+        self._csv: csv.DictWriter | None = None
+        if self.path.suffix.lower() == ".csv":
+            self._csv = csv.DictWriter(
+                self._file, fieldnames=[field.name for field in fields(FlockMetrics)]
+            )
+            self._csv.writeheader()
+
+    def write(self, metrics: FlockMetrics) -> None:
+        """Append the metrics of one step."""
+        if self._file is None:
+            return
+        row = asdict(metrics)
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            # NaN is not valid JSON
+            row = {name: None if value != value else value for name, value in row.items()}
+            self._file.write(json.dumps(row) + "\n")
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class FlockAnalytics:
+    """Compute flock metrics every k-th simulation step and pass them to a sink.
+
+    Attributes:
+        every (int): Analyze one step out of this many simulation steps.
+        sink (MetricsSink | None): Destination of every result, if any.
+        show_in_hud (bool): Whether the HUD shows the latest result.
+        latest (FlockMetrics | None): Metrics of the last analyzed step.
+    """
+
+    def __init__(self, every: int = 10, sink: MetricsSink | None = None, show_in_hud: bool = False):
+        """Initialize the analytics.
+
+        Args:
+            every (int): Analysis interval in simulation steps. Defaults to 10.
+            sink (MetricsSink | None): Destination of every result. Defaults
+                to None, which only keeps the latest.
+            show_in_hud (bool): Show the latest result in the HUD. Defaults
+                to False.
+
+        Raises:
+            ValueError: If ``every`` is less than 1.
+        """
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.every = every
+        self.sink = sink
+        self.show_in_hud = show_in_hud
+        self.latest: FlockMetrics | None = None
+
+    def should_analyze(self, step: int) -> bool:
+        """Whether ``step`` is due for analysis."""
+        return step % self.every == 0
+
+    def analyze(self, step: int, positions: np.ndarray, velocities: np.ndarray) -> FlockMetrics:
+        """Compute the metrics of one step, keep them and pass them to the sink.
+
+        Args:
+            step (int): Simulation step.
+            positions (np.ndarray): Boid positions as an (n, 2) array.
+            velocities (np.ndarray): Boid velocities as an (n, 2) array.
+
+        Returns:
+            FlockMetrics: The metrics.
+        """
+        metrics = flock_metrics(positions, velocities, step)
+        self.latest = metrics
+        if self.sink is not None:
+            self.sink.write(metrics)
+        return metrics
+
+    def close(self) -> None:
+        """Close the sink."""
+        if self.sink is not None:
+            self.sink.close()
@@ -2,13 +2,22 @@
 Boid simulation using PyGame and Sprites
 """
 
+import argparse
+import os
+import sys
+
 import pygame as pg
 import pygame_gui
 from pygame_gui.elements import UIButton
 
+from my_boids.capture import CAPTURE_FORMATS, FrameCapture
 from my_boids.game import Game
-from my_boids.options import ScreenOptions
+from my_boids.options import PerformanceOptions, ScreenOptions
+from my_boids.pipeline import SimulationThread
+from my_boids.recording import TrajectoryRecorder, open_trajectory
+from my_boids.replay import ReplayPlayer
 from my_boids.settings_ui import SettingsDialog
+from my_boids.trajectory_codec import COMPRESSIONS, TrajectoryCodec
 
 _CONFIG_PATH = "config.ini"
 _SETTINGS_BTN_W = 120
@@ -16,12 +25,254 @@ _SETTINGS_BTN_H = 34
 _SETTINGS_BTN_MARGIN = 8
 
 
-def main():
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="my-boids", description="Boids simulation")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run without a window, rendering only the frames that are captured",
+    )
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=500,
+        help="number of simulation steps to run in headless mode (default: 500)",
+    )
+    parser.add_argument(
+        "--capture",
+        metavar="PATH",
+        help=(
+            "capture frames to PATH: a directory for png, a file or '-' for raw "
+            "(set PYGAME_HIDE_SUPPORT_PROMPT=1 when streaming to stdout)"
+        ),
+    )
+    parser.add_argument(
+        "--capture-every",
+        type=int,
+        default=1,
+        metavar="K",
+        help="capture one frame every K simulation steps (default: 1)",
+    )
+    parser.add_argument(
+        "--capture-format",
+        choices=CAPTURE_FORMATS,
+        default="png",
+        help="png image sequence or raw RGB24 stream (default: png)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=int,
+        metavar="N",
+        help="profile the first N frames with cProfile (press F9 to profile later frames)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="record the positions and velocities of every boid to a trajectory file",
+    )
+    parser.add_argument(
+        "--record-every",
+        type=int,
+        default=1,
+        metavar="K",
+        help="record one simulation step out of every K (default: 1)",
+    )
+    parser.add_argument(
+        "--record-compression",
+        choices=COMPRESSIONS,
+        help="write the recording as quantized, delta-encoded chunks compressed with zlib or lzma",
+    )
+    parser.add_argument(
+        "--record-keyframe-every",
+        type=int,
+        default=64,
+        metavar="K",
+        help="recorded steps per compressed chunk, each starting with a keyframe (default: 64)",
+    )
+    parser.add_argument(
+        "--record-error",
+        type=float,
+        metavar="E",
+        help="largest position error of a compressed recording, in pixels "
+        "(default: the finest 16 bits allow)",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="play back a trajectory file recorded with --record instead of simulating",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        metavar="X",
+        help="recorded steps shown per frame during replay (default: 1)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="PATH",
+        help="resume from a game state file saved with --checkpoint",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        help="in headless mode, save the game state to PATH periodically and at the end",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=1000,
+        metavar="K",
+        help="save a checkpoint every K simulation steps (default: 1000)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="seed for the initial flock, so runs with the same seed start identically",
+    )
+    return parser.parse_args(argv)
+
+
+def run_headless(
+    game: Game, steps: int, checkpoint: str | None = None, checkpoint_every: int = 1000
+) -> None:
+    """Advance the simulation without a window.
+
+    Frames are rendered to an offscreen surface, and only on the steps that
+    ``game.capture`` wants, so a headless run without capture never renders.
+    With ``checkpoint`` set, the game state is saved there every
+    ``checkpoint_every`` steps and once more at the end, and a trajectory
+    being recorded is flushed with it, so a killed run leaves a readable
+    recording up to its last checkpoint.
+    """
+    surface = pg.Surface(game.screen_opts.winsize)
+    for _ in range(steps):
+        game.performance.start_frame()
+        game.run_logic()
+        if game.capture is not None and game.capture.should_capture(game.steps):
+            game.display_frame(surface, flip=False)
+        if checkpoint is not None and game.steps % checkpoint_every == 0:
+            _save_checkpoint(game, checkpoint)
+        game.end_frame()
+    if checkpoint is not None:
+        _save_checkpoint(game, checkpoint)
+
+
+def _save_checkpoint(game: Game, path: str) -> None:
+    game.save_state(path)
+    if game.recorder is not None:
+        game.recorder.flush()
+
+
+def _close_capture(capture: FrameCapture | None) -> None:
+    """Close the capture and warn on stderr if any frame was dropped."""
+    if capture is None:
+        return
+    capture.close()
+    if capture.frames_dropped:
+        print(
+            f"warning: dropped {capture.frames_dropped} captured frame(s) because the "
+            "writer fell behind; the capture is missing those steps",
+            file=sys.stderr,
+        )
+
+
+def _make_recorder(args: argparse.Namespace) -> TrajectoryRecorder:
+    codec = None
+    if args.record_compression is not None:
+        codec = TrajectoryCodec(
+            keyframe_every=args.record_keyframe_every,
+            compression=args.record_compression,
+            position_error=args.record_error,
+        )
+    return TrajectoryRecorder(args.record, every=args.record_every, codec=codec)
+
+
+def run_replay(path: str, speed: float, capture: FrameCapture | None, headless: bool) -> None:
+    """Play back a recorded trajectory.
+
+    In a window the recording plays until it is closed, with the replay keys
+    for pausing, stepping, seeking and speed. Headless, every recorded step
+    is rendered once offscreen, which is only useful with ``capture``.
+    """
+    trajectory = open_trajectory(path)
+    if headless:
+        surface = pg.Surface(trajectory.winsize)
+        player = ReplayPlayer(trajectory, show_metrics=False)
+        player.capture = capture
+        for index in range(len(trajectory)):
+            player.seek(index)
+            player.display_frame(surface, flip=False)
+        return
+
+    screen = pg.display.set_mode(trajectory.winsize)
+    pg.display.set_caption(f"My Boids - {path}")
+    player = ReplayPlayer(trajectory, speed=speed)
+    player.capture = capture
+    clock = pg.time.Clock()
+    done = False
+    while not done:
+        clock.tick(50)
+        player.performance.start_frame()
+        done = player.process_events()
+        player.display_frame(screen)
+        player.advance()
+
+
+def main(argv: list[str] | None = None):
     """Main program function."""
+    args = _parse_args(argv)
+
+    capture: FrameCapture | None = None
+    if args.capture is not None:
+        capture = FrameCapture(args.capture, every=args.capture_every, fmt=args.capture_format)
+
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
     # Initialize Pygame and set up the window
     pg.init()
 
+    if args.replay is not None:
+        if args.headless:
+            # A display mode is still needed to convert the predator image
+            pg.display.set_mode((1, 1))
+        if capture is not None:
+            capture.start()
+        run_replay(args.replay, args.replay_speed, capture, args.headless)
+        _close_capture(capture)
+        pg.quit()
+        return
+
     screen_opts = ScreenOptions.from_config()
+    performance_opts = PerformanceOptions.from_config()
+
+    if args.headless:
+        # A display mode is still needed to convert sprite images
+        pg.display.set_mode(screen_opts.winsize)
+        game = Game(screen_opts=screen_opts, performance_opts=performance_opts, seed=args.seed)
+        if args.resume is not None:
+            game.load_state(args.resume)
+        game.capture = capture
+        if capture is not None:
+            capture.start()
+        if args.profile is not None:
+            game.start_profiling(args.profile)
+        if args.record is not None:
+            game.start_recording(_make_recorder(args))
+        run_headless(game, args.steps, args.checkpoint, args.checkpoint_every)
+        game.stop_recording()
+        _close_capture(capture)
+        if game.performance.trace is not None:
+            game.performance.trace.close()
+        if game.analytics is not None:
+            game.analytics.close()
+        if game.performance.watchdog is not None:
+            game.performance.watchdog.close()
+        game.profiler.stop()
+        game.gc_scheduler.restore()
+        pg.quit()
+        return
 
     if screen_opts.fullscreen:
         screen = pg.display.set_mode((0, 0), pg.FULLSCREEN)
@@ -50,7 +301,16 @@ def main():
     )
 
     # Create an instance of the Game class
-    game = Game(screen_opts=screen_opts)
+    game = Game(screen_opts=screen_opts, performance_opts=performance_opts, seed=args.seed)
+    if args.resume is not None:
+        game.load_state(args.resume)
+    game.capture = capture
+    if capture is not None:
+        capture.start()
+    if args.profile is not None:
+        game.start_profiling(args.profile)
+    if args.record is not None:
+        game.start_recording(_make_recorder(args))
 
     # Create the settings dialog (built lazily when first opened)
     settings_dialog = SettingsDialog(
@@ -59,6 +319,20 @@ def main():
         game=game,
     )
 
+    # In pipelined mode the simulation steps on a worker thread while this
+    # thread renders the latest finished step and runs the UI
+    sim_thread: SimulationThread | None = None
+    if performance_opts.pipelined:
+        sim_thread = SimulationThread(
+            step=game.run_logic,
+            snapshot=game.snapshot,
+            handoff=game.performance.hand_off_thread_spans,
+        )
+        if game.performance.watchdog is not None:
+            # Capture the state going into a frame between steps
+            game.performance.watchdog.lock = sim_thread.lock
+        sim_thread.start()
+
     done = False
     clock = pg.time.Clock()
 
@@ -72,46 +346,95 @@ def main():
         # Collect events once so both the UI layer and game receive them
         events = pg.event.get()
 
-        for event in events:
-            # Let pygame_gui handle its own events first
-            ui_manager.process_events(event)
-
-            # Settings button opens the dialog
-            if (
-                event.type == pygame_gui.UI_BUTTON_PRESSED
-                and event.ui_element is settings_btn
-                and not settings_dialog.is_open()
-            ):
-                settings_dialog.open(screen.get_size())
-
-            # Forward all events to the dialog (it ignores them when closed)
-            settings_dialog.handle_event(event)
-
-        # Only forward game events when the settings dialog is closed
-        if settings_dialog.is_open():
-            # Still honour QUIT / ESC so the app can always be exited
-            for event in events:
-                if event.type == pg.QUIT or (event.type == pg.KEYUP and event.key == pg.K_ESCAPE):
-                    done = True
-        else:
-            done = game.process_events(events)
+        if sim_thread is None:
+            with game.performance.span("events"):
+                done = _handle_events(
+                    events, game, ui_manager, settings_btn, settings_dialog, screen
+                )
 
-        # Update object positions, check for collisions
-        game.run_logic()
+            # Update object positions, check for collisions
+            game.run_logic()
 
-        # Draw game frame - defer the display flip so the UI renders on top
-        game.display_frame(screen, flip=False)
+            # Draw game frame - defer the display flip so the UI renders on top
+            game.display_frame(screen, flip=False)
+        else:
+            # Event handlers mutate simulation state, so exclude the worker
+            with game.performance.span("events"), sim_thread.lock:
+                done = _handle_events(
+                    events, game, ui_manager, settings_btn, settings_dialog, screen
+                )
+
+            # Grab the latest finished step, then let the worker compute the
+            # next one while this frame is drawn
+            snapshot = sim_thread.buffer.latest()
+            sim_thread.request_step()
+            game.display_frame(screen, flip=False, snapshot=snapshot)
 
         # Draw pygame_gui elements on top of the game frame
-        ui_manager.update(time_delta)
-        ui_manager.draw_ui(screen)
+        with game.performance.span("ui"):
+            ui_manager.update(time_delta)
+            ui_manager.draw_ui(screen)
 
         # Single flip for the final composited frame
-        pg.display.flip()
+        with game.performance.span("flip"):
+            pg.display.flip()
+
+        game.end_frame()
+
+    if sim_thread is not None:
+        sim_thread.stop()
+    game.stop_recording()
+    _close_capture(capture)
+    if game.performance.trace is not None:
+        game.performance.trace.close()
+    if game.analytics is not None:
+        game.analytics.close()
+    if game.performance.watchdog is not None:
+        game.performance.watchdog.close()
+    game.profiler.stop()
+    game.gc_scheduler.restore()
 
     # Close window and exit
     pg.quit()
 
 
+def _handle_events(
+    events: list[pg.event.Event],
+    game: Game,
+    ui_manager: pygame_gui.UIManager,
+    settings_btn: UIButton,
+    settings_dialog: SettingsDialog,
+    screen: pg.Surface,
+) -> bool:
+    """Dispatch one frame's events to the UI, dialog and game.
+
+    Returns:
+        bool: True when the application should exit.
+    """
+    for event in events:
+        # Let pygame_gui handle its own events first
+        ui_manager.process_events(event)
+
+        # Settings button opens the dialog
+        if (
+            event.type == pygame_gui.UI_BUTTON_PRESSED
+            and event.ui_element is settings_btn
+            and not settings_dialog.is_open()
+        ):
+            settings_dialog.open(screen.get_size())
+
+        # Forward all events to the dialog (it ignores them when closed)
+        settings_dialog.handle_event(event)
+
+    # Only forward game events when the settings dialog is closed
+    if settings_dialog.is_open():
+        # Still honour QUIT / ESC so the app can always be exited
+        return any(
+            event.type == pg.QUIT or (event.type == pg.KEYUP and event.key == pg.K_ESCAPE)
+            for event in events
+        )
+    return game.process_events(events)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,171 @@
+"""Frame capture to a PNG sequence or a raw RGB video stream.
+
+Frames are copied out of the render surface on the calling thread, which is
+a single memcpy, and handed to a background writer through a bounded queue.
+Encoding and disk or pipe I/O happen on the writer thread, so a slow disk
+drops frames instead of stalling the simulation. A write that fails stops
+the writing but not the draining, so the simulation never blocks on a dead
+writer, and the error is raised again by :meth:`FrameCapture.close`.
+"""
+
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import BinaryIO, Literal
+
+import pygame as pg
+
+CaptureFormat = Literal["png", "raw"]
+CAPTURE_FORMAT_PNG: CaptureFormat = "png"
+CAPTURE_FORMAT_RAW: CaptureFormat = "raw"
+CAPTURE_FORMATS: tuple[CaptureFormat, CaptureFormat] = (CAPTURE_FORMAT_PNG, CAPTURE_FORMAT_RAW)
+
+_Frame = tuple[int, tuple[int, int], bytes]
+
+
+class FrameCapture:
+    """Capture every k-th rendered frame through a background writer thread.
+
+    In ``png`` mode ``output`` is a directory that receives
+    ``frame_000000.png``, ``frame_000001.png``, ... named by simulation step.
+    In ``raw`` mode frames are appended as packed RGB24 bytes to ``output``,
+    which may be a file path, ``"-"`` for stdout, or an open binary stream such
+    as the stdin of an encoder subprocess (e.g. ``ffmpeg -f rawvideo
+    -pix_fmt rgb24 -s WxH -i -``).
+
+    Attributes:
+        every (int): Capture one frame out of this many simulation steps.
+        fmt (CaptureFormat): Output format, ``"png"`` or ``"raw"``.
+        frames_written (int): Frames fully written by the writer thread.
+        frames_dropped (int): Frames discarded because the queue was full or
+            the writer had failed.
+        error (Exception | None): The first error the writer thread hit, or
+            None. Once set, no more frames are written.
+    """
+
+    def __init__(
+        self,
+        output: str | Path | BinaryIO,
+        every: int = 1,
+        fmt: CaptureFormat = CAPTURE_FORMAT_PNG,
+        max_queued: int = 8,
+    ):
+        """Initialize the frame capture.
+
+        Args:
+            output (str | Path | BinaryIO): Directory for PNG frames, or the
+                destination of the raw stream.
+            every (int): Capture interval in simulation steps. Defaults to 1.
+            fmt (CaptureFormat): ``"png"`` or ``"raw"``. Defaults to ``"png"``.
+            max_queued (int): Frames that may wait for the writer before new
+                frames are dropped. Defaults to 8.
+        """
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        if fmt not in CAPTURE_FORMATS:
+            raise ValueError(f"fmt must be one of {CAPTURE_FORMATS}")
+        if fmt == CAPTURE_FORMAT_PNG and not isinstance(output, str | Path):
+            raise ValueError("png capture needs a directory path")
+
+        self.every = every
+        self.fmt = fmt
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.error: Exception | None = None
+        self._output = output
+        self._queue: queue.Queue[_Frame | None] = queue.Queue(maxsize=max_queued)
+        self._writer: threading.Thread | None = None
+        self._stream: BinaryIO | None = None
+        self._owns_stream = False
+
+    def start(self) -> None:
+        """Open the output and start the writer thread."""
+        if self._writer is not None:
+            return
+        if self.fmt == CAPTURE_FORMAT_PNG:
+            assert isinstance(self._output, str | Path)
+            Path(self._output).mkdir(parents=True, exist_ok=True)
+        elif self._output == "-":
+            self._stream = sys.stdout.buffer
+        elif isinstance(self._output, str | Path):
+            self._stream = open(self._output, "wb")  # noqa: SIM115
+            self._owns_stream = True
+        else:
+            self._stream = self._output
+
+        self._writer = threading.Thread(
+            target=self._write_frames, name="boids-capture", daemon=True
+        )
+        self._writer.start()
+
+    def should_capture(self, step: int) -> bool:
+        """Whether the frame for ``step`` is due for capture."""
+        return step % self.every == 0
+
+    def submit(self, surface: pg.Surface, step: int) -> bool:
+        """Queue a copy of ``surface`` for writing without blocking.
+
+        Args:
+            surface (pg.Surface): The rendered frame.
+            step (int): Simulation step the frame belongs to.
+
+        Returns:
+            bool: True if the frame was queued, False if it was dropped.
+        """
+        if self.error is not None:
+            self.frames_dropped += 1
+            return False
+        frame = (step, surface.get_size(), pg.image.tobytes(surface, "RGB"))
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            self.frames_dropped += 1
+            return False
+        return True
+
+    def close(self) -> None:
+        """Flush queued frames, stop the writer thread and close the output.
+
+        Raises:
+            Exception: The error that stopped the writer thread, if any.
+        """
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        if self._stream is not None:
+            try:
+                if self.error is None:
+                    self._stream.flush()
+            finally:
+                if self._owns_stream:
+                    self._stream.close()
+                self._stream = None
+        if self.error is not None:
+            raise self.error
+
+    def _write_frames(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                return
+            if self.error is not None:
+                # Keep draining so that submit and close never wait on a dead writer
+                continue
+            try:
+                self._write_frame(*frame)
+            except Exception as error:
+                self.error = error
+            else:
+                self.frames_written += 1
+
+    def _write_frame(self, step: int, size: tuple[int, int], data: bytes) -> None:
+        if self.fmt == CAPTURE_FORMAT_PNG:
+            assert isinstance(self._output, str | Path)
+            path = Path(self._output) / f"frame_{step:06d}.png"
+            pg.image.save(pg.image.frombytes(data, size, "RGB"), str(path))
+        else:
+            assert self._stream is not None
+            self._stream.write(data)
@@ -0,0 +1,228 @@
+"""Detection of separate sub-flocks (clusters) within the visual range.
+
+Two boids belong to the same cluster when a chain of boids connects them in
+which each is within ``radius`` of the next, so clusters are the connected
+components of the visual-range neighbor graph.
+
+The components are found without listing every neighbor pair. Like the
+:class:`~my_boids.spatial_grid.SpatialGrid`, the points are hashed into
+square cells, but a third of the radius wide and held as index arrays:
+
+- all points of one cell, and of two cells whose farthest corners are within
+  the radius, are neighbors of each other, so such cells are joined without
+  any distance check
+- cells that are too far apart for any pair to be within the radius are
+  never compared
+- only the cells in between are checked point by point, and only while they
+  are not already joined
+
+Cells are joined with a union-find over index arrays: every round hooks the
+larger root of each pair onto the smaller one and then flattens the trees by
+pointer jumping, so the work is a few numpy passes per round.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Cells per radius. Points in the same or adjacent cells are always within
+# the radius of each other
+_CELLS_PER_RADIUS = 3
+# Point pairs distance-checked at a time
+_PAIRS_PER_BATCH = 2**22
+
+
+def _neighbor_offsets() -> list[tuple[int, int, bool]]:
+    """Cell offsets ``(dx, dy, always_within)`` that can hold points within the radius.
+
+    Only one of every pair of opposite offsets is listed, since joining is
+    symmetric, and the offsets that always join come first.
+    """
+    reach = _CELLS_PER_RADIUS + 1
+    limit = _CELLS_PER_RADIUS**2
+    offsets = []
+    for dy in range(reach + 1):
+        for dx in range(-reach, reach + 1):
+            if dy == 0 and dx <= 0:
+                continue
+            gap_x, gap_y = max(abs(dx) - 1, 0), max(abs(dy) - 1, 0)
+            if gap_x**2 + gap_y**2 > limit:
+                continue
+            always_within = (abs(dx) + 1) ** 2 + (abs(dy) + 1) ** 2 <= limit
+            offsets.append((dx, dy, always_within))
+    offsets.sort(key=lambda offset: not offset[2])
+    return offsets
+
+
+_OFFSETS = _neighbor_offsets()
+
+
+@dataclass(frozen=True)
+class Clusters:
+    """Clusters of a flock, numbered from the largest.
+
+    Attributes:
+        labels: Cluster of every boid, as an (n,) int64 array, in the order
+            the positions were given.
+        sizes: Boids in every cluster, as a (count,) int64 array in
+            decreasing order.
+    """
+
+    labels: np.ndarray
+    sizes: np.ndarray
+
+    @property
+    def count(self) -> int:
+        """Number of clusters."""
+        return len(self.sizes)
+
+    @property
+    def largest(self) -> int:
+        """Size of the largest cluster, or 0 without boids."""
+        return int(self.sizes[0]) if len(self.sizes) else 0
+
+    @property
+    def singletons(self) -> int:
+        """Number of boids with no other boid within reach."""
+        return int(np.count_nonzero(self.sizes == 1))
+
+    def centroids(self, positions: np.ndarray) -> np.ndarray:
+        """Mean position of every cluster.
+
+        Args:
+            positions (np.ndarray): The (n, 2) positions the clusters were
+                found from.
+
+        Returns:
+            np.ndarray: (count, 2) centroids.
+        """
+        sums = np.stack(
+            [
+                np.bincount(self.labels, weights=positions[:, axis], minlength=self.count)
+                for axis in (0, 1)
+            ],
+            axis=1,
+        )
+        centroids: np.ndarray = sums / self.sizes[:, None]
+        return centroids
+
+
+def _flatten(parent: np.ndarray) -> None:
+    """Point every node straight at its root."""
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            return
+        parent[:] = grandparent
+
+
+def _join(parent: np.ndarray, first: np.ndarray, second: np.ndarray) -> None:
+    """Join the sets of every ``first[i]`` and ``second[i]``, leaving ``parent`` flat."""
+    while len(first):
+        first_roots, second_roots = parent[first], parent[second]
+        apart = first_roots != second_roots
+        if not apart.any():
+            return
+        first, second = first[apart], second[apart]
+        first_roots, second_roots = first_roots[apart], second_roots[apart]
+        # Roots only ever point to smaller roots, so no cycles form
+        np.minimum.at(
+            parent,
+            np.maximum(first_roots, second_roots),
+            np.minimum(first_roots, second_roots),
+        )
+        _flatten(parent)
+
+
+def _cells_within(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    order: np.ndarray,
+    starts: np.ndarray,
+    counts: np.ndarray,
+    first: np.ndarray,
+    second: np.ndarray,
+    radius: float,
+) -> np.ndarray:
+    """Whether any point of cell ``first[i]`` is within ``radius`` of one of ``second[i]``."""
+    within = np.zeros(len(first), dtype=bool)
+    first_counts, second_counts = counts[first], counts[second]
+    pairs = first_counts * second_counts
+    cumulative = np.cumsum(pairs)
+    begin = 0
+    while begin < len(first):
+        # Cell pairs up to about _PAIRS_PER_BATCH point pairs, at least one
+        done = cumulative[begin] - pairs[begin]
+        end = max(
+            int(np.searchsorted(cumulative, done + _PAIRS_PER_BATCH, side="right")), begin + 1
+        )
+        batch_pairs = pairs[begin:end]
+        owners = np.repeat(np.arange(begin, end), batch_pairs)
+        local = np.arange(len(owners)) - np.repeat(
+            cumulative[begin:end] - batch_pairs - done, batch_pairs
+        )
+        columns = second_counts[owners]
+        a = order[starts[first[owners]] + local // columns]
+        b = order[starts[second[owners]] + local % columns]
+        dx = xs[a] - xs[b]
+        dy = ys[a] - ys[b]
+        within[owners[dx * dx + dy * dy <= radius * radius]] = True
+        begin = end
+    return within
+
+
+def find_clusters(positions: np.ndarray, radius: float) -> Clusters:
+    """Find the clusters of boids connected by chains of neighbors within ``radius``.
+
+    Args:
+        positions (np.ndarray): Boid positions as an (n, 2) array.
+        radius (float): Neighbor distance, usually the visual range.
+
+    Returns:
+        Clusters: The cluster of every boid and the cluster sizes.
+
+    Raises:
+        ValueError: If ``radius`` is not positive.
+    """
+    if radius <= 0:
+        raise ValueError("radius must be positive")
+    points = np.asarray(positions, dtype=np.float64)
+    if len(points) == 0:
+        return Clusters(labels=np.zeros(0, dtype=np.int64), sizes=np.zeros(0, dtype=np.int64))
+    xs = np.ascontiguousarray(points[:, 0])
+    ys = np.ascontiguousarray(points[:, 1])
+
+    reach = _CELLS_PER_RADIUS + 1
+    cells = np.floor((points - points.min(axis=0)) / (radius / _CELLS_PER_RADIUS))
+    cells = cells.astype(np.int64) + reach
+    # Empty columns on both sides, so neighboring keys never wrap rows
+    width = int(cells[:, 0].max()) + reach + 1
+    cell_keys, point_cells = np.unique(cells[:, 1] * width + cells[:, 0], return_inverse=True)
+    occupied = len(cell_keys)
+    order = np.argsort(point_cells, kind="stable")
+    counts = np.bincount(point_cells, minlength=occupied)
+    starts = np.cumsum(counts) - counts
+
+    parent = np.arange(occupied)
+    everything = np.arange(occupied)
+    for dx, dy, always_within in _OFFSETS:
+        target = cell_keys + dy * width + dx
+        neighbors = np.minimum(np.searchsorted(cell_keys, target), occupied - 1)
+        found = cell_keys[neighbors] == target
+        first, second = everything[found], neighbors[found]
+        if not always_within:
+            apart = parent[first] != parent[second]
+            first, second = first[apart], second[apart]
+            within = _cells_within(xs, ys, order, starts, counts, first, second, radius)
+            first, second = first[within], second[within]
+        _join(parent, first, second)
+
+    roots, point_roots, sizes = np.unique(
+        parent[point_cells], return_inverse=True, return_counts=True
+    )
+    by_size = np.argsort(-sizes, kind="stable")
+    renumber = np.empty(len(roots), dtype=np.int64)
+    renumber[by_size] = np.arange(len(roots))
+    return Clusters(labels=renumber[point_roots], sizes=sizes[by_size].astype(np.int64))
@@ -1,11 +1,26 @@
+import time
 from collections.abc import Callable
+from dataclasses import asdict
+from itertools import chain
+from pathlib import Path
+from typing import Any
 
 import numpy as np
 import pygame as pg
 
+from my_boids.analytics import FlockAnalytics, FlockMetrics, MetricsFileSink
 from my_boids.boid_vs_boundary import boid_vs_boundary
 from my_boids.boids import Boid
-from my_boids.flock_rules import flock_rules, react_to_predator
+from my_boids.capture import FrameCapture
+from my_boids.clusters import Clusters, find_clusters
+from my_boids.flock_rules import (
+    avoid_other_boids,
+    cohesion,
+    flock_rules,
+    match_velocity,
+    react_to_predator,
+)
+from my_boids.heatmap import density_histogram, grid_density_histogram, render_density
 from my_boids.hud import (
     draw_frame,
     draw_game_over,
@@ -14,29 +29,66 @@ from my_boids.hud import (
     draw_predator_mode,
     draw_score,
 )
+from my_boids.memory import AllocationSampler, GCMonitor, GCScheduler
 from my_boids.options import (
     PREDATOR_ATTACK_MODE_CENTER,
+    PREDATOR_ATTACK_MODE_CLUSTER,
     PREDATOR_ATTACK_MODE_ISOLATED,
     PREDATOR_ATTACK_MODE_MOUSE,
     PREDATOR_ATTACK_MODE_NEAREST,
     PREDATOR_MODE_ATTRACT,
     PREDATOR_MODE_AVOID,
     BoidOptions,
+    PerformanceOptions,
     PredatorAttackMode,
     PredatorOptions,
     ScreenOptions,
 )
 from my_boids.performance import PerformanceMonitor
+from my_boids.pipeline import FrameSnapshot
 from my_boids.predator import Predator
 from my_boids.predator_targeting import (
     target_flock_center,
     target_most_isolated_bird,
     target_mouse_cursor,
     target_nearest_bird,
+    target_nearest_cluster,
+)
+from my_boids.profiler import ProfileCapture
+from my_boids.recording import TrajectoryRecorder
+from my_boids.spatial_grid import GridQueryStats, SpatialGrid
+from my_boids.state import GameState, load_game_state, save_game_state
+from my_boids.tracing import TraceRecorder
+from my_boids.watchdog import FrameWatchdog, SlowFrame, SlowFrameState
+
+# Stages of the per-boid rules, in the order they run, as timed by the
+# detailed rule breakdown
+RULE_STAGES = (
+    "neighbors",
+    "cohesion",
+    "separation",
+    "alignment",
+    "predator",
+    "speed_limit",
+    "boundary",
+)
+# Stages that compare the boid against every neighbor
+PAIRWISE_RULE_STAGES = ("cohesion", "separation", "alignment")
+# Boid colors of the cluster color mode, cycled from the largest cluster down
+CLUSTER_COLORS = (
+    (230, 25, 75),
+    (60, 180, 75),
+    (255, 225, 25),
+    (67, 99, 216),
+    (245, 130, 49),
+    (145, 30, 180),
+    (66, 212, 244),
+    (240, 50, 230),
+    (191, 239, 69),
+    (250, 190, 212),
+    (70, 153, 144),
+    (220, 190, 255),
 )
-from my_boids.spatial_grid import SpatialGrid
-
-rng = np.random.default_rng()
 
 
 class Game:
@@ -47,29 +99,104 @@ class Game:
         screen_opts: ScreenOptions | None = None,
         boid_opts: BoidOptions | None = None,
         predator_opts: PredatorOptions | None = None,
+        performance_opts: PerformanceOptions | None = None,
         use_spatial_grid: bool = False,
         show_metrics: bool = True,
         enable_profiling: bool = True,
+        seed: int | None = None,
     ):
+        """Initialize the game and create the flock.
+
+        Args:
+            screen_opts (ScreenOptions | None): Screen options. Defaults to config.ini.
+            boid_opts (BoidOptions | None): Boid options. Defaults to config.ini.
+            predator_opts (PredatorOptions | None): Predator options. Defaults to config.ini.
+            performance_opts (PerformanceOptions | None): Performance options.
+                Defaults to config.ini.
+            use_spatial_grid (bool): Use the spatial grid for neighbor search.
+                Defaults to False.
+            show_metrics (bool): Draw the performance metrics. Defaults to True.
+            enable_profiling (bool): Collect performance metrics. Defaults to True.
+            seed (int | None): Seed for the random boid positions, velocities and
+                colors, so runs with the same seed start from the same flock.
+                Defaults to None, a different flock every run.
+        """
         self.screen_opts = screen_opts if screen_opts else ScreenOptions.from_config()
         self.boid_opts = boid_opts if boid_opts else BoidOptions.from_config()
         self.predator_opts = predator_opts if predator_opts else PredatorOptions.from_config()
+        self.performance_opts = (
+            performance_opts if performance_opts else PerformanceOptions.from_config()
+        )
         self.use_spatial_grid = use_spatial_grid
         self.show_metrics = show_metrics
+        self.rng = np.random.default_rng(seed)
 
         self.score = 0
         self.game_over = False
+        self.steps = 0
 
         self.boid_list: pg.sprite.Group[Boid] = pg.sprite.Group()
         self.all_sprites_list: pg.sprite.Group = pg.sprite.Group()
 
         self.spatial_grid: SpatialGrid | None
+        self.grid_stats: GridQueryStats | None = None
         if self.use_spatial_grid:
             self.spatial_grid = SpatialGrid(cell_size=float(self.boid_opts.visual_range))
         else:
             self.spatial_grid = None
 
         self.performance = PerformanceMonitor(enabled=enable_profiling)
+        if self.performance_opts.trace_events:
+            self.performance.trace = TraceRecorder(
+                capacity=self.performance_opts.trace_capacity,
+                stream_path=self.performance_opts.trace_stream_path or None,
+            )
+        if self.performance_opts.track_gc:
+            self.performance.gc_monitor = GCMonitor().install()
+        if self.performance_opts.alloc_sample_every:
+            self.performance.allocations = AllocationSampler(
+                self.performance_opts.alloc_sample_every
+            )
+        if self.performance_opts.watchdog_budget_ms > 0:
+            self.performance.watchdog = FrameWatchdog(
+                budget=self.performance_opts.watchdog_budget_ms / 1000,
+                output_dir=self.performance_opts.watchdog_dir,
+                state=self.slow_frame_state,
+                min_interval=self.performance_opts.watchdog_min_interval,
+                keep=self.performance_opts.watchdog_keep,
+            )
+        self.gc_scheduler = GCScheduler()
+        if self.performance_opts.gc_freeze:
+            self.gc_scheduler.defer_full_collections()
+        self.capture: FrameCapture | None = None
+        self._last_captured_step: int | None = None
+        self.recorder: TrajectoryRecorder | None = None
+        self.analytics: FlockAnalytics | None = None
+        if self.performance_opts.analytics_every:
+            self.analytics = FlockAnalytics(
+                every=self.performance_opts.analytics_every,
+                sink=(
+                    MetricsFileSink(self.performance_opts.analytics_path)
+                    if self.performance_opts.analytics_path
+                    else None
+                ),
+                show_in_hud=self.performance_opts.analytics_hud,
+            )
+        # Clusters of the current step, keyed by step and flock size
+        self._clusters: Clusters | None = None
+        self._clusters_key: tuple[int, int] | None = None
+        # Own images of the boids drawn in cluster colors, to restore them
+        self._boid_images: dict[Boid, pg.Surface | None] = {}
+        self._cluster_images: dict[tuple[int, int], pg.Surface] = {}
+        # Fields of every options section the options were last dumped from,
+        # and the dump
+        self._options_fields: list[dict[str, Any]] = []
+        self._options_dump: dict[str, dict] = {}
+        self.profiler = ProfileCapture(
+            output_dir=self.performance_opts.profile_dir,
+            frames=self.performance_opts.profile_frames,
+            top_n=self.performance_opts.profile_top_n,
+        )
 
         self._initialize_sprites()
         self._predator_attack_mode_strategies = self._build_predator_attack_mode_strategies()
@@ -91,27 +218,33 @@ class Game:
             PREDATOR_ATTACK_MODE_ISOLATED: lambda: target_most_isolated_bird(
                 list(self.boid_list), self.predator.pos
             ),
+            PREDATOR_ATTACK_MODE_CLUSTER: lambda: target_nearest_cluster(
+                self.predator.pos,
+                self.get_boid_positions(),
+                self.find_clusters(),
+            ),
         }
 
     def _create_boid(self) -> Boid:
         screen_opts = self.screen_opts
         boid_opts = self.boid_opts
 
-        pos_array = rng.integers(0, screen_opts.winsize, size=2)
-        vel_array = rng.uniform(-boid_opts.max_speed, boid_opts.max_speed, size=2)
-        color_array = rng.integers(30, 255, 3)
-
-        boid = Boid(
-            pos=pg.Vector2(float(pos_array[0]), float(pos_array[1])),
-            vel=pg.Vector2(float(vel_array[0]), float(vel_array[1])),
-            color=pg.Color(int(color_array[0]), int(color_array[1]), int(color_array[2])),
-            size=boid_opts.size,
-            width=boid_opts.size,
-            height=boid_opts.size,
+        pos_array = self.rng.integers(0, screen_opts.winsize, size=2)
+        vel_array = self.rng.uniform(-boid_opts.max_speed, boid_opts.max_speed, size=2)
+        color_array = self.rng.integers(30, 255, 3)
+
+        boid = self._make_boid(
+            pg.Vector2(float(pos_array[0]), float(pos_array[1])),
+            pg.Vector2(float(vel_array[0]), float(vel_array[1])),
+            pg.Color(int(color_array[0]), int(color_array[1]), int(color_array[2])),
         )
         boid.speed_limit(boid_opts.max_speed)
         return boid
 
+    def _make_boid(self, pos: pg.Vector2, vel: pg.Vector2, color: pg.Color) -> Boid:
+        size = self.boid_opts.size
+        return Boid(pos=pos, vel=vel, color=color, size=size, width=size, height=size)
+
     def _create_predator(self) -> Predator:
         screen_opts = self.screen_opts
         return Predator(
@@ -128,12 +261,22 @@ class Game:
         self.predator = self._create_predator()
         self.all_sprites_list.add(self.predator)
 
+        if self.performance_opts.gc_freeze:
+            # The sprites live for the whole game, so keep them out of full collections
+            self.gc_scheduler.freeze()
+
     def reset(self) -> None:
         self.score = 0
         self.game_over = False
+        self.steps = 0
+        self._last_captured_step = None
         self.boid_list.empty()
         self.all_sprites_list.empty()
+        self._clusters = None
+        self._boid_images.clear()
         self._initialize_sprites()
+        if self.recorder is not None:
+            self.recorder.reset_slots()
 
     def process_events(self, events: list | None = None) -> bool:
         if events is None:
@@ -144,6 +287,12 @@ class Game:
                 return True
             if event.type == pg.MOUSEBUTTONDOWN and self.game_over:
                 self.reset()
+            if event.type == pg.KEYUP and event.key == pg.K_t:
+                self.dump_trace()
+            if event.type == pg.KEYUP and event.key == pg.K_F9:
+                self.start_profiling()
+            if event.type == pg.KEYUP and event.key == pg.K_c:
+                self.performance_opts.cluster_colors = not self.performance_opts.cluster_colors
             if event.type == pg.KEYUP and event.key == pg.K_p:
                 if self.predator_opts.predator_behavior_mode == PREDATOR_MODE_AVOID:
                     self.predator_opts.predator_behavior_mode = PREDATOR_MODE_ATTRACT
@@ -152,12 +301,150 @@ class Game:
 
         return False
 
+    def dump_trace(self, path: str | Path | None = None) -> Path | None:
+        """Write the recorded trace events to a Chrome trace JSON file.
+
+        Args:
+            path (str | Path | None): Destination file. Defaults to a
+                timestamped file in ``performance_opts.trace_dir``.
+
+        Returns:
+            Path | None: The written file, or None when tracing is disabled.
+        """
+        if self.performance.trace is None:
+            return None
+        if path is None:
+            timestamp = time.strftime("%Y%m%d-%H%M%S")
+            path = Path(self.performance_opts.trace_dir) / f"trace-{timestamp}.json"
+        return self.performance.trace.dump(path)
+
+    def start_profiling(self, frames: int | None = None) -> None:
+        """Profile the next ``frames`` frames with cProfile.
+
+        Results are written to ``performance_opts.profile_dir`` once the
+        capture ends. Does nothing if a capture is already running.
+
+        Args:
+            frames (int | None): Frames to profile. Defaults to
+                ``performance_opts.profile_frames``.
+        """
+        self.profiler.start(frames)
+
+    def start_recording(self, recorder: TrajectoryRecorder) -> None:
+        """Start recording the trajectory of every k-th step, beginning with this one.
+
+        The recorder gets one slot per boid up to ``boid_opts.num_boids``, or
+        the current flock if that is larger, the game options in its header,
+        and ``boid_opts.max_speed`` as its velocity limit.
+
+        Args:
+            recorder (TrajectoryRecorder): Recorder to attach. It is started here.
+        """
+        winsize = (self.screen_opts.winsize[0], self.screen_opts.winsize[1])
+        slots = max(len(self.boid_list), self.boid_opts.num_boids)
+        recorder.start(
+            slots,
+            winsize,
+            options=self._options_state(),
+            velocity_limit=self.boid_opts.max_speed,
+        )
+        self.recorder = recorder
+        self._record_step()
+
+    def stop_recording(self) -> None:
+        """Detach the recorder and close its file. Does nothing when not recording."""
+        if self.recorder is None:
+            return
+        self.recorder.close()
+        self.recorder = None
+
+    def _record_step(self) -> None:
+        recorder = self.recorder
+        if recorder is not None and recorder.should_record(self.steps):
+            with self.performance.span("record"):
+                recorder.record(self.steps, self.boid_list, self.predator, self.score)
+
+    def _analyze_step(self) -> None:
+        analytics = self.analytics
+        if analytics is not None and analytics.should_analyze(self.steps):
+            with self.performance.span("analytics"):
+                analytics.analyze(self.steps, self.get_boid_positions(), self.get_boid_velocities())
+
+    def _hud_flock_metrics(self) -> FlockMetrics | None:
+        analytics = self.analytics
+        if analytics is None or not analytics.show_in_hud:
+            return None
+        return analytics.latest
+
+    def find_clusters(self) -> Clusters:
+        """Find the sub-flocks of boids connected by neighbors within the visual range.
+
+        The result is computed once per step, in the ``clusters`` span, and
+        its labels follow the order of :meth:`get_boid_positions`.
+
+        Returns:
+            Clusters: The cluster of every live boid and the cluster sizes.
+        """
+        key = (self.steps, len(self.boid_list))
+        if self._clusters is None or self._clusters_key != key:
+            with self.performance.span("clusters"):
+                self._clusters = find_clusters(
+                    self.get_boid_positions(), float(self.boid_opts.visual_range)
+                )
+            self._clusters_key = key
+        return self._clusters
+
+    def _hud_clusters(self) -> Clusters | None:
+        if not self.performance_opts.cluster_hud or self.game_over:
+            return None
+        return self.find_clusters()
+
+    def _cluster_image(self, label: int, size: int) -> pg.Surface:
+        index = label % len(CLUSTER_COLORS)
+        image = self._cluster_images.get((index, size))
+        if image is None:
+            image = pg.Surface([size, size])
+            image.fill(pg.Color("black"))
+            image.set_colorkey(pg.Color("black"))
+            pg.draw.ellipse(image, CLUSTER_COLORS[index], [0, 0, size, size])
+            self._cluster_images[(index, size)] = image
+        return image
+
+    def _paint_clusters(self) -> None:
+        """Draw every boid in its cluster's color, or restore their own colors."""
+        if self.performance_opts.cluster_colors:
+            labels = self.find_clusters().labels.tolist()
+            for boid, label in zip(self.boid_list, labels, strict=True):
+                self._boid_images.setdefault(boid, boid.image)
+                boid.image = self._cluster_image(label, boid.size)
+            if len(self._boid_images) > len(self.boid_list):
+                # Forget the boids the predator caught, and their images
+                self._boid_images = {boid: self._boid_images[boid] for boid in self.boid_list}
+        elif self._boid_images:
+            for boid, image in self._boid_images.items():
+                boid.image = image
+            self._boid_images.clear()
+
+    def end_frame(self) -> None:
+        """Finish the frame's performance metrics and advance any profiling capture.
+
+        With ``gc_freeze`` enabled, this is also where deferred full garbage
+        collections run, after the frame has been measured.
+        """
+        self.performance.end_frame()
+        self.profiler.end_frame()
+        self.gc_scheduler.collect_if_due()
+
     def update_boid_options(self, new_opts: BoidOptions) -> None:
         old_count = len(self.boid_list)
         old_size = self.boid_opts.size
         self.boid_opts = new_opts
+        # The visual range may have changed
+        self._clusters = None
 
         if new_opts.size != old_size:
+            # Resized boids get their own colors back until the next cluster repaint
+            self._boid_images.clear()
             for boid in self.boid_list:
                 size = new_opts.size
                 boid.size = size
@@ -186,23 +473,258 @@ class Game:
 
     def run_logic(self):
         if not self.game_over:
-            self.performance.start_operation()
-            self._update_sprites()
-            self.performance.end_operation("update")
+            with self.performance.span("update"):
+                self._update_sprites()
 
-            self.performance.start_operation()
-            self._apply_all_boid_rules()
-            self.performance.end_operation("logic")
+            with self.performance.span("logic"):
+                self._apply_all_boid_rules()
 
-            self.performance.start_operation()
-            self._handle_predator_collisions()
-            self.performance.end_operation("collision")
+            with self.performance.span("collision"):
+                self._handle_predator_collisions()
 
             self._check_game_over()
+            self.steps += 1
+            self._record_step()
+            self._analyze_step()
+
+    def get_boid_positions(self) -> np.ndarray:
+        """Return the positions of all live boids as an (n, 2) array."""
+        count = len(self.boid_list)
+        flat = np.fromiter(
+            chain.from_iterable(boid.pos for boid in self.boid_list),
+            dtype=np.float64,
+            count=2 * count,
+        )
+        return flat.reshape(count, 2)
+
+    def get_boid_velocities(self) -> np.ndarray:
+        """Return the velocities of all live boids as an (n, 2) array."""
+        count = len(self.boid_list)
+        flat = np.fromiter(
+            chain.from_iterable(boid.vel for boid in self.boid_list),
+            dtype=np.float64,
+            count=2 * count,
+        )
+        return flat.reshape(count, 2)
+
+    def slow_frame_state(self) -> SlowFrameState:
+        """Capture the state that the frame watchdog writes for a slow frame."""
+        return SlowFrameState(
+            step=self.steps,
+            positions=self.get_boid_positions(),
+            velocities=self.get_boid_velocities(),
+            predator_pos=(self.predator.pos.x, self.predator.pos.y),
+            options=self._options_state(),
+            grid_stats=asdict(self.grid_stats) if self.grid_stats is not None else None,
+        )
+
+    def _options_state(self) -> dict[str, dict]:
+        """The game's options as JSON-compatible dicts, one per options section.
+
+        The options are dumped again only when one of them changed since the
+        last call, so the result is shared and must not be modified.
+        """
+        sections = (self.screen_opts, self.boid_opts, self.predator_opts, self.performance_opts)
+        fields = [dict(vars(options)) for options in sections]
+        fields.append({"use_spatial_grid": self.use_spatial_grid})
+        if fields != self._options_fields:
+            self._options_fields = fields
+            self._options_dump = {
+                "screen": self.screen_opts.model_dump(mode="json"),
+                "boid": self.boid_opts.model_dump(mode="json"),
+                "predator": self.predator_opts.model_dump(mode="json"),
+                "performance": self.performance_opts.model_dump(mode="json"),
+                "game": {"use_spatial_grid": self.use_spatial_grid},
+            }
+        return self._options_dump
+
+    def restore_slow_frame(self, slow_frame: SlowFrame) -> None:
+        """Replace the flock and predator with those of a watchdog snapshot.
+
+        The game's options are left unchanged; build the game from
+        ``slow_frame.state.options`` to replay the frame exactly.
+
+        Args:
+            slow_frame (SlowFrame): Snapshot from :func:`load_slow_frame`.
+        """
+        state = slow_frame.state
+        self._clusters = None
+        self._boid_images.clear()
+        self.boid_list.empty()
+        self.all_sprites_list.empty()
+        for pos, vel in zip(state.positions, state.velocities, strict=True):
+            boid = self._create_boid()
+            boid.pos = pg.Vector2(float(pos[0]), float(pos[1]))
+            boid.vel = pg.Vector2(float(vel[0]), float(vel[1]))
+            boid.rect.center = (round(boid.pos.x), round(boid.pos.y))
+            self.boid_list.add(boid)
+            self.all_sprites_list.add(boid)
+        self.predator.pos = pg.Vector2(state.predator_pos)
+        self.all_sprites_list.add(self.predator)
+        self.steps = state.step
+        self.game_over = False
+        if self.recorder is not None:
+            self.recorder.reset_slots()
+
+    def get_boid_colors(self) -> np.ndarray:
+        """Return the RGB colors of all live boids as an (n, 3) uint8 array."""
+        count = len(self.boid_list)
+        flat = np.fromiter(
+            chain.from_iterable(
+                (boid.color.r, boid.color.g, boid.color.b) for boid in self.boid_list
+            ),
+            dtype=np.uint8,
+            count=3 * count,
+        )
+        return flat.reshape(count, 3)
+
+    def capture_state(self) -> GameState:
+        """Capture everything needed to resume the game exactly from this step."""
+        return GameState(
+            step=self.steps,
+            score=self.score,
+            game_over=self.game_over,
+            positions=self.get_boid_positions(),
+            velocities=self.get_boid_velocities(),
+            colors=self.get_boid_colors(),
+            predator_pos=(self.predator.pos.x, self.predator.pos.y),
+            predator_vel=(self.predator.vel.x, self.predator.vel.y),
+            predator_angle=self.predator.angle,
+            options=self._options_state(),
+            rng_state=dict(self.rng.bit_generator.state),
+        )
+
+    def save_state(self, path: str | Path) -> Path:
+        """Checkpoint the game to a state file, replacing it atomically.
+
+        Args:
+            path (str | Path): Destination file. Parent directories are created.
+
+        Returns:
+            Path: The written file.
+        """
+        with self.performance.span("save_state"):
+            return save_game_state(self.capture_state(), path)
+
+    def load_state(self, path: str | Path) -> None:
+        """Resume from a state file written by :meth:`save_state`.
+
+        See :meth:`restore_state` for what is restored.
+
+        Args:
+            path (str | Path): State file.
+        """
+        self.restore_state(load_game_state(path))
+
+    def restore_state(self, state: GameState) -> None:
+        """Replace the flock, predator, score, options and random state with ``state``.
+
+        The screen, boid and predator options and the neighbor backend are
+        restored. The performance options are kept, since they configure this
+        process's instrumentation rather than the simulation.
+
+        Args:
+            state (GameState): State from :meth:`capture_state` or
+                :func:`load_game_state`.
+        """
+        options = state.options
+        self.screen_opts = ScreenOptions.model_validate(options["screen"])
+        self.boid_opts = BoidOptions.model_validate(options["boid"])
+        self.predator_opts = PredatorOptions.model_validate(options["predator"])
+        self.use_spatial_grid = options["game"]["use_spatial_grid"]
+        self.spatial_grid = (
+            SpatialGrid(cell_size=float(self.boid_opts.visual_range))
+            if self.use_spatial_grid
+            else None
+        )
+        self.grid_stats = None
+        self._clusters = None
+        self._boid_images.clear()
+
+        self.boid_list.empty()
+        self.all_sprites_list.empty()
+        boids = [
+            self._make_boid(pg.Vector2(pos), pg.Vector2(vel), pg.Color(*color))
+            for pos, vel, color in zip(
+                state.positions.tolist(),
+                state.velocities.tolist(),
+                state.colors.tolist(),
+                strict=True,
+            )
+        ]
+        self.boid_list.add(*boids)
+        self.all_sprites_list.add(*boids)
+
+        predator = self.predator
+        predator.pos = pg.Vector2(state.predator_pos)
+        predator.prev_pos = predator.pos
+        predator.vel = pg.Vector2(state.predator_vel)
+        predator.angle = state.predator_angle
+        predator.image = pg.transform.rotate(predator.orig_image, predator.angle)
+        predator.rect = predator.image.get_rect(center=predator.pos)
+        self.all_sprites_list.add(predator)
+
+        self.steps = state.step
+        self.score = state.score
+        self.game_over = state.game_over
+        self.rng.bit_generator.state = state.rng_state
+        if self.recorder is not None:
+            self.recorder.reset_slots()
+        if self.performance_opts.gc_freeze:
+            self.gc_scheduler.freeze()
+
+    def use_density_heatmap(self) -> bool:
+        """Whether the flock is large enough to be drawn as a density heatmap."""
+        return len(self.boid_list) >= self.performance_opts.heatmap_threshold
+
+    def render_density_heatmap(self) -> pg.Surface:
+        """Render the current boid density as a window-sized heatmap surface."""
+        winsize = (self.screen_opts.winsize[0], self.screen_opts.winsize[1])
+        if self.spatial_grid is not None and self.spatial_grid.grid:
+            counts = grid_density_histogram(self.spatial_grid, winsize)
+        else:
+            counts = density_histogram(
+                self.get_boid_positions(),
+                winsize,
+                float(self.performance_opts.heatmap_cell_size),
+            )
+        return render_density(counts, winsize)
+
+    def _get_frame_layers(self) -> tuple[pg.sprite.Group, pg.Surface | None]:
+        """Return the sprites to draw and the density heatmap drawn beneath them."""
+        if self.use_density_heatmap() and not self.game_over:
+            return pg.sprite.Group(self.predator), self.render_density_heatmap()
+        self._paint_clusters()
+        return self.all_sprites_list, None
+
+    def snapshot(self) -> FrameSnapshot:
+        """Capture everything needed to render the current state."""
+        sprites, density = self._get_frame_layers()
+        return FrameSnapshot(
+            step=self.steps,
+            blit_sequence=tuple((sprite.image, sprite.rect.topleft) for sprite in sprites),
+            score=self.score,
+            game_over=self.game_over,
+            predator_behavior_mode=self.predator_opts.predator_behavior_mode,
+            predator_attack_mode=self.predator_opts.predator_attack_mode,
+            boid_count=len(self.boid_list),
+            density=density,
+            grid_stats=self.grid_stats,
+            grid_cells=self._grid_cells(),
+            step_metrics=self.performance.step_metrics(),
+            flock_metrics=self._hud_flock_metrics(),
+            clusters=self._hud_clusters(),
+        )
+
+    def _grid_cells(self) -> int | None:
+        if not self.use_spatial_grid or self.spatial_grid is None:
+            return None
+        return self.spatial_grid.get_cell_count()
 
     def _update_sprites(self) -> None:
         self.boid_list.update()
-        self.predator.update(self._get_predator_target())
+        with self.performance.span("predator"):
+            self.predator.update(self._get_predator_target())
 
     def _get_predator_target(self) -> pg.Vector2:
         mode = self.predator_opts.predator_attack_mode
@@ -249,12 +771,95 @@ class Game:
 
     def _apply_all_boid_rules(self) -> None:
         if self.use_spatial_grid and self.spatial_grid:
-            self.spatial_grid.clear()
-            for boid in self.boid_list:
-                self.spatial_grid.insert(boid)
+            with self.performance.span("grid"):
+                self.spatial_grid.clear()
+                for boid in self.boid_list:
+                    self.spatial_grid.insert(boid)
+
+        with self.performance.span("rules"):
+            if self._rule_breakdown_due():
+                self._apply_all_boid_rules_detailed()
+            else:
+                for boid in self.boid_list:
+                    self._apply_boid_movement_rules(boid)
 
+        if self.use_spatial_grid and self.spatial_grid:
+            self._record_grid_stats(self.spatial_grid)
+
+    def _record_grid_stats(self, spatial_grid: SpatialGrid) -> None:
+        stats = spatial_grid.get_query_stats()
+        self.grid_stats = stats
+        self.performance.count("grid_queries", stats.queries)
+        self.performance.count("grid_candidates", stats.candidates)
+        self.performance.count("grid_neighbors", stats.neighbors)
+        self.performance.count("grid_cells_visited", stats.cells_visited)
+        self.performance.count("grid_max_occupancy", stats.max_occupancy)
+
+    def _rule_breakdown_due(self) -> bool:
+        every = self.performance_opts.rule_breakdown_every
+        return every > 0 and self.steps % every == 0
+
+    def _apply_all_boid_rules_detailed(self) -> None:
+        """Apply the same rules as ``_apply_boid_movement_rules``, timing each stage.
+
+        Stage times are summed over all boids and recorded once per stage as
+        spans nested in the current span, so the overhead is a few clock reads
+        per boid. The number of boid pairs each pairwise rule evaluated is
+        recorded as the ``<stage>_pairs`` counter.
+        """
+        boid_opts = self.boid_opts
+        predator_opts = self.predator_opts
+        screen_opts = self.screen_opts
+        visual_range = float(boid_opts.visual_range)
+        window_size = (screen_opts.winsize[0], screen_opts.winsize[1])
+        predator_pos = self.predator.pos
+        clock = time.perf_counter
+
+        stage_times = [0.0] * len(RULE_STAGES)
+        pairs = 0
+        boid_count = 0
         for boid in self.boid_list:
-            self._apply_boid_movement_rules(boid)
+            start = clock()
+            if self.use_spatial_grid and self.spatial_grid:
+                nearby_boids = self.spatial_grid.get_nearby_boids(
+                    boid.pos, search_radius=visual_range
+                )
+            else:
+                nearby_boids = list(self.boid_list)
+            neighbors_done = clock()
+            cohesion(boid, nearby_boids, boid_opts.cohesion_factor, visual_range)
+            cohesion_done = clock()
+            avoid_other_boids(boid, nearby_boids, boid_opts.separation, boid_opts.avoid_factor)
+            separation_done = clock()
+            match_velocity(boid, nearby_boids, boid_opts.alignment_factor, visual_range)
+            alignment_done = clock()
+            react_to_predator(
+                boid,
+                predator_pos,
+                behavior_mode=predator_opts.predator_behavior_mode,
+                detection_range=predator_opts.predator_detection_range,
+                reaction_strength=predator_opts.predator_reaction_strength,
+            )
+            predator_done = clock()
+            boid.speed_limit(boid_opts.max_speed)
+            speed_limit_done = clock()
+            boid_vs_boundary(boid, boundary_type=screen_opts.boundary_type, window_size=window_size)
+            boundary_done = clock()
+
+            stage_times[0] += neighbors_done - start
+            stage_times[1] += cohesion_done - neighbors_done
+            stage_times[2] += separation_done - cohesion_done
+            stage_times[3] += alignment_done - separation_done
+            stage_times[4] += predator_done - alignment_done
+            stage_times[5] += speed_limit_done - predator_done
+            stage_times[6] += boundary_done - speed_limit_done
+            pairs += len(nearby_boids)
+            boid_count += 1
+
+        for stage, elapsed in zip(RULE_STAGES, stage_times, strict=True):
+            self.performance.add_span(stage, elapsed, calls=boid_count)
+        for stage in PAIRWISE_RULE_STAGES:
+            self.performance.count(f"{stage}_pairs", pairs)
 
     def _handle_predator_collisions(self) -> None:
         boid_hit_list = pg.sprite.spritecollide(
@@ -289,24 +894,81 @@ class Game:
             len(self.boid_list),
             self.use_spatial_grid,
             self.spatial_grid,
+            self.grid_stats,
         )
 
-    def display_frame(self, screen: pg.Surface, flip: bool = True):
-        self.performance.start_operation()
-        draw_frame(
-            screen,
-            self.all_sprites_list,
-            self.score,
-            self.predator_opts.predator_behavior_mode,
-            self.predator_opts.predator_attack_mode,
-            self.game_over,
-            self.performance,
-            self.show_metrics,
-            len(self.boid_list),
-            self.use_spatial_grid,
-            self.spatial_grid,
-        )
+    def _profiling_frames_remaining(self) -> int | None:
+        return self.profiler.frames_remaining if self.profiler.active else None
+
+    def display_frame(
+        self,
+        screen: pg.Surface,
+        flip: bool = True,
+        snapshot: FrameSnapshot | None = None,
+    ):
+        """Draw a frame from live state, or from ``snapshot`` when pipelined.
+
+        With ``flip=False`` the caller is responsible for flipping the display
+        and calling ``end_frame()`` once the frame is complete.
+        """
+        with self.performance.span("render"):
+            if snapshot is None:
+                sprites, density = self._get_frame_layers()
+                draw_frame(
+                    screen,
+                    sprites,
+                    self.score,
+                    self.predator_opts.predator_behavior_mode,
+                    self.predator_opts.predator_attack_mode,
+                    self.game_over,
+                    self.performance,
+                    self.show_metrics,
+                    len(self.boid_list),
+                    self.use_spatial_grid,
+                    self.spatial_grid,
+                    density,
+                    self._profiling_frames_remaining(),
+                    self.grid_stats,
+                    self._hud_flock_metrics(),
+                    self._hud_clusters(),
+                )
+            else:
+                draw_frame(
+                    screen,
+                    snapshot,
+                    snapshot.score,
+                    snapshot.predator_behavior_mode,
+                    snapshot.predator_attack_mode,
+                    snapshot.game_over,
+                    self.performance,
+                    self.show_metrics,
+                    snapshot.boid_count,
+                    self.use_spatial_grid,
+                    # The worker may be rebuilding the live grid, so only the
+                    # snapshot's statistics are shown
+                    None,
+                    snapshot.density,
+                    self._profiling_frames_remaining(),
+                    snapshot.grid_stats,
+                    snapshot.flock_metrics,
+                    snapshot.clusters,
+                    grid_cells=snapshot.grid_cells,
+                    step_metrics=snapshot.step_metrics,
+                )
+            step = self.steps if snapshot is None else snapshot.step
+            # The renderer can outrun the simulation, so a step is drawn more
+            # than once, but captured only the first time
+            if (
+                self.capture is not None
+                and step != self._last_captured_step
+                and self.capture.should_capture(step)
+            ):
+                self.capture.submit(screen, step)
+                self._last_captured_step = step
+            if flip:
+                with self.performance.span("flip"):
+                    pg.display.flip()
+        # A deferred flip means the caller still has drawing to do, so it
+        # also ends the frame once it flips
         if flip:
-            pg.display.flip()
-        self.performance.end_operation("render")
-        self.performance.end_frame()
+            self.end_frame()
@@ -0,0 +1,111 @@
+"""Density heatmap rendering for very large flocks.
+
+Past a few thousand boids individual sprites blur into a smear and drawing
+them costs time linear in the boid count. The heatmap bins boid positions
+into a coarse 2D histogram and blits it as a single scaled, colormapped
+surface, so rendering cost depends on the window size rather than the flock.
+"""
+
+import numpy as np
+import pygame as pg
+
+from my_boids.spatial_grid import SpatialGrid
+
+# Anchor colors for the colormap, from empty (black) to densest (pale yellow)
+_COLORMAP_ANCHORS = np.array(
+    [
+        [0, 0, 0],
+        [40, 11, 84],
+        [120, 28, 109],
+        [202, 62, 72],
+        [246, 139, 31],
+        [252, 255, 164],
+    ],
+    dtype=np.float64,
+)
+
+
+def _build_colormap(size: int = 256) -> np.ndarray:
+    """Interpolate the anchor colors into a (size, 3) uint8 lookup table."""
+    anchor_x = np.linspace(0.0, 1.0, len(_COLORMAP_ANCHORS))
+    sample_x = np.linspace(0.0, 1.0, size)
+    channels = [np.interp(sample_x, anchor_x, _COLORMAP_ANCHORS[:, c]) for c in range(3)]
+    return np.stack(channels, axis=1).astype(np.uint8)
+
+
+COLORMAP = _build_colormap()
+
+
+def density_histogram(
+    positions: np.ndarray,
+    winsize: tuple[int, int],
+    cell_size: float,
+) -> np.ndarray:
+    """Bin boid positions into a histogram covering the window.
+
+    Args:
+        positions (np.ndarray): Boid positions with shape (n, 2).
+        winsize (tuple[int, int]): Window size in pixels.
+        cell_size (float): Edge length of one histogram bin in pixels.
+
+    Returns:
+        np.ndarray: Counts with shape (bins_x, bins_y). Boids outside the
+            window are ignored.
+    """
+    bins_x = max(1, int(np.ceil(winsize[0] / cell_size)))
+    bins_y = max(1, int(np.ceil(winsize[1] / cell_size)))
+    if len(positions) == 0:
+        return np.zeros((bins_x, bins_y), dtype=np.float64)
+    counts: np.ndarray
+    counts, _, _ = np.histogram2d(
+        positions[:, 0],
+        positions[:, 1],
+        bins=(bins_x, bins_y),
+        range=((0.0, bins_x * cell_size), (0.0, bins_y * cell_size)),
+    )
+    return counts
+
+
+def grid_density_histogram(spatial_grid: SpatialGrid, winsize: tuple[int, int]) -> np.ndarray:
+    """Build the density histogram from spatial grid cell occupancy.
+
+    The grid already holds per-cell boid lists for the current step, so this
+    costs one pass over occupied cells instead of one over every boid.
+
+    Args:
+        spatial_grid (SpatialGrid): A populated spatial grid.
+        winsize (tuple[int, int]): Window size in pixels.
+
+    Returns:
+        np.ndarray: Counts with shape (bins_x, bins_y) using the grid cell size.
+    """
+    cell_size = spatial_grid.cell_size
+    bins_x = max(1, int(np.ceil(winsize[0] / cell_size)))
+    bins_y = max(1, int(np.ceil(winsize[1] / cell_size)))
+    counts = np.zeros((bins_x, bins_y), dtype=np.float64)
+    for (cell_x, cell_y), boids in spatial_grid.grid.items():
+        if 0 <= cell_x < bins_x and 0 <= cell_y < bins_y:
+            counts[cell_x, cell_y] = len(boids)
+    return counts
+
+
+def render_density(counts: np.ndarray, winsize: tuple[int, int]) -> pg.Surface:
+    """Colormap a density histogram and scale it to the window.
+
+    Counts are log-scaled so a few very dense cells don't wash out the rest
+    of the flock.
+
+    Args:
+        counts (np.ndarray): Histogram with shape (bins_x, bins_y).
+        winsize (tuple[int, int]): Size of the returned surface.
+
+    Returns:
+        pg.Surface: The heatmap, ready to blit at (0, 0).
+    """
+    scaled = np.log1p(counts)
+    peak = scaled.max()
+    if peak > 0:
+        scaled /= peak
+    indices = (scaled * (len(COLORMAP) - 1)).astype(np.intp)
+    surface = pg.surfarray.make_surface(COLORMAP[indices])
+    return pg.transform.scale(surface, winsize)
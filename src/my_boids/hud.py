@@ -2,9 +2,13 @@
 
 import pygame as pg
 
+from my_boids.analytics import FlockMetrics
+from my_boids.clusters import Clusters
+from my_boids.memory import GC_GENERATIONS
 from my_boids.options import PredatorAttackMode, PredatorBehaviorMode
-from my_boids.performance import PerformanceMonitor
-from my_boids.spatial_grid import SpatialGrid
+from my_boids.performance import FrameMetrics, PerformanceMonitor
+from my_boids.pipeline import FrameSnapshot
+from my_boids.spatial_grid import GridQueryStats, SpatialGrid
 
 
 def draw_score(screen: pg.Surface, score: int) -> None:
@@ -34,6 +38,7 @@ def draw_predator_attack_mode(screen: pg.Surface, attack_mode: PredatorAttackMod
         "center": "Flock Center",
         "nearest": "Nearest Bird",
         "isolated": "Most Isolated Bird",
+        "cluster": "Nearest Cluster",
     }
     strategy_text = strategy_labels.get(attack_mode, attack_mode.replace("_", " ").title())
     text = font.render(f"Predator Attack Mode: {strategy_text}", True, pg.Color("white"))
@@ -52,38 +57,163 @@ def draw_game_over(screen: pg.Surface) -> None:
     screen.blit(text, text_rect)
 
 
+def draw_profiling_indicator(screen: pg.Surface, frames_remaining: int) -> None:
+    """Draw a notice that a profiling capture is in progress."""
+    winsize = screen.get_size()
+    font = pg.font.SysFont("monospace", 14)
+    text = font.render(f"PROFILING ({frames_remaining} frames left)", True, pg.Color("red"))
+    text_rect = text.get_rect()
+    text_rect.bottomright = (winsize[0] - 10, winsize[1] - 10)
+    screen.blit(text, text_rect)
+
+
+def draw_replay_status(
+    screen: pg.Surface, step: int, index: int, count: int, speed: float, paused: bool
+) -> None:
+    """Draw the replay position, speed and pause state."""
+    winsize = screen.get_size()
+    font = pg.font.SysFont("monospace", 14)
+    state = "PAUSED" if paused else f"x{speed:g}"
+    text = font.render(
+        f"REPLAY step {step} ({index + 1}/{count}) {state}", True, pg.Color("yellow")
+    )
+    text_rect = text.get_rect()
+    text_rect.bottomleft = (10, winsize[1] - 10)
+    screen.blit(text, text_rect)
+
+
+def draw_flock_metrics(screen: pg.Surface, metrics: FlockMetrics) -> int:
+    """Draw the latest flock metrics in the top-right corner.
+
+    Returns:
+        int: The y coordinate below the metrics.
+    """
+    winsize = screen.get_size()
+    font = pg.font.SysFont("monospace", 14)
+    lines = [
+        f"Flock @ step {metrics.step}",
+        f"Polarization: {metrics.polarization:.2f}",
+        f"Gyration radius: {metrics.radius_of_gyration:.0f}",
+        f"Speed: {metrics.speed_mean:.2f} +/- {metrics.speed_std:.2f}",
+        f"NN p10/p50/p90: {metrics.nn_p10:.1f}/{metrics.nn_p50:.1f}/{metrics.nn_p90:.1f}",
+    ]
+    y_offset = 40
+    for line in lines:
+        text = font.render(line, True, pg.Color("cyan"))
+        text_rect = text.get_rect()
+        text_rect.topright = (winsize[0] - 10, y_offset)
+        screen.blit(text, text_rect)
+        y_offset += 18
+    return y_offset
+
+
+def draw_clusters(screen: pg.Surface, clusters: Clusters, top: int = 40) -> None:
+    """Draw the number and sizes of the clusters at the right edge, from ``top`` down."""
+    winsize = screen.get_size()
+    font = pg.font.SysFont("monospace", 14)
+    text = font.render(
+        f"Clusters: {clusters.count} (largest {clusters.largest}, "
+        f"{clusters.singletons} singletons)",
+        True,
+        pg.Color("cyan"),
+    )
+    text_rect = text.get_rect()
+    text_rect.topright = (winsize[0] - 10, top)
+    screen.blit(text, text_rect)
+
+
+def _rule_breakdown_lines(performance: PerformanceMonitor) -> list[str]:
+    """Lines for the per-stage logic breakdown, if one has been recorded."""
+    stage_prefix = "logic/rules/"
+    stage_paths = [path for path in performance.span_stats if path.startswith(stage_prefix)]
+    if not stage_paths:
+        return []
+
+    lines = []
+    if "logic/grid" in performance.span_stats:
+        lines.append(f"  grid: {performance.get_avg_span_time('logic/grid'):.2f}ms")
+    for path in stage_paths:
+        stage = path.removeprefix(stage_prefix)
+        line = f"  {stage}: {performance.get_avg_span_time(path):.2f}ms"
+        pairs_name = f"{stage}_pairs"
+        if pairs_name in performance.count_stats:
+            line += f" ({performance.get_avg_count(pairs_name):.0f} pairs)"
+        lines.append(line)
+    return lines
+
+
 def draw_metrics(
     screen: pg.Surface,
     performance: PerformanceMonitor,
     boid_count: int,
     use_spatial_grid: bool,
     spatial_grid: SpatialGrid | None,
+    grid_stats: GridQueryStats | None = None,
+    grid_cells: int | None = None,
+    step_metrics: FrameMetrics | None = None,
 ) -> None:
-    """Draw performance metrics."""
+    """Draw performance metrics.
+
+    ``grid_stats`` adds the spatial grid's query and occupancy statistics.
+    ``grid_cells`` and ``step_metrics`` give the cell count and the update,
+    logic and collision times of the step drawn, in place of those of
+    ``spatial_grid`` and ``performance.current_metrics``.
+    """
     font = pg.font.SysFont("monospace", 14)
     y_offset = 10
 
     fps = performance.get_fps()
     avg_frame_time = performance.get_avg_frame_time()
+    p50, p95, p99 = (performance.get_frame_time_percentile(p) for p in (50, 95, 99))
     metrics = [
         f"FPS: {fps:.1f}",
         f"Frame: {avg_frame_time:.2f}ms",
+        f"p50/p95/p99: {p50:.1f}/{p95:.1f}/{p99:.1f}ms",
+        f"Max: {performance.get_max_frame_time():.2f}ms",
         f"Boids: {boid_count}",
     ]
 
-    if use_spatial_grid and spatial_grid is not None:
-        metrics.append(f"Grid: {spatial_grid.get_cell_count()} cells")
+    if grid_cells is None and spatial_grid is not None:
+        grid_cells = spatial_grid.get_cell_count()
+    if use_spatial_grid and grid_cells is not None:
+        metrics.append(f"Grid: {grid_cells} cells")
         metrics.append("Mode: Spatial")
+        if grid_stats is not None:
+            metrics.append(
+                f"Occupancy: avg {grid_stats.mean_occupancy:.1f} max {grid_stats.max_occupancy}"
+            )
+            metrics.append(
+                f"Query: {grid_stats.cells_per_query:.0f} cells, "
+                f"{grid_stats.candidates_per_query:.1f} scanned, {grid_stats.hit_rate:.0%} hit"
+            )
     else:
         metrics.append("Mode: Brute Force")
 
     if performance.current_metrics:
         metrics_state = performance.current_metrics
-        metrics.append(f"Update: {metrics_state.update_time * 1000:.2f}ms")
-        metrics.append(f"Logic: {metrics_state.logic_time * 1000:.2f}ms")
-        metrics.append(f"Collision: {metrics_state.collision_time * 1000:.2f}ms")
+        step_state = step_metrics or metrics_state
+        metrics.append(f"Update: {step_state.update_time * 1000:.2f}ms")
+        metrics.append(f"Logic: {step_state.logic_time * 1000:.2f}ms")
+        metrics.extend(_rule_breakdown_lines(performance))
+        metrics.append(f"Collision: {step_state.collision_time * 1000:.2f}ms")
+        if "analytics" in performance.span_stats:
+            metrics.append(f"Analytics: {performance.get_avg_span_time('analytics'):.2f}ms")
+        if "clusters" in performance.span_stats:
+            metrics.append(f"Clusters: {performance.get_avg_span_time('clusters'):.2f}ms")
         metrics.append(f"Render: {metrics_state.render_time * 1000:.2f}ms")
 
+    if performance.gc_monitor is not None:
+        collections = "/".join(
+            str(performance.get_gc_collections(generation)) for generation in range(GC_GENERATIONS)
+        )
+        metrics.append(
+            f"GC: {collections} pause {performance.get_avg_gc_pause():.2f}"
+            f"/{performance.get_max_gc_pause():.2f}ms"
+        )
+    if performance.last_allocation_sample is not None:
+        sample = performance.last_allocation_sample
+        metrics.append(f"Alloc: {sample.blocks} blocks, peak {sample.peak / 1024:.0f}KB")
+
     for line in metrics:
         text = font.render(line, True, pg.Color("green"))
         screen.blit(text, (10, y_offset))
@@ -92,7 +222,7 @@ def draw_metrics(
 
 def draw_frame(
     screen: pg.Surface,
-    all_sprites: pg.sprite.Group,
+    all_sprites: pg.sprite.Group | FrameSnapshot,
     score: int,
     predator_mode: PredatorBehaviorMode,
     predator_attack_mode: PredatorAttackMode,
@@ -102,17 +232,54 @@ def draw_frame(
     boid_count: int,
     use_spatial_grid: bool,
     spatial_grid: SpatialGrid | None,
+    density: pg.Surface | None = None,
+    profiling_frames_remaining: int | None = None,
+    grid_stats: GridQueryStats | None = None,
+    flock_metrics: FlockMetrics | None = None,
+    clusters: Clusters | None = None,
+    grid_cells: int | None = None,
+    step_metrics: FrameMetrics | None = None,
 ) -> None:
-    """Draw the complete simulation frame."""
+    """Draw the complete simulation frame.
+
+    When ``density`` is given it is drawn in place of the boid sprites, and
+    ``all_sprites`` should only hold what still draws on top (the predator).
+    ``profiling_frames_remaining`` shows the profiling indicator when set,
+    ``grid_stats`` adds the grid query statistics to the metrics,
+    ``flock_metrics`` shows the flock analytics and ``clusters`` the
+    cluster counts beneath them. ``grid_cells`` and ``step_metrics`` are
+    passed on to :func:`draw_metrics`.
+    """
     screen.fill(pg.Color("black"))
 
     if game_over:
         draw_game_over(screen)
         return
 
-    all_sprites.draw(screen)
-    draw_score(screen, score)
-    draw_predator_mode(screen, predator_mode)
-    draw_predator_attack_mode(screen, predator_attack_mode)
-    if show_metrics:
-        draw_metrics(screen, performance, boid_count, use_spatial_grid, spatial_grid)
+    with performance.span("sprites"):
+        if density is not None:
+            screen.blit(density, (0, 0))
+        all_sprites.draw(screen)
+
+    with performance.span("hud"):
+        draw_score(screen, score)
+        draw_predator_mode(screen, predator_mode)
+        draw_predator_attack_mode(screen, predator_attack_mode)
+        if show_metrics:
+            draw_metrics(
+                screen,
+                performance,
+                boid_count,
+                use_spatial_grid,
+                spatial_grid,
+                grid_stats,
+                grid_cells,
+                step_metrics,
+            )
+        top = 40
+        if flock_metrics is not None:
+            top = draw_flock_metrics(screen, flock_metrics)
+        if clusters is not None:
+            draw_clusters(screen, clusters, top)
+        if profiling_frames_remaining is not None:
+            draw_profiling_indicator(screen, profiling_frames_remaining)
@@ -0,0 +1,255 @@
+"""Garbage collection and allocation instrumentation, and GC scheduling.
+
+:class:`GCMonitor` times every collection through ``gc.callbacks``, and
+:class:`AllocationSampler` measures the allocations of every N-th frame with
+``tracemalloc``, whose overhead is too high to leave on for every frame.
+
+:class:`GCScheduler` reduces collection hitches: it freezes the long-lived
+startup heap (the initial sprites) with ``gc.freeze()`` so full collections
+no longer scan it, and moves full collections out of the frame to the frame
+boundary.
+"""
+
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+import weakref
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+GC_GENERATIONS = 3
+
+# Bound on pauses buffered between drains, in case nothing drains them
+MAX_PENDING_PAUSES = 1024
+
+# Full-collection threshold used while full collections are deferred; high
+# enough that the interpreter never reaches it on its own
+DEFERRED_FULL_COLLECTION_THRESHOLD = 1_000_000
+
+
+def _remove_gc_callback(callback: Callable[[str, dict[str, Any]], None]) -> None:
+    if callback in gc.callbacks:
+        gc.callbacks.remove(callback)
+
+
+@dataclass(frozen=True)
+class GCPause:
+    """One garbage collection.
+
+    Attributes:
+        generation: Oldest generation collected.
+        start: Start of the collection as a ``time.perf_counter`` value.
+        duration: Length of the collection pause in seconds.
+        collected: Number of unreachable objects found.
+    """
+
+    generation: int
+    start: float
+    duration: float
+    collected: int
+
+
+class GCMonitor:
+    """Record the generation and pause time of every garbage collection.
+
+    Collections are buffered until :meth:`drain` is called, normally once per
+    frame by :class:`~my_boids.performance.PerformanceMonitor`.
+
+    Attributes:
+        pauses (deque[GCPause]): Collections since the last drain.
+    """
+
+    def __init__(self):
+        """Initialize the monitor. Call :meth:`install` to start recording."""
+        self.pauses: deque[GCPause] = deque(maxlen=MAX_PENDING_PAUSES)
+        self._collection_start: float | None = None
+        self._callback: Callable[[str, dict[str, Any]], None] | None = None
+
+    def install(self) -> GCMonitor:
+        """Register the ``gc.callbacks`` hook.
+
+        The hook only holds a weak reference to the monitor and is
+        unregistered once the monitor is garbage collected.
+
+        Returns:
+            GCMonitor: This monitor, for chaining.
+        """
+        if self._callback is not None:
+            return self
+        monitor_ref = weakref.ref(self)
+
+        def callback(phase: str, info: dict[str, Any]) -> None:
+            monitor = monitor_ref()
+            if monitor is not None:
+                monitor._on_gc(phase, info)
+
+        self._callback = callback
+        gc.callbacks.append(callback)
+        weakref.finalize(self, _remove_gc_callback, callback)
+        return self
+
+    def uninstall(self) -> None:
+        """Unregister the ``gc.callbacks`` hook."""
+        if self._callback is None:
+            return
+        _remove_gc_callback(self._callback)
+        self._callback = None
+
+    def _on_gc(self, phase: str, info: dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if phase == "start":
+            self._collection_start = now
+        elif self._collection_start is not None:
+            start = self._collection_start
+            self._collection_start = None
+            self.pauses.append(
+                GCPause(info["generation"], start, now - start, info.get("collected", 0))
+            )
+
+    def drain(self) -> list[GCPause]:
+        """Return and forget the collections recorded since the last drain."""
+        pauses = []
+        while self.pauses:
+            pauses.append(self.pauses.popleft())
+        return pauses
+
+
+@dataclass(frozen=True)
+class AllocationSample:
+    """Allocations made during one sampled frame.
+
+    ``tracemalloc`` only sees memory that is still allocated, so short-lived
+    temporaries (like per-boid ``pg.Vector2`` results) show up in ``peak``
+    rather than in ``blocks``.
+
+    Attributes:
+        blocks: Memory blocks allocated during the frame and still alive at its end.
+        size: Total size of those blocks in bytes.
+        peak: Peak traced memory during the frame in bytes.
+    """
+
+    blocks: int
+    size: int
+    peak: int
+
+
+class AllocationSampler:
+    """Trace the allocations of one frame out of every ``every`` with tracemalloc.
+
+    Frames are skipped while something else is already tracing, since
+    starting and stopping tracemalloc would disturb it.
+    """
+
+    def __init__(self, every: int):
+        """Initialize the sampler.
+
+        Args:
+            every (int): Sample one frame in this many. Must be at least 1.
+
+        Raises:
+            ValueError: If ``every`` is less than 1.
+        """
+        if every < 1:
+            raise ValueError(f"every must be at least 1, got {every}")
+        self.every = every
+        self._frame_index = 0
+        self._sampling = False
+
+    def start_frame(self) -> None:
+        """Start tracing if this frame is sampled."""
+        sampled = self._frame_index % self.every == 0
+        self._frame_index += 1
+        if not sampled or self._sampling or tracemalloc.is_tracing():
+            return
+        tracemalloc.start()
+        self._sampling = True
+
+    def end_frame(self) -> AllocationSample | None:
+        """Stop tracing and measure the frame.
+
+        Returns:
+            AllocationSample | None: The frame's allocations, or None if it
+                was not sampled.
+        """
+        if not self._sampling:
+            return None
+        self._sampling = False
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        statistics = snapshot.statistics("filename")
+        return AllocationSample(
+            blocks=sum(stat.count for stat in statistics),
+            size=sum(stat.size for stat in statistics),
+            peak=peak,
+        )
+
+
+class GCScheduler:
+    """Freeze the startup heap and run full collections between frames.
+
+    While deferred, the interpreter keeps collecting the young generations
+    on its own but full collections only run from :meth:`collect_if_due`,
+    once the middle generation has been collected as many times as the
+    original full-collection threshold allows.
+
+    The interpreter also skips a full collection until the objects promoted
+    to the oldest generation since the last one exceed a quarter of those
+    that survived it. Python does not expose those counts, so that check is
+    not applied here: with a large, stable heap this runs more full
+    collections than the interpreter would, but between frames.
+    """
+
+    def __init__(self):
+        """Initialize the scheduler without changing any GC settings."""
+        self._saved_threshold: tuple[int, int, int] | None = None
+        self._frozen = False
+        self._full_threshold = gc.get_threshold()[2]
+
+    @property
+    def deferring(self) -> bool:
+        """Whether full collections are currently deferred."""
+        return self._saved_threshold is not None
+
+    def freeze(self) -> None:
+        """Collect once, then move every surviving object to the permanent generation."""
+        gc.collect()
+        gc.freeze()
+        self._frozen = True
+
+    def defer_full_collections(self) -> None:
+        """Stop the interpreter from starting full collections on its own."""
+        if self._saved_threshold is not None:
+            return
+        threshold0, threshold1, threshold2 = gc.get_threshold()
+        self._saved_threshold = (threshold0, threshold1, threshold2)
+        self._full_threshold = threshold2
+        gc.set_threshold(threshold0, threshold1, DEFERRED_FULL_COLLECTION_THRESHOLD)
+
+    def collect_if_due(self) -> bool:
+        """Run a deferred full collection if one is due.
+
+        A collection is due once the middle generation has been collected
+        the original ``threshold2`` times since the last full collection,
+        whatever the size of the oldest generation.
+
+        Returns:
+            bool: Whether a collection ran.
+        """
+        if self._saved_threshold is None or gc.get_count()[2] < self._full_threshold:
+            return False
+        gc.collect()
+        return True
+
+    def restore(self) -> None:
+        """Restore the original thresholds and unfreeze the heap if it was frozen."""
+        if self._saved_threshold is not None:
+            gc.set_threshold(*self._saved_threshold)
+            self._saved_threshold = None
+        if self._frozen:
+            gc.unfreeze()
+            self._frozen = False
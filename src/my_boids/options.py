@@ -27,21 +27,24 @@ PREDATOR_BEHAVIOR_MODES: tuple[PredatorBehaviorMode, PredatorBehaviorMode] = (
     PREDATOR_MODE_ATTRACT,
 )
 
-PredatorAttackMode = Literal["mouse", "center", "nearest", "isolated"]
+PredatorAttackMode = Literal["mouse", "center", "nearest", "isolated", "cluster"]
 PREDATOR_ATTACK_MODE_MOUSE: PredatorAttackMode = "mouse"
 PREDATOR_ATTACK_MODE_CENTER: PredatorAttackMode = "center"
 PREDATOR_ATTACK_MODE_NEAREST: PredatorAttackMode = "nearest"
 PREDATOR_ATTACK_MODE_ISOLATED: PredatorAttackMode = "isolated"
+PREDATOR_ATTACK_MODE_CLUSTER: PredatorAttackMode = "cluster"
 PREDATOR_ATTACK_MODES: tuple[
     PredatorAttackMode,
     PredatorAttackMode,
     PredatorAttackMode,
     PredatorAttackMode,
+    PredatorAttackMode,
 ] = (
     PREDATOR_ATTACK_MODE_MOUSE,
     PREDATOR_ATTACK_MODE_CENTER,
     PREDATOR_ATTACK_MODE_NEAREST,
     PREDATOR_ATTACK_MODE_ISOLATED,
+    PREDATOR_ATTACK_MODE_CLUSTER,
 )
 
 
@@ -153,12 +156,16 @@ class ScreenOptions(BaseModel):
         return cls(winsize=winsize, fullscreen=fullscreen, boundary_type=boundary_type)
 
 
+# Upper bound on the flock size, high enough for headless scaling runs
+MAX_NUM_BOIDS = 100_000
+
+
 class BoidOptions(BaseModel):
     """Options for the boids."""
 
     model_config = ConfigDict(validate_assignment=True)
 
-    num_boids: int = Field(default=53, ge=1, le=200)
+    num_boids: int = Field(default=53, ge=1, le=MAX_NUM_BOIDS)
     size: int = Field(default=10, ge=5, le=20)
     max_speed: float = Field(default=20.0, ge=5.0, le=50.0)
     cohesion_factor: float = Field(default=0.01, ge=0.001, le=0.1)
@@ -239,6 +246,106 @@ class PredatorOptions(BaseModel):
         )
 
 
+class PerformanceOptions(BaseModel):
+    """Options that control how the main loop is scheduled and rendered."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    pipelined: bool = Field(default=False)
+    heatmap_threshold: int = Field(default=3000, ge=1)
+    heatmap_cell_size: int = Field(default=8, ge=2, le=64)
+    trace_events: bool = Field(default=False)
+    trace_capacity: int = Field(default=100_000, ge=1)
+    trace_stream_path: str = Field(default="")
+    trace_dir: str = Field(default="traces")
+    profile_frames: int = Field(default=300, ge=1)
+    profile_top_n: int = Field(default=30, ge=1)
+    profile_dir: str = Field(default="profiles")
+    track_gc: bool = Field(default=True)
+    alloc_sample_every: int = Field(default=0, ge=0)
+    gc_freeze: bool = Field(default=False)
+    rule_breakdown_every: int = Field(default=0, ge=0)
+    watchdog_budget_ms: float = Field(default=0.0, ge=0.0)
+    watchdog_dir: str = Field(default="slow_frames")
+    watchdog_min_interval: float = Field(default=5.0, ge=0.0)
+    watchdog_keep: int = Field(default=10, ge=1)
+    analytics_every: int = Field(default=0, ge=0)
+    analytics_path: str = Field(default="")
+    analytics_hud: bool = Field(default=False)
+    cluster_hud: bool = Field(default=False)
+    cluster_colors: bool = Field(default=False)
+
+    @classmethod
+    def get_defaults(cls) -> PerformanceOptions:
+        return cls()
+
+    @classmethod
+    def from_config(cls, config_path: str = "config.ini") -> PerformanceOptions:
+        config = load_config(config_path)
+        defaults = cls.get_defaults()
+        if not config.has_section("performance"):
+            return defaults
+        performance_section = config["performance"]
+        return cls(
+            pipelined=performance_section.getboolean("pipelined", fallback=defaults.pipelined),
+            heatmap_threshold=performance_section.getint(
+                "heatmap_threshold", fallback=defaults.heatmap_threshold
+            ),
+            heatmap_cell_size=performance_section.getint(
+                "heatmap_cell_size", fallback=defaults.heatmap_cell_size
+            ),
+            trace_events=performance_section.getboolean(
+                "trace_events", fallback=defaults.trace_events
+            ),
+            trace_capacity=performance_section.getint(
+                "trace_capacity", fallback=defaults.trace_capacity
+            ),
+            trace_stream_path=performance_section.get("trace_stream_path", fallback="")
+            or defaults.trace_stream_path,
+            trace_dir=performance_section.get("trace_dir", fallback="") or defaults.trace_dir,
+            profile_frames=performance_section.getint(
+                "profile_frames", fallback=defaults.profile_frames
+            ),
+            profile_top_n=performance_section.getint(
+                "profile_top_n", fallback=defaults.profile_top_n
+            ),
+            profile_dir=performance_section.get("profile_dir", fallback="") or defaults.profile_dir,
+            track_gc=performance_section.getboolean("track_gc", fallback=defaults.track_gc),
+            alloc_sample_every=performance_section.getint(
+                "alloc_sample_every", fallback=defaults.alloc_sample_every
+            ),
+            gc_freeze=performance_section.getboolean("gc_freeze", fallback=defaults.gc_freeze),
+            rule_breakdown_every=performance_section.getint(
+                "rule_breakdown_every", fallback=defaults.rule_breakdown_every
+            ),
+            watchdog_budget_ms=performance_section.getfloat(
+                "watchdog_budget_ms", fallback=defaults.watchdog_budget_ms
+            ),
+            watchdog_dir=performance_section.get("watchdog_dir", fallback="")
+            or defaults.watchdog_dir,
+            watchdog_min_interval=performance_section.getfloat(
+                "watchdog_min_interval", fallback=defaults.watchdog_min_interval
+            ),
+            watchdog_keep=performance_section.getint(
+                "watchdog_keep", fallback=defaults.watchdog_keep
+            ),
+            analytics_every=performance_section.getint(
+                "analytics_every", fallback=defaults.analytics_every
+            ),
+            analytics_path=performance_section.get("analytics_path", fallback="")
+            or defaults.analytics_path,
+            analytics_hud=performance_section.getboolean(
+                "analytics_hud", fallback=defaults.analytics_hud
+            ),
+            cluster_hud=performance_section.getboolean(
+                "cluster_hud", fallback=defaults.cluster_hud
+            ),
+            cluster_colors=performance_section.getboolean(
+                "cluster_colors", fallback=defaults.cluster_colors
+            ),
+        )
+
+
 class GameProtocol(Protocol):
     """Minimal surface that SettingsDialog needs from Game."""
 
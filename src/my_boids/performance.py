@@ -1,8 +1,36 @@
 """Performance monitoring and metrics tracking for the boids simulation."""
 
+from __future__ import annotations
+
+import functools
+import threading
 import time
 from collections import deque
-from dataclasses import dataclass
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import ParamSpec, TypeVar
+
+from my_boids.memory import GC_GENERATIONS, AllocationSample, AllocationSampler, GCMonitor
+from my_boids.stats import WindowStats
+from my_boids.tracing import TraceRecorder
+from my_boids.watchdog import FrameWatchdog
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+# Root-level spans with these names also fill the matching FrameMetrics field
+_FRAME_METRICS_FIELDS = {
+    "update": "update_time",
+    "logic": "logic_time",
+    "collision": "collision_time",
+    "render": "render_time",
+}
+
+SPAN_PATH_SEPARATOR = "/"
+
+# Percentiles reported by the summary and HUD
+SUMMARY_PERCENTILES = (50, 95, 99)
 
 
 @dataclass
@@ -24,17 +52,107 @@ class FrameMetrics:
     render_time: float = 0.0
 
 
+@dataclass
+class SpanNode:
+    """Timing for one named span within a frame, and the spans nested in it.
+
+    A span entered several times in one frame (e.g. once per boid) keeps a
+    single node whose time and call count accumulate.
+
+    Attributes:
+        name: Span name.
+        total_time: Total time spent in the span this frame, in seconds.
+        calls: Number of times the span was entered this frame.
+        children: Nested spans keyed by name.
+    """
+
+    name: str
+    total_time: float = 0.0
+    calls: int = 0
+    children: dict[str, SpanNode] = field(default_factory=dict)
+
+    def child(self, name: str) -> SpanNode:
+        """Return the nested span called ``name``, creating it if needed."""
+        node = self.children.get(name)
+        if node is None:
+            node = SpanNode(name)
+            self.children[name] = node
+        return node
+
+    def iter_paths(self, prefix: str = "") -> Iterator[tuple[str, SpanNode]]:
+        """Yield ``(path, node)`` for every descendant, depth first."""
+        for name, node in self.children.items():
+            path = f"{prefix}{SPAN_PATH_SEPARATOR}{name}" if prefix else name
+            yield path, node
+            yield from node.iter_paths(path)
+
+    def merge(self, other: SpanNode) -> None:
+        """Add the times and calls of every span nested in ``other`` to this tree."""
+        for name, other_child in other.children.items():
+            node = self.child(name)
+            node.total_time += other_child.total_time
+            node.calls += other_child.calls
+            node.merge(other_child)
+
+
 class PerformanceMonitor:
     """Monitor and track performance metrics for the simulation.
 
     This class tracks frame times and calculates statistics like FPS,
     average frame time, and timing breakdowns for different operations.
 
+    Operations are timed as named spans that may nest, either with the
+    :meth:`span` context manager or the :meth:`timed` decorator. Each frame
+    builds a tree of spans; when the frame ends every span's total is added
+    to a per-path sample window, where paths join nested names with ``/``
+    (e.g. ``"logic/grid"``).
+
+    Frame and span times are summarized by :class:`WindowStats`, which keeps
+    the mean, min, max and p50/p95/p99 up to date in O(1) per sample.
+
+    Work counts (e.g. boid pairs evaluated) are recorded with :meth:`count`
+    and summarized per frame in the same way.
+
+    The thread that calls :meth:`start_frame` owns the frame's span tree and
+    ``current_metrics``. Any other thread, such as the pipelined simulation
+    thread, times into a tree and metrics of its own (see
+    :meth:`step_metrics`), which it adds to the frame with
+    :meth:`hand_off_thread_spans` once its work is done; the spans are then
+    counted in the frame that ends next.
+
+    When ``gc_monitor`` is set, each frame also records the collections per
+    generation and the total collection pause; when ``allocations`` is set,
+    sampled frames record their tracemalloc allocations.
+
     Attributes:
         enabled (bool): Whether performance monitoring is active.
         max_samples (int): Maximum number of frame samples to keep.
         frame_times (deque): Recent frame times in seconds.
+        frame_stats (WindowStats): Streaming statistics of ``frame_times``.
         current_metrics (FrameMetrics | None): Metrics for the current frame.
+        span_stats (dict[str, WindowStats]): Streaming statistics of the
+            per-frame total of each span path, in seconds, over the frames in
+            which the span ran.
+        last_frame_spans (SpanNode | None): Span tree of the last completed frame.
+        count_stats (dict[str, WindowStats]): Streaming statistics of the
+            per-frame total of each counter, over the frames in which it was
+            counted.
+        trace (TraceRecorder | None): When set, every span and frame is also
+            recorded as a trace event.
+        gc_monitor (GCMonitor | None): When set, garbage collections are
+            counted and timed per frame.
+        gc_collection_stats (list[WindowStats]): Per-frame collection counts
+            for each generation.
+        gc_pause_stats (WindowStats): Per-frame total collection pause in seconds.
+        allocations (AllocationSampler | None): When set, sampled frames
+            record their allocations.
+        last_allocation_sample (AllocationSample | None): The most recent
+            allocation sample.
+        alloc_block_stats (WindowStats): Surviving blocks of recent samples.
+        alloc_peak_stats (WindowStats): Peak traced bytes of recent samples.
+        watchdog (FrameWatchdog | None): When set, it captures the state
+            going into every frame, timed as the ``watchdog`` span, and checks
+            every finished frame against its budget.
     """
 
     def __init__(self, enabled: bool = True, max_samples: int = 60):
@@ -48,16 +166,131 @@ class PerformanceMonitor:
         self.enabled = enabled
         self.max_samples = max_samples
         self.frame_times: deque[float] = deque(maxlen=max_samples)
+        self.frame_stats = WindowStats(max_samples)
         self.current_metrics: FrameMetrics | None = None
+        self.span_stats: dict[str, WindowStats] = {}
+        self.last_frame_spans: SpanNode | None = None
+        self.count_stats: dict[str, WindowStats] = {}
+        self.trace: TraceRecorder | None = None
+        self.gc_monitor: GCMonitor | None = None
+        self.gc_collection_stats = [WindowStats(max_samples) for _ in range(GC_GENERATIONS)]
+        self.gc_pause_stats = WindowStats(max_samples)
+        self.allocations: AllocationSampler | None = None
+        self.last_allocation_sample: AllocationSample | None = None
+        self.alloc_block_stats = WindowStats(max_samples)
+        self.alloc_peak_stats = WindowStats(max_samples)
+        self.watchdog: FrameWatchdog | None = None
         self._frame_start_time: float = 0.0
-        self._operation_start_time: float = 0.0
+        self._frame_spans = SpanNode("frame")
+        self._frame_counts: dict[str, int] = {}
+        # Span stacks and operation start times are per thread so a pipelined
+        # simulation thread and the render thread can time work concurrently.
+        self._thread_state = threading.local()
+        # Threads other than the frame's own time into their own trees and
+        # hand them over here, to be merged when the frame ends
+        self._frame_thread: int | None = None
+        self._handoff_lock = threading.Lock()
+        self._handed_off_spans = SpanNode("frame")
+        self._handed_off_counts: dict[str, int] = {}
+
+    def _span_stack(self) -> list[tuple[SpanNode, float]]:
+        stack: list[tuple[SpanNode, float]] | None = getattr(self._thread_state, "stack", None)
+        if stack is None:
+            stack = []
+            self._thread_state.stack = stack
+        return stack
+
+    def _owns_frame(self) -> bool:
+        return self._frame_thread is None or self._frame_thread == threading.get_ident()
+
+    def _span_root(self) -> SpanNode:
+        """The span tree the calling thread records root-level spans into."""
+        if self._owns_frame():
+            return self._frame_spans
+        root: SpanNode | None = getattr(self._thread_state, "root", None)
+        if root is None:
+            root = SpanNode("frame")
+            self._thread_state.root = root
+        return root
+
+    def _counts(self) -> dict[str, int]:
+        """The counter totals the calling thread adds to."""
+        if self._owns_frame():
+            return self._frame_counts
+        counts: dict[str, int] | None = getattr(self._thread_state, "counts", None)
+        if counts is None:
+            counts = {}
+            self._thread_state.counts = counts
+        return counts
+
+    def _metrics(self) -> FrameMetrics | None:
+        """The metrics the calling thread's root-level spans fill."""
+        if self._owns_frame():
+            return self.current_metrics
+        metrics: FrameMetrics | None = getattr(self._thread_state, "metrics", None)
+        if metrics is None:
+            metrics = FrameMetrics(frame_time=0.0)
+            self._thread_state.metrics = metrics
+        return metrics
+
+    def step_metrics(self) -> FrameMetrics | None:
+        """Copy of the span times last recorded in the calling thread's metrics.
+
+        On a thread other than the frame's own, these are the times of its
+        last 'update', 'logic' and 'collision' spans, e.g. those of the last
+        pipelined simulation step.
+
+        Returns:
+            FrameMetrics | None: The metrics, or None when disabled or before
+                the first frame.
+        """
+        if not self.enabled:
+            return None
+        metrics = self._metrics()
+        return None if metrics is None else replace(metrics)
+
+    def hand_off_thread_spans(self) -> None:
+        """Hand the calling thread's spans and counters over to the frame.
+
+        Call it from a thread other than the frame's own, outside any span,
+        whenever its work is finished (e.g. after every pipelined simulation
+        step). They are added to the frame that ends next. Does nothing on
+        the thread that owns the frame.
+        """
+        if not self.enabled or self._owns_frame():
+            return
+        root: SpanNode | None = getattr(self._thread_state, "root", None)
+        counts: dict[str, int] | None = getattr(self._thread_state, "counts", None)
+        self._thread_state.root = None
+        self._thread_state.counts = None
+        with self._handoff_lock:
+            if root is not None:
+                self._handed_off_spans.merge(root)
+            for name, value in (counts or {}).items():
+                self._handed_off_counts[name] = self._handed_off_counts.get(name, 0) + value
+
+    def _take_handed_off(self) -> tuple[SpanNode, dict[str, int]]:
+        with self._handoff_lock:
+            spans, counts = self._handed_off_spans, self._handed_off_counts
+            self._handed_off_spans = SpanNode("frame")
+            self._handed_off_counts = {}
+        return spans, counts
 
     def start_frame(self) -> None:
         """Mark the start of a new frame."""
         if not self.enabled:
             return
+        self._frame_thread = threading.get_ident()
         self._frame_start_time = time.perf_counter()
         self.current_metrics = FrameMetrics(frame_time=0.0)
+        self._frame_spans = SpanNode("frame")
+        self._frame_counts = {}
+        if self.allocations is not None:
+            self.allocations.start_frame()
+        if self.watchdog is not None:
+            # Timed with the frame, so the cost of the capture shows up
+            with self.span("watchdog"):
+                self.watchdog.start_frame()
 
     def end_frame(self) -> None:
         """Mark the end of a frame and record its duration."""
@@ -66,32 +299,251 @@ class PerformanceMonitor:
         frame_time = time.perf_counter() - self._frame_start_time
         self.current_metrics.frame_time = frame_time
         self.frame_times.append(frame_time)
+        self.frame_stats.add(frame_time)
+        if self.trace is not None:
+            self.trace.record_span("frame", self._frame_start_time, frame_time, category="frame")
+
+        frame_spans = self._frame_spans
+        frame_counts = self._frame_counts
+        handed_off_spans, handed_off_counts = self._take_handed_off()
+        frame_spans.merge(handed_off_spans)
+        for name, value in handed_off_counts.items():
+            frame_counts[name] = frame_counts.get(name, 0) + value
+        for path, node in frame_spans.iter_paths():
+            stats = self.span_stats.get(path)
+            if stats is None:
+                stats = WindowStats(self.max_samples)
+                self.span_stats[path] = stats
+            stats.add(node.total_time)
+        self.last_frame_spans = frame_spans
+        self._frame_spans = SpanNode("frame")
+
+        for name, value in frame_counts.items():
+            stats = self.count_stats.get(name)
+            if stats is None:
+                stats = WindowStats(self.max_samples)
+                self.count_stats[name] = stats
+            stats.add(value)
+        self._frame_counts = {}
+
+        if self.watchdog is not None and frame_time > self.watchdog.budget:
+            spans = {path: node.total_time * 1000 for path, node in frame_spans.iter_paths()}
+            self.watchdog.check(frame_time, spans)
+
+        if self.gc_monitor is not None:
+            self._record_gc_pauses(self.gc_monitor)
+        if self.allocations is not None:
+            sample = self.allocations.end_frame()
+            if sample is not None:
+                self.last_allocation_sample = sample
+                self.alloc_block_stats.add(sample.blocks)
+                self.alloc_peak_stats.add(sample.peak)
+
+    def _record_gc_pauses(self, gc_monitor: GCMonitor) -> None:
+        collections = [0] * GC_GENERATIONS
+        pause_time = 0.0
+        for pause in gc_monitor.drain():
+            collections[pause.generation] += 1
+            pause_time += pause.duration
+            if self.trace is not None:
+                self.trace.record_span(
+                    f"gc gen{pause.generation}", pause.start, pause.duration, category="gc"
+                )
+        for stats, count in zip(self.gc_collection_stats, collections, strict=True):
+            stats.add(count)
+        self.gc_pause_stats.add(pause_time)
+
+    def begin_span(self, name: str) -> None:
+        """Enter a span nested inside the calling thread's current span.
+
+        Every call must be matched by :meth:`end_span` on the same thread;
+        prefer :meth:`span` or :meth:`timed`, which guarantee that.
+
+        Args:
+            name (str): Name of the span.
+        """
+        if not self.enabled:
+            return
+        stack = self._span_stack()
+        parent = stack[-1][0] if stack else self._span_root()
+        stack.append((parent.child(name), time.perf_counter()))
+
+    def end_span(self) -> float:
+        """Leave the calling thread's current span.
+
+        Returns:
+            float: Time spent in the span in seconds, or 0.0 when disabled.
+        """
+        if not self.enabled:
+            return 0.0
+        stack = self._span_stack()
+        if not stack:
+            return 0.0
+        node, start = stack.pop()
+        elapsed = time.perf_counter() - start
+        node.total_time += elapsed
+        node.calls += 1
+        if self.trace is not None:
+            self.trace.record_span(node.name, start, elapsed)
+
+        field_name = _FRAME_METRICS_FIELDS.get(node.name)
+        if not stack and field_name is not None:
+            metrics = self._metrics()
+            if metrics is not None:
+                setattr(metrics, field_name, elapsed)
+        return elapsed
+
+    def add_span(self, name: str, elapsed: float, calls: int = 1) -> None:
+        """Add time measured elsewhere as a span nested in the current span.
+
+        Useful for work timed in many small pieces, where entering a span for
+        every piece would cost more than the work itself. The time is not
+        recorded as a trace event since it has no single start.
+
+        Args:
+            name (str): Name of the span.
+            elapsed (float): Time to add in seconds.
+            calls (int): Number of pieces the time was measured over. Defaults to 1.
+        """
+        if not self.enabled:
+            return
+        stack = self._span_stack()
+        parent = stack[-1][0] if stack else self._span_root()
+        node = parent.child(name)
+        node.total_time += elapsed
+        node.calls += calls
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add ``value`` to the current frame's total for the counter ``name``.
+
+        Args:
+            name (str): Counter name, e.g. ``"cohesion_pairs"``.
+            value (int): Amount to add. Defaults to 1.
+        """
+        if not self.enabled:
+            return
+        counts = self._counts()
+        counts[name] = counts.get(name, 0) + value
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a span called ``name``.
+
+        Args:
+            name (str): Name of the span. Root-level spans named 'update',
+                'logic', 'collision' or 'render' also fill ``current_metrics``.
+        """
+        self.begin_span(name)
+        try:
+            yield
+        finally:
+            self.end_span()
+
+    def timed(self, name: str | None = None) -> Callable[[Callable[_P, _R]], Callable[_P, _R]]:
+        """Decorate a function so every call is timed as a span.
+
+        Args:
+            name (str | None): Span name. Defaults to the function's name.
+        """
+
+        def decorator(func: Callable[_P, _R]) -> Callable[_P, _R]:
+            span_name = name if name is not None else func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+                self.begin_span(span_name)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.end_span()
+
+            return wrapper
+
+        return decorator
 
     def start_operation(self) -> None:
         """Mark the start of a timed operation."""
         if not self.enabled:
             return
-        self._operation_start_time = time.perf_counter()
+        self._thread_state.operation_start = time.perf_counter()
 
     def end_operation(self, operation: str) -> None:
         """Mark the end of a timed operation and record its duration.
 
+        Operations are recorded as root-level spans, so any name is accepted.
+
         Args:
-            operation (str): Name of the operation. One of: 'update', 'logic',
-                'collision', 'render'.
+            operation (str): Name of the operation. 'update', 'logic',
+                'collision' and 'render' also fill ``current_metrics``.
         """
         if not self.enabled or self.current_metrics is None:
             return
-        elapsed = time.perf_counter() - self._operation_start_time
+        start = getattr(self._thread_state, "operation_start", 0.0)
+        elapsed = time.perf_counter() - start
+
+        node = self._span_root().child(operation)
+        node.total_time += elapsed
+        node.calls += 1
+        if self.trace is not None:
+            self.trace.record_span(operation, start, elapsed)
+
+        field_name = _FRAME_METRICS_FIELDS.get(operation)
+        metrics = self._metrics()
+        if field_name is not None and metrics is not None:
+            setattr(metrics, field_name, elapsed)
+
+    def get_avg_span_time(self, path: str) -> float:
+        """Average per-frame time of a span in milliseconds.
+
+        Args:
+            path (str): Span path, e.g. ``"logic"`` or ``"logic/grid"``.
+
+        Returns:
+            float: Average time in milliseconds over the frames in which the
+                span ran, or 0.0 if it has not been recorded.
+        """
+        stats = self.span_stats.get(path)
+        if stats is None:
+            return 0.0
+        return stats.mean * 1000
+
+    def get_span_percentile(self, path: str, percentile: float) -> float:
+        """Approximate percentile of a span's per-frame time in milliseconds.
+
+        Args:
+            path (str): Span path, e.g. ``"logic/grid"``.
+            percentile (float): Percentile between 0 and 100.
 
-        if operation == "update":
-            self.current_metrics.update_time = elapsed
-        elif operation == "logic":
-            self.current_metrics.logic_time = elapsed
-        elif operation == "collision":
-            self.current_metrics.collision_time = elapsed
-        elif operation == "render":
-            self.current_metrics.render_time = elapsed
+        Returns:
+            float: The percentile in milliseconds, or 0.0 if not recorded.
+        """
+        stats = self.span_stats.get(path)
+        if stats is None:
+            return 0.0
+        return stats.quantile(percentile / 100) * 1000
+
+    def get_avg_count(self, name: str) -> float:
+        """Average per-frame total of a counter.
+
+        Args:
+            name (str): Counter name.
+
+        Returns:
+            float: Average over the frames in which the counter was counted,
+                or 0.0 if it has not been recorded.
+        """
+        stats = self.count_stats.get(name)
+        if stats is None:
+            return 0.0
+        return stats.mean
+
+    def get_span_summary(self) -> dict[str, float]:
+        """Average per-frame time in milliseconds for every recorded span path.
+
+        Returns:
+            dict[str, float]: Mapping of span path to average milliseconds.
+        """
+        return {path: self.get_avg_span_time(path) for path in self.span_stats}
 
     def get_fps(self) -> float:
         """Calculate the current frames per second.
@@ -99,9 +551,7 @@ class PerformanceMonitor:
         Returns:
             float: Current FPS, or 0.0 if no samples available.
         """
-        if not self.frame_times:
-            return 0.0
-        avg_frame_time = sum(self.frame_times) / len(self.frame_times)
+        avg_frame_time = self.frame_stats.mean
         return 1.0 / avg_frame_time if avg_frame_time > 0 else 0.0
 
     def get_avg_frame_time(self) -> float:
@@ -110,9 +560,7 @@ class PerformanceMonitor:
         Returns:
             float: Average frame time in milliseconds, or 0.0 if no samples.
         """
-        if not self.frame_times:
-            return 0.0
-        return (sum(self.frame_times) / len(self.frame_times)) * 1000
+        return self.frame_stats.mean * 1000
 
     def get_min_frame_time(self) -> float:
         """Get the minimum frame time in milliseconds.
@@ -120,9 +568,7 @@ class PerformanceMonitor:
         Returns:
             float: Minimum frame time in milliseconds, or 0.0 if no samples.
         """
-        if not self.frame_times:
-            return 0.0
-        return min(self.frame_times) * 1000
+        return self.frame_stats.min * 1000
 
     def get_max_frame_time(self) -> float:
         """Get the maximum frame time in milliseconds.
@@ -130,24 +576,95 @@ class PerformanceMonitor:
         Returns:
             float: Maximum frame time in milliseconds, or 0.0 if no samples.
         """
-        if not self.frame_times:
-            return 0.0
-        return max(self.frame_times) * 1000
+        return self.frame_stats.max * 1000
+
+    def get_frame_time_percentile(self, percentile: float) -> float:
+        """Approximate a frame time percentile in milliseconds.
+
+        Args:
+            percentile (float): Percentile between 0 and 100.
+
+        Returns:
+            float: The percentile in milliseconds, or 0.0 if no samples.
+        """
+        return self.frame_stats.quantile(percentile / 100) * 1000
+
+    def get_gc_collections(self, generation: int) -> int:
+        """Number of collections of a generation over the recent frames.
+
+        Args:
+            generation (int): GC generation, 0 to 2.
+
+        Returns:
+            int: Collections in the sample window, or 0 if GC is not monitored.
+        """
+        stats = self.gc_collection_stats[generation]
+        return round(stats.mean * len(stats))
+
+    def get_avg_gc_pause(self) -> float:
+        """Average per-frame garbage collection pause in milliseconds."""
+        return self.gc_pause_stats.mean * 1000
+
+    def get_max_gc_pause(self) -> float:
+        """Longest per-frame garbage collection pause in milliseconds."""
+        return self.gc_pause_stats.max * 1000
 
     def get_performance_summary(self) -> dict[str, float]:
         """Get a summary of performance metrics.
 
+        Frame time keys are followed by ``<span path>_avg_ms``,
+        ``<span path>_p50_ms`` ... ``<span path>_max_ms`` for every span and
+        ``<counter>_avg`` for every counter, then ``gc_*`` keys when GC is
+        monitored, ``alloc_*`` keys once an allocation sample has been taken
+        and ``watchdog_slow_frames`` with a watchdog.
+
         Returns:
             dict[str, float]: Dictionary containing FPS and timing statistics.
         """
-        return {
+        summary = {
             "fps": self.get_fps(),
             "avg_frame_time_ms": self.get_avg_frame_time(),
             "min_frame_time_ms": self.get_min_frame_time(),
             "max_frame_time_ms": self.get_max_frame_time(),
         }
+        for percentile in SUMMARY_PERCENTILES:
+            summary[f"p{percentile}_frame_time_ms"] = self.get_frame_time_percentile(percentile)
+
+        for path, stats in self.span_stats.items():
+            summary[f"{path}_avg_ms"] = stats.mean * 1000
+            for percentile in SUMMARY_PERCENTILES:
+                summary[f"{path}_p{percentile}_ms"] = stats.quantile(percentile / 100) * 1000
+            summary[f"{path}_max_ms"] = stats.max * 1000
+        for name, stats in self.count_stats.items():
+            summary[f"{name}_avg"] = stats.mean
+
+        if self.gc_monitor is not None:
+            for generation in range(GC_GENERATIONS):
+                summary[f"gc_gen{generation}_collections"] = self.get_gc_collections(generation)
+            summary["gc_pause_avg_ms"] = self.get_avg_gc_pause()
+            summary["gc_pause_max_ms"] = self.get_max_gc_pause()
+        if self.watchdog is not None:
+            summary["watchdog_slow_frames"] = self.watchdog.slow_frames
+        if len(self.alloc_block_stats):
+            summary["alloc_blocks_avg"] = self.alloc_block_stats.mean
+            summary["alloc_peak_kb_avg"] = self.alloc_peak_stats.mean / 1024
+            summary["alloc_peak_kb_max"] = self.alloc_peak_stats.max / 1024
+        return summary
 
     def reset(self) -> None:
         """Clear all collected metrics."""
         self.frame_times.clear()
+        self.frame_stats.clear()
         self.current_metrics = None
+        self.span_stats.clear()
+        self.last_frame_spans = None
+        self._frame_spans = SpanNode("frame")
+        self.count_stats.clear()
+        self._frame_counts = {}
+        self._take_handed_off()
+        for stats in self.gc_collection_stats:
+            stats.clear()
+        self.gc_pause_stats.clear()
+        self.last_allocation_sample = None
+        self.alloc_block_stats.clear()
+        self.alloc_peak_stats.clear()
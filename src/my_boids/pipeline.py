@@ -0,0 +1,151 @@
+"""Pipelined simulation support: a background simulation thread and frame handoff.
+
+The simulation steps on a worker thread and publishes immutable snapshots of
+everything the renderer needs. The pygame thread renders whichever snapshot is
+newest while the next simulation step is already running, so the cost of a
+frame becomes max(sim, render) instead of sim + render.
+"""
+
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import pygame as pg
+
+from my_boids.analytics import FlockMetrics
+from my_boids.clusters import Clusters
+from my_boids.options import PredatorAttackMode, PredatorBehaviorMode
+from my_boids.performance import FrameMetrics
+from my_boids.spatial_grid import GridQueryStats
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """Immutable view of the simulation state needed to render one frame.
+
+    Attributes:
+        step: Simulation step that produced the snapshot.
+        blit_sequence: (image, topleft) pairs for every sprite, in draw order.
+        score: Current score.
+        game_over: Whether the game has ended.
+        predator_behavior_mode: Active predator behavior mode.
+        predator_attack_mode: Active predator attack mode.
+        boid_count: Number of live boids.
+        density: Pre-rendered density heatmap replacing the boid sprites, or
+            None when the boids are drawn individually.
+        grid_stats: Spatial grid query statistics of the step, or None when
+            the grid is disabled.
+        grid_cells: Occupied spatial grid cells of the step, or None when the
+            grid is disabled.
+        step_metrics: Update, logic and collision times of the step, or None
+            when performance monitoring is disabled.
+        flock_metrics: Latest flock metrics to show in the HUD, or None.
+        clusters: Clusters of the step to show in the HUD, or None.
+    """
+
+    step: int
+    blit_sequence: tuple[tuple[pg.Surface, tuple[int, int]], ...]
+    score: int
+    game_over: bool
+    predator_behavior_mode: PredatorBehaviorMode
+    predator_attack_mode: PredatorAttackMode
+    boid_count: int
+    density: pg.Surface | None = None
+    grid_stats: GridQueryStats | None = None
+    grid_cells: int | None = None
+    step_metrics: FrameMetrics | None = None
+    flock_metrics: FlockMetrics | None = None
+    clusters: Clusters | None = None
+
+    def draw(self, surface: pg.Surface) -> None:
+        """Draw the captured sprites, mirroring ``pg.sprite.Group.draw``."""
+        surface.blits(self.blit_sequence, doreturn=False)
+
+
+class SnapshotBuffer:
+    """Triple buffer handing snapshots from one writer to one reader.
+
+    The writer fills the slot after the published one and then publishes it by
+    rebinding a single index, which is atomic under the GIL, so neither side
+    ever takes a lock. Snapshots are immutable, so a reader holding an older
+    slot can never observe a half-written frame.
+    """
+
+    def __init__(self) -> None:
+        self._slots: list[FrameSnapshot | None] = [None, None, None]
+        self._published = 0
+
+    def publish(self, snapshot: FrameSnapshot) -> None:
+        """Make ``snapshot`` the latest frame visible to the reader."""
+        write_index = (self._published + 1) % len(self._slots)
+        self._slots[write_index] = snapshot
+        self._published = write_index
+
+    def latest(self) -> FrameSnapshot | None:
+        """Return the most recently published snapshot, if any."""
+        return self._slots[self._published]
+
+
+class SimulationThread(threading.Thread):
+    """Worker thread that advances the simulation one step per request.
+
+    The render loop calls :meth:`request_step` once per frame. Requests that
+    arrive while a step is still running collapse into one, so a slow
+    simulation never builds a backlog and the renderer simply redraws the
+    latest snapshot.
+
+    Attributes:
+        lock (threading.Lock): Held for the duration of every step. Code on
+            other threads must hold it while mutating simulation state
+            (event handling, option changes, resets).
+        buffer (SnapshotBuffer): Where finished snapshots are published.
+    """
+
+    def __init__(
+        self,
+        step: Callable[[], None],
+        snapshot: Callable[[], FrameSnapshot],
+        handoff: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the simulation thread.
+
+        Args:
+            step: Advances the simulation by one step (e.g. ``Game.run_logic``).
+            snapshot: Captures the current state (e.g. ``Game.snapshot``).
+            handoff: Called on the worker after every step, before its
+                snapshot is published (e.g.
+                ``PerformanceMonitor.hand_off_thread_spans``). Defaults to None.
+        """
+        super().__init__(name="boids-simulation", daemon=True)
+        self._step = step
+        self._snapshot = snapshot
+        self._handoff = handoff
+        self._step_requested = threading.Event()
+        self._stopping = False
+        self.lock = threading.Lock()
+        self.buffer = SnapshotBuffer()
+        self.buffer.publish(snapshot())
+
+    def request_step(self) -> None:
+        """Ask the worker to compute the next simulation step."""
+        self._step_requested.set()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the worker and wait for the current step to finish."""
+        self._stopping = True
+        self._step_requested.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self) -> None:
+        while True:
+            self._step_requested.wait()
+            self._step_requested.clear()
+            if self._stopping:
+                return
+            with self.lock:
+                self._step()
+                snapshot = self._snapshot()
+            if self._handoff is not None:
+                self._handoff()
+            self.buffer.publish(snapshot)
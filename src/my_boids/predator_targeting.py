@@ -1,8 +1,10 @@
 """Predator target selection strategies."""
 
+import numpy as np
 import pygame as pg
 
 from my_boids.boids import Boid
+from my_boids.clusters import Clusters
 
 
 def target_mouse_cursor() -> pg.Vector2:
@@ -50,3 +52,28 @@ def target_most_isolated_bird(boids: list[Boid], fallback: pg.Vector2) -> pg.Vec
 
     isolated_boid = max(boids, key=nearest_neighbor_distance)
     return pg.Vector2(isolated_boid.pos)
+
+
+def target_nearest_cluster(
+    predator_pos: pg.Vector2,
+    positions: np.ndarray,
+    clusters: Clusters,
+) -> pg.Vector2:
+    """Target the centroid of the cluster nearest to the predator.
+
+    Args:
+        predator_pos (pg.Vector2): Predator position.
+        positions (np.ndarray): Boid positions as an (n, 2) array.
+        clusters (Clusters): Clusters found from ``positions``.
+
+    Returns:
+        pg.Vector2: Centroid of the cluster with the boid closest to the
+            predator, or the predator's own position when no boids remain.
+    """
+    if len(positions) == 0:
+        return pg.Vector2(predator_pos)
+
+    offsets = positions - (predator_pos.x, predator_pos.y)
+    nearest = int(np.argmin(np.einsum("ij,ij->i", offsets, offsets)))
+    center = clusters.centroids(positions)[clusters.labels[nearest]]
+    return pg.Vector2(float(center[0]), float(center[1]))
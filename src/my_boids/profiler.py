@@ -0,0 +1,123 @@
+"""On-demand cProfile capture for a bounded window of frames.
+
+Profiling a whole session under ``python -m cProfile`` mixes startup and UI
+noise into the numbers. :class:`ProfileCapture` instead starts the profiler
+from a running game, stops it after a fixed number of frames and writes both
+the raw ``.prof`` stats (for snakeviz, ``pstats`` etc.) and a top-N text
+summary.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+from pathlib import Path
+
+DEFAULT_PROFILE_FRAMES = 300
+DEFAULT_PROFILE_TOP_N = 30
+
+
+class ProfileCapture:
+    """Profile the next N frames and write the results to disk.
+
+    cProfile only observes the thread that starts it, so in pipelined mode
+    the capture covers the render thread; profile the simulation with the
+    pipeline disabled.
+
+    Attributes:
+        output_dir (Path): Directory that profile files are written to.
+        frames (int): Default number of frames per capture.
+        top_n (int): Number of functions listed in the text summary.
+        frames_remaining (int): Frames left in the current capture.
+        last_output (Path | None): ``.prof`` file written by the last capture.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path = "profiles",
+        frames: int = DEFAULT_PROFILE_FRAMES,
+        top_n: int = DEFAULT_PROFILE_TOP_N,
+    ):
+        """Initialize the profile capture.
+
+        Args:
+            output_dir (str | Path): Directory for profile files.
+                Defaults to "profiles".
+            frames (int): Default capture length in frames. Defaults to 300.
+            top_n (int): Functions listed in the text summary. Defaults to 30.
+        """
+        self.output_dir = Path(output_dir)
+        self.frames = frames
+        self.top_n = top_n
+        self.frames_remaining = 0
+        self.last_output: Path | None = None
+        self._profile: cProfile.Profile | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether a capture is in progress."""
+        return self._profile is not None
+
+    def start(self, frames: int | None = None) -> None:
+        """Start profiling for ``frames`` frames (defaults to ``self.frames``).
+
+        Does nothing if a capture is already running.
+        """
+        if self._profile is not None:
+            return
+        self.frames_remaining = frames if frames is not None else self.frames
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def end_frame(self) -> Path | None:
+        """Count a finished frame, stopping the capture after the last one.
+
+        Returns:
+            Path | None: The written ``.prof`` file when this frame completed
+                the capture, otherwise None.
+        """
+        if self._profile is None:
+            return None
+        self.frames_remaining -= 1
+        if self.frames_remaining > 0:
+            return None
+        return self.stop()
+
+    def stop(self) -> Path | None:
+        """Stop profiling now and write the results.
+
+        Writes ``profile-<timestamp>.prof`` and a matching ``.txt`` summary of
+        the top functions by cumulative time. A capture ending in the same
+        second as an earlier one gets a ``-2``, ``-3``, ... suffix.
+
+        Returns:
+            Path | None: The written ``.prof`` file, or None if not profiling.
+        """
+        profile = self._profile
+        if profile is None:
+            return None
+        profile.disable()
+        self._profile = None
+        self.frames_remaining = 0
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = self._unique_stem(f"profile-{time.strftime('%Y%m%d-%H%M%S')}")
+        prof_path = self.output_dir / f"{stem}.prof"
+        profile.dump_stats(prof_path)
+
+        summary = io.StringIO()
+        stats = pstats.Stats(profile, stream=summary)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+        (self.output_dir / f"{stem}.txt").write_text(summary.getvalue())
+
+        self.last_output = prof_path
+        return prof_path
+
+    def _unique_stem(self, base: str) -> str:
+        """``base``, or the first of ``base-2``, ``base-3``, ... not yet written."""
+        stem = base
+        number = 1
+        while any((self.output_dir / f"{stem}{suffix}").exists() for suffix in (".prof", ".txt")):
+            number += 1
+            stem = f"{base}-{number}"
+        return stem
@@ -0,0 +1,616 @@
+"""Memory-mapped trajectory recording.
+
+A trajectory file holds the full state of every recorded step: the position,
+velocity and alive flag of every boid, the predator's position and velocity,
+and the score. Its layout, every section aligned to 64 bytes:
+
+- the magic bytes ``\\x93BOIDTRJ`` and the header length as a little-endian
+  uint32
+- a JSON header: format version, number of boid slots, recording interval,
+  world size, number of recorded steps and the game options
+- one RGB color per slot, as uint8
+- one fixed-size record per step, laid out by :func:`record_dtype`
+
+Every boid is given a slot the first time it is recorded and keeps it until
+the game is reset, so a boid's trajectory is one column of the file. Slots of
+boids the predator caught are marked dead in the alive mask.
+
+The records are preallocated in a memory-mapped file that doubles in size
+when full, and each step is written as a few array assignments straight into
+the mapping, so recording costs little more than reading the positions out of
+the sprites. The file is truncated to the recorded steps on close.
+
+With a :class:`~my_boids.trajectory_codec.TrajectoryCodec`, the records are
+instead buffered in memory and appended as compressed chunks, each followed
+on flush by an index of every chunk's offset, length and step count, which
+the header points to. :func:`open_trajectory` reads both kinds of file, and
+decodes compressed chunks as they are accessed.
+"""
+
+import json
+import operator
+import struct
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from my_boids.boids import MAX_SPEED, Boid
+from my_boids.predator import Predator
+from my_boids.trajectory_codec import (
+    Quantization,
+    TrajectoryCodec,
+    decode_chunk,
+    encode_chunk,
+)
+
+TRAJECTORY_MAGIC = b"\x93BOIDTRJ"
+TRAJECTORY_FORMAT_VERSION = 1
+# Sections start at multiples of this many bytes
+TRAJECTORY_ALIGNMENT = 64
+# Spare header bytes, so the header can be rewritten as the step count grows
+_HEADER_RESERVE = 64
+_LENGTH = struct.Struct("<I")
+# Decoded chunks kept in memory by a compressed trajectory reader
+_CACHED_CHUNKS = 4
+
+
+def record_dtype(slots: int) -> np.dtype:
+    """Structured dtype of one recorded step for ``slots`` boids.
+
+    The fields are ``step`` and ``score`` (int64), ``predator_pos`` and
+    ``predator_vel`` (float64, (2,)), ``positions`` and ``velocities``
+    (float64, (slots, 2)) and ``alive`` (bool, (slots,)). Records are padded
+    to a multiple of 8 bytes, so the float fields of every record stay aligned.
+    """
+    fields: list[tuple[str, str, tuple[int, ...]]] = [
+        ("step", "<i8", ()),
+        ("score", "<i8", ()),
+        ("predator_pos", "<f8", (2,)),
+        ("predator_vel", "<f8", (2,)),
+        ("positions", "<f8", (slots, 2)),
+        ("velocities", "<f8", (slots, 2)),
+        ("alive", "?", (slots,)),
+    ]
+    names, formats, offsets = [], [], []
+    offset = 0
+    for name, base, shape in fields:
+        field_dtype = np.dtype((base, shape)) if shape else np.dtype(base)
+        names.append(name)
+        formats.append(field_dtype)
+        offsets.append(offset)
+        offset += field_dtype.itemsize
+    itemsize = -(-offset // 8) * 8
+    return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": itemsize})
+
+
+def _align(offset: int) -> int:
+    return -(-offset // TRAJECTORY_ALIGNMENT) * TRAJECTORY_ALIGNMENT
+
+
+def _encode_header(header: dict[str, Any], size: int | None = None) -> bytes:
+    """Encode the header, padded with spaces to ``size`` bytes or to the next alignment."""
+    data = json.dumps(header).encode()
+    if size is None:
+        size = _align(len(TRAJECTORY_MAGIC) + _LENGTH.size + len(data) + _HEADER_RESERVE)
+    length = size - len(TRAJECTORY_MAGIC) - _LENGTH.size
+    if len(data) > length:
+        raise ValueError("Trajectory header outgrew its reserved space")
+    return TRAJECTORY_MAGIC + _LENGTH.pack(length) + data.ljust(length)
+
+
+def read_trajectory_header(path: str | Path) -> tuple[dict[str, Any], int]:
+    """Read the JSON header of a trajectory file.
+
+    Args:
+        path (str | Path): Trajectory file.
+
+    Returns:
+        tuple[dict[str, Any], int]: The header, and the offset of the color
+            block that follows it.
+
+    Raises:
+        ValueError: If the file is not a trajectory or its format version is
+            not supported.
+    """
+    with open(path, "rb") as file_handle:
+        magic = file_handle.read(len(TRAJECTORY_MAGIC))
+        if magic != TRAJECTORY_MAGIC:
+            raise ValueError(f"{path} is not a trajectory file")
+        (length,) = _LENGTH.unpack(file_handle.read(_LENGTH.size))
+        header = json.loads(file_handle.read(length))
+    if header.get("format_version") != TRAJECTORY_FORMAT_VERSION:
+        raise ValueError(f"Unsupported trajectory format version: {header.get('format_version')}")
+    return header, len(TRAJECTORY_MAGIC) + _LENGTH.size + length
+
+
+class TrajectoryRecorder:
+    """Record every k-th simulation step into a memory-mapped trajectory file.
+
+    Attach it to a game with ``Game.start_recording``, which also records the
+    current step, and detach it with ``Game.stop_recording``.
+
+    Attributes:
+        codec (TrajectoryCodec | None): Compression settings, or None for
+            raw memory-mapped records.
+        every (int): Record one step out of this many simulation steps.
+        slots (int): Number of boid slots, fixed when recording starts.
+        steps_recorded (int): Steps written so far.
+        boids_untracked (int): Boids seen after every slot was taken. They
+            are left out of the recording.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        every: int = 1,
+        initial_capacity: int = 256,
+        codec: TrajectoryCodec | None = None,
+    ):
+        """Initialize the recorder.
+
+        Args:
+            path (str | Path): Destination file. It is overwritten.
+            every (int): Recording interval in simulation steps. Defaults to 1.
+            initial_capacity (int): Steps to preallocate for raw records. The
+                file doubles in size whenever it fills up. Defaults to 256.
+            codec (TrajectoryCodec | None): Write compressed chunks with
+                these settings. Defaults to None, raw records.
+        """
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        if initial_capacity < 1:
+            raise ValueError("initial_capacity must be at least 1")
+        self.path = Path(path)
+        self.codec = codec
+        self.every = every
+        self.slots = 0
+        self.steps_recorded = 0
+        self.boids_untracked = 0
+        self._capacity = initial_capacity
+        self._header: dict[str, Any] = {}
+        self._header_size = 0
+        self._records_offset = 0
+        self._records: np.memmap | None = None
+        self._colors: np.memmap | None = None
+        self._slot_of: dict[Boid, int] = {}
+        self._next_slot = 0
+        # The last recorded boids and the slot of every one of them, looked
+        # up again whenever the boids differ from the last step's
+        self._slot_boids: list[Boid] = []
+        self._slot_index: np.ndarray | None = None
+        self._slots_in_order = False
+        # Compressed recordings: the records of the chunk being filled, and
+        # the offset, length and record count of every written chunk
+        self._quantization: Quantization | None = None
+        self._chunk: np.ndarray | None = None
+        self._chunk_rows = 0
+        self._chunk_index: list[tuple[int, int, int]] = []
+        self._chunks_end = 0
+
+    @property
+    def recording(self) -> bool:
+        """Whether the recorder has been started and not closed."""
+        return self._colors is not None
+
+    def start(
+        self,
+        slots: int,
+        winsize: tuple[int, int],
+        options: dict[str, Any] | None = None,
+        velocity_limit: float = MAX_SPEED,
+    ) -> None:
+        """Create the file and map it.
+
+        Args:
+            slots (int): Number of boid slots.
+            winsize (tuple[int, int]): World size.
+            options (dict[str, Any] | None): Game options stored in the header.
+            velocity_limit (float): Boid speed limit, which sets the velocity
+                range of compressed recordings. Defaults to ``MAX_SPEED``.
+
+        Raises:
+            ValueError: If ``slots`` is less than 1, or the codec's error
+                bounds are finer than it can represent.
+        """
+        if self.recording:
+            return
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        self.slots = slots
+        self._header = {
+            "format_version": TRAJECTORY_FORMAT_VERSION,
+            "slots": slots,
+            "every": self.every,
+            "winsize": list(winsize),
+            "steps": 0,
+            "options": options or {},
+            "codec": None,
+        }
+        if self.codec is not None:
+            self._quantization = self.codec.quantization(winsize, velocity_limit)
+            self._header["codec"] = self.codec.to_header(self._quantization)
+            # Reserve room for the index location, written on flush
+            self._header["index_offset"] = 2**62
+            self._header["chunks"] = 2**31
+        header = _encode_header(self._header)
+        self._header_size = len(header)
+        self._records_offset = _align(self._header_size + 3 * slots)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "wb") as file_handle:
+            file_handle.write(header)
+            file_handle.truncate(self._file_size(0 if self.codec else self._capacity))
+        self._colors = np.memmap(
+            self.path, dtype=np.uint8, mode="r+", offset=self._header_size, shape=(slots, 3)
+        )
+        if self.codec is None:
+            self._map_records()
+        else:
+            self._chunk = np.zeros(self.codec.keyframe_every, dtype=record_dtype(slots))
+            self._chunk_index = []
+            self._chunks_end = self._records_offset
+            self._header["index_offset"] = self._records_offset
+            self._header["chunks"] = 0
+            self._write_header()
+
+    def should_record(self, step: int) -> bool:
+        """Whether ``step`` is due for recording."""
+        return step % self.every == 0
+
+    def record(self, step: int, boids: Iterable[Boid], predator: Predator, score: int) -> None:
+        """Append one step.
+
+        Args:
+            step (int): Simulation step.
+            boids (Iterable[Boid]): Live boids.
+            predator (Predator): The predator.
+            score (int): Current score.
+        """
+        if not self.recording:
+            raise RuntimeError("The recorder has not been started")
+
+        boids = list(boids)
+        count = len(boids)
+        if self._slot_index is None or not self._same_boids(boids):
+            self._slot_index = np.fromiter(
+                (self._slot(boid) for boid in boids), dtype=np.intp, count=count
+            )
+            self._slot_boids = boids
+            self._slots_in_order = bool(
+                np.array_equal(self._slot_index, np.arange(count, dtype=np.intp))
+            )
+        slot_index = self._slot_index
+        tracked = slot_index >= 0
+
+        positions = np.fromiter(
+            chain.from_iterable(boid.pos for boid in boids), dtype=np.float64, count=2 * count
+        ).reshape(count, 2)
+        velocities = np.fromiter(
+            chain.from_iterable(boid.vel for boid in boids), dtype=np.float64, count=2 * count
+        ).reshape(count, 2)
+
+        row = self._next_row()
+        row["step"] = step
+        row["score"] = score
+        row["predator_pos"][0] = tuple(predator.pos)
+        row["predator_vel"][0] = tuple(predator.vel)
+        alive = row["alive"][0]
+        alive[:] = False
+        if self._slots_in_order:
+            # Nobody died since the slots were handed out: plain slices
+            row["positions"][0, :count] = positions
+            row["velocities"][0, :count] = velocities
+            alive[:count] = True
+        elif tracked.all():
+            row["positions"][0, slot_index] = positions
+            row["velocities"][0, slot_index] = velocities
+            alive[slot_index] = True
+        else:
+            row["positions"][0, slot_index[tracked]] = positions[tracked]
+            row["velocities"][0, slot_index[tracked]] = velocities[tracked]
+            alive[slot_index[tracked]] = True
+        self.steps_recorded += 1
+        if self._chunk is not None:
+            self._chunk_rows += 1
+            if self._chunk_rows == len(self._chunk):
+                self._write_chunk()
+
+    def reset_slots(self) -> None:
+        """Hand out slots from the first one again, for a new flock after a reset."""
+        self._slot_of.clear()
+        self._next_slot = 0
+        self._slot_boids = []
+        self._slot_index = None
+
+    def flush(self) -> None:
+        """Write the recorded steps to disk and update the header's step count.
+
+        A compressed recording also writes the steps buffered so far as a
+        chunk, and a new chunk index after it.
+        """
+        if self._colors is None:
+            return
+        self._colors.flush()
+        if self._records is not None:
+            self._records.flush()
+        else:
+            self._write_chunk()
+            self._write_chunk_index()
+        self._write_header()
+
+    def close(self) -> None:
+        """Flush, unmap and truncate the file to the recorded steps."""
+        if self._colors is None:
+            return
+        self.flush()
+        self._colors = None
+        if self._records is not None:
+            self._records = None
+            with open(self.path, "r+b") as file_handle:
+                file_handle.truncate(self._file_size(self.steps_recorded))
+        self._chunk = None
+
+    def _next_row(self) -> np.ndarray:
+        """The one-record slice the next step is written into."""
+        if self._chunk is not None:
+            return self._chunk[self._chunk_rows : self._chunk_rows + 1]
+        if self.steps_recorded == self._capacity:
+            self._grow()
+        assert self._records is not None
+        return self._records[self.steps_recorded : self.steps_recorded + 1]
+
+    def _write_chunk(self) -> None:
+        if self._chunk is None or self._chunk_rows == 0:
+            return
+        assert self.codec is not None and self._quantization is not None
+        data = encode_chunk(self._chunk[: self._chunk_rows], self.codec, self._quantization)
+        with open(self.path, "r+b") as file_handle:
+            file_handle.seek(self._chunks_end)
+            file_handle.write(data)
+        self._chunk_index.append((self._chunks_end, len(data), self._chunk_rows))
+        self._chunks_end += len(data)
+        self._chunk_rows = 0
+
+    def _write_chunk_index(self) -> None:
+        # Later chunks go after this index rather than over it, so if
+        # recording is interrupted the header still points to the complete
+        # index of the last flush
+        index = np.array(self._chunk_index, dtype="<i8").reshape(-1, 3)
+        with open(self.path, "r+b") as file_handle:
+            file_handle.seek(self._chunks_end)
+            file_handle.write(index.tobytes())
+        self._header["index_offset"] = self._chunks_end
+        self._header["chunks"] = len(self._chunk_index)
+        self._chunks_end += index.nbytes
+
+    def _same_boids(self, boids: list[Boid]) -> bool:
+        """Whether ``boids`` are the last recorded boids, in the same order."""
+        return len(boids) == len(self._slot_boids) and all(
+            map(operator.is_, boids, self._slot_boids)
+        )
+
+    def _slot(self, boid: Boid) -> int:
+        slot = self._slot_of.get(boid)
+        if slot is None:
+            if self._next_slot >= self.slots:
+                self.boids_untracked += 1
+                slot = -1
+            else:
+                slot = self._next_slot
+                self._next_slot += 1
+                assert self._colors is not None
+                self._colors[slot] = (boid.color.r, boid.color.g, boid.color.b)
+            self._slot_of[boid] = slot
+        return slot
+
+    def _file_size(self, steps: int) -> int:
+        return self._records_offset + steps * record_dtype(self.slots).itemsize
+
+    def _map_records(self) -> None:
+        self._records = np.memmap(
+            self.path,
+            dtype=record_dtype(self.slots),
+            mode="r+",
+            offset=self._records_offset,
+            shape=(self._capacity,),
+        )
+
+    def _grow(self) -> None:
+        assert self._records is not None
+        self._records.flush()
+        self._records = None
+        self._capacity *= 2
+        with open(self.path, "r+b") as file_handle:
+            file_handle.truncate(self._file_size(self._capacity))
+        self._map_records()
+        self._write_header()
+
+    def _write_header(self) -> None:
+        self._header["steps"] = self.steps_recorded
+        with open(self.path, "r+b") as file_handle:
+            file_handle.write(_encode_header(self._header, self._header_size))
+
+
+class CompressedRecords:
+    """Records of a compressed trajectory, decoded one chunk at a time.
+
+    Indexing with an int or a slice decodes only the chunks holding those
+    records, and the last few decoded chunks are cached, so stepping through
+    a recording decodes every chunk once. Indexing with a field name decodes
+    the whole recording.
+
+    Attributes:
+        dtype (np.dtype): Record layout, from :func:`record_dtype`.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        index: np.ndarray,
+        dtype: np.dtype,
+        codec: TrajectoryCodec,
+        quantization: Quantization,
+    ):
+        """Initialize the reader.
+
+        Args:
+            data (np.ndarray): The whole file, as a uint8 memory map.
+            index (np.ndarray): Offset, length and record count of every
+                chunk, as a (chunks, 3) int64 array.
+            dtype (np.dtype): Record layout.
+            codec (TrajectoryCodec): Compression settings.
+            quantization (Quantization): Fixed-point mapping.
+        """
+        self.dtype = dtype
+        self._data = data
+        self._index = index
+        self._codec = codec
+        self._quantization = quantization
+        # Index of the first record of every chunk, and the record count
+        self._starts = np.concatenate(([0], np.cumsum(index[:, 2])))
+        self._cache: dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    def __getitem__(self, key: int | slice | str) -> Any:
+        if isinstance(key, str):
+            return self[:][key]
+        if isinstance(key, slice):
+            indices = np.arange(len(self))[key]
+            if len(indices) == 0:
+                return np.zeros(0, dtype=self.dtype)
+            chunks = np.searchsorted(self._starts, indices, side="right") - 1
+            first, last = int(chunks.min()), int(chunks.max())
+            decoded = np.concatenate([self.chunk(chunk) for chunk in range(first, last + 1)])
+            return decoded[indices - self._starts[first]]
+        length = len(self)
+        if not -length <= key < length:
+            raise IndexError(f"record {key} is out of range for {length} records")
+        key %= length
+        chunk = int(np.searchsorted(self._starts, key, side="right")) - 1
+        return self.chunk(chunk)[key - self._starts[chunk]]
+
+    def chunk(self, chunk: int) -> np.ndarray:
+        """Decode one chunk.
+
+        Args:
+            chunk (int): Chunk number.
+
+        Returns:
+            np.ndarray: The chunk's records.
+        """
+        records = self._cache.get(chunk)
+        if records is None:
+            offset, size, count = (int(value) for value in self._index[chunk])
+            data = self._data[offset : offset + size].tobytes()
+            records = decode_chunk(data, count, self.dtype, self._codec, self._quantization)
+            if len(self._cache) >= _CACHED_CHUNKS:
+                del self._cache[next(iter(self._cache))]
+            self._cache[chunk] = records
+        return records
+
+
+@dataclass(frozen=True)
+class Trajectory:
+    """A recorded trajectory, memory-mapped read-only.
+
+    Nothing is read until it is accessed, so opening a file of any size is
+    instant. The array attributes of a raw recording are views of the file,
+    indexed by recorded step first; those of a compressed recording decode
+    the whole file.
+
+    Attributes:
+        path: The trajectory file.
+        slots: Number of boid slots.
+        every: Recording interval in simulation steps.
+        winsize: World size.
+        options: Game options the recording was made with.
+        colors: RGB color of every slot, as a (slots, 3) uint8 array.
+        records: Every recorded step, laid out by :func:`record_dtype`,
+            decoded on access for a compressed recording.
+    """
+
+    path: Path
+    slots: int
+    every: int
+    winsize: tuple[int, int]
+    options: dict[str, Any]
+    colors: np.ndarray
+    records: np.ndarray | CompressedRecords
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def steps(self) -> np.ndarray:
+        """Simulation step of every record."""
+        return self.records["step"]
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Boid positions, as a (records, slots, 2) array."""
+        return self.records["positions"]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """Boid velocities, as a (records, slots, 2) array."""
+        return self.records["velocities"]
+
+    @property
+    def alive(self) -> np.ndarray:
+        """Alive mask, as a (records, slots) array."""
+        return self.records["alive"]
+
+
+def open_trajectory(path: str | Path) -> Trajectory:
+    """Memory-map a trajectory file for reading.
+
+    Args:
+        path (str | Path): Trajectory file.
+
+    Returns:
+        Trajectory: The recording.
+
+    Raises:
+        ValueError: If the file is not a trajectory or its format version is
+            not supported.
+    """
+    path = Path(path)
+    header, colors_offset = read_trajectory_header(path)
+    slots = header["slots"]
+    records_offset = _align(colors_offset + 3 * slots)
+    steps = header["steps"]
+    colors = np.memmap(path, dtype=np.uint8, mode="r", offset=colors_offset, shape=(slots, 3))
+    records: np.ndarray | CompressedRecords
+    if header.get("codec"):
+        codec, quantization = TrajectoryCodec.from_header(header["codec"])
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        index_offset = header["index_offset"]
+        index = data[index_offset : index_offset + 24 * header["chunks"]]
+        records = CompressedRecords(
+            data,
+            np.frombuffer(index.tobytes(), dtype="<i8").reshape(-1, 3),
+            record_dtype(slots),
+            codec,
+            quantization,
+        )
+    elif steps:
+        records = np.memmap(
+            path, dtype=record_dtype(slots), mode="r", offset=records_offset, shape=(steps,)
+        )
+    else:
+        # A zero-length mapping is not allowed
+        records = np.zeros(0, dtype=record_dtype(slots))
+    return Trajectory(
+        path=path,
+        slots=slots,
+        every=header["every"],
+        winsize=(header["winsize"][0], header["winsize"][1]),
+        options=header["options"],
+        colors=colors,
+        records=records,
+    )
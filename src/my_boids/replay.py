@@ -0,0 +1,240 @@
+"""Replay of recorded trajectories through the game's renderer and HUD.
+
+The trajectory stays memory-mapped while it plays: every frame reads just the
+one record it shows, so a recording of any size opens instantly and only the
+pages that were played take up memory. A compressed recording is decoded a
+chunk of steps at a time as playback reaches it.
+
+Keys:
+
+- ``SPACE``: pause or resume
+- ``RIGHT`` / ``LEFT``: step one recorded step forward or back, pausing
+- ``UP`` / ``DOWN``: double or halve the speed
+- ``PAGEDOWN`` / ``PAGEUP``: seek a tenth of the recording forward or back
+- ``HOME`` / ``END``: seek to the first or last recorded step
+"""
+
+import numpy as np
+import pygame as pg
+
+from my_boids.capture import FrameCapture
+from my_boids.heatmap import density_histogram, render_density
+from my_boids.hud import draw_frame, draw_replay_status
+from my_boids.options import BoidOptions, PerformanceOptions, PredatorOptions
+from my_boids.performance import PerformanceMonitor
+from my_boids.pipeline import FrameSnapshot
+from my_boids.predator import Predator
+from my_boids.recording import Trajectory
+
+# Recorded steps shown per rendered frame
+REPLAY_MIN_SPEED = 1 / 16
+REPLAY_MAX_SPEED = 64.0
+# Fraction of the recording that PAGEUP and PAGEDOWN skip
+REPLAY_SEEK_FRACTION = 0.1
+
+
+class ReplayPlayer:
+    """Play a recorded trajectory frame by frame.
+
+    Attributes:
+        trajectory (Trajectory): The recording being played.
+        position (float): Current record, fractional when playing slower
+            than one recorded step per frame.
+        speed (float): Recorded steps advanced per rendered frame.
+        paused (bool): Whether playback is paused.
+        performance (PerformanceMonitor): Frame metrics shown in the HUD.
+        capture (FrameCapture | None): Capture of the rendered frames, if any.
+    """
+
+    def __init__(self, trajectory: Trajectory, speed: float = 1.0, show_metrics: bool = True):
+        """Initialize the player at the first recorded step.
+
+        Args:
+            trajectory (Trajectory): The recording to play.
+            speed (float): Recorded steps per rendered frame. Defaults to 1.
+            show_metrics (bool): Draw the performance metrics. Defaults to True.
+
+        Raises:
+            ValueError: If the trajectory holds no steps.
+        """
+        if len(trajectory) == 0:
+            raise ValueError(f"{trajectory.path} holds no recorded steps")
+        self.trajectory = trajectory
+        self.position = 0.0
+        self.speed = 1.0
+        self.set_speed(speed)
+        self.paused = False
+        self.show_metrics = show_metrics
+        self.performance = PerformanceMonitor(enabled=show_metrics)
+        self.capture: FrameCapture | None = None
+
+        options = trajectory.options
+        self.boid_opts = BoidOptions.model_validate(options.get("boid", {}))
+        self.predator_opts = PredatorOptions.model_validate(options.get("predator", {}))
+        self.performance_opts = PerformanceOptions.model_validate(options.get("performance", {}))
+        self._boid_images: dict[int, pg.Surface] = {}
+        self._predator = Predator()
+
+    @property
+    def index(self) -> int:
+        """Index of the record shown."""
+        return int(self.position)
+
+    @property
+    def at_end(self) -> bool:
+        """Whether the last recorded step is shown."""
+        return self.index == len(self.trajectory) - 1
+
+    def seek(self, index: float) -> None:
+        """Jump to a record, clamped to the recording."""
+        self.position = float(min(max(index, 0), len(self.trajectory) - 1))
+
+    def step(self, count: int = 1) -> None:
+        """Pause and move ``count`` records forward, or back when negative."""
+        self.paused = True
+        self.seek(self.index + count)
+
+    def set_speed(self, speed: float) -> None:
+        """Set the recorded steps per frame, clamped to the supported range."""
+        self.speed = min(max(speed, REPLAY_MIN_SPEED), REPLAY_MAX_SPEED)
+
+    def advance(self) -> None:
+        """Move on by ``speed`` records unless paused, pausing at the end."""
+        if self.paused:
+            return
+        self.seek(self.position + self.speed)
+        if self.at_end:
+            self.paused = True
+
+    def process_events(self, events: list[pg.event.Event] | None = None) -> bool:
+        """Handle the playback keys.
+
+        Returns:
+            bool: True when the player should exit.
+        """
+        if events is None:
+            events = pg.event.get()
+
+        seek_step = max(1, round(len(self.trajectory) * REPLAY_SEEK_FRACTION))
+        for event in events:
+            if event.type == pg.QUIT:
+                return True
+            if event.type != pg.KEYUP:
+                continue
+            if event.key == pg.K_ESCAPE:
+                return True
+            if event.key == pg.K_SPACE:
+                if self.paused and self.at_end:
+                    self.seek(0)
+                self.paused = not self.paused
+            elif event.key == pg.K_RIGHT:
+                self.step(1)
+            elif event.key == pg.K_LEFT:
+                self.step(-1)
+            elif event.key == pg.K_UP:
+                self.set_speed(self.speed * 2)
+            elif event.key == pg.K_DOWN:
+                self.set_speed(self.speed / 2)
+            elif event.key == pg.K_PAGEDOWN:
+                self.seek(self.index + seek_step)
+            elif event.key == pg.K_PAGEUP:
+                self.seek(self.index - seek_step)
+            elif event.key == pg.K_HOME:
+                self.seek(0)
+            elif event.key == pg.K_END:
+                self.seek(len(self.trajectory) - 1)
+        return False
+
+    def snapshot(self) -> FrameSnapshot:
+        """Build the frame for the current record, reading only that record."""
+        record = self.trajectory.records[self.index]
+        slots = np.flatnonzero(record["alive"])
+        positions = record["positions"][slots]
+        winsize = self.trajectory.winsize
+
+        blit_sequence: list[tuple[pg.Surface, tuple[int, int]]] = []
+        density = None
+        if len(slots) >= self.performance_opts.heatmap_threshold:
+            counts = density_histogram(
+                positions, winsize, float(self.performance_opts.heatmap_cell_size)
+            )
+            density = render_density(counts, winsize)
+        else:
+            # Boid sprites are centered on their rounded position
+            topleft = np.rint(positions).astype(np.int64) - self.boid_opts.size // 2
+            blit_sequence.extend(
+                (self._boid_image(slot), (x, y))
+                for slot, (x, y) in zip(slots.tolist(), topleft.tolist(), strict=True)
+            )
+        blit_sequence.append(self._predator_blit(record["predator_pos"], record["predator_vel"]))
+
+        return FrameSnapshot(
+            step=int(record["step"]),
+            blit_sequence=tuple(blit_sequence),
+            score=int(record["score"]),
+            game_over=False,
+            predator_behavior_mode=self.predator_opts.predator_behavior_mode,
+            predator_attack_mode=self.predator_opts.predator_attack_mode,
+            boid_count=len(slots),
+            density=density,
+        )
+
+    def display_frame(self, screen: pg.Surface, flip: bool = True) -> None:
+        """Draw the current record with the HUD and the replay status.
+
+        With ``flip=False`` the caller flips the display and ends the frame.
+        """
+        snapshot = self.snapshot()
+        with self.performance.span("render"):
+            draw_frame(
+                screen,
+                snapshot,
+                snapshot.score,
+                snapshot.predator_behavior_mode,
+                snapshot.predator_attack_mode,
+                snapshot.game_over,
+                self.performance,
+                self.show_metrics,
+                snapshot.boid_count,
+                False,
+                None,
+                snapshot.density,
+            )
+            draw_replay_status(
+                screen,
+                snapshot.step,
+                self.index,
+                len(self.trajectory),
+                self.speed,
+                self.paused,
+            )
+            if self.capture is not None and self.capture.should_capture(snapshot.step):
+                self.capture.submit(screen, snapshot.step)
+            if flip:
+                with self.performance.span("flip"):
+                    pg.display.flip()
+        if flip:
+            self.performance.end_frame()
+
+    def _boid_image(self, slot: int) -> pg.Surface:
+        image = self._boid_images.get(slot)
+        if image is None:
+            size = self.boid_opts.size
+            color = pg.Color(*(int(channel) for channel in self.trajectory.colors[slot]))
+            image = pg.Surface([size, size])
+            image.fill(pg.Color("black"))
+            image.set_colorkey(pg.Color("black"))
+            pg.draw.ellipse(image, color, [0, 0, size, size])
+            self._boid_images[slot] = image
+        return image
+
+    def _predator_blit(
+        self, pos: np.ndarray, vel: np.ndarray
+    ) -> tuple[pg.Surface, tuple[int, int]]:
+        image = self._predator.orig_image
+        velocity = pg.Vector2(float(vel[0]), float(vel[1]))
+        if velocity.length_squared() > 0:
+            # Same rotation as Predator.update
+            image = pg.transform.rotate(image, velocity.angle_to(pg.Vector2(0, 0)) - 180)
+        rect = image.get_rect(center=(round(float(pos[0])), round(float(pos[1]))))
+        return image, rect.topleft
@@ -52,6 +52,11 @@ _PREDATOR_FIELDS: list[tuple[str, str, float, int]] = [
 ]
 
 
+# Slider maximums below the model's own bounds. The model accepts flocks
+# large enough for headless scaling runs, far more than the window can animate
+_UI_MAX: dict[str, float] = {"num_boids": 200.0}
+
+
 def _field_range(
     model_cls: type[BoidOptions] | type[PredatorOptions], field_name: str
 ) -> tuple[float, float]:
@@ -66,7 +71,7 @@ def _field_range(
             hi = float(meta.le)
         if hasattr(meta, "lt"):
             hi = float(meta.lt)
-    return lo, hi
+    return lo, min(hi, _UI_MAX.get(field_name, hi))
 
 
 class SettingsDialog:
@@ -3,15 +3,60 @@
 This module implements a spatial hash grid that partitions 2D space into cells.
 Boids are placed into cells based on their position, allowing for O(1) lookup
 of nearby boids instead of checking all boids in the simulation.
+
+The grid also counts the work its neighbor queries do, to help tune
+``cell_size`` against the search radius.
 """
 
 from collections import defaultdict
+from dataclasses import dataclass
 
 import pygame as pg
 
 from my_boids.boids import Boid
 
 
+@dataclass(frozen=True)
+class GridQueryStats:
+    """Neighbor-query counters and cell occupancy of a spatial grid.
+
+    Attributes:
+        queries: Neighbor queries since the grid was last cleared.
+        candidates: Boids distance-checked by those queries.
+        neighbors: Boids that passed the distance filter.
+        cells_visited: Cells looked up by those queries, occupied or not.
+        occupied_cells: Cells containing at least one boid.
+        max_occupancy: Most boids in a single cell.
+        mean_occupancy: Average boids per occupied cell.
+        occupancy_histogram: Occupied cells by occupancy, where bucket ``i``
+            counts cells holding ``2**i`` to ``2**(i + 1) - 1`` boids.
+    """
+
+    queries: int
+    candidates: int
+    neighbors: int
+    cells_visited: int
+    occupied_cells: int
+    max_occupancy: int
+    mean_occupancy: float
+    occupancy_histogram: tuple[int, ...]
+
+    @property
+    def candidates_per_query(self) -> float:
+        """Average boids distance-checked per query."""
+        return self.candidates / self.queries if self.queries else 0.0
+
+    @property
+    def cells_per_query(self) -> float:
+        """Average cells looked up per query."""
+        return self.cells_visited / self.queries if self.queries else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of candidates that passed the distance filter."""
+        return self.neighbors / self.candidates if self.candidates else 0.0
+
+
 class SpatialGrid:
     """A spatial hash grid for efficient neighbor queries.
 
@@ -19,6 +64,10 @@ class SpatialGrid:
     to cells based on their position. When searching for neighbors, only
     boids in the same cell and adjacent cells need to be checked.
 
+    Neighbor queries count the cells they look up and the boids they
+    distance-check and return; the counters restart whenever the grid is
+    cleared, so with one rebuild per frame they describe a single frame.
+
     Attributes:
         cell_size (float): The size of each grid cell in pixels.
         grid (dict): A dictionary mapping cell coordinates to lists of boids.
@@ -33,10 +82,19 @@ class SpatialGrid:
         """
         self.cell_size = cell_size
         self.grid: dict[tuple[int, int], list[Boid]] = defaultdict(list)
+        self.reset_query_stats()
 
     def clear(self) -> None:
-        """Remove all boids from the grid."""
+        """Remove all boids from the grid and reset the query counters."""
         self.grid.clear()
+        self.reset_query_stats()
+
+    def reset_query_stats(self) -> None:
+        """Reset the neighbor-query counters."""
+        self._queries = 0
+        self._candidates = 0
+        self._neighbors = 0
+        self._cells_visited = 0
 
     def _get_cell(self, pos: pg.Vector2) -> tuple[int, int]:
         """Get the grid cell coordinates for a position.
@@ -85,15 +143,22 @@ class SpatialGrid:
         cells_to_check = int(search_radius // self.cell_size) + 1
 
         # Check all cells in the search area
+        candidates = 0
         for dx in range(-cells_to_check, cells_to_check + 1):
             for dy in range(-cells_to_check, cells_to_check + 1):
                 cell = (center_cell[0] + dx, center_cell[1] + dy)
                 if cell in self.grid:
+                    cell_boids = self.grid[cell]
+                    candidates += len(cell_boids)
                     # Filter boids by actual distance
-                    for boid in self.grid[cell]:
+                    for boid in cell_boids:
                         if boid.pos.distance_to(pos) <= search_radius:
                             nearby_boids.append(boid)
 
+        self._queries += 1
+        self._candidates += candidates
+        self._neighbors += len(nearby_boids)
+        self._cells_visited += (2 * cells_to_check + 1) ** 2
         return nearby_boids
 
     def get_cell_count(self) -> int:
@@ -111,3 +176,27 @@ class SpatialGrid:
             int: The total number of boids across all cells.
         """
         return sum(len(boids) for boids in self.grid.values())
+
+    def get_query_stats(self) -> GridQueryStats:
+        """Get the query counters since the last clear and the current occupancy.
+
+        Returns:
+            GridQueryStats: Query counters and cell occupancy.
+        """
+        occupancies = [len(boids) for boids in self.grid.values() if boids]
+        histogram: list[int] = []
+        for occupancy in occupancies:
+            bucket = occupancy.bit_length() - 1
+            if bucket >= len(histogram):
+                histogram.extend([0] * (bucket + 1 - len(histogram)))
+            histogram[bucket] += 1
+        return GridQueryStats(
+            queries=self._queries,
+            candidates=self._candidates,
+            neighbors=self._neighbors,
+            cells_visited=self._cells_visited,
+            occupied_cells=len(occupancies),
+            max_occupancy=max(occupancies, default=0),
+            mean_occupancy=sum(occupancies) / len(occupancies) if occupancies else 0.0,
+            occupancy_histogram=tuple(histogram),
+        )
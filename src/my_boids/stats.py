@@ -0,0 +1,176 @@
+"""Streaming statistics over a sliding window of timing samples.
+
+Every update is O(1): the mean comes from a running sum, min and max from
+monotonic queues, and percentiles from a fixed-bucket log-scale histogram
+whose bucket counts are adjusted as samples enter and leave the window.
+Queries never re-scan the samples, so they are cheap enough to call on every
+HUD draw.
+"""
+
+import math
+from collections import deque
+
+# Histogram range and resolution. Timings below the floor land in the first
+# bucket and timings above the ceiling in the last; with 32 buckets per
+# decade each bucket spans about 7.5%, so percentiles are within ~4%.
+HISTOGRAM_MIN_VALUE = 1e-6
+HISTOGRAM_MAX_VALUE = 100.0
+HISTOGRAM_BUCKETS_PER_DECADE = 32
+
+
+class LogHistogram:
+    """Fixed-bucket histogram with logarithmically spaced buckets.
+
+    Attributes:
+        counts (list[int]): Number of samples in each bucket.
+        total (int): Number of samples across all buckets.
+    """
+
+    def __init__(
+        self,
+        min_value: float = HISTOGRAM_MIN_VALUE,
+        max_value: float = HISTOGRAM_MAX_VALUE,
+        buckets_per_decade: int = HISTOGRAM_BUCKETS_PER_DECADE,
+    ):
+        """Initialize the histogram.
+
+        Args:
+            min_value (float): Lower edge of the first bucket. Must be positive.
+            max_value (float): Upper edge of the last bucket.
+            buckets_per_decade (int): Buckets per factor of ten.
+        """
+        self._min_value = min_value
+        self._log_min = math.log10(min_value)
+        self._buckets_per_decade = buckets_per_decade
+        bucket_count = math.ceil((math.log10(max_value) - self._log_min) * buckets_per_decade)
+        self.counts = [0] * bucket_count
+        self.total = 0
+
+    def bucket_index(self, value: float) -> int:
+        """Return the bucket a value falls into, clamped to the histogram range."""
+        if value <= self._min_value:
+            return 0
+        index = int((math.log10(value) - self._log_min) * self._buckets_per_decade)
+        return min(index, len(self.counts) - 1)
+
+    def bucket_value(self, index: int) -> float:
+        """Return the geometric midpoint of a bucket."""
+        return 10 ** (self._log_min + (index + 0.5) / self._buckets_per_decade)
+
+    def add(self, index: int) -> None:
+        """Count a sample in the bucket at ``index``."""
+        self.counts[index] += 1
+        self.total += 1
+
+    def remove(self, index: int) -> None:
+        """Forget a sample previously counted in the bucket at ``index``."""
+        self.counts[index] -= 1
+        self.total -= 1
+
+    def quantile(self, q: float) -> float:
+        """Approximate the ``q`` quantile (0-1) of the counted samples.
+
+        Returns:
+            float: The midpoint of the bucket holding the quantile, or 0.0 if
+                the histogram is empty.
+        """
+        if self.total == 0:
+            return 0.0
+        rank = max(1, math.ceil(q * self.total))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return self.bucket_value(index)
+        return self.bucket_value(len(self.counts) - 1)
+
+    def clear(self) -> None:
+        """Forget all samples."""
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+
+
+class WindowStats:
+    """Mean, min, max and percentiles over the most recent ``window`` samples.
+
+    Percentiles come from a :class:`LogHistogram` and are clamped to the exact
+    window min and max, so p0 and p100 are exact.
+    """
+
+    def __init__(self, window: int):
+        """Initialize the statistics.
+
+        Args:
+            window (int): Number of most recent samples to summarize.
+        """
+        self.window = window
+        self._samples: deque[tuple[float, int]] = deque()
+        self._sum = 0.0
+        # Monotonic queues of (sequence number, value) for sliding min/max
+        self._min_queue: deque[tuple[int, float]] = deque()
+        self._max_queue: deque[tuple[int, float]] = deque()
+        self._sequence = 0
+        self._histogram = LogHistogram()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        """Add a sample, evicting the oldest one once the window is full."""
+        if len(self._samples) == self.window:
+            old_value, old_index = self._samples.popleft()
+            self._sum -= old_value
+            self._histogram.remove(old_index)
+            evicted = self._sequence - self.window
+            if self._min_queue[0][0] == evicted:
+                self._min_queue.popleft()
+            if self._max_queue[0][0] == evicted:
+                self._max_queue.popleft()
+
+        index = self._histogram.bucket_index(value)
+        self._samples.append((value, index))
+        self._sum += value
+        self._histogram.add(index)
+
+        while self._min_queue and self._min_queue[-1][1] >= value:
+            self._min_queue.pop()
+        self._min_queue.append((self._sequence, value))
+        while self._max_queue and self._max_queue[-1][1] <= value:
+            self._max_queue.pop()
+        self._max_queue.append((self._sequence, value))
+        self._sequence += 1
+
+    @property
+    def mean(self) -> float:
+        """Mean of the window, or 0.0 if empty."""
+        if not self._samples:
+            return 0.0
+        return self._sum / len(self._samples)
+
+    @property
+    def min(self) -> float:
+        """Smallest sample in the window, or 0.0 if empty."""
+        return self._min_queue[0][1] if self._min_queue else 0.0
+
+    @property
+    def max(self) -> float:
+        """Largest sample in the window, or 0.0 if empty."""
+        return self._max_queue[0][1] if self._max_queue else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Approximate the ``q`` quantile (0-1) of the window, or 0.0 if empty."""
+        if not self._samples:
+            return 0.0
+        if q <= 0.0:
+            return self.min
+        if q >= 1.0:
+            return self.max
+        return min(max(self._histogram.quantile(q), self.min), self.max)
+
+    def clear(self) -> None:
+        """Forget all samples."""
+        self._samples.clear()
+        self._sum = 0.0
+        self._min_queue.clear()
+        self._max_queue.clear()
+        self._histogram.clear()
@@ -0,0 +1,159 @@
+"""Chrome trace event recording for PerformanceMonitor spans.
+
+Span timings are recorded as trace events in a bounded ring buffer and can be
+written to a JSON file that loads in ``chrome://tracing`` or Perfetto
+(https://ui.perfetto.dev), giving a per-frame flame view of the simulation.
+Every event carries the id of the thread that produced it, so the simulation
+and render threads of a pipelined run appear as separate tracks.
+
+Spans are recorded as complete (``"X"``) events, which carry both the start
+and the duration. Unlike separate begin/end events they cannot be split in
+half when the ring buffer drops its oldest entries.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, TextIO
+
+TraceEvent = dict[str, Any]
+
+DEFAULT_TRACE_CAPACITY = 100_000
+
+
+class TraceRecorder:
+    """Record timed spans as Chrome trace events.
+
+    Events are kept in a ring buffer of the most recent ``capacity`` events
+    and written on demand with :meth:`dump`. When ``stream_path`` is given,
+    every event is also appended to that file as it is recorded, using the
+    trace format's JSON array form whose closing bracket is optional, so the
+    file stays loadable even if the process dies mid-run.
+
+    Attributes:
+        capacity (int): Maximum number of events kept in memory.
+        events (deque[TraceEvent]): The most recent events.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_TRACE_CAPACITY,
+        stream_path: str | Path | None = None,
+    ):
+        """Initialize the trace recorder.
+
+        Args:
+            capacity (int): Maximum number of events kept in memory.
+                Defaults to 100,000.
+            stream_path (str | Path | None): File that every event is also
+                appended to as it is recorded. Defaults to None.
+        """
+        self.capacity = capacity
+        self.events: deque[TraceEvent] = deque(maxlen=capacity)
+        self._pid = os.getpid()
+        self._epoch = time.perf_counter()
+        self._thread_names: dict[int, str] = {}
+        self._stream: TextIO | None = None
+        self._stream_lock = threading.Lock()
+        if stream_path is not None:
+            Path(stream_path).parent.mkdir(parents=True, exist_ok=True)
+            self._stream = open(stream_path, "w")  # noqa: SIM115
+            self._stream.write("[\n")
+
+    def _timestamp(self, perf_counter_time: float) -> float:
+        """Convert a ``time.perf_counter`` value to trace microseconds."""
+        return (perf_counter_time - self._epoch) * 1e6
+
+    def record_span(self, name: str, start: float, duration: float, category: str = "span") -> None:
+        """Record a completed span.
+
+        Args:
+            name (str): Span name.
+            start (float): Span start as a ``time.perf_counter`` value.
+            duration (float): Span duration in seconds.
+            category (str): Trace category. Defaults to "span".
+        """
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            self._record_thread_name(thread_id)
+        self._append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": self._timestamp(start),
+                "dur": duration * 1e6,
+                "pid": self._pid,
+                "tid": thread_id,
+            }
+        )
+
+    def _record_thread_name(self, thread_id: int) -> None:
+        thread_name = threading.current_thread().name
+        self._thread_names[thread_id] = thread_name
+        event = {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": self._pid,
+            "tid": thread_id,
+            "args": {"name": thread_name},
+        }
+        # Metadata is kept out of the ring buffer so it is never evicted
+        self._write_stream(event)
+
+    def _append(self, event: TraceEvent) -> None:
+        self.events.append(event)
+        self._write_stream(event)
+
+    def _write_stream(self, event: TraceEvent) -> None:
+        if self._stream is None:
+            return
+        with self._stream_lock:
+            self._stream.write(json.dumps(event) + ",\n")
+
+    def metadata_events(self) -> list[TraceEvent]:
+        """Return thread name metadata events for every thread seen so far."""
+        return [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": thread_id,
+                "args": {"name": thread_name},
+            }
+            for thread_id, thread_name in self._thread_names.items()
+        ]
+
+    def dump(self, path: str | Path) -> Path:
+        """Write the buffered events to a trace JSON file.
+
+        Args:
+            path (str | Path): Destination file. Parent directories are created.
+
+        Returns:
+            Path: The written file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        trace = {
+            "traceEvents": self.metadata_events() + list(self.events),
+            "displayTimeUnit": "ms",
+        }
+        with open(path, "w") as file_handle:
+            json.dump(trace, file_handle)
+        return path
+
+    def clear(self) -> None:
+        """Drop all buffered events."""
+        self.events.clear()
+
+    def close(self) -> None:
+        """Flush and close the streaming file, if any."""
+        with self._stream_lock:
+            if self._stream is not None:
+                self._stream.flush()
+                self._stream.close()
+                self._stream = None
@@ -0,0 +1,261 @@
+"""Compressed encoding of trajectory records.
+
+Recordings are split into chunks of up to ``keyframe_every`` steps, and every
+chunk is encoded on its own, so any step can be decoded by reading a single
+chunk. Within a chunk:
+
+- positions and velocities are quantized to uint16 fixed-point codes over a
+  range derived from the world size (positions) or the speed limit
+  (velocities), so the error is at most half a quantization step
+- the first step, the keyframe, stores the codes themselves and every later
+  step stores the difference to the step before, modulo 2**16. Differences
+  always fit, even when a boid wraps around the world, and decoding is an
+  exact cumulative sum, so errors never accumulate
+- the alive mask is bit-packed, and the step, score and predator state are
+  kept at full precision
+
+The high and low bytes of the codes are stored in separate planes, which
+makes small differences compress far better, and the chunk is then
+compressed with zlib or lzma from the standard library.
+"""
+
+import lzma
+import zlib
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+
+Compression = Literal["zlib", "lzma"]
+COMPRESSIONS: tuple[Compression, ...] = ("zlib", "lzma")
+
+# Number of uint16 codes
+_CODES = 1 << 16
+# Positions are quantized over the world plus this fraction of its larger
+# side on every edge, so boids overshooting a bounce are still in range
+POSITION_MARGIN = 0.25
+# Velocities are quantized over this multiple of the speed limit
+VELOCITY_MARGIN = 2.0
+
+
+@dataclass(frozen=True)
+class Quantization:
+    """Fixed-point mapping of positions and velocities to uint16 codes.
+
+    A value ``v`` is stored as the code ``round((v - origin) / quantum)``.
+
+    Attributes:
+        position_origin: Smallest representable position coordinate.
+        position_quantum: Position step between neighboring codes.
+        velocity_origin: Smallest representable velocity component.
+        velocity_quantum: Velocity step between neighboring codes.
+    """
+
+    position_origin: float
+    position_quantum: float
+    velocity_origin: float
+    velocity_quantum: float
+
+    @property
+    def position_error(self) -> float:
+        """Largest position error of an in-range value."""
+        return self.position_quantum / 2
+
+    @property
+    def velocity_error(self) -> float:
+        """Largest velocity error of an in-range value."""
+        return self.velocity_quantum / 2
+
+
+def _quantum(span: float, error: float | None, name: str) -> float:
+    finest = span / (_CODES - 1)
+    if error is None:
+        return finest
+    if 2 * error < finest:
+        raise ValueError(
+            f"{name} of {error:g} is finer than 16 bits allow over {span:g}; use at least "
+            f"{finest / 2:g}"
+        )
+    return 2 * error
+
+
+@dataclass(frozen=True)
+class TrajectoryCodec:
+    """Settings of the compressed trajectory encoding.
+
+    Attributes:
+        keyframe_every: Steps per chunk, each starting with a keyframe.
+        compression: ``"zlib"`` or ``"lzma"``.
+        level: Compression level, 0 to 9 for both.
+        position_error: Largest position error in world units, or None for
+            the finest that 16 bits allow over the world.
+        velocity_error: Largest velocity error, or None for the finest that
+            16 bits allow over the velocity range.
+    """
+
+    keyframe_every: int = 64
+    compression: Compression = "zlib"
+    level: int = 6
+    position_error: float | None = None
+    velocity_error: float | None = None
+
+    def __post_init__(self):
+        if self.keyframe_every < 1:
+            raise ValueError("keyframe_every must be at least 1")
+        if self.compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {COMPRESSIONS}")
+        if not 0 <= self.level <= 9:
+            raise ValueError("level must be between 0 and 9")
+
+    def quantization(self, winsize: tuple[int, int], velocity_limit: float) -> Quantization:
+        """Quantization for a world of ``winsize`` and speeds up to ``velocity_limit``.
+
+        Raises:
+            ValueError: If an error bound is finer than 16 bits can represent.
+        """
+        extent = float(max(winsize))
+        position_span = extent * (1 + 2 * POSITION_MARGIN)
+        velocity_span = 2 * VELOCITY_MARGIN * velocity_limit
+        return Quantization(
+            position_origin=-POSITION_MARGIN * extent,
+            position_quantum=_quantum(position_span, self.position_error, "position_error"),
+            velocity_origin=-VELOCITY_MARGIN * velocity_limit,
+            velocity_quantum=_quantum(velocity_span, self.velocity_error, "velocity_error"),
+        )
+
+    def to_header(self, quantization: Quantization) -> dict[str, Any]:
+        """The codec settings and quantization as stored in a trajectory header."""
+        return {
+            "keyframe_every": self.keyframe_every,
+            "compression": self.compression,
+            "level": self.level,
+            "position_origin": quantization.position_origin,
+            "position_quantum": quantization.position_quantum,
+            "velocity_origin": quantization.velocity_origin,
+            "velocity_quantum": quantization.velocity_quantum,
+        }
+
+    @classmethod
+    def from_header(cls, header: dict[str, Any]) -> tuple["TrajectoryCodec", Quantization]:
+        """Read back the codec settings and quantization written by :meth:`to_header`."""
+        quantization = Quantization(
+            position_origin=header["position_origin"],
+            position_quantum=header["position_quantum"],
+            velocity_origin=header["velocity_origin"],
+            velocity_quantum=header["velocity_quantum"],
+        )
+        codec = cls(
+            keyframe_every=header["keyframe_every"],
+            compression=header["compression"],
+            level=header["level"],
+        )
+        return codec, quantization
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress an encoded chunk."""
+        if self.compression == "lzma":
+            return lzma.compress(data, preset=self.level)
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress a chunk compressed by :meth:`compress`."""
+        if self.compression == "lzma":
+            return lzma.decompress(data)
+        return zlib.decompress(data)
+
+
+def _to_codes(values: np.ndarray, origin: float, quantum: float) -> np.ndarray:
+    scaled = np.rint((values - origin) / quantum)
+    return np.clip(scaled, 0, _CODES - 1).astype(np.uint16)
+
+
+def _delta_planes(codes: np.ndarray) -> bytes:
+    """Keyframe plus modular differences, as a low byte plane and a high byte plane."""
+    deltas = codes.copy()
+    deltas[1:] -= codes[:-1]
+    return deltas.astype("<u2").view(np.uint8).reshape(-1, 2).T.tobytes()
+
+
+def _from_delta_planes(data: bytes, shape: tuple[int, ...]) -> np.ndarray:
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(2, -1)
+    deltas = np.ascontiguousarray(planes.T).view("<u2").reshape(shape)
+    return np.cumsum(deltas, axis=0, dtype=np.uint16)
+
+
+def encode_chunk(records: np.ndarray, codec: TrajectoryCodec, quantization: Quantization) -> bytes:
+    """Encode and compress consecutive records.
+
+    Args:
+        records (np.ndarray): Records laid out by ``record_dtype``.
+        codec (TrajectoryCodec): Compression settings.
+        quantization (Quantization): Fixed-point mapping.
+
+    Returns:
+        bytes: The compressed chunk.
+    """
+    positions = _to_codes(
+        records["positions"], quantization.position_origin, quantization.position_quantum
+    )
+    velocities = _to_codes(
+        records["velocities"], quantization.velocity_origin, quantization.velocity_quantum
+    )
+    parts = [
+        records["step"].astype("<i8").tobytes(),
+        records["score"].astype("<i8").tobytes(),
+        records["predator_pos"].astype("<f8").tobytes(),
+        records["predator_vel"].astype("<f8").tobytes(),
+        np.packbits(records["alive"], axis=1).tobytes(),
+        _delta_planes(positions),
+        _delta_planes(velocities),
+    ]
+    return codec.compress(b"".join(parts))
+
+
+def decode_chunk(
+    data: bytes,
+    count: int,
+    dtype: np.dtype,
+    codec: TrajectoryCodec,
+    quantization: Quantization,
+) -> np.ndarray:
+    """Decompress and decode a chunk written by :func:`encode_chunk`.
+
+    Args:
+        data (bytes): The compressed chunk.
+        count (int): Number of records in the chunk.
+        dtype (np.dtype): Record layout, from ``record_dtype``.
+        codec (TrajectoryCodec): Compression settings.
+        quantization (Quantization): Fixed-point mapping.
+
+    Returns:
+        np.ndarray: The records.
+    """
+    raw = codec.decompress(data)
+    fields = dtype.fields
+    assert fields is not None
+    slots = fields["alive"][0].shape[0]
+    records = np.zeros(count, dtype=dtype)
+
+    offset = 0
+
+    def take(size: int) -> bytes:
+        nonlocal offset
+        part = raw[offset : offset + size]
+        offset += size
+        return part
+
+    records["step"] = np.frombuffer(take(8 * count), dtype="<i8")
+    records["score"] = np.frombuffer(take(8 * count), dtype="<i8")
+    records["predator_pos"] = np.frombuffer(take(16 * count), dtype="<f8").reshape(count, 2)
+    records["predator_vel"] = np.frombuffer(take(16 * count), dtype="<f8").reshape(count, 2)
+    packed_width = -(-slots // 8)
+    packed = np.frombuffer(take(packed_width * count), dtype=np.uint8).reshape(count, -1)
+    records["alive"] = np.unpackbits(packed, axis=1, count=slots).astype(bool)
+    shape = (count, slots, 2)
+    positions = _from_delta_planes(take(4 * count * slots), shape)
+    velocities = _from_delta_planes(take(4 * count * slots), shape)
+    records["positions"] = quantization.position_origin + positions * quantization.position_quantum
+    records["velocities"] = (
+        quantization.velocity_origin + velocities * quantization.velocity_quantum
+    )
+    return records
@@ -0,0 +1,270 @@
+"""Frame-budget watchdog that snapshots the simulation on slow frames.
+
+Slow frames are hard to reproduce once the flock has moved on, so when a frame
+exceeds its budget the watchdog writes the state that produced it to disk: the
+boid positions and velocities, the options, the frame's span breakdown and the
+spatial grid statistics. :func:`load_slow_frame` reads a snapshot back so the
+same state can be replayed, e.g. in a benchmark.
+
+The state is captured when the frame starts, before it steps, since the state
+after a slow step does not reproduce it. Snapshots are written by a background
+thread, so writing one does not slow down the frames that follow.
+
+Snapshots are ``.npz`` archives holding the arrays and a JSON metadata string.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+DEFAULT_MIN_INTERVAL = 5.0
+DEFAULT_KEEP = 10
+
+
+@dataclass(frozen=True)
+class SlowFrameState:
+    """Simulation state captured for a slow frame.
+
+    Attributes:
+        step: Simulation step of the frame.
+        positions: Boid positions as an (n, 2) array.
+        velocities: Boid velocities as an (n, 2) array.
+        predator_pos: Predator position.
+        options: Option values by section, e.g. ``{"boid": {...}}``.
+        grid_stats: Spatial grid statistics of the step before, as a dict, or
+            None without the grid.
+    """
+
+    step: int
+    positions: np.ndarray
+    velocities: np.ndarray
+    predator_pos: tuple[float, float]
+    options: dict[str, dict[str, Any]]
+    grid_stats: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True)
+class SlowFrame:
+    """A snapshot written by :class:`FrameWatchdog`.
+
+    Attributes:
+        frame_time: Duration of the slow frame in seconds.
+        budget: Frame budget that was exceeded, in seconds.
+        spans: Time of every span path in the frame, in milliseconds.
+        state: The simulation state going into the frame.
+    """
+
+    frame_time: float
+    budget: float
+    spans: dict[str, float]
+    state: SlowFrameState
+
+
+class FrameWatchdog:
+    """Write a snapshot of the simulation whenever a frame exceeds its budget.
+
+    Call :meth:`start_frame` before every frame and :meth:`check` after it.
+    While a snapshot could be written, :meth:`start_frame` captures the state
+    going into the frame, which costs a copy of the boid arrays per frame:
+    about 7 ms at 20,000 boids.
+    Snapshots are rate limited to one every ``min_interval`` seconds, and only
+    the most recent ``keep`` snapshots written by this watchdog are kept on
+    disk. :meth:`close` waits for the snapshots still being written.
+
+    In pipelined mode, set ``lock`` to the simulation thread's lock, so the
+    state is never read while a step is changing it.
+
+    Attributes:
+        budget (float): Frame budget in seconds.
+        output_dir (Path): Directory snapshots are written to.
+        state (Callable[[], SlowFrameState] | None): Provides the simulation
+            state to snapshot. Without it, slow frames are only counted.
+        min_interval (float): Minimum seconds between snapshots.
+        keep (int): Number of snapshots kept on disk.
+        lock (threading.Lock | None): Held while the state is captured, or
+            None to capture it without locking.
+        slow_frames (int): Frames that exceeded the budget.
+        snapshots (deque[Path]): Snapshots written and kept, oldest first.
+        error (Exception | None): The first error hit writing a snapshot, or None.
+    """
+
+    def __init__(
+        self,
+        budget: float,
+        output_dir: str | Path = "slow_frames",
+        state: Callable[[], SlowFrameState] | None = None,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        keep: int = DEFAULT_KEEP,
+        lock: threading.Lock | None = None,
+    ):
+        """Initialize the watchdog.
+
+        Args:
+            budget (float): Frame budget in seconds, e.g. 0.02 at 50 FPS.
+            output_dir (str | Path): Directory for snapshots.
+                Defaults to "slow_frames".
+            state (Callable[[], SlowFrameState] | None): Provides the
+                simulation state to snapshot. Defaults to None.
+            min_interval (float): Minimum seconds between snapshots.
+                Defaults to 5.0.
+            keep (int): Number of snapshots kept on disk. Defaults to 10.
+            lock (threading.Lock | None): Held while the state is captured.
+                Defaults to None.
+
+        Raises:
+            ValueError: If ``budget`` is not positive or ``keep`` is less than 1.
+        """
+        if budget <= 0:
+            raise ValueError(f"budget must be positive, got {budget}")
+        if keep < 1:
+            raise ValueError(f"keep must be at least 1, got {keep}")
+        self.budget = budget
+        self.output_dir = Path(output_dir)
+        self.state = state
+        self.min_interval = min_interval
+        self.keep = keep
+        self.lock = lock
+        self.slow_frames = 0
+        self.snapshots: deque[Path] = deque()
+        self.error: Exception | None = None
+        self._last_snapshot_time: float | None = None
+        self._frame_state: SlowFrameState | None = None
+        self._pending: queue.Queue[tuple[SlowFrame, Path]] = queue.Queue()
+        self._writer: threading.Thread | None = None
+
+    def _rate_limited(self) -> bool:
+        return self._last_snapshot_time is not None and (
+            time.monotonic() - self._last_snapshot_time < self.min_interval
+        )
+
+    def start_frame(self) -> None:
+        """Capture the state going into a frame, unless no snapshot could be written for it."""
+        self._frame_state = None
+        if self.state is not None and not self._rate_limited():
+            with self.lock or nullcontext():
+                self._frame_state = self.state()
+
+    def check(self, frame_time: float, spans: dict[str, float]) -> Path | None:
+        """Check a finished frame against the budget.
+
+        Args:
+            frame_time (float): Duration of the frame in seconds.
+            spans (dict[str, float]): Time of every span path in the frame,
+                in milliseconds.
+
+        Returns:
+            Path | None: The snapshot queued for writing, or None if the frame
+                was within budget, a snapshot was rate limited or no state was
+                captured when the frame started.
+        """
+        if frame_time <= self.budget:
+            return None
+        self.slow_frames += 1
+        state = self._frame_state
+        self._frame_state = None
+        if state is None or self._rate_limited():
+            return None
+        self._last_snapshot_time = time.monotonic()
+
+        slow_frame = SlowFrame(frame_time=frame_time, budget=self.budget, spans=spans, state=state)
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        path = self.output_dir / f"slow-frame-{timestamp}-step{state.step:08d}.npz"
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._write_snapshots, name="boids-watchdog", daemon=True
+            )
+            self._writer.start()
+        self._pending.put((slow_frame, path))
+        return path
+
+    def close(self) -> None:
+        """Wait until every queued snapshot has been written."""
+        self._pending.join()
+
+    def _write_snapshots(self) -> None:
+        while True:
+            slow_frame, path = self._pending.get()
+            try:
+                save_slow_frame(slow_frame, path)
+                if path not in self.snapshots:
+                    self.snapshots.append(path)
+                while len(self.snapshots) > self.keep:
+                    self.snapshots.popleft().unlink(missing_ok=True)
+            except Exception as error:
+                # Keep serving later snapshots so that close never waits forever
+                if self.error is None:
+                    self.error = error
+            finally:
+                self._pending.task_done()
+
+
+def save_slow_frame(slow_frame: SlowFrame, path: str | Path) -> Path:
+    """Write a slow-frame snapshot to an ``.npz`` file.
+
+    Args:
+        slow_frame (SlowFrame): The snapshot to write.
+        path (str | Path): Destination file. Parent directories are created.
+
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    state = slow_frame.state
+    metadata = {
+        "frame_time": slow_frame.frame_time,
+        "budget": slow_frame.budget,
+        "spans": slow_frame.spans,
+        "step": state.step,
+        "predator_pos": list(state.predator_pos),
+        "options": state.options,
+        "grid_stats": state.grid_stats,
+    }
+    with open(path, "wb") as file_handle:
+        np.savez_compressed(
+            file_handle,
+            positions=state.positions,
+            velocities=state.velocities,
+            metadata=np.array(json.dumps(metadata)),
+        )
+    return path
+
+
+def load_slow_frame(path: str | Path) -> SlowFrame:
+    """Read a snapshot written by :class:`FrameWatchdog`.
+
+    Args:
+        path (str | Path): Snapshot file.
+
+    Returns:
+        SlowFrame: The snapshot.
+    """
+    with np.load(path) as archive:
+        metadata = json.loads(str(archive["metadata"]))
+        positions = archive["positions"]
+        velocities = archive["velocities"]
+    predator_x, predator_y = metadata["predator_pos"]
+    return SlowFrame(
+        frame_time=metadata["frame_time"],
+        budget=metadata["budget"],
+        spans=metadata["spans"],
+        state=SlowFrameState(
+            step=metadata["step"],
+            positions=positions,
+            velocities=velocities,
+            predator_pos=(predator_x, predator_y),
+            options=metadata["options"],
+            grid_stats=metadata["grid_stats"],
+        ),
+    )
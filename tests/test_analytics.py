@@ -0,0 +1,132 @@
+"""Tests for my_boids.analytics."""
+
+import csv
+import json
+import math
+
+import numpy as np
+import pytest
+
+from my_boids.analytics import (
+    FlockAnalytics,
+    MetricsFileSink,
+    flock_metrics,
+    nearest_neighbor_distances,
+)
+
+
+def _brute_force(positions):
+    squared = ((positions[:, None, :] - positions[None, :, :]) ** 2).sum(axis=2)
+    np.fill_diagonal(squared, np.inf)
+    return np.sqrt(squared.min(axis=1))
+
+
+@pytest.mark.parametrize(
+    "layout", ["uniform", "one_cluster", "cluster_with_outliers", "several_flocks"]
+)
+def test_nearest_neighbors_match_brute_force(layout):
+    rng = np.random.default_rng(3)
+    count = 2000
+    if layout == "uniform":
+        positions = rng.uniform(0, 800, size=(count, 2))
+    elif layout == "one_cluster":
+        positions = rng.normal(400, 3, size=(count, 2))
+    elif layout == "cluster_with_outliers":
+        positions = np.concatenate(
+            [rng.normal(400, 2, size=(count - 5, 2)), rng.uniform(0, 800, size=(5, 2))]
+        )
+    else:
+        centers = rng.uniform(0, 800, size=(12, 2))
+        positions = centers[rng.integers(0, 12, count)] + rng.normal(0, 10, size=(count, 2))
+
+    np.testing.assert_allclose(nearest_neighbor_distances(positions), _brute_force(positions))
+
+
+def test_nearest_neighbors_of_tiny_and_degenerate_flocks():
+    assert nearest_neighbor_distances(np.zeros((0, 2))).shape == (0,)
+    assert nearest_neighbor_distances(np.zeros((1, 2))).tolist() == [math.inf]
+    np.testing.assert_array_equal(nearest_neighbor_distances(np.ones((1000, 2))), 0)
+    np.testing.assert_allclose(nearest_neighbor_distances(np.array([[0, 0], [3, 4]])), [5, 5])
+
+
+def test_aligned_flock_is_fully_polarized():
+    positions = np.array([[0.0, 0.0], [2.0, 0.0], [0.0, 2.0], [2.0, 2.0]])
+    velocities = np.array([[1.0, 0.0], [3.0, 0.0], [1.0, 0.0], [3.0, 0.0]])
+
+    metrics = flock_metrics(positions, velocities, step=7)
+
+    assert metrics.step == 7
+    assert metrics.count == 4
+    assert metrics.polarization == pytest.approx(1.0)
+    assert (metrics.centroid_x, metrics.centroid_y) == (1.0, 1.0)
+    assert metrics.radius_of_gyration == pytest.approx(math.sqrt(2))
+    assert metrics.speed_mean == 2.0
+    assert metrics.speed_std == 1.0
+    assert metrics.nn_mean == metrics.nn_p10 == metrics.nn_p50 == metrics.nn_p90 == 2.0
+
+
+def test_opposing_headings_cancel():
+    positions = np.zeros((2, 2))
+    velocities = np.array([[1.0, 0.0], [-5.0, 0.0]])
+
+    assert flock_metrics(positions, velocities).polarization == pytest.approx(0.0)
+
+
+def test_empty_and_single_boid_metrics_are_nan():
+    empty = flock_metrics(np.zeros((0, 2)), np.zeros((0, 2)))
+    assert empty.count == 0
+    assert math.isnan(empty.polarization)
+
+    single = flock_metrics(np.array([[5.0, 5.0]]), np.array([[0.0, 0.0]]))
+    assert single.polarization == 0.0
+    assert single.centroid_x == 5.0
+    assert math.isnan(single.nn_mean)
+
+
+def test_analytics_runs_every_k_steps_and_writes_to_the_sink():
+    written = []
+
+    class ListSink:
+        def write(self, metrics):
+            written.append(metrics)
+
+        def close(self):
+            written.append(None)
+
+    analytics = FlockAnalytics(every=5, sink=ListSink())
+    positions = np.array([[0.0, 0.0], [1.0, 0.0]])
+    velocities = np.array([[1.0, 0.0], [1.0, 0.0]])
+    for step in range(11):
+        if analytics.should_analyze(step):
+            analytics.analyze(step, positions, velocities)
+    analytics.close()
+
+    assert [metrics.step for metrics in written[:-1]] == [0, 5, 10]
+    assert written[-1] is None
+    assert analytics.latest is written[-2]
+    with pytest.raises(ValueError):
+        FlockAnalytics(every=0)
+
+
+def test_file_sink_writes_csv(tmp_path):
+    sink = MetricsFileSink(tmp_path / "metrics.csv")
+    sink.write(flock_metrics(np.array([[0.0, 0.0], [3.0, 4.0]]), np.ones((2, 2)), step=2))
+    sink.close()
+
+    with open(tmp_path / "metrics.csv", newline="") as file_handle:
+        rows = list(csv.DictReader(file_handle))
+    assert len(rows) == 1
+    assert rows[0]["step"] == "2"
+    assert float(rows[0]["nn_mean"]) == 5.0
+
+
+def test_file_sink_writes_json_lines_without_nan(tmp_path):
+    sink = MetricsFileSink(tmp_path / "metrics.jsonl")
+    sink.write(flock_metrics(np.array([[0.0, 0.0]]), np.ones((1, 2)), step=1))
+    sink.write(flock_metrics(np.array([[0.0, 0.0], [0.0, 2.0]]), np.ones((2, 2)), step=2))
+    sink.close()
+
+    rows = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text().splitlines()]
+    assert [row["step"] for row in rows] == [1, 2]
+    assert rows[0]["nn_mean"] is None
+    assert rows[1]["nn_mean"] == 2.0
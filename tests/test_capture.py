@@ -0,0 +1,189 @@
+"""Tests for capture.py"""
+
+import io
+
+import pygame as pg
+import pytest
+
+from my_boids.boids_sim import _close_capture, run_headless
+from my_boids.capture import FrameCapture
+from my_boids.game import Game
+from my_boids.options import BoidOptions, PredatorOptions, ScreenOptions
+from my_boids.recording import TrajectoryRecorder, open_trajectory
+from my_boids.trajectory_codec import TrajectoryCodec
+
+
+@pytest.fixture(name="small_game")
+def fixture_small_game(pygame_display, monkeypatch):
+    game = Game(
+        screen_opts=ScreenOptions(winsize=[64, 48]),
+        boid_opts=BoidOptions(num_boids=5),
+        predator_opts=PredatorOptions(predator_attack_mode="mouse"),
+        show_metrics=False,
+    )
+    # Keep the predator far away so no boid is caught and the game never ends
+    monkeypatch.setattr(pg.mouse, "get_pos", lambda: (-10_000, -10_000))
+    game.predator.pos = pg.Vector2(-10_000, -10_000)
+    # The predator only moves its rect while it is away from its target
+    assert game.predator.rect is not None
+    game.predator.rect.center = (-10_000, -10_000)
+    return game
+
+
+def test_capture_rejects_invalid_interval(tmp_path):
+    with pytest.raises(ValueError):
+        FrameCapture(tmp_path, every=0)
+
+
+def test_should_capture_every_k_steps(tmp_path):
+    capture = FrameCapture(tmp_path, every=3)
+    assert [step for step in range(10) if capture.should_capture(step)] == [0, 3, 6, 9]
+
+
+def test_capture_png_sequence(tmp_path, pygame_display):
+    surface = pg.Surface((8, 6))
+    surface.fill(pg.Color("red"))
+    capture = FrameCapture(tmp_path / "frames", fmt="png")
+    capture.start()
+
+    capture.submit(surface, 0)
+    capture.submit(surface, 2)
+    capture.close()
+
+    assert capture.frames_written == 2
+    assert sorted(p.name for p in (tmp_path / "frames").iterdir()) == [
+        "frame_000000.png",
+        "frame_000002.png",
+    ]
+    loaded = pg.image.load(str(tmp_path / "frames" / "frame_000002.png"))
+    assert loaded.get_size() == (8, 6)
+    assert loaded.get_at((0, 0))[:3] == (255, 0, 0)
+
+
+def test_capture_raw_stream(pygame_display):
+    surface = pg.Surface((8, 6))
+    surface.fill(pg.Color(1, 2, 3))
+    stream = io.BytesIO()
+    capture = FrameCapture(stream, fmt="raw")
+    capture.start()
+
+    for step in range(3):
+        capture.submit(surface, step)
+    capture.close()
+
+    data = stream.getvalue()
+    assert len(data) == 3 * 8 * 6 * 3
+    assert data[:3] == bytes((1, 2, 3))
+
+
+def test_capture_close_raises_writer_error_without_hanging(pygame_display):
+    class FailingStream(io.BytesIO):
+        def write(self, data) -> int:
+            raise OSError("disk full")
+
+    surface = pg.Surface((4, 4))
+    capture = FrameCapture(FailingStream(), fmt="raw", max_queued=2)
+    capture.start()
+
+    for step in range(10):
+        capture.submit(surface, step)
+    with pytest.raises(OSError, match="disk full"):
+        capture.close()
+
+    assert capture.frames_written == 0
+    assert isinstance(capture.error, OSError)
+    assert capture.submit(surface, 10) is False
+
+
+def test_capture_drops_frames_when_queue_full(tmp_path, pygame_display):
+    surface = pg.Surface((4, 4))
+    capture = FrameCapture(tmp_path, max_queued=1)
+
+    assert capture.submit(surface, 0) is True
+    assert capture.submit(surface, 1) is False
+    assert capture.frames_dropped == 1
+
+
+def test_dropped_frames_are_reported_on_close(tmp_path, pygame_display, capsys):
+    surface = pg.Surface((4, 4))
+    capture = FrameCapture(tmp_path, max_queued=1)
+    capture.submit(surface, 0)
+    capture.submit(surface, 1)
+    capture.start()
+
+    _close_capture(capture)
+
+    assert "dropped 1 captured frame(s)" in capsys.readouterr().err
+
+
+def test_complete_captures_close_quietly(tmp_path, pygame_display, capsys):
+    capture = FrameCapture(tmp_path)
+    capture.start()
+    capture.submit(pg.Surface((4, 4)), 0)
+
+    _close_capture(capture)
+
+    assert capsys.readouterr().err == ""
+
+
+def test_display_frame_submits_due_frames(small_game, pygame_display):
+    stream = io.BytesIO()
+    small_game.capture = FrameCapture(stream, every=2, fmt="raw")
+    small_game.capture.start()
+    surface = pg.Surface((64, 48))
+
+    for _ in range(4):
+        small_game.run_logic()
+        small_game.display_frame(surface, flip=False)
+    small_game.capture.close()
+
+    assert small_game.capture.frames_written == 2
+    assert len(stream.getvalue()) == 2 * 64 * 48 * 3
+
+
+def test_run_headless_captures_offscreen(small_game, tmp_path):
+    small_game.capture = FrameCapture(tmp_path, every=5, fmt="png")
+    small_game.capture.start()
+
+    run_headless(small_game, steps=10)
+    small_game.capture.close()
+
+    assert small_game.steps == 10
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "frame_000005.png",
+        "frame_000010.png",
+    ]
+
+
+def test_run_headless_writes_checkpoints(small_game, tmp_path):
+    checkpoint = tmp_path / "state.npz"
+
+    run_headless(small_game, steps=5, checkpoint=str(checkpoint), checkpoint_every=2)
+
+    small_game.run_logic()
+    small_game.load_state(checkpoint)
+    assert small_game.steps == 5
+
+
+@pytest.mark.parametrize("codec", [None, TrajectoryCodec(keyframe_every=4)])
+def test_run_headless_flushes_the_recording_with_checkpoints(
+    small_game, tmp_path, monkeypatch, codec
+):
+    path = tmp_path / "run.trj"
+    small_game.start_recording(TrajectoryRecorder(path, codec=codec))
+    run_logic = small_game.run_logic
+
+    def run_logic_until_killed() -> None:
+        if small_game.steps == 5:
+            raise KeyboardInterrupt
+        run_logic()
+
+    monkeypatch.setattr(small_game, "run_logic", run_logic_until_killed)
+
+    with pytest.raises(KeyboardInterrupt):
+        run_headless(
+            small_game, steps=10, checkpoint=str(tmp_path / "state.npz"), checkpoint_every=2
+        )
+
+    # The recorder was never closed, the last checkpoint was at step 4
+    assert open_trajectory(path).steps.tolist() == [0, 1, 2, 3, 4]
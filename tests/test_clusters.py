@@ -0,0 +1,99 @@
+"""Tests for my_boids.clusters."""
+
+import numpy as np
+import pytest
+
+from my_boids.clusters import find_clusters
+
+
+def _brute_force_components(positions, radius):
+    """Connected components by breadth-first search over every pair."""
+    count = len(positions)
+    squared = ((positions[:, None, :] - positions[None, :, :]) ** 2).sum(axis=2)
+    adjacent = squared <= radius * radius
+    labels = np.full(count, -1)
+    for start in range(count):
+        if labels[start] >= 0:
+            continue
+        labels[start] = start
+        frontier = [start]
+        while frontier:
+            node = frontier.pop()
+            for other in np.flatnonzero(adjacent[node] & (labels < 0)):
+                labels[other] = start
+                frontier.append(int(other))
+    return labels
+
+
+def _same_partition(first, second):
+    pairs = set(zip(first.tolist(), second.tolist(), strict=True))
+    return len(pairs) == len(set(first.tolist())) == len(set(second.tolist()))
+
+
+@pytest.mark.parametrize("layout", ["uniform", "dense", "several_flocks", "duplicates"])
+def test_clusters_match_brute_force(layout):
+    rng = np.random.default_rng(11)
+    count = 1500
+    if layout == "uniform":
+        positions = rng.uniform(0, 800, size=(count, 2))
+    elif layout == "dense":
+        positions = rng.normal(400, 4, size=(count, 2))
+    elif layout == "several_flocks":
+        centers = rng.uniform(0, 2000, size=(15, 2))
+        positions = centers[rng.integers(0, 15, count)] + rng.normal(0, 12, size=(count, 2))
+    else:
+        positions = np.repeat(rng.uniform(0, 800, size=(count // 3, 2)), 3, axis=0)
+    radius = 17.0
+
+    clusters = find_clusters(positions, radius)
+
+    expected = _brute_force_components(positions, radius)
+    assert _same_partition(clusters.labels, expected)
+    assert clusters.count == len(set(expected.tolist()))
+    assert clusters.sizes.sum() == count
+
+
+def test_chain_of_neighbors_forms_one_cluster():
+    # Consecutive boids are within the radius, the ends are far apart
+    positions = np.column_stack([np.arange(50) * 9.5, np.zeros(50)])
+
+    clusters = find_clusters(positions, 10.0)
+
+    assert clusters.count == 1
+    assert clusters.largest == 50
+
+
+def test_boids_exactly_at_the_radius_are_connected():
+    positions = np.array([[0.0, 0.0], [30.0, 40.0], [200.0, 0.0]])
+
+    clusters = find_clusters(positions, 50.0)
+
+    assert clusters.labels.tolist() == [0, 0, 1]
+
+
+def test_clusters_are_numbered_from_the_largest():
+    positions = np.array(
+        [[500.0, 500.0], [0.0, 0.0], [1.0, 0.0], [2.0, 0.0], [300.0, 0.0], [301.0, 0.0]]
+    )
+
+    clusters = find_clusters(positions, 5.0)
+
+    assert clusters.labels.tolist() == [2, 0, 0, 0, 1, 1]
+    assert clusters.sizes.tolist() == [3, 2, 1]
+    assert (clusters.count, clusters.largest, clusters.singletons) == (3, 3, 1)
+    np.testing.assert_allclose(
+        clusters.centroids(positions), [[1.0, 0.0], [300.5, 0.0], [500.0, 500.0]]
+    )
+
+
+def test_empty_flock_has_no_clusters():
+    clusters = find_clusters(np.zeros((0, 2)), 10.0)
+
+    assert clusters.count == 0
+    assert clusters.largest == 0
+    assert clusters.labels.shape == (0,)
+
+
+def test_radius_must_be_positive():
+    with pytest.raises(ValueError, match="radius"):
+        find_clusters(np.zeros((3, 2)), 0.0)
@@ -1,20 +1,26 @@
 """Tests for my_boids.game."""
 
+import numpy as np
 import pygame as pg
 import pytest
 
-from my_boids.game import Game
+from my_boids.game import RULE_STAGES, Game
 from my_boids.options import (
     PREDATOR_ATTACK_MODE_CENTER,
+    PREDATOR_ATTACK_MODE_CLUSTER,
     PREDATOR_ATTACK_MODE_ISOLATED,
     PREDATOR_ATTACK_MODE_MOUSE,
     PREDATOR_ATTACK_MODE_NEAREST,
+    PREDATOR_MODE_ATTRACT,
     PREDATOR_MODE_AVOID,
     BoidOptions,
     BoundaryType,
+    PerformanceOptions,
     PredatorOptions,
     ScreenOptions,
 )
+from my_boids.recording import TrajectoryRecorder, open_trajectory
+from my_boids.watchdog import SlowFrame, SlowFrameState
 
 
 @pytest.fixture(name="game")
@@ -91,6 +97,19 @@ def test_game_creates_correct_number_of_boids(game):
     assert len(game.boid_list) == 3
 
 
+def test_game_seed_makes_flock_reproducible(pygame_display):
+    def flock(seed):
+        game = Game(
+            screen_opts=ScreenOptions(winsize=[800, 600]),
+            boid_opts=BoidOptions(num_boids=5),
+            seed=seed,
+        )
+        return game.get_boid_positions().tolist(), game.get_boid_velocities().tolist()
+
+    assert flock(1) == flock(1)
+    assert flock(1) != flock(2)
+
+
 def test_game_predator_exists(game):
     assert game.predator is not None
 
@@ -160,6 +179,20 @@ def test_get_predator_target_isolated_strategy(game):
     assert game._get_predator_target() == pg.Vector2(400, 400)
 
 
+def test_get_predator_target_cluster_strategy(game):
+    game.predator.pos = pg.Vector2(500, 500)
+    positions = [(100, 100), (150, 100), (480, 470)]
+    for boid, (x_pos, y_pos) in zip(game.boid_list, positions, strict=False):
+        boid.pos = pg.Vector2(x_pos, y_pos)
+
+    game.predator_opts.predator_attack_mode = PREDATOR_ATTACK_MODE_CLUSTER
+    assert game._get_predator_target() == pg.Vector2(480, 470)
+
+    game.predator.pos = pg.Vector2(90, 90)
+    game.steps += 1
+    assert game._get_predator_target() == pg.Vector2(125, 100)
+
+
 def test_get_predator_target_mouse_strategy(game, monkeypatch):
     game.predator_opts.predator_attack_mode = PREDATOR_ATTACK_MODE_MOUSE
     monkeypatch.setattr(pg.mouse, "get_pos", lambda: (123, 456))
@@ -262,3 +295,257 @@ def test_spatial_grid_produces_same_behavior(game_with_spatial_grid):
 
     assert game_with_spatial_grid.score >= 0
     assert len(game_with_spatial_grid.boid_list) <= 3
+
+
+def test_run_logic_records_nested_spans(game_with_spatial_grid):
+    performance = game_with_spatial_grid.performance
+    performance.start_frame()
+    game_with_spatial_grid.run_logic()
+    performance.end_frame()
+
+    assert {"update", "update/predator", "logic", "logic/grid", "logic/rules", "collision"} <= set(
+        performance.span_stats
+    )
+
+
+def test_rule_breakdown_records_stage_spans_and_pairs(game_with_spatial_grid):
+    game_with_spatial_grid.performance_opts.rule_breakdown_every = 1
+    performance = game_with_spatial_grid.performance
+    performance.start_frame()
+    game_with_spatial_grid.run_logic()
+    performance.end_frame()
+
+    stage_paths = [path for path in performance.span_stats if path.startswith("logic/rules/")]
+    assert stage_paths == [f"logic/rules/{stage}" for stage in RULE_STAGES]
+    assert performance.last_frame_spans is not None
+    rules = performance.last_frame_spans.children["logic"].children["rules"]
+    assert rules.children["cohesion"].calls == len(game_with_spatial_grid.boid_list)
+    assert performance.get_avg_count("cohesion_pairs") >= len(game_with_spatial_grid.boid_list)
+    assert "separation_pairs_avg" in performance.get_performance_summary()
+
+
+def test_rule_breakdown_only_on_sampled_steps(game):
+    game.performance_opts.rule_breakdown_every = 2
+    performance = game.performance
+    for _ in range(3):
+        performance.start_frame()
+        game.run_logic()
+        performance.end_frame()
+
+    assert len(performance.span_stats["logic/rules/cohesion"]) == 2
+    assert len(performance.span_stats["logic/rules"]) == 3
+
+
+def test_rule_breakdown_matches_regular_rules(game_with_spatial_grid):
+    game = game_with_spatial_grid
+    game.predator.pos = pg.Vector2(-10_000, -10_000)
+    boids = list(game.boid_list)
+    initial = [(pg.Vector2(boid.pos), pg.Vector2(boid.vel)) for boid in boids]
+
+    game._apply_all_boid_rules()
+    regular = [(pg.Vector2(boid.pos), pg.Vector2(boid.vel)) for boid in boids]
+    for boid, (pos, vel) in zip(boids, initial, strict=True):
+        boid.pos, boid.vel = pg.Vector2(pos), pg.Vector2(vel)
+    game.spatial_grid.clear()
+    for boid in boids:
+        game.spatial_grid.insert(boid)
+    game._apply_all_boid_rules_detailed()
+    detailed = [(pg.Vector2(boid.pos), pg.Vector2(boid.vel)) for boid in boids]
+
+    assert detailed == regular
+
+
+def test_run_logic_records_grid_stats(game_with_spatial_grid):
+    performance = game_with_spatial_grid.performance
+    performance.start_frame()
+    game_with_spatial_grid.run_logic()
+    performance.end_frame()
+
+    stats = game_with_spatial_grid.grid_stats
+    assert stats is not None
+    assert stats.queries == len(game_with_spatial_grid.boid_list)
+    assert performance.get_avg_count("grid_queries") == stats.queries
+    assert game_with_spatial_grid.snapshot().grid_stats is stats
+
+
+def test_analytics_runs_every_k_steps_and_streams_metrics(pygame_display, tmp_path):
+    game = Game(
+        screen_opts=ScreenOptions(winsize=[800, 600]),
+        boid_opts=BoidOptions(num_boids=20),
+        performance_opts=PerformanceOptions(
+            analytics_every=2,
+            analytics_path=str(tmp_path / "metrics.csv"),
+            analytics_hud=True,
+            track_gc=False,
+        ),
+        seed=5,
+    )
+    performance = game.performance
+    for _ in range(4):
+        performance.start_frame()
+        game.run_logic()
+        performance.end_frame()
+    assert game.analytics is not None
+    game.analytics.close()
+
+    assert len(performance.span_stats["analytics"]) == 2
+    latest = game.analytics.latest
+    assert latest is not None
+    assert (latest.step, latest.count) == (4, len(game.boid_list))
+    assert game.snapshot().flock_metrics is latest
+    lines = (tmp_path / "metrics.csv").read_text().splitlines()
+    assert [line.split(",")[0] for line in lines] == ["step", "2", "4"]
+
+
+def test_analytics_is_off_by_default(game):
+    game.run_logic()
+
+    assert game.analytics is None
+    assert game.snapshot().flock_metrics is None
+
+
+def test_find_clusters_is_computed_once_per_step(game):
+    positions = [(100, 100), (150, 100), (480, 470)]
+    for boid, (x_pos, y_pos) in zip(game.boid_list, positions, strict=False):
+        boid.pos = pg.Vector2(x_pos, y_pos)
+
+    game.performance.start_frame()
+    clusters = game.find_clusters()
+    assert game.find_clusters() is clusters
+    game.performance.end_frame()
+
+    assert clusters.sizes.tolist() == [2, 1]
+    assert len(game.performance.span_stats["clusters"]) == 1
+    game.steps += 1
+    assert game.find_clusters() is not clusters
+
+
+def test_cluster_hud_shows_clusters_in_snapshot(pygame_display):
+    game = Game(
+        screen_opts=ScreenOptions(winsize=[800, 600]),
+        boid_opts=BoidOptions(num_boids=10),
+        performance_opts=PerformanceOptions(cluster_hud=True, track_gc=False),
+        seed=2,
+    )
+
+    clusters = game.snapshot().clusters
+
+    assert clusters is not None
+    assert clusters.sizes.sum() == len(game.boid_list)
+
+
+def test_cluster_colors_toggle_repaints_and_restores_boids(game):
+    positions = [(100, 100), (150, 100), (480, 470)]
+    boids = list(game.boid_list)
+    for boid, (x_pos, y_pos) in zip(boids, positions, strict=True):
+        boid.pos = pg.Vector2(x_pos, y_pos)
+    own_images = [boid.image for boid in boids]
+
+    game.process_events([pg.event.Event(pg.KEYUP, key=pg.K_c)])
+    game._get_frame_layers()
+
+    assert game.performance_opts.cluster_colors
+    assert boids[0].image is boids[1].image
+    assert boids[0].image is not boids[2].image
+    assert not any(boid.image is image for boid, image in zip(boids, own_images, strict=True))
+
+    game.process_events([pg.event.Event(pg.KEYUP, key=pg.K_c)])
+    game._get_frame_layers()
+
+    assert [boid.image for boid in boids] == own_images
+
+
+def test_cluster_colors_forget_caught_boids(game):
+    game.process_events([pg.event.Event(pg.KEYUP, key=pg.K_c)])
+    game._get_frame_layers()
+    caught, *survivors = game.boid_list
+    caught.kill()
+
+    game._get_frame_layers()
+
+    assert set(game._boid_images) == set(survivors)
+
+
+def test_game_records_trajectory(game, tmp_path):
+    game.start_recording(TrajectoryRecorder(tmp_path / "run.trj"))
+    for _ in range(3):
+        game.run_logic()
+    game.stop_recording()
+
+    trajectory = open_trajectory(tmp_path / "run.trj")
+    assert trajectory.steps.tolist() == [0, 1, 2, 3]
+    assert trajectory.options["boid"]["num_boids"] == 3
+    assert game.recorder is None
+
+
+def test_game_reset_restarts_recording_slots(game, tmp_path):
+    game.start_recording(TrajectoryRecorder(tmp_path / "run.trj"))
+    game.reset()
+    game.run_logic()
+    game.stop_recording()
+
+    trajectory = open_trajectory(tmp_path / "run.trj")
+    assert trajectory.alive.all()
+    assert trajectory.slots == 3
+
+
+def test_slow_frame_state_dumps_options_only_when_they_change(game):
+    first = game.slow_frame_state().options
+    assert game.slow_frame_state().options is first
+
+    game.predator_opts.predator_behavior_mode = PREDATOR_MODE_ATTRACT
+    changed = game.slow_frame_state().options
+
+    assert changed is not first
+    assert changed["predator"]["predator_behavior_mode"] == PREDATOR_MODE_ATTRACT
+
+
+def test_restoring_a_slow_frame_restarts_recording_slots(game, tmp_path):
+    game.start_recording(TrajectoryRecorder(tmp_path / "run.trj"))
+    state = SlowFrameState(
+        step=5,
+        positions=np.array([[10.0, 20.0], [30.0, 40.0], [50.0, 60.0]]),
+        velocities=np.array([[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0]]),
+        predator_pos=(-10_000.0, -10_000.0),
+        options={},
+    )
+    game.restore_slow_frame(SlowFrame(frame_time=0.05, budget=0.02, spans={}, state=state))
+    assert game.recorder is not None
+    game.recorder.record(game.steps, game.boid_list, game.predator, game.score)
+    game.stop_recording()
+
+    trajectory = open_trajectory(tmp_path / "run.trj")
+    assert trajectory.steps.tolist() == [0, 5]
+    assert trajectory.alive.all()
+    np.testing.assert_array_equal(trajectory.positions[-1], state.positions)
+    np.testing.assert_array_equal(trajectory.colors, game.get_boid_colors())
+
+
+def test_game_resumes_exactly_from_saved_state(game, tmp_path):
+    for _ in range(3):
+        game.run_logic()
+    game.save_state(tmp_path / "state.npz")
+    for _ in range(5):
+        game.run_logic()
+    expected = game.get_boid_positions().tolist(), game.steps, game.score
+    expected_draw = game.rng.integers(0, 1_000_000)
+
+    game.load_state(tmp_path / "state.npz")
+    assert game.steps == 3
+    for _ in range(5):
+        game.run_logic()
+
+    assert (game.get_boid_positions().tolist(), game.steps, game.score) == expected
+    assert game.rng.integers(0, 1_000_000) == expected_draw
+
+
+def test_load_state_restores_options_and_colors(game, game_with_spatial_grid, tmp_path):
+    game_with_spatial_grid.save_state(tmp_path / "state.npz")
+
+    game.load_state(tmp_path / "state.npz")
+
+    assert game.use_spatial_grid
+    assert game.spatial_grid is not None
+    assert game.get_boid_colors().tolist() == game_with_spatial_grid.get_boid_colors().tolist()
+    assert game.boid_opts == game_with_spatial_grid.boid_opts
+    assert len(game.all_sprites_list) == len(game.boid_list) + 1
@@ -0,0 +1,102 @@
+"""Tests for heatmap.py"""
+
+import numpy as np
+import pygame as pg
+import pytest
+
+from my_boids.boids import Boid
+from my_boids.game import Game
+from my_boids.heatmap import (
+    COLORMAP,
+    density_histogram,
+    grid_density_histogram,
+    render_density,
+)
+from my_boids.options import BoidOptions, PerformanceOptions, PredatorOptions, ScreenOptions
+from my_boids.spatial_grid import SpatialGrid
+
+
+@pytest.fixture(name="heatmap_game")
+def fixture_heatmap_game(pygame_display):
+    return Game(
+        screen_opts=ScreenOptions(winsize=[800, 600]),
+        boid_opts=BoidOptions(num_boids=20),
+        predator_opts=PredatorOptions(predator_attack_mode="center"),
+        performance_opts=PerformanceOptions(heatmap_threshold=10),
+    )
+
+
+def test_density_histogram_counts_positions():
+    positions = np.array([[5.0, 5.0], [6.0, 7.0], [25.0, 5.0]])
+
+    counts = density_histogram(positions, (40, 20), cell_size=10.0)
+
+    assert counts.shape == (4, 2)
+    assert counts[0, 0] == 2
+    assert counts[2, 0] == 1
+    assert counts.sum() == 3
+
+
+def test_density_histogram_ignores_positions_outside_window():
+    positions = np.array([[-5.0, 5.0], [5.0, 500.0], [5.0, 5.0]])
+
+    counts = density_histogram(positions, (40, 20), cell_size=10.0)
+
+    assert counts.sum() == 1
+
+
+def test_density_histogram_empty():
+    counts = density_histogram(np.empty((0, 2)), (40, 20), cell_size=10.0)
+    assert counts.shape == (4, 2)
+    assert counts.sum() == 0
+
+
+def test_grid_density_histogram_matches_direct_binning():
+    positions = [(5.0, 5.0), (15.0, 5.0), (16.0, 8.0), (35.0, 15.0), (-5.0, 2.0)]
+    grid = SpatialGrid(cell_size=10.0)
+    for pos in positions:
+        grid.insert(Boid(pos=pg.Vector2(pos)))
+
+    from_grid = grid_density_histogram(grid, (40, 20))
+    direct = density_histogram(np.array(positions), (40, 20), cell_size=10.0)
+
+    np.testing.assert_array_equal(from_grid, direct)
+
+
+def test_render_density_scales_to_window(pygame_display):
+    counts = np.zeros((4, 2))
+    counts[0, 0] = 5
+
+    surface = render_density(counts, (40, 20))
+
+    assert surface.get_size() == (40, 20)
+    assert surface.get_at((5, 5))[:3] == tuple(COLORMAP[-1])
+    assert surface.get_at((35, 15))[:3] == (0, 0, 0)
+
+
+def test_game_uses_heatmap_above_threshold(heatmap_game):
+    assert heatmap_game.use_density_heatmap()
+
+    heatmap_game.performance_opts.heatmap_threshold = 100
+    assert not heatmap_game.use_density_heatmap()
+
+
+def test_game_get_boid_positions(heatmap_game):
+    positions = heatmap_game.get_boid_positions()
+
+    assert positions.shape == (20, 2)
+    first = next(iter(heatmap_game.boid_list))
+    assert tuple(positions[0]) == (first.pos.x, first.pos.y)
+
+
+def test_snapshot_uses_heatmap_and_keeps_predator(heatmap_game):
+    snapshot = heatmap_game.snapshot()
+
+    assert snapshot.density is not None
+    assert len(snapshot.blit_sequence) == 1
+    assert snapshot.blit_sequence[0][0] is heatmap_game.predator.image
+
+
+def test_display_frame_with_heatmap(heatmap_game, pygame_display):
+    heatmap_game.display_frame(pygame_display, flip=False)
+    heatmap_game.display_frame(pygame_display, flip=False, snapshot=heatmap_game.snapshot())
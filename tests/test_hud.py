@@ -1,10 +1,14 @@
 """Focused tests for HUD rendering helpers."""
 
+import numpy as np
 import pygame as pg
 
 from my_boids import hud
+from my_boids.analytics import FlockMetrics
+from my_boids.clusters import Clusters
+from my_boids.memory import AllocationSample, GCMonitor
 from my_boids.performance import FrameMetrics, PerformanceMonitor
-from my_boids.spatial_grid import SpatialGrid
+from my_boids.spatial_grid import GridQueryStats, SpatialGrid
 
 
 def test_draw_predator_attack_mode_uses_friendly_label(monkeypatch, pygame_display):
@@ -34,6 +38,7 @@ def test_draw_metrics_includes_grid_mode_and_timing_lines(monkeypatch, pygame_di
 
     performance = PerformanceMonitor(enabled=True)
     performance.frame_times.append(1 / 50)
+    performance.frame_stats.add(1 / 50)
     performance.current_metrics = FrameMetrics(
         frame_time=1 / 50,
         update_time=0.001,
@@ -52,12 +57,38 @@ def test_draw_metrics_includes_grid_mode_and_timing_lines(monkeypatch, pygame_di
     )
 
     assert "Mode: Spatial" in captured_lines
+    assert "p50/p95/p99: 20.0/20.0/20.0ms" in captured_lines
     assert "Update: 1.00ms" in captured_lines
     assert "Logic: 2.00ms" in captured_lines
     assert "Collision: 3.00ms" in captured_lines
     assert "Render: 4.00ms" in captured_lines
 
 
+def test_draw_metrics_includes_gc_and_allocation_lines(monkeypatch, pygame_display):
+    captured_lines: list[str] = []
+
+    class FakeFont:
+        def render(self, text: str, _antialias: bool, _color: pg.Color) -> pg.Surface:
+            captured_lines.append(text)
+            return pg.Surface((1, 1))
+
+    monkeypatch.setattr(pg.font, "SysFont", lambda *_args, **_kwargs: FakeFont())
+
+    performance = PerformanceMonitor(enabled=True)
+    performance.gc_monitor = GCMonitor()
+    for stats, count in zip(performance.gc_collection_stats, (4, 1, 0), strict=True):
+        stats.add(count)
+    performance.gc_pause_stats.add(0.002)
+    performance.last_allocation_sample = AllocationSample(blocks=120, size=4096, peak=10240)
+
+    hud.draw_metrics(
+        pygame_display, performance, boid_count=1, use_spatial_grid=False, spatial_grid=None
+    )
+
+    assert "GC: 4/1/0 pause 2.00/2.00ms" in captured_lines
+    assert "Alloc: 120 blocks, peak 10KB" in captured_lines
+
+
 def test_draw_frame_game_over_short_circuits_sprite_and_metric_draw(monkeypatch, pygame_display):
     calls: list[str] = []
 
@@ -151,3 +182,116 @@ def test_draw_frame_active_calls_expected_helpers(monkeypatch, pygame_display):
     assert "predator_attack_mode" in calls
     assert "metrics" in calls
     assert "game_over" not in calls
+
+
+def test_draw_metrics_includes_rule_breakdown(monkeypatch, pygame_display):
+    captured_lines: list[str] = []
+
+    class FakeFont:
+        def render(self, text: str, _antialias: bool, _color: pg.Color) -> pg.Surface:
+            captured_lines.append(text)
+            return pg.Surface((1, 1))
+
+    monkeypatch.setattr(pg.font, "SysFont", lambda *_args, **_kwargs: FakeFont())
+
+    performance = PerformanceMonitor(enabled=True)
+    performance.start_frame()
+    with performance.span("logic"), performance.span("rules"):
+        performance.add_span("neighbors", 0.001)
+        performance.add_span("cohesion", 0.002)
+    performance.count("cohesion_pairs", 1500)
+    performance.end_frame()
+
+    hud.draw_metrics(
+        pygame_display, performance, boid_count=1, use_spatial_grid=False, spatial_grid=None
+    )
+
+    logic_index = next(i for i, line in enumerate(captured_lines) if line.startswith("Logic:"))
+    assert captured_lines[logic_index + 1 : logic_index + 3] == [
+        "  neighbors: 1.00ms",
+        "  cohesion: 2.00ms (1500 pairs)",
+    ]
+
+
+def test_draw_metrics_includes_grid_query_stats(monkeypatch, pygame_display):
+    captured_lines: list[str] = []
+
+    class FakeFont:
+        def render(self, text: str, _antialias: bool, _color: pg.Color) -> pg.Surface:
+            captured_lines.append(text)
+            return pg.Surface((1, 1))
+
+    monkeypatch.setattr(pg.font, "SysFont", lambda *_args, **_kwargs: FakeFont())
+    grid_stats = GridQueryStats(
+        queries=10,
+        candidates=200,
+        neighbors=50,
+        cells_visited=90,
+        occupied_cells=4,
+        max_occupancy=12,
+        mean_occupancy=5.0,
+        occupancy_histogram=(1, 1, 1, 1),
+    )
+
+    hud.draw_metrics(
+        pygame_display,
+        PerformanceMonitor(enabled=True),
+        boid_count=20,
+        use_spatial_grid=True,
+        spatial_grid=SpatialGrid(cell_size=25.0),
+        grid_stats=grid_stats,
+    )
+
+    assert "Occupancy: avg 5.0 max 12" in captured_lines
+    assert "Query: 9 cells, 20.0 scanned, 25% hit" in captured_lines
+
+
+def test_draw_flock_metrics_lists_the_latest_metrics(monkeypatch, pygame_display):
+    captured_lines: list[str] = []
+
+    class FakeFont:
+        def render(self, text: str, _antialias: bool, _color: pg.Color) -> pg.Surface:
+            captured_lines.append(text)
+            return pg.Surface((1, 1))
+
+    monkeypatch.setattr(pg.font, "SysFont", lambda *_args, **_kwargs: FakeFont())
+    metrics = FlockMetrics(
+        step=40,
+        count=10,
+        polarization=0.875,
+        centroid_x=400.0,
+        centroid_y=300.0,
+        radius_of_gyration=120.4,
+        speed_mean=3.5,
+        speed_std=0.25,
+        nn_mean=9.0,
+        nn_p10=4.0,
+        nn_p50=8.5,
+        nn_p90=15.25,
+    )
+
+    hud.draw_flock_metrics(pygame_display, metrics)
+
+    assert captured_lines == [
+        "Flock @ step 40",
+        "Polarization: 0.88",
+        "Gyration radius: 120",
+        "Speed: 3.50 +/- 0.25",
+        "NN p10/p50/p90: 4.0/8.5/15.2",
+    ]
+
+
+def test_draw_clusters_summarizes_the_clusters(monkeypatch, pygame_display):
+    captured_lines: list[str] = []
+
+    class FakeFont:
+        def render(self, text: str, _antialias: bool, _color: pg.Color) -> pg.Surface:
+            captured_lines.append(text)
+            return pg.Surface((1, 1))
+
+    monkeypatch.setattr(pg.font, "SysFont", lambda *_args, **_kwargs: FakeFont())
+    clusters = Clusters(labels=np.array([0, 0, 0, 1, 2, 3]), sizes=np.array([3, 1, 1, 1]))
+
+    hud.draw_clusters(pygame_display, clusters)
+
+    assert captured_lines == ["Clusters: 4 (largest 3, 3 singletons)"]
@@ -0,0 +1,42 @@
+"""Tests for the lazily resolved public API of the my_boids package."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import my_boids
+from my_boids.game import Game
+from my_boids.options import PREDATOR_MODE_AVOID, BoidOptions
+
+
+def test_public_names_resolve_to_their_definitions():
+    assert my_boids.Game is Game
+    assert my_boids.BoidOptions is BoidOptions
+    assert my_boids.PREDATOR_MODE_AVOID == PREDATOR_MODE_AVOID
+
+
+def test_every_public_name_is_resolvable():
+    for name in my_boids.__all__:
+        assert getattr(my_boids, name) is not None
+    assert set(my_boids.__all__) <= set(dir(my_boids))
+
+
+def test_unknown_name_raises_attribute_error():
+    with pytest.raises(AttributeError):
+        my_boids.NoSuchName  # noqa: B018
+
+
+def test_import_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, my_boids; "
+        "print(sorted(m for m in ('pygame', 'pygame_gui', 'numpy', 'pydantic') if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(my_boids.__file__).resolve().parents[1])}
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+    )
+
+    assert completed.stdout.strip() == "[]"
@@ -0,0 +1,182 @@
+"""Tests for memory.py"""
+
+import gc
+import tracemalloc
+
+import pytest
+
+from my_boids.game import Game
+from my_boids.memory import (
+    DEFERRED_FULL_COLLECTION_THRESHOLD,
+    AllocationSampler,
+    GCMonitor,
+    GCScheduler,
+)
+from my_boids.options import BoidOptions, PerformanceOptions
+from my_boids.performance import PerformanceMonitor
+from my_boids.tracing import TraceRecorder
+
+
+@pytest.fixture(name="restore_gc")
+def fixture_restore_gc():
+    threshold = gc.get_threshold()
+    yield
+    gc.set_threshold(*threshold)
+    gc.unfreeze()
+
+
+def test_gc_monitor_records_collections():
+    monitor = GCMonitor().install()
+    try:
+        gc.collect(1)
+        gc.collect()
+    finally:
+        monitor.uninstall()
+
+    pauses = monitor.drain()
+    assert [pause.generation for pause in pauses][-2:] == [1, 2]
+    assert all(pause.duration >= 0 for pause in pauses)
+    assert monitor.drain() == []
+
+
+def test_gc_monitor_uninstall_stops_recording():
+    monitor = GCMonitor().install()
+    monitor.uninstall()
+
+    gc.collect()
+
+    assert monitor.drain() == []
+
+
+def test_gc_monitor_hook_is_removed_with_the_monitor():
+    callback_count = len(gc.callbacks)
+    GCMonitor().install()
+
+    gc.collect()
+
+    assert len(gc.callbacks) == callback_count
+
+
+def test_allocation_sampler_samples_every_nth_frame():
+    sampler = AllocationSampler(every=2)
+    samples = []
+    kept = []
+    for _ in range(4):
+        sampler.start_frame()
+        kept.append([object() for _ in range(100)])
+        samples.append(sampler.end_frame())
+
+    assert samples[1] is None
+    assert samples[3] is None
+    assert samples[0] is not None
+    assert samples[0].blocks >= 100
+    assert samples[0].size > 0
+    assert samples[0].peak > 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_allocation_sampler_leaves_existing_tracing_alone():
+    sampler = AllocationSampler(every=1)
+    tracemalloc.start()
+    try:
+        sampler.start_frame()
+        assert sampler.end_frame() is None
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_allocation_sampler_rejects_invalid_interval():
+    with pytest.raises(ValueError):
+        AllocationSampler(every=0)
+
+
+def test_gc_scheduler_defers_and_restores_full_collections(restore_gc):
+    original = gc.get_threshold()
+    scheduler = GCScheduler()
+
+    scheduler.defer_full_collections()
+    assert gc.get_threshold()[2] == DEFERRED_FULL_COLLECTION_THRESHOLD
+    assert scheduler.collect_if_due() is False
+    for _ in range(original[2]):
+        gc.collect(1)
+    assert scheduler.collect_if_due() is True
+    assert gc.get_count()[2] == 0
+
+    scheduler.restore()
+    assert gc.get_threshold() == original
+    assert not scheduler.deferring
+
+
+def test_gc_scheduler_collects_without_the_long_lived_ratio_check(restore_gc):
+    original = gc.get_threshold()
+    scheduler = GCScheduler()
+    # A large oldest generation that does not grow, so the interpreter's own
+    # check would keep skipping full collections
+    long_lived: list[list[int]] = [[] for _ in range(100_000)]
+    gc.collect()
+
+    scheduler.defer_full_collections()
+    for _ in range(original[2]):
+        gc.collect(1)
+
+    assert scheduler.collect_if_due() is True
+    scheduler.restore()
+    del long_lived
+
+
+def test_gc_scheduler_freeze(restore_gc):
+    scheduler = GCScheduler()
+
+    scheduler.freeze()
+    assert gc.get_freeze_count() > 0
+
+    scheduler.restore()
+    assert gc.get_freeze_count() == 0
+
+
+def test_performance_monitor_records_gc_per_frame():
+    monitor = PerformanceMonitor()
+    monitor.gc_monitor = GCMonitor().install()
+    monitor.trace = TraceRecorder()
+    try:
+        monitor.start_frame()
+        gc.collect()
+        monitor.end_frame()
+    finally:
+        monitor.gc_monitor.uninstall()
+
+    assert monitor.get_gc_collections(2) >= 1
+    assert monitor.get_max_gc_pause() > 0
+    summary = monitor.get_performance_summary()
+    assert summary["gc_gen2_collections"] >= 1
+    assert "gc_pause_avg_ms" in summary
+    assert any(event["cat"] == "gc" for event in monitor.trace.events)
+
+
+def test_performance_monitor_records_allocation_samples():
+    monitor = PerformanceMonitor()
+    monitor.allocations = AllocationSampler(every=1)
+
+    monitor.start_frame()
+    kept = [object() for _ in range(50)]
+    monitor.end_frame()
+
+    assert kept
+    assert monitor.last_allocation_sample is not None
+    summary = monitor.get_performance_summary()
+    assert summary["alloc_blocks_avg"] >= 50
+    assert summary["alloc_peak_kb_max"] > 0
+
+
+def test_game_gc_freeze_option(pygame_display, restore_gc):
+    game = Game(
+        boid_opts=BoidOptions(num_boids=5),
+        performance_opts=PerformanceOptions(gc_freeze=True, track_gc=False),
+    )
+
+    assert game.gc_scheduler.deferring
+    assert gc.get_freeze_count() > 0
+    assert game.performance.gc_monitor is None
+
+    game.gc_scheduler.restore()
@@ -5,11 +5,13 @@ from pathlib import Path
 import pytest
 
 from my_boids.options import (
+    MAX_NUM_BOIDS,
     PREDATOR_ATTACK_MODE_CENTER,
     PREDATOR_ATTACK_MODE_MOUSE,
     PREDATOR_ATTACK_MODE_NEAREST,
     BoidOptions,
     BoundaryType,
+    PerformanceOptions,
     PredatorOptions,
     ScreenOptions,
     load_config,
@@ -40,6 +42,13 @@ def test_boid_options_num_boids():
     assert opts.num_boids == 53
 
 
+def test_boid_options_num_boids_allows_large_flocks():
+    """BoidOptions accepts flocks up to MAX_NUM_BOIDS"""
+    assert BoidOptions(num_boids=MAX_NUM_BOIDS).num_boids == MAX_NUM_BOIDS
+    with pytest.raises(ValueError):
+        BoidOptions(num_boids=MAX_NUM_BOIDS + 1)
+
+
 def test_boid_options_size():
     """BoidOptions reads size from config"""
     opts = BoidOptions.from_config()
@@ -110,3 +119,43 @@ def test_predator_options_attack_mode_invalid_falls_back(tmp_path: Path):
 
     assert opts.predator_attack_mode == PREDATOR_ATTACK_MODE_MOUSE
     load_config.cache_clear()
+
+
+def test_performance_options_defaults_without_section(tmp_path: Path):
+    """PerformanceOptions falls back to defaults when the section is missing."""
+    config_path = tmp_path / "config.ini"
+    config_path.write_text("[screen]\nwinsize = [800, 600]\n")
+    load_config.cache_clear()
+
+    opts = PerformanceOptions.from_config(str(config_path))
+
+    assert opts.pipelined is False
+    load_config.cache_clear()
+
+
+def test_performance_options_pipelined(tmp_path: Path):
+    """PerformanceOptions reads the pipelined flag from config."""
+    config_path = tmp_path / "config.ini"
+    config_path.write_text("[performance]\npipelined = yes\n")
+    load_config.cache_clear()
+
+    opts = PerformanceOptions.from_config(str(config_path))
+
+    assert opts.pipelined is True
+    load_config.cache_clear()
+
+
+def test_performance_options_gc_settings(tmp_path: Path):
+    """PerformanceOptions reads the GC instrumentation and scheduling settings."""
+    config_path = tmp_path / "config.ini"
+    config_path.write_text(
+        "[performance]\ntrack_gc = no\nalloc_sample_every = 30\ngc_freeze = yes\n"
+    )
+    load_config.cache_clear()
+
+    opts = PerformanceOptions.from_config(str(config_path))
+
+    assert opts.track_gc is False
+    assert opts.alloc_sample_every == 30
+    assert opts.gc_freeze is True
+    load_config.cache_clear()
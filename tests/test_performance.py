@@ -1,7 +1,10 @@
 """Tests for performance.py"""
 
+import threading
 import time
 
+import pytest
+
 from my_boids.performance import FrameMetrics, PerformanceMonitor
 
 
@@ -186,3 +189,221 @@ def test_operation_types():
     assert monitor.current_metrics.logic_time > 0
     assert monitor.current_metrics.collision_time > 0
     assert monitor.current_metrics.render_time > 0
+
+
+def test_span_records_nested_paths():
+    """Nested spans are aggregated by their full path."""
+    monitor = PerformanceMonitor()
+
+    monitor.start_frame()
+    with monitor.span("logic"):
+        with monitor.span("grid"):
+            time.sleep(0.002)
+        for _ in range(3):
+            with monitor.span("rules"):
+                pass
+    monitor.end_frame()
+
+    tree = monitor.last_frame_spans
+    assert tree is not None
+    logic = tree.children["logic"]
+    assert logic.calls == 1
+    assert logic.children["rules"].calls == 3
+    assert logic.total_time >= logic.children["grid"].total_time >= 0.002
+
+    assert set(monitor.span_stats) == {"logic", "logic/grid", "logic/rules"}
+    assert monitor.get_avg_span_time("logic/grid") >= 2
+
+
+def test_span_root_legacy_name_fills_frame_metrics():
+    """Root-level spans with legacy names still fill FrameMetrics."""
+    monitor = PerformanceMonitor()
+
+    monitor.start_frame()
+    with monitor.span("render"):
+        time.sleep(0.001)
+    with monitor.span("update"), monitor.span("logic"):
+        pass
+    monitor.end_frame()
+
+    assert monitor.current_metrics is not None
+    assert monitor.current_metrics.render_time >= 0.001
+    # A nested 'logic' span is not the frame-level logic time
+    assert monitor.current_metrics.logic_time == 0.0
+
+
+def test_timed_decorator_records_span():
+    """The timed decorator wraps every call in a span."""
+    monitor = PerformanceMonitor()
+
+    @monitor.timed()
+    def neighbor_query(value: int) -> int:
+        return value * 2
+
+    @monitor.timed("custom")
+    def other() -> None:
+        pass
+
+    monitor.start_frame()
+    assert neighbor_query(21) == 42
+    neighbor_query(1)
+    other()
+    monitor.end_frame()
+
+    assert monitor.last_frame_spans is not None
+    assert monitor.last_frame_spans.children["neighbor_query"].calls == 2
+    assert "custom" in monitor.get_span_summary()
+
+
+def test_end_operation_accepts_arbitrary_names():
+    """Unknown operation names are recorded as spans instead of dropped."""
+    monitor = PerformanceMonitor()
+
+    monitor.start_frame()
+    monitor.start_operation()
+    monitor.end_operation("hud")
+    monitor.end_frame()
+
+    assert "hud" in monitor.span_stats
+
+
+def test_span_disabled_records_nothing():
+    """Spans are no-ops when monitoring is disabled."""
+    monitor = PerformanceMonitor(enabled=False)
+
+    monitor.start_frame()
+    with monitor.span("logic"):
+        pass
+    monitor.end_frame()
+
+    assert monitor.span_stats == {}
+    assert monitor.last_frame_spans is None
+
+
+def test_span_window_is_bounded():
+    """Span samples are kept over the same window as frame times."""
+    monitor = PerformanceMonitor(max_samples=4)
+
+    for _ in range(10):
+        monitor.start_frame()
+        with monitor.span("logic"):
+            pass
+        monitor.end_frame()
+
+    assert len(monitor.span_stats["logic"]) == 4
+
+
+def test_performance_summary_includes_percentiles_and_spans():
+    """The summary reports frame and span percentiles."""
+    monitor = PerformanceMonitor()
+
+    for _ in range(5):
+        monitor.start_frame()
+        with monitor.span("logic"):
+            time.sleep(0.001)
+        monitor.end_frame()
+
+    summary = monitor.get_performance_summary()
+
+    for key in ("p50_frame_time_ms", "p95_frame_time_ms", "p99_frame_time_ms"):
+        assert summary[key] > 0
+    assert summary["p50_frame_time_ms"] <= summary["max_frame_time_ms"]
+    for key in ("logic_avg_ms", "logic_p50_ms", "logic_p95_ms", "logic_p99_ms", "logic_max_ms"):
+        assert summary[key] >= 1
+    assert monitor.get_span_percentile("logic", 99) == summary["logic_p99_ms"]
+
+
+def test_add_span_nests_in_current_span():
+    monitor = PerformanceMonitor()
+    monitor.start_frame()
+    with monitor.span("rules"):
+        monitor.add_span("cohesion", 0.003, calls=10)
+        monitor.add_span("cohesion", 0.001, calls=10)
+    monitor.end_frame()
+
+    assert monitor.last_frame_spans is not None
+    node = monitor.last_frame_spans.children["rules"].children["cohesion"]
+    assert node.total_time == pytest.approx(0.004)
+    assert node.calls == 20
+    assert monitor.get_avg_span_time("rules/cohesion") == pytest.approx(4.0)
+
+
+def test_count_totals_per_frame():
+    monitor = PerformanceMonitor()
+    for pairs in (10, 30):
+        monitor.start_frame()
+        monitor.count("cohesion_pairs", pairs)
+        monitor.count("cohesion_pairs", pairs)
+        monitor.end_frame()
+
+    assert monitor.get_avg_count("cohesion_pairs") == pytest.approx(40.0)
+    assert monitor.get_avg_count("missing") == 0.0
+    assert monitor.get_performance_summary()["cohesion_pairs_avg"] == pytest.approx(40.0)
+
+
+def _run_in_thread(target):
+    worker = threading.Thread(target=target)
+    worker.start()
+    worker.join()
+
+
+def test_other_thread_spans_join_the_frame_only_after_hand_off():
+    monitor = PerformanceMonitor()
+
+    def step():
+        with monitor.span("logic"):
+            monitor.add_span("rules", 0.002)
+        monitor.count("pairs", 3)
+
+    monitor.start_frame()
+    _run_in_thread(step)
+    with monitor.span("render"):
+        pass
+    monitor.end_frame()
+
+    assert set(monitor.span_stats) == {"render"}
+    assert monitor.get_avg_count("pairs") == 0.0
+
+    def step_and_hand_off():
+        step()
+        monitor.hand_off_thread_spans()
+
+    monitor.start_frame()
+    _run_in_thread(step_and_hand_off)
+    monitor.end_frame()
+
+    assert monitor.last_frame_spans is not None
+    rules = monitor.last_frame_spans.children["logic"].children["rules"]
+    assert rules.total_time == pytest.approx(0.002)
+    assert rules.calls == 1
+    assert monitor.get_avg_count("pairs") == pytest.approx(3.0)
+
+
+def test_hand_off_on_the_frame_thread_is_a_no_op():
+    monitor = PerformanceMonitor()
+    monitor.start_frame()
+    with monitor.span("logic"):
+        pass
+    monitor.hand_off_thread_spans()
+    monitor.end_frame()
+
+    assert monitor.last_frame_spans is not None
+    assert monitor.last_frame_spans.children["logic"].calls == 1
+
+
+def test_other_threads_keep_their_own_step_metrics():
+    monitor = PerformanceMonitor()
+    monitor.start_frame()
+    step_metrics = []
+
+    def step():
+        with monitor.span("logic"):
+            time.sleep(0.001)
+        step_metrics.append(monitor.step_metrics())
+
+    _run_in_thread(step)
+
+    assert monitor.current_metrics is not None
+    assert monitor.current_metrics.logic_time == 0.0
+    assert step_metrics[0] is not None
+    assert step_metrics[0].logic_time >= 0.001
@@ -0,0 +1,166 @@
+"""Tests for pipeline.py"""
+
+import io
+import threading
+
+import pygame as pg
+import pytest
+
+from my_boids.capture import FrameCapture
+from my_boids.game import Game
+from my_boids.options import BoidOptions, BoundaryType, PredatorOptions, ScreenOptions
+from my_boids.pipeline import FrameSnapshot, SimulationThread, SnapshotBuffer
+
+
+def _snapshot(step: int) -> FrameSnapshot:
+    return FrameSnapshot(
+        step=step,
+        blit_sequence=(),
+        score=0,
+        game_over=False,
+        predator_behavior_mode="avoid",
+        predator_attack_mode="center",
+        boid_count=0,
+    )
+
+
+@pytest.fixture(name="game")
+def fixture_game(pygame_display):
+    return Game(
+        screen_opts=ScreenOptions(winsize=[800, 600], boundary_type=BoundaryType.BOUNCE),
+        boid_opts=BoidOptions(num_boids=5),
+        predator_opts=PredatorOptions(predator_attack_mode="center"),
+    )
+
+
+def test_snapshot_buffer_starts_empty():
+    assert SnapshotBuffer().latest() is None
+
+
+def test_snapshot_buffer_returns_latest_publish():
+    buffer = SnapshotBuffer()
+    for step in range(7):
+        buffer.publish(_snapshot(step))
+
+    latest = buffer.latest()
+    assert latest is not None
+    assert latest.step == 6
+
+
+def test_snapshot_draw_blits_every_sprite(pygame_display):
+    image = pg.Surface((2, 2))
+    image.fill(pg.Color("red"))
+    snapshot = FrameSnapshot(
+        step=0,
+        blit_sequence=((image, (5, 5)), (image, (20, 20))),
+        score=0,
+        game_over=False,
+        predator_behavior_mode="avoid",
+        predator_attack_mode="center",
+        boid_count=2,
+    )
+    pygame_display.fill(pg.Color("black"))
+
+    snapshot.draw(pygame_display)
+
+    assert pygame_display.get_at((5, 5)) == pg.Color("red")
+    assert pygame_display.get_at((21, 21)) == pg.Color("red")
+
+
+def test_game_snapshot_captures_all_sprites(game):
+    snapshot = game.snapshot()
+
+    assert snapshot.step == game.steps
+    assert snapshot.boid_count == 5
+    assert len(snapshot.blit_sequence) == len(game.all_sprites_list)
+    assert snapshot.predator_attack_mode == "center"
+
+
+def test_run_logic_advances_step_counter(game):
+    game.run_logic()
+    game.run_logic()
+    assert game.steps == 2
+
+
+def test_display_frame_from_snapshot(game, pygame_display):
+    game.display_frame(pygame_display, flip=False, snapshot=game.snapshot())
+
+
+def test_snapshot_hud_does_not_read_live_state(pygame_display):
+    game = Game(
+        boid_opts=BoidOptions(num_boids=5),
+        predator_opts=PredatorOptions(predator_attack_mode="center"),
+        use_spatial_grid=True,
+    )
+    game.performance.start_frame()
+    game.run_logic()
+    snapshot = game.snapshot()
+    assert snapshot.grid_cells is not None
+    assert snapshot.step_metrics is not None
+    assert snapshot.step_metrics.logic_time > 0
+
+    def rebuilding() -> int:
+        raise AssertionError("the live grid was read")
+
+    assert game.spatial_grid is not None
+    game.spatial_grid.get_cell_count = rebuilding  # type: ignore[method-assign]
+    game.display_frame(pygame_display, flip=False, snapshot=snapshot)
+
+
+def test_snapshot_steps_are_captured_once(game, pygame_display):
+    stream = io.BytesIO()
+    game.capture = FrameCapture(stream, fmt="raw")
+    game.capture.start()
+    snapshot = game.snapshot()
+
+    for _ in range(3):
+        game.display_frame(pygame_display, flip=False, snapshot=snapshot)
+    game.capture.close()
+
+    assert game.capture.frames_written == 1
+
+
+def test_simulation_thread_steps_on_request(game):
+    stepped = threading.Event()
+
+    def step() -> None:
+        game.run_logic()
+        stepped.set()
+
+    sim_thread = SimulationThread(step=step, snapshot=game.snapshot)
+    initial = sim_thread.buffer.latest()
+    assert initial is not None
+    assert initial.step == 0
+
+    sim_thread.start()
+    try:
+        sim_thread.request_step()
+        assert stepped.wait(timeout=5)
+    finally:
+        sim_thread.stop(timeout=5)
+
+    latest = sim_thread.buffer.latest()
+    assert latest is not None
+    assert latest.step == 1
+    assert not sim_thread.is_alive()
+
+
+def test_simulation_thread_hands_off_before_publishing(game):
+    published_at_handoff: list[int] = []
+    handed_off = threading.Event()
+
+    def handoff() -> None:
+        latest = sim_thread.buffer.latest()
+        assert latest is not None
+        published_at_handoff.append(latest.step)
+        handed_off.set()
+
+    sim_thread = SimulationThread(step=game.run_logic, snapshot=game.snapshot, handoff=handoff)
+    sim_thread.start()
+    try:
+        sim_thread.request_step()
+        assert handed_off.wait(timeout=5)
+    finally:
+        sim_thread.stop(timeout=5)
+
+    assert published_at_handoff == [0]
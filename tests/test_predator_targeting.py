@@ -1,13 +1,16 @@
 """Focused tests for predator target selection helpers."""
 
+import numpy as np
 import pygame as pg
 
 from my_boids.boids import Boid
+from my_boids.clusters import find_clusters
 from my_boids.predator_targeting import (
     target_flock_center,
     target_most_isolated_bird,
     target_mouse_cursor,
     target_nearest_bird,
+    target_nearest_cluster,
 )
 
 
@@ -54,3 +57,18 @@ def test_target_most_isolated_bird_returns_single_boid_when_only_one_exists():
 def test_target_most_isolated_bird_returns_boid_with_largest_nearest_neighbor_gap():
     boids = [_make_boid(0, 0), _make_boid(2, 0), _make_boid(100, 100)]
     assert target_most_isolated_bird(boids, pg.Vector2(0, 0)) == pg.Vector2(100, 100)
+
+
+def test_target_nearest_cluster_holds_position_for_empty_flock():
+    positions = np.zeros((0, 2))
+    predator_pos = pg.Vector2(3, 4)
+    clusters = find_clusters(positions, 10.0)
+    assert target_nearest_cluster(predator_pos, positions, clusters) == predator_pos
+
+
+def test_target_nearest_cluster_returns_centroid_of_cluster_holding_closest_boid():
+    positions = np.array([[0.0, 0.0], [8.0, 0.0], [16.0, 0.0], [200.0, 200.0], [204.0, 200.0]])
+    clusters = find_clusters(positions, 10.0)
+    predator_pos = pg.Vector2(20, 5)
+    target = target_nearest_cluster(predator_pos, positions, clusters)
+    assert target == pg.Vector2(8, 0)
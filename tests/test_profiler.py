@@ -0,0 +1,110 @@
+"""Tests for profiler.py"""
+
+import pstats
+import time
+
+import pygame as pg
+
+from my_boids.game import Game
+from my_boids.options import BoidOptions, PerformanceOptions, PredatorOptions, ScreenOptions
+from my_boids.profiler import ProfileCapture
+
+
+def _busy_work() -> int:
+    return sum(range(1000))
+
+
+def test_capture_stops_after_requested_frames(tmp_path):
+    profiler = ProfileCapture(output_dir=tmp_path, frames=3)
+
+    profiler.start()
+    _busy_work()
+    assert profiler.active
+    assert profiler.end_frame() is None
+    assert profiler.end_frame() is None
+    prof_path = profiler.end_frame()
+
+    assert not profiler.active
+    assert prof_path is not None
+    assert prof_path == profiler.last_output
+    assert prof_path.suffix == ".prof"
+    functions = {name for _, _, name in pstats.Stats(str(prof_path)).stats}
+    assert "_busy_work" in functions
+    summary = prof_path.with_suffix(".txt").read_text()
+    assert "cumulative" in summary
+    assert "_busy_work" in summary
+
+
+def test_captures_in_the_same_second_do_not_overwrite_each_other(tmp_path, monkeypatch):
+    monkeypatch.setattr(time, "strftime", lambda _format: "20260101-120000")
+    profiler = ProfileCapture(output_dir=tmp_path, frames=1)
+
+    paths = []
+    for _ in range(3):
+        profiler.start()
+        paths.append(profiler.stop())
+
+    assert [path.name for path in paths if path is not None] == [
+        "profile-20260101-120000.prof",
+        "profile-20260101-120000-2.prof",
+        "profile-20260101-120000-3.prof",
+    ]
+    assert len(list(tmp_path.glob("*.txt"))) == 3
+
+
+def test_start_while_active_keeps_current_capture(tmp_path):
+    profiler = ProfileCapture(output_dir=tmp_path, frames=5)
+    profiler.start(frames=2)
+    profiler.start(frames=10)
+
+    assert profiler.frames_remaining == 2
+    profiler.stop()
+
+
+def test_end_frame_and_stop_are_noops_when_idle(tmp_path):
+    profiler = ProfileCapture(output_dir=tmp_path)
+
+    assert profiler.end_frame() is None
+    assert profiler.stop() is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_game_profiling_hotkey(pygame_display, tmp_path):
+    game = Game(
+        screen_opts=ScreenOptions(),
+        boid_opts=BoidOptions(num_boids=3),
+        predator_opts=PredatorOptions(predator_attack_mode="center"),
+        performance_opts=PerformanceOptions(profile_frames=2, profile_dir=str(tmp_path)),
+        show_metrics=False,
+    )
+
+    game.process_events([pg.event.Event(pg.KEYUP, key=pg.K_F9)])
+    assert game.profiler.active
+    for _ in range(2):
+        game.performance.start_frame()
+        game.run_logic()
+        game.end_frame()
+
+    assert not game.profiler.active
+    (prof_file,) = tmp_path.glob("profile-*.prof")
+    assert "run_logic" in prof_file.with_suffix(".txt").read_text()
+
+
+def test_display_frame_shows_profiling_indicator(pygame_display, monkeypatch, tmp_path):
+    game = Game(
+        boid_opts=BoidOptions(num_boids=3),
+        performance_opts=PerformanceOptions(profile_dir=str(tmp_path)),
+        show_metrics=False,
+    )
+    calls = []
+    monkeypatch.setattr(
+        "my_boids.hud.draw_profiling_indicator",
+        lambda screen, frames_remaining: calls.append(frames_remaining),
+    )
+
+    game.display_frame(pygame_display, flip=False)
+    game.start_profiling(frames=4)
+    game.display_frame(pygame_display, flip=False)
+    game.profiler.stop()
+
+    assert calls == [4]
@@ -0,0 +1,189 @@
+"""Tests for my_boids.recording."""
+
+import numpy as np
+import pygame as pg
+import pytest
+
+from my_boids.boids import Boid
+from my_boids.predator import Predator
+from my_boids.recording import (
+    CompressedRecords,
+    TrajectoryRecorder,
+    open_trajectory,
+    record_dtype,
+)
+from my_boids.trajectory_codec import TrajectoryCodec
+
+
+@pytest.fixture(name="predator")
+def fixture_predator(pygame_display):
+    return Predator(pos=pg.Vector2(400, 300), vel=pg.Vector2(1, -1))
+
+
+def _boids(count):
+    return [
+        Boid(pos=(10 * i, 20 * i), vel=(i, -i), color=(30 + i, 40, 50), size=1)
+        for i in range(count)
+    ]
+
+
+def test_record_dtype_keeps_records_aligned():
+    for slots in (1, 3, 7, 8):
+        dtype = record_dtype(slots)
+        assert dtype.itemsize % 8 == 0
+        fields = dtype.fields
+        assert fields is not None
+        assert fields["positions"][1] % 8 == 0
+
+
+def test_recorder_rejects_bad_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(tmp_path / "t.trj", every=0)
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(tmp_path / "t.trj").start(0, (800, 600))
+
+
+def test_record_requires_start(tmp_path, predator):
+    with pytest.raises(RuntimeError):
+        TrajectoryRecorder(tmp_path / "t.trj").record(0, _boids(1), predator, 0)
+
+
+def test_recorded_steps_round_trip(tmp_path, predator):
+    boids = _boids(3)
+    recorder = TrajectoryRecorder(tmp_path / "t.trj", initial_capacity=1)
+    recorder.start(3, (800, 600), options={"boid": {"size": 1}})
+    for step in range(5):
+        for boid in boids:
+            boid.pos += boid.vel
+        recorder.record(step, boids, predator, score=step)
+    recorder.close()
+
+    trajectory = open_trajectory(tmp_path / "t.trj")
+    assert len(trajectory) == 5
+    assert trajectory.winsize == (800, 600)
+    assert trajectory.options == {"boid": {"size": 1}}
+    assert trajectory.steps.tolist() == [0, 1, 2, 3, 4]
+    assert trajectory.records["score"].tolist() == [0, 1, 2, 3, 4]
+    np.testing.assert_array_equal(trajectory.positions[-1], [tuple(boid.pos) for boid in boids])
+    np.testing.assert_array_equal(trajectory.velocities[0], [tuple(boid.vel) for boid in boids])
+    np.testing.assert_array_equal(trajectory.records["predator_pos"][0], (400, 300))
+    np.testing.assert_array_equal(trajectory.colors[:, 0], [30, 31, 32])
+    assert trajectory.alive.all()
+
+
+def test_dead_boids_keep_their_slot(tmp_path, predator):
+    boids = _boids(3)
+    recorder = TrajectoryRecorder(tmp_path / "t.trj")
+    recorder.start(3, (800, 600))
+    recorder.record(0, boids, predator, 0)
+    recorder.record(1, [boids[0], boids[2]], predator, 1)
+    recorder.close()
+
+    trajectory = open_trajectory(tmp_path / "t.trj")
+    assert trajectory.alive.tolist() == [[True, True, True], [True, False, True]]
+    np.testing.assert_array_equal(trajectory.positions[1, 2], tuple(boids[2].pos))
+
+
+def test_replaced_boids_get_their_own_slots(tmp_path, predator):
+    boids = _boids(3)
+    recorder = TrajectoryRecorder(tmp_path / "t.trj")
+    recorder.start(4, (800, 600))
+    recorder.record(0, boids, predator, 0)
+    newcomer = Boid(pos=(5, 5), vel=(1, 1), color=(200, 40, 50), size=1)
+    recorder.record(1, [boids[0], boids[1], newcomer], predator, 1)
+    recorder.close()
+
+    trajectory = open_trajectory(tmp_path / "t.trj")
+    assert trajectory.alive.tolist() == [[True, True, True, False], [True, True, False, True]]
+    np.testing.assert_array_equal(trajectory.positions[1, 3], (5, 5))
+    assert trajectory.colors[3, 0] == 200
+
+
+def test_boids_beyond_the_slots_are_untracked(tmp_path, predator):
+    recorder = TrajectoryRecorder(tmp_path / "t.trj")
+    recorder.start(2, (800, 600))
+    recorder.record(0, _boids(3), predator, 0)
+    recorder.close()
+
+    assert recorder.boids_untracked == 1
+    assert open_trajectory(tmp_path / "t.trj").alive.tolist() == [[True, True]]
+
+
+def test_flush_makes_steps_visible_before_close(tmp_path, predator):
+    recorder = TrajectoryRecorder(tmp_path / "t.trj")
+    recorder.start(2, (800, 600))
+    recorder.record(0, _boids(2), predator, 0)
+    recorder.flush()
+
+    assert len(open_trajectory(tmp_path / "t.trj")) == 1
+    recorder.close()
+
+
+def test_open_trajectory_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a trajectory")
+
+    with pytest.raises(ValueError):
+        open_trajectory(path)
+
+
+def _record_compressed(path, predator, steps, codec):
+    boids = _boids(3)
+    recorder = TrajectoryRecorder(path, codec=codec)
+    recorder.start(3, (800, 600), velocity_limit=20)
+    positions = []
+    for step in range(steps):
+        for boid in boids:
+            boid.pos += boid.vel
+        recorder.record(step, boids, predator, score=step)
+        positions.append([tuple(boid.pos) for boid in boids])
+    return recorder, np.array(positions)
+
+
+def test_compressed_steps_round_trip(tmp_path, predator):
+    codec = TrajectoryCodec(keyframe_every=4, position_error=0.01)
+    recorder, positions = _record_compressed(tmp_path / "t.trj", predator, 10, codec)
+    recorder.close()
+
+    trajectory = open_trajectory(tmp_path / "t.trj")
+    assert isinstance(trajectory.records, CompressedRecords)
+    assert len(trajectory) == 10
+    assert trajectory.steps.tolist() == list(range(10))
+    np.testing.assert_allclose(trajectory.positions, positions, atol=0.01)
+    np.testing.assert_allclose(trajectory.records[-1]["positions"], positions[-1], atol=0.01)
+    np.testing.assert_allclose(trajectory.records[3:6]["positions"], positions[3:6], atol=0.01)
+    np.testing.assert_array_equal(trajectory.records["predator_pos"][0], (400, 300))
+    np.testing.assert_array_equal(trajectory.colors[:, 0], [30, 31, 32])
+    assert trajectory.alive.all()
+    with pytest.raises(IndexError):
+        trajectory.records[10]
+
+
+def test_compressed_flush_makes_steps_visible_before_close(tmp_path, predator):
+    codec = TrajectoryCodec(keyframe_every=4)
+    recorder, positions = _record_compressed(tmp_path / "t.trj", predator, 6, codec)
+    recorder.flush()
+    trajectory = open_trajectory(tmp_path / "t.trj")
+    assert len(trajectory) == 6
+
+    # Later chunks leave the flushed index intact until the next flush
+    for step in range(6, 9):
+        recorder.record(step, _boids(3), predator, score=step)
+    assert len(open_trajectory(tmp_path / "t.trj")) == 6
+    recorder.close()
+    assert open_trajectory(tmp_path / "t.trj").steps.tolist() == list(range(9))
+
+
+def test_compressed_recording_is_smaller(tmp_path, predator):
+    raw = TrajectoryRecorder(tmp_path / "raw.trj")
+    raw.start(3, (800, 600))
+    compressed, _ = _record_compressed(tmp_path / "z.trj", predator, 64, TrajectoryCodec())
+    boids = _boids(3)
+    for step in range(64):
+        for boid in boids:
+            boid.pos += boid.vel
+        raw.record(step, boids, predator, score=step)
+    raw.close()
+    compressed.close()
+
+    assert (tmp_path / "z.trj").stat().st_size < (tmp_path / "raw.trj").stat().st_size / 2
@@ -0,0 +1,118 @@
+"""Tests for my_boids.replay."""
+
+import pygame as pg
+import pytest
+
+from my_boids.game import Game
+from my_boids.options import BoidOptions, ScreenOptions
+from my_boids.recording import TrajectoryRecorder, open_trajectory
+from my_boids.replay import REPLAY_MAX_SPEED, REPLAY_MIN_SPEED, ReplayPlayer
+from my_boids.trajectory_codec import TrajectoryCodec
+
+
+@pytest.fixture(
+    name="trajectory", params=[None, TrajectoryCodec(keyframe_every=4)], ids=["raw", "compressed"]
+)
+def fixture_trajectory(request, pygame_display, tmp_path):
+    game = Game(
+        screen_opts=ScreenOptions(winsize=[800, 600]),
+        boid_opts=BoidOptions(num_boids=5, size=6),
+        seed=7,
+    )
+    game.start_recording(TrajectoryRecorder(tmp_path / "run.trj", codec=request.param))
+    for _ in range(9):
+        game.run_logic()
+    game.stop_recording()
+    return open_trajectory(tmp_path / "run.trj")
+
+
+def _key(key):
+    return pg.event.Event(pg.KEYUP, key=key)
+
+
+def test_snapshot_shows_the_recorded_flock(trajectory):
+    player = ReplayPlayer(trajectory)
+    player.seek(4)
+
+    snapshot = player.snapshot()
+
+    assert snapshot.step == 4
+    assert snapshot.boid_count == int(trajectory.alive[4].sum())
+    # One blit per live boid plus the predator
+    assert len(snapshot.blit_sequence) == snapshot.boid_count + 1
+    x, y = trajectory.positions[4, 0]
+    assert snapshot.blit_sequence[0][1] == (round(x) - 3, round(y) - 3)
+
+
+def test_large_flocks_replay_as_a_heatmap(trajectory):
+    player = ReplayPlayer(trajectory)
+    player.performance_opts.heatmap_threshold = 1
+
+    snapshot = player.snapshot()
+
+    assert snapshot.density is not None
+    assert len(snapshot.blit_sequence) == 1
+
+
+def test_playback_advances_by_speed_and_pauses_at_the_end(trajectory):
+    player = ReplayPlayer(trajectory, speed=4)
+
+    player.advance()
+    assert player.index == 4
+    player.advance()
+    player.advance()
+    assert player.at_end
+    assert player.paused
+
+
+def test_slow_playback_holds_frames(trajectory):
+    player = ReplayPlayer(trajectory, speed=0.5)
+
+    player.advance()
+    assert player.index == 0
+    player.advance()
+    assert player.index == 1
+
+
+def test_speed_is_clamped(trajectory):
+    player = ReplayPlayer(trajectory)
+
+    player.set_speed(1000)
+    assert player.speed == REPLAY_MAX_SPEED
+    player.set_speed(0)
+    assert player.speed == REPLAY_MIN_SPEED
+
+
+def test_keys_step_seek_and_change_speed(trajectory):
+    player = ReplayPlayer(trajectory)
+
+    assert not player.process_events([_key(pg.K_RIGHT), _key(pg.K_RIGHT), _key(pg.K_LEFT)])
+    assert player.paused
+    assert player.index == 1
+    player.process_events([_key(pg.K_END)])
+    assert player.at_end
+    player.process_events([_key(pg.K_HOME), _key(pg.K_PAGEDOWN)])
+    assert player.index == 1
+    player.process_events([_key(pg.K_UP)])
+    assert player.speed == 2
+    player.process_events([_key(pg.K_SPACE)])
+    assert not player.paused
+    assert player.process_events([_key(pg.K_ESCAPE)])
+
+
+def test_display_frame_draws_without_flip(trajectory, pygame_display):
+    player = ReplayPlayer(trajectory)
+
+    player.display_frame(pygame_display, flip=False)
+
+    x, y = trajectory.positions[0, 0]
+    assert tuple(pygame_display.get_at((round(x), round(y))))[:3] == tuple(trajectory.colors[0])
+
+
+def test_empty_trajectory_is_rejected(pygame_display, tmp_path):
+    recorder = TrajectoryRecorder(tmp_path / "empty.trj")
+    recorder.start(1, (800, 600))
+    recorder.close()
+
+    with pytest.raises(ValueError):
+        ReplayPlayer(open_trajectory(tmp_path / "empty.trj"))
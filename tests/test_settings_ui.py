@@ -15,7 +15,7 @@ from my_boids.options import (
     PredatorOptions,
     ScreenOptions,
 )
-from my_boids.settings_ui import SettingsDialog
+from my_boids.settings_ui import SettingsDialog, _field_range
 
 
 @pytest.fixture(name="ui_game")
@@ -103,3 +103,8 @@ def test_settings_dialog_handle_save_writes_predator_section(tmp_path: Path, ui_
     assert "predator_attack_mode = center" in text
     assert "num_boids = 3" in text
     assert "None" not in text
+
+
+def test_num_boids_slider_keeps_an_interactive_maximum():
+    assert _field_range(BoidOptions, "num_boids") == (1.0, 200.0)
+    assert _field_range(BoidOptions, "visual_range") == (20.0, 100.0)
@@ -171,3 +171,49 @@ def test_negative_positions(grid):
     nearby = grid.get_nearby_boids(pg.Vector2(-50, -50), search_radius=50)
     assert len(nearby) == 1
     assert boid in nearby
+
+
+def test_query_stats_count_candidates_and_neighbors(grid, boids_in_grid):
+    """Test that queries count scanned candidates, matches and visited cells."""
+    for boid in boids_in_grid:
+        grid.insert(boid)
+
+    neighbors = grid.get_nearby_boids(pg.Vector2(50, 50), search_radius=60)
+    stats = grid.get_query_stats()
+
+    assert stats.queries == 1
+    # Radius 60 with cell size 100 checks a 3x3 block holding four boids
+    assert stats.cells_visited == 9
+    assert stats.candidates == 4
+    assert stats.neighbors == len(neighbors) == 1
+    assert stats.hit_rate == pytest.approx(0.25)
+    assert stats.candidates_per_query == 4
+
+
+def test_query_stats_occupancy(grid):
+    """Test cell occupancy statistics and the power-of-two histogram."""
+    for _ in range(5):
+        grid.insert(Boid(pos=pg.Vector2(10, 10)))
+    grid.insert(Boid(pos=pg.Vector2(150, 10)))
+    grid.insert(Boid(pos=pg.Vector2(250, 10)))
+
+    stats = grid.get_query_stats()
+
+    assert stats.occupied_cells == 3
+    assert stats.max_occupancy == 5
+    assert stats.mean_occupancy == pytest.approx(7 / 3)
+    assert stats.occupancy_histogram == (2, 0, 1)
+
+
+def test_clear_resets_query_stats(grid, boids_in_grid):
+    """Test that clearing the grid restarts the query counters."""
+    for boid in boids_in_grid:
+        grid.insert(boid)
+    grid.get_nearby_boids(pg.Vector2(50, 50), search_radius=60)
+
+    grid.clear()
+    stats = grid.get_query_stats()
+
+    assert stats.queries == stats.candidates == stats.cells_visited == 0
+    assert stats.max_occupancy == 0
+    assert stats.hit_rate == 0.0
@@ -0,0 +1,65 @@
+"""Tests for my_boids.state."""
+
+import json
+
+import numpy as np
+import pytest
+
+from my_boids.state import GameState, load_game_state, save_game_state
+
+
+@pytest.fixture(name="state")
+def fixture_state():
+    return GameState(
+        step=12,
+        score=3,
+        game_over=False,
+        positions=np.array([[1.5, 2.5], [3.0, 4.0]]),
+        velocities=np.array([[0.1, -0.2], [0.0, 1.0]]),
+        colors=np.array([[30, 40, 50], [60, 70, 80]], dtype=np.uint8),
+        predator_pos=(400.0, 300.0),
+        predator_vel=(1.0, -1.0),
+        predator_angle=45.0,
+        options={"boid": {"size": 5}},
+        rng_state=dict(np.random.default_rng(1).bit_generator.state),
+    )
+
+
+def test_state_round_trips(state, tmp_path):
+    path = save_game_state(state, tmp_path / "nested" / "state.npz")
+
+    loaded = load_game_state(path)
+
+    assert loaded.step == 12
+    assert loaded.score == 3
+    assert loaded.predator_pos == (400.0, 300.0)
+    assert loaded.predator_vel == (1.0, -1.0)
+    assert loaded.predator_angle == 45.0
+    assert loaded.options == {"boid": {"size": 5}}
+    assert loaded.rng_state == state.rng_state
+    np.testing.assert_array_equal(loaded.positions, state.positions)
+    np.testing.assert_array_equal(loaded.velocities, state.velocities)
+    np.testing.assert_array_equal(loaded.colors, state.colors)
+    assert loaded.colors.dtype == np.uint8
+
+
+def test_save_replaces_the_file_without_leaving_a_temporary(state, tmp_path):
+    path = tmp_path / "state.npz"
+    save_game_state(state, path)
+    save_game_state(state, path)
+
+    assert [child.name for child in tmp_path.iterdir()] == ["state.npz"]
+
+
+def test_unsupported_format_version_is_rejected(state, tmp_path):
+    path = tmp_path / "state.npz"
+    np.savez(
+        path,
+        positions=state.positions,
+        velocities=state.velocities,
+        colors=state.colors,
+        header=np.array(json.dumps({"format_version": 99})),
+    )
+
+    with pytest.raises(ValueError):
+        load_game_state(path)
@@ -0,0 +1,81 @@
+"""Tests for stats.py"""
+
+import random
+
+import pytest
+
+from my_boids.stats import LogHistogram, WindowStats
+
+
+def test_log_histogram_quantile_within_bucket_error():
+    histogram = LogHistogram()
+    for value in (0.001, 0.002, 0.003, 0.004, 0.100):
+        histogram.add(histogram.bucket_index(value))
+
+    assert histogram.quantile(0.5) == pytest.approx(0.003, rel=0.05)
+    assert histogram.quantile(1.0) == pytest.approx(0.100, rel=0.05)
+
+
+def test_log_histogram_clamps_out_of_range_values():
+    histogram = LogHistogram(min_value=1e-3, max_value=1.0)
+
+    assert histogram.bucket_index(0.0) == 0
+    assert histogram.bucket_index(50.0) == len(histogram.counts) - 1
+
+
+def test_log_histogram_empty_quantile():
+    assert LogHistogram().quantile(0.5) == 0.0
+
+
+def test_window_stats_empty():
+    stats = WindowStats(window=10)
+
+    assert len(stats) == 0
+    assert stats.mean == 0.0
+    assert stats.min == 0.0
+    assert stats.max == 0.0
+    assert stats.quantile(0.99) == 0.0
+
+
+def test_window_stats_matches_exact_statistics_over_window():
+    rng = random.Random(1)
+    window = 50
+    stats = WindowStats(window=window)
+    samples = [rng.lognormvariate(-4, 0.5) for _ in range(500)]
+
+    for count, value in enumerate(samples, start=1):
+        stats.add(value)
+        recent = samples[max(0, count - window) : count]
+        assert len(stats) == len(recent)
+        assert stats.mean == pytest.approx(sum(recent) / len(recent))
+        assert stats.min == min(recent)
+        assert stats.max == max(recent)
+
+    recent = sorted(samples[-window:])
+    assert stats.quantile(0.5) == pytest.approx(recent[len(recent) // 2 - 1], rel=0.1)
+    assert stats.quantile(0.0) == recent[0]
+    assert stats.quantile(1.0) == recent[-1]
+
+
+def test_window_stats_percentiles_expose_hitches():
+    stats = WindowStats(window=100)
+    for _ in range(97):
+        stats.add(0.010)
+    for _ in range(3):
+        stats.add(0.100)
+
+    assert stats.quantile(0.5) == pytest.approx(0.010, rel=0.05)
+    assert stats.quantile(0.99) == pytest.approx(0.100, rel=0.05)
+    assert stats.mean < 0.015
+
+
+def test_window_stats_clear():
+    stats = WindowStats(window=5)
+    for value in (1.0, 2.0, 3.0):
+        stats.add(value)
+
+    stats.clear()
+    stats.add(4.0)
+
+    assert len(stats) == 1
+    assert stats.min == stats.max == stats.mean == 4.0
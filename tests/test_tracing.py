@@ -0,0 +1,115 @@
+"""Tests for tracing.py"""
+
+import json
+import threading
+
+import pygame as pg
+
+from my_boids.game import Game
+from my_boids.options import BoidOptions, PerformanceOptions, PredatorOptions, ScreenOptions
+from my_boids.performance import PerformanceMonitor
+from my_boids.tracing import TraceRecorder
+
+
+def test_record_span_creates_complete_event():
+    recorder = TraceRecorder()
+
+    recorder.record_span("logic", start=recorder._epoch + 0.5, duration=0.002)
+
+    (event,) = recorder.events
+    assert event["ph"] == "X"
+    assert event["name"] == "logic"
+    assert event["ts"] == 500_000
+    assert event["dur"] == 2_000
+    assert event["tid"] == threading.get_ident()
+
+
+def test_ring_buffer_keeps_most_recent_events():
+    recorder = TraceRecorder(capacity=3)
+
+    for index in range(5):
+        recorder.record_span(f"span{index}", start=0.0, duration=0.0)
+
+    assert [event["name"] for event in recorder.events] == ["span2", "span3", "span4"]
+
+
+def test_dump_writes_loadable_trace(tmp_path):
+    recorder = TraceRecorder()
+    recorder.record_span("render", start=0.0, duration=0.001)
+
+    path = recorder.dump(tmp_path / "nested" / "trace.json")
+
+    trace = json.loads(path.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    phases = [event["ph"] for event in trace["traceEvents"]]
+    assert phases == ["M", "X"]
+    assert trace["traceEvents"][0]["args"]["name"] == threading.current_thread().name
+
+
+def test_stream_path_appends_events(tmp_path):
+    stream_path = tmp_path / "stream.json"
+    recorder = TraceRecorder(stream_path=stream_path)
+    recorder.record_span("a", start=0.0, duration=0.0)
+    recorder.record_span("b", start=0.0, duration=0.0)
+    recorder.close()
+
+    # The JSON array format allows the closing bracket to be left off
+    events = json.loads(stream_path.read_text().rstrip().rstrip(",") + "]")
+    assert [event["ph"] for event in events] == ["M", "X", "X"]
+
+
+def test_events_from_other_threads_get_their_own_track():
+    recorder = TraceRecorder()
+    worker = threading.Thread(
+        target=lambda: recorder.record_span("logic", 0.0, 0.0), name="boids-simulation"
+    )
+    worker.start()
+    worker.join()
+    recorder.record_span("render", 0.0, 0.0)
+
+    thread_names = {event["args"]["name"] for event in recorder.metadata_events()}
+    assert thread_names == {"boids-simulation", threading.current_thread().name}
+    assert len({event["tid"] for event in recorder.events}) == 2
+
+
+def test_performance_monitor_records_spans_and_frames():
+    monitor = PerformanceMonitor()
+    monitor.trace = TraceRecorder()
+
+    monitor.start_frame()
+    with monitor.span("logic"), monitor.span("grid"):
+        pass
+    monitor.end_frame()
+
+    names = [event["name"] for event in monitor.trace.events]
+    assert names == ["grid", "logic", "frame"]
+    grid, logic, frame = monitor.trace.events
+    assert logic["ts"] <= grid["ts"]
+    assert grid["ts"] + grid["dur"] <= logic["ts"] + logic["dur"]
+    assert frame["cat"] == "frame"
+
+
+def test_game_dump_trace_hotkey(pygame_display, tmp_path):
+    game = Game(
+        screen_opts=ScreenOptions(),
+        boid_opts=BoidOptions(num_boids=3),
+        predator_opts=PredatorOptions(predator_attack_mode="center"),
+        performance_opts=PerformanceOptions(trace_events=True, trace_dir=str(tmp_path)),
+    )
+    game.performance.start_frame()
+    game.run_logic()
+    game.performance.end_frame()
+
+    game.process_events([pg.event.Event(pg.KEYUP, key=pg.K_t)])
+
+    (trace_file,) = tmp_path.glob("trace-*.json")
+    names = {event["name"] for event in json.loads(trace_file.read_text())["traceEvents"]}
+    assert {"update", "logic", "collision", "frame"} <= names
+
+
+def test_game_dump_trace_disabled(pygame_display):
+    game = Game(
+        boid_opts=BoidOptions(num_boids=3),
+        performance_opts=PerformanceOptions(trace_events=False),
+    )
+    assert game.dump_trace() is None
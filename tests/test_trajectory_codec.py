@@ -0,0 +1,100 @@
+"""Tests for my_boids.trajectory_codec."""
+
+import numpy as np
+import pytest
+
+from my_boids.recording import record_dtype
+from my_boids.trajectory_codec import TrajectoryCodec, decode_chunk, encode_chunk
+
+
+def _records(count, slots, seed=0):
+    rng = np.random.default_rng(seed)
+    records = np.zeros(count, dtype=record_dtype(slots))
+    records["step"] = np.arange(count) * 3
+    records["score"] = np.arange(count)
+    records["predator_pos"] = rng.uniform(0, 800, size=(count, 2))
+    records["predator_vel"] = rng.uniform(-5, 5, size=(count, 2))
+    velocities = rng.uniform(-20, 20, size=(count, slots, 2))
+    records["velocities"] = velocities
+    records["positions"] = np.cumsum(velocities, axis=0) % (800, 600)
+    records["alive"] = rng.random((count, slots)) < 0.9
+    return records
+
+
+@pytest.mark.parametrize("compression", ["zlib", "lzma"])
+def test_chunk_round_trips_within_the_error_bounds(compression):
+    codec = TrajectoryCodec(compression=compression, position_error=0.05, velocity_error=0.01)
+    quantization = codec.quantization((800, 600), velocity_limit=20)
+    records = _records(16, 11)
+
+    data = encode_chunk(records, codec, quantization)
+    decoded = decode_chunk(data, len(records), records.dtype, codec, quantization)
+
+    for field in ("step", "score", "predator_pos", "predator_vel", "alive"):
+        np.testing.assert_array_equal(decoded[field], records[field])
+    np.testing.assert_allclose(decoded["positions"], records["positions"], atol=0.05)
+    np.testing.assert_allclose(decoded["velocities"], records["velocities"], atol=0.01)
+
+
+def test_wrap_around_jumps_decode_exactly():
+    codec = TrajectoryCodec()
+    quantization = codec.quantization((800, 600), velocity_limit=20)
+    records = _records(4, 1)
+    # A boid wrapping from one edge to the other and back
+    records["positions"][:, 0, 0] = [799.0, 1.0, 799.0, 1.0]
+
+    data = encode_chunk(records, codec, quantization)
+    decoded = decode_chunk(data, len(records), records.dtype, codec, quantization)
+
+    np.testing.assert_allclose(
+        decoded["positions"][:, 0, 0],
+        records["positions"][:, 0, 0],
+        atol=quantization.position_error,
+    )
+
+
+def test_out_of_range_values_are_clamped():
+    codec = TrajectoryCodec()
+    quantization = codec.quantization((800, 600), velocity_limit=20)
+    records = _records(2, 1)
+    records["positions"][0, 0] = (-1e6, 1e6)
+
+    data = encode_chunk(records, codec, quantization)
+    decoded = decode_chunk(data, len(records), records.dtype, codec, quantization)
+
+    low = quantization.position_origin
+    high = low + quantization.position_quantum * 65535
+    np.testing.assert_allclose(decoded["positions"][0, 0], (low, high))
+
+
+def test_default_error_is_the_finest_16_bits_allow():
+    quantization = TrajectoryCodec().quantization((800, 600), velocity_limit=20)
+
+    assert quantization.position_error == pytest.approx(1200 / 65535 / 2)
+    assert quantization.velocity_error == pytest.approx(80 / 65535 / 2)
+
+
+def test_too_fine_errors_are_rejected():
+    with pytest.raises(ValueError):
+        TrajectoryCodec(position_error=1e-4).quantization((800, 600), velocity_limit=20)
+    with pytest.raises(ValueError):
+        TrajectoryCodec(velocity_error=1e-5).quantization((800, 600), velocity_limit=20)
+
+
+def test_bad_settings_are_rejected():
+    with pytest.raises(ValueError):
+        TrajectoryCodec(keyframe_every=0)
+    with pytest.raises(ValueError):
+        TrajectoryCodec(compression="gzip")  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        TrajectoryCodec(level=10)
+
+
+def test_header_round_trip():
+    codec = TrajectoryCodec(keyframe_every=8, compression="lzma", level=3)
+    quantization = codec.quantization((800, 600), velocity_limit=20)
+
+    restored, restored_quantization = TrajectoryCodec.from_header(codec.to_header(quantization))
+
+    assert restored == codec
+    assert restored_quantization == quantization
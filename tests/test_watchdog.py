@@ -0,0 +1,191 @@
+"""Tests for watchdog.py"""
+
+import threading
+
+import numpy as np
+import pygame as pg
+import pytest
+
+from my_boids.game import Game
+from my_boids.options import BoidOptions, PerformanceOptions, PredatorOptions, ScreenOptions
+from my_boids.performance import PerformanceMonitor
+from my_boids.watchdog import FrameWatchdog, SlowFrameState, load_slow_frame
+
+
+def _state(step: int = 7) -> SlowFrameState:
+    return SlowFrameState(
+        step=step,
+        positions=np.array([[1.0, 2.0], [3.0, 4.0]]),
+        velocities=np.array([[0.5, -0.5], [1.0, 0.0]]),
+        predator_pos=(10.0, 20.0),
+        options={"boid": {"num_boids": 2}},
+    )
+
+
+def test_frames_within_budget_are_ignored(tmp_path):
+    watchdog = FrameWatchdog(budget=0.02, output_dir=tmp_path, state=_state)
+
+    watchdog.start_frame()
+    assert watchdog.check(0.019, {}) is None
+    watchdog.close()
+    assert watchdog.slow_frames == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_slow_frame_snapshot_round_trip(tmp_path):
+    watchdog = FrameWatchdog(budget=0.02, output_dir=tmp_path, state=_state)
+
+    watchdog.start_frame()
+    path = watchdog.check(0.035, {"logic": 30.0, "logic/rules": 28.0})
+    watchdog.close()
+
+    assert path is not None
+    assert list(watchdog.snapshots) == [path]
+    slow_frame = load_slow_frame(path)
+    assert slow_frame.frame_time == pytest.approx(0.035)
+    assert slow_frame.budget == pytest.approx(0.02)
+    assert slow_frame.spans == {"logic": 30.0, "logic/rules": 28.0}
+    assert slow_frame.state.step == 7
+    np.testing.assert_array_equal(slow_frame.state.positions, [[1.0, 2.0], [3.0, 4.0]])
+    np.testing.assert_array_equal(slow_frame.state.velocities, [[0.5, -0.5], [1.0, 0.0]])
+    assert slow_frame.state.predator_pos == (10.0, 20.0)
+    assert slow_frame.state.options == {"boid": {"num_boids": 2}}
+
+
+def test_snapshots_are_rate_limited(tmp_path):
+    watchdog = FrameWatchdog(budget=0.02, output_dir=tmp_path, state=_state, min_interval=60)
+
+    watchdog.start_frame()
+    assert watchdog.check(0.05, {}) is not None
+    watchdog.start_frame()
+    assert watchdog.check(0.05, {}) is None
+    assert watchdog.slow_frames == 2
+
+
+def test_only_the_most_recent_snapshots_are_kept(tmp_path):
+    steps = iter(range(5))
+    watchdog = FrameWatchdog(
+        budget=0.02,
+        output_dir=tmp_path,
+        state=lambda: _state(next(steps)),
+        min_interval=0,
+        keep=2,
+    )
+
+    for _ in range(5):
+        watchdog.start_frame()
+        watchdog.check(0.05, {})
+    watchdog.close()
+
+    assert sorted(tmp_path.iterdir()) == sorted(watchdog.snapshots)
+    assert [load_slow_frame(path).state.step for path in watchdog.snapshots] == [3, 4]
+
+
+def test_state_is_captured_when_the_frame_starts(tmp_path):
+    steps = iter(range(10))
+    watchdog = FrameWatchdog(
+        budget=0.02, output_dir=tmp_path, state=lambda: _state(next(steps)), min_interval=0
+    )
+
+    watchdog.start_frame()
+    path = watchdog.check(0.05, {})
+    watchdog.close()
+
+    assert path is not None
+    assert load_slow_frame(path).state.step == 0
+
+
+def test_state_is_captured_under_the_lock(tmp_path):
+    lock = threading.Lock()
+    locked = []
+
+    def state() -> SlowFrameState:
+        locked.append(lock.locked())
+        return _state()
+
+    watchdog = FrameWatchdog(budget=0.02, output_dir=tmp_path, state=state, lock=lock)
+    watchdog.start_frame()
+
+    assert locked == [True]
+    assert not lock.locked()
+
+
+def test_frames_not_started_are_not_snapshotted(tmp_path):
+    watchdog = FrameWatchdog(budget=0.02, output_dir=tmp_path, state=_state)
+
+    assert watchdog.check(0.05, {}) is None
+    assert watchdog.slow_frames == 1
+
+
+def test_write_errors_do_not_block_close(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    watchdog = FrameWatchdog(budget=0.02, output_dir=blocker / "sub", state=_state)
+
+    watchdog.start_frame()
+    assert watchdog.check(0.05, {}) is not None
+    watchdog.close()
+
+    assert isinstance(watchdog.error, OSError)
+    assert not watchdog.snapshots
+
+
+def test_invalid_settings_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        FrameWatchdog(budget=0, output_dir=tmp_path)
+    with pytest.raises(ValueError):
+        FrameWatchdog(budget=0.02, output_dir=tmp_path, keep=0)
+
+
+def test_performance_monitor_checks_frames():
+    monitor = PerformanceMonitor()
+    spans_seen = []
+    monitor.watchdog = FrameWatchdog(budget=1e-9)
+    monitor.watchdog.check = lambda frame_time, spans: spans_seen.append(spans)  # type: ignore[method-assign]
+
+    monitor.start_frame()
+    with monitor.span("logic"):
+        pass
+    monitor.end_frame()
+
+    # The capture of the state going into the frame is timed with it
+    assert list(spans_seen[0]) == ["watchdog", "logic"]
+
+
+def test_game_watchdog_snapshot_replays(pygame_display, tmp_path):
+    game = Game(
+        screen_opts=ScreenOptions(),
+        boid_opts=BoidOptions(num_boids=4),
+        predator_opts=PredatorOptions(predator_attack_mode="center"),
+        performance_opts=PerformanceOptions(
+            watchdog_budget_ms=1e-6, watchdog_dir=str(tmp_path), watchdog_min_interval=0
+        ),
+        use_spatial_grid=True,
+    )
+    for _ in range(2):
+        positions = game.get_boid_positions()
+        velocities = game.get_boid_velocities()
+        predator_pos = pg.Vector2(game.predator.pos)
+        step = game.steps
+        game.performance.start_frame()
+        game.run_logic()
+        game.end_frame()
+
+    assert game.performance.watchdog is not None
+    game.performance.watchdog.close()
+    *_, path = game.performance.watchdog.snapshots
+    slow_frame = load_slow_frame(path)
+    assert slow_frame.state.options["boid"]["num_boids"] == 4
+    assert slow_frame.state.grid_stats is not None
+    assert "logic/rules" in slow_frame.spans
+
+    replay = Game(
+        boid_opts=BoidOptions(num_boids=1),
+        performance_opts=PerformanceOptions(),
+    )
+    replay.restore_slow_frame(slow_frame)
+    # The snapshot holds the state going into the slow frame
+    np.testing.assert_allclose(replay.get_boid_positions(), positions)
+    np.testing.assert_allclose(replay.get_boid_velocities(), velocities)
+    assert replay.predator.pos == predator_pos
+    assert replay.steps == step